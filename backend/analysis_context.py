@@ -2,6 +2,23 @@ from __future__ import annotations
 
 from typing import Any
 
+from prompt import PAPER_CONTEXT_ACK, PAPER_SYSTEM_PROMPT
+
+
+def build_paper_messages(paper_context: str | None, task_messages: list[dict]) -> list[dict]:
+    """System prompt and paper text first, then the per-call task messages.
+
+    Every call about one paper starts with the same bytes, so the provider's
+    prefix cache covers the paper text across analysis, code-availability and
+    chat requests.
+    """
+    messages = [{"role": "system", "content": PAPER_SYSTEM_PROMPT}]
+    if paper_context:
+        messages.append({"role": "user", "content": paper_context})
+        messages.append({"role": "assistant", "content": PAPER_CONTEXT_ACK})
+    messages.extend(task_messages)
+    return messages
+
 
 def build_analysis_prompt(paper_info: dict[str, Any], paper_content: str | None, content_error: str | None = None) -> str:
     if paper_content:
@@ -11,14 +28,20 @@ def build_analysis_prompt(paper_info: dict[str, Any], paper_content: str | None,
     return f"以下是论文元数据。未能获取论文全文时，请只基于这些信息做初筛分析；无法判断的内容必须明确写“未知”，不要编造。\n\n{metadata_context}"
 
 
-def build_chat_context_parts(
+def build_chat_context(
     paper_info: dict[str, Any],
     paper_content: str | None,
     content_error: str | None = None,
-) -> list[str]:
+) -> str:
+    """Paper context for chat sessions.
+
+    With the full text this is byte-identical to the analysis prompt, so chat
+    turns reuse the analysis call's cached prefix. Metadata-only papers get
+    the bare metadata, without the analysis-only screening instruction.
+    """
     if paper_content:
-        return [f"论文全文：\n{paper_content}"]
-    return [build_paper_metadata_context(paper_info, content_error=content_error)]
+        return build_analysis_prompt(paper_info, paper_content, content_error)
+    return build_paper_metadata_context(paper_info, content_error=content_error)
 
 
 def build_paper_metadata_context(paper_info: dict[str, Any], content_error: str | None = None) -> str:
@@ -0,0 +1,292 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+
+from database import (
+    claim_analysis_jobs,
+    complete_analysis_job,
+    fail_analysis_job,
+    get_paper,
+    release_analysis_job,
+)
+from llm_scheduler import LLMPreempted
+
+logger = logging.getLogger(__name__)
+
+_STAGE_CLOSED = object()
+# How often a running pipeline checks whether a stage's slot limit was raised.
+WORKER_SCALE_INTERVAL_SECONDS = 1.0
+
+
+@dataclass
+class PipelineItem:
+    job: dict
+    paper_info: dict | None = None
+    paper_content: str | None = None
+    content_error: str | None = None
+    user_prompt: str | None = None
+    response: str | None = None
+
+
+@dataclass
+class _Stage:
+    name: str
+    concurrency: int
+    handler: Callable[[PipelineItem], Awaitable[PipelineItem | None]]
+    inbox: asyncio.Queue
+    outbox: asyncio.Queue | None
+    slot_limit: Callable[[], int]
+    active_workers: int = 0
+    running_slots: set[int] = field(default_factory=set)
+    closed: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+class AnalysisPipeline:
+    """Drain the analysis queue through fetch → extract → LLM → persist stages.
+
+    Stages are connected by bounded queues so PDFs for the next papers are
+    downloaded and tokenized while the LLM works on the current ones, without
+    claiming (and leasing) more jobs than the queues can hold.
+    """
+
+    def __init__(
+        self,
+        analyzer,
+        min_priority: int | None = None,
+        continue_draining: Callable[[], bool] = lambda: True,
+        pool_name: str = "queue",
+    ):
+        self.analyzer = analyzer
+        self.min_priority = min_priority
+        self.continue_draining = continue_draining
+        self.pool_name = pool_name
+        self.success_count = 0
+        self.failed_count = 0
+        self._in_flight: dict[int, PipelineItem] = {}
+
+    def _build_stages(self) -> list[_Stage]:
+        job_settings = self.analyzer.job_settings
+        queue_size = max(1, job_settings.stage_queue_size)
+        # The LLM stage follows the admin-controlled concurrency: lowering it
+        # retires surplus LLM workers after their current paper, raising it
+        # starts new ones within WORKER_SCALE_INTERVAL_SECONDS.
+        handlers = [
+            ("fetch", lambda: job_settings.fetch_concurrency, self._fetch),
+            ("extract", lambda: job_settings.extract_concurrency, self._extract),
+            ("llm", lambda: self.analyzer.concurrency, self._generate),
+            ("persist", lambda: job_settings.persist_concurrency, self._persist),
+        ]
+        inboxes = [asyncio.Queue(maxsize=queue_size) for _ in handlers]
+        return [
+            _Stage(
+                name=name,
+                concurrency=max(1, slot_limit()),
+                handler=handler,
+                inbox=inboxes[index],
+                outbox=inboxes[index + 1] if index + 1 < len(inboxes) else None,
+                slot_limit=slot_limit,
+            )
+            for index, (name, slot_limit, handler) in enumerate(handlers)
+        ]
+
+    async def run(self) -> tuple[int, int]:
+        stages = self._build_stages()
+        self._reset_worker_states(stages)
+        try:
+            async with asyncio.TaskGroup() as group:
+                group.create_task(self._feed(stages[0].inbox))
+                for stage in stages:
+                    for slot in range(stage.concurrency):
+                        self._start_worker(group, stage, slot)
+                group.create_task(self._scale_workers(group, stages))
+        except BaseException:
+            await self._release_in_flight()
+            raise
+        return self.success_count, self.failed_count
+
+    async def _feed(self, inbox: asyncio.Queue) -> None:
+        try:
+            while self.continue_draining() and self.analyzer.llm.is_configured():
+                jobs = await asyncio.to_thread(
+                    claim_analysis_jobs,
+                    self.analyzer.worker_id,
+                    1,
+                    self.analyzer.job_settings.lease_seconds,
+                    None,
+                    self.min_priority,
+                )
+                if not jobs:
+                    break
+                item = PipelineItem(job=jobs[0])
+                self._in_flight[item.job["id"]] = item
+                await inbox.put(item)
+        finally:
+            await inbox.put(_STAGE_CLOSED)
+
+    def _start_worker(self, group: asyncio.TaskGroup, stage: _Stage, slot: int) -> None:
+        stage.running_slots.add(slot)
+        group.create_task(self._stage_worker(stage, slot))
+
+    async def _scale_workers(self, group: asyncio.TaskGroup, stages: list[_Stage]) -> None:
+        """Start workers for slots added to a stage's limit while the pipeline runs."""
+        while not stages[-1].closed.is_set():
+            try:
+                await asyncio.wait_for(stages[-1].closed.wait(), WORKER_SCALE_INTERVAL_SECONDS)
+            except TimeoutError:
+                pass
+            for stage in stages:
+                if stage.closed.is_set():
+                    continue
+                for slot in range(max(1, stage.slot_limit())):
+                    if slot not in stage.running_slots:
+                        self._register_worker(stage, slot)
+                        self._start_worker(group, stage, slot)
+
+    async def _stage_worker(self, stage: _Stage, slot: int) -> None:
+        state = self.analyzer.workers[self._worker_key(stage.name, slot)]
+        stage.active_workers += 1
+        try:
+            while slot == 0 or slot < stage.slot_limit():
+                item = await stage.inbox.get()
+                if item is _STAGE_CLOSED:
+                    # Hand the marker on to the sibling workers of this stage.
+                    stage.closed.set()
+                    stage.inbox.put_nowait(item)
+                    break
+                state["paper_id"] = item.job["paper_id"]
+                state["started_at"] = datetime.now(timezone.utc)
+                try:
+                    result = await stage.handler(item)
+                except Exception as exc:
+                    await self._fail(item, str(exc))
+                    result = None
+                finally:
+                    state["paper_id"] = None
+                    state["last_finished_at"] = datetime.now(timezone.utc)
+                state["processed_count"] += 1
+                if result is not None and stage.outbox is not None:
+                    await stage.outbox.put(result)
+        finally:
+            stage.active_workers -= 1
+            stage.running_slots.discard(slot)
+            if stage.active_workers == 0 and stage.outbox is not None:
+                await stage.outbox.put(_STAGE_CLOSED)
+
+    async def _fetch(self, item: PipelineItem) -> PipelineItem | None:
+        paper_id = item.job["paper_id"]
+        paper_info = await asyncio.to_thread(get_paper, paper_id)
+        if not paper_info:
+            await self._fail(item, "paper not found")
+            return None
+        if (paper_info.get("llm_response") or "").strip():
+            logger.info(f"[{paper_id}] 已有分析结果，跳过")
+            await self._complete(item)
+            return None
+        item.paper_info = paper_info
+        item.paper_content, item.content_error = await self.analyzer.fetch_paper_content(paper_info)
+        return item
+
+    async def _extract(self, item: PipelineItem) -> PipelineItem:
+        item.user_prompt = await asyncio.to_thread(
+            self.analyzer.build_prompt,
+            item.paper_info,
+            item.paper_content,
+            item.content_error,
+        )
+        item.paper_content = None
+        return item
+
+    async def _generate(self, item: PipelineItem) -> PipelineItem | None:
+        try:
+            item.response = await self.analyzer.generate_analysis(
+                item.job["paper_id"],
+                item.user_prompt,
+                self._priority_class(item),
+            )
+        except LLMPreempted:
+            await self._requeue(item)
+            return None
+        item.user_prompt = None
+        return item
+
+    async def _persist(self, item: PipelineItem) -> None:
+        await self.analyzer.persist_analysis(item.paper_info, item.response, self._priority_class(item))
+        await self._complete(item)
+        return None
+
+    async def _complete(self, item: PipelineItem) -> None:
+        self._in_flight.pop(item.job["id"], None)
+        await asyncio.to_thread(complete_analysis_job, item.job["id"], self.analyzer.worker_id)
+        self.analyzer._record_completion()
+        self.success_count += 1
+
+    @staticmethod
+    def _priority_class(item: PipelineItem) -> str:
+        # Job sources double as LLM scheduler classes (backlog / hf_daily / feishu).
+        return item.job.get("source") or "backlog"
+
+    async def _requeue(self, item: PipelineItem) -> None:
+        self._in_flight.pop(item.job["id"], None)
+        await asyncio.to_thread(release_analysis_job, item.job["id"], self.analyzer.worker_id)
+        logger.info("[%s] LLM 槽位被交互请求抢占，任务重新排队", item.job["paper_id"])
+
+    async def _fail(self, item: PipelineItem, error: str) -> None:
+        self._in_flight.pop(item.job["id"], None)
+        status = await asyncio.to_thread(
+            fail_analysis_job,
+            item.job["id"],
+            self.analyzer.worker_id,
+            error,
+            self.analyzer.job_settings.retry_delay_seconds,
+        )
+        self.failed_count += 1
+        logger.warning(
+            "[%s] 分析任务失败 (第 %s/%s 次，状态: %s): %s",
+            item.job["paper_id"],
+            item.job.get("attempts"),
+            item.job.get("max_attempts"),
+            status,
+            error,
+        )
+
+    async def _release_in_flight(self) -> None:
+        """Stopping mid-run: hand claimed jobs back to the queue instead of waiting for lease expiry.
+
+        Handler errors are already failed per item in ``_stage_worker``; what is
+        still in flight here was interrupted, so its attempt is not charged.
+        """
+        items = list(self._in_flight.values())
+        self._in_flight.clear()
+        for item in items:
+            try:
+                await asyncio.to_thread(release_analysis_job, item.job["id"], self.analyzer.worker_id)
+            except Exception as exc:
+                logger.warning("[%s] 释放分析任务失败: %s", item.job["paper_id"], exc)
+
+    def _worker_key(self, stage_name: str, slot: int) -> str:
+        return f"{self.pool_name}-{stage_name}-{slot + 1}"
+
+    def _reset_worker_states(self, stages: list[_Stage]) -> None:
+        workers = self.analyzer.workers
+        for key in [key for key, state in workers.items() if state["pool"] == self.pool_name]:
+            del workers[key]
+        for stage in stages:
+            for slot in range(stage.concurrency):
+                self._register_worker(stage, slot)
+
+    def _register_worker(self, stage: _Stage, slot: int) -> None:
+        key = self._worker_key(stage.name, slot)
+        self.analyzer.workers.setdefault(
+            key,
+            {
+                "worker": key,
+                "pool": self.pool_name,
+                "stage": stage.name,
+                "paper_id": None,
+                "started_at": None,
+                "last_finished_at": None,
+                "processed_count": 0,
+            },
+        )
@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import time
+import uuid
+from typing import AsyncIterator, Callable
+
+logger = logging.getLogger(__name__)
+
+# Finished streams stay replayable this long so a client that dropped near the
+# end can reconnect with Last-Event-ID and receive the tail.
+FINISHED_STREAM_RETENTION_SECONDS = 300
+
+
+class AnalysisStream:
+    """One server-side paper analysis; events carry ``<stream token>:<seq>`` ids so viewers can resume."""
+
+    def __init__(self, paper_id: str):
+        self.paper_id = paper_id
+        self.token = uuid.uuid4().hex[:12]
+        self.events: list[dict] = []
+        self.finished = False
+        self.finished_at: float | None = None
+        self.subscribers = 0
+        self.task: asyncio.Task | None = None
+        self._wakeup = asyncio.Event()
+
+    def publish(self, event: dict) -> None:
+        self.events.append({**event, "id": f"{self.token}:{len(self.events) + 1}"})
+        self._notify()
+
+    def finish(self) -> None:
+        self.finished = True
+        self.finished_at = time.monotonic()
+        self._notify()
+
+    def _notify(self) -> None:
+        wakeup, self._wakeup = self._wakeup, asyncio.Event()
+        wakeup.set()
+
+    def resume_position(self, last_event_id: str | None) -> int | None:
+        """Number of events the client already has, or None if the id belongs to another stream."""
+        token, _, sequence = (last_event_id or "").partition(":")
+        if token != self.token or not sequence.isdigit():
+            return None
+        return min(int(sequence), len(self.events))
+
+    async def subscribe(self, after: int = 0) -> AsyncIterator[dict]:
+        """Yield events after the first ``after``; the caller must have been counted by the hub."""
+        index = after
+        try:
+            while True:
+                while index < len(self.events):
+                    yield self.events[index]
+                    index += 1
+                if self.finished:
+                    return
+                await self._wakeup.wait()
+        finally:
+            self.subscribers -= 1
+
+
+class AnalysisStreamHub:
+    """Single-flight registry of analysis tasks that run independently of the requests watching them."""
+
+    def __init__(self):
+        self._streams: dict[str, AnalysisStream] = {}
+        self.started_count = 0
+        self.attached_count = 0
+        self.resumed_count = 0
+
+    def _prune(self) -> None:
+        cutoff = time.monotonic() - FINISHED_STREAM_RETENTION_SECONDS
+        for paper_id, stream in list(self._streams.items()):
+            if stream.finished and stream.finished_at is not None and stream.finished_at < cutoff:
+                del self._streams[paper_id]
+
+    def resume(self, paper_id: str, last_event_id: str | None) -> tuple[AnalysisStream, int] | None:
+        """Reattach a reconnecting client to the stream its Last-Event-ID came from."""
+        self._prune()
+        stream = self._streams.get(paper_id)
+        if stream is None or not last_event_id:
+            return None
+        position = stream.resume_position(last_event_id)
+        if position is None:
+            return None
+        stream.subscribers += 1
+        self.resumed_count += 1
+        return stream, position
+
+    def attach(
+        self,
+        paper_id: str,
+        producer: Callable[[], AsyncIterator[dict]],
+    ) -> tuple[AnalysisStream, bool]:
+        """Join the running analysis of ``paper_id`` or start ``producer``; returns (stream, started)."""
+        self._prune()
+        stream = self._streams.get(paper_id)
+        if stream is not None and not stream.finished:
+            stream.subscribers += 1
+            self.attached_count += 1
+            return stream, False
+
+        stream = AnalysisStream(paper_id)
+        stream.subscribers = 1
+        self._streams[paper_id] = stream
+        stream.task = asyncio.create_task(self._run(stream, producer))
+        self.started_count += 1
+        return stream, True
+
+    async def _run(self, stream: AnalysisStream, producer: Callable[[], AsyncIterator[dict]]) -> None:
+        try:
+            async for event in producer():
+                stream.publish(event)
+        except asyncio.CancelledError:
+            logger.info("[%s] 分析任务被取消", stream.paper_id)
+            raise
+        except Exception as exc:
+            logger.exception("[%s] 论文分析失败", stream.paper_id)
+            stream.publish({"event": "error", "data": str(exc)})
+        finally:
+            stream.finish()
+
+    def running_tasks(self) -> list[asyncio.Task]:
+        return [
+            stream.task
+            for stream in self._streams.values()
+            if stream.task is not None and not stream.task.done()
+        ]
+
+    def status_snapshot(self) -> dict:
+        self._prune()
+        running = [stream for stream in self._streams.values() if not stream.finished]
+        return {
+            "in_flight_count": len(running),
+            "viewer_count": sum(stream.subscribers for stream in running),
+            "retained_count": len(self._streams) - len(running),
+            "started_count": self.started_count,
+            "attached_count": self.attached_count,
+            "resumed_count": self.resumed_count,
+        }
+
+
+analysis_stream_hub = AnalysisStreamHub()
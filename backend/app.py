@@ -26,8 +26,10 @@ from auth import (
 )
 from config import settings, write_background_analysis_config
 from llm import ManagedLLM, fetch_openai_compatible_model_names
+from llm_scheduler import llm_scheduler
 from migrations import apply_migrations
-from analysis_context import build_analysis_prompt, build_chat_context_parts
+from analysis_context import build_analysis_prompt, build_chat_context
+from analysis_streams import analysis_stream_hub
 from github_oauth import (
     GITHUB_AUTHORIZE_URL,
     GithubOAuthError,
@@ -52,41 +54,38 @@ from feishu import (
     validate_feishu_webhook_url,
 )
 from database import (
+    LLM_PROVIDER_RATE_LIMIT_COLUMNS,
     DatabaseError,
+    InvalidCursorError,
+    close_connection_pool,
     count_arxiv_paper_read_states,
     count_active_admins,
     count_hf_daily_paper_read_states,
     count_pending_code_availability,
     count_papers,
-    count_search_paper_read_states,
     count_unchecked_code_availability,
+    count_analysis_jobs_by_status,
     count_unanalyzed_papers,
-    create_chat_session,
+    enqueue_analysis_jobs,
     create_or_link_github_user,
     create_user_session,
-    delete_chat_session,
     delete_user,
-    delete_last_chat_message_pair,
     ensure_admin_user,
     ensure_default_llm_providers,
     add_llm_model,
-    get_chat_messages,
-    get_chat_session,
-    get_chat_sessions_for_account,
     get_arxiv_papers,
-    get_conference_papers,
     get_hf_daily_papers,
     get_feishu_settings,
     get_active_llm_config,
+    get_connection_pool_stats,
+    get_open_analysis_job,
     get_paper,
     get_llm_provider,
+    get_llm_completion_cache_metrics,
     get_llm_token_usage_metrics,
-    get_paper_marks,
-    get_presence_counts,
     get_presence_trend,
     get_user_by_email,
     get_user_by_id,
-    get_user_by_session_token_hash,
     has_hf_daily_papers_for_date,
     has_successful_feishu_push,
     list_enabled_feishu_settings,
@@ -94,14 +93,12 @@ from database import (
     list_llm_providers,
     list_users,
     migrate_anonymous_data,
-    record_presence,
     record_feishu_push_result,
     record_presence_snapshot,
     revoke_session,
     revoke_user_sessions,
-    save_chat_message,
     save_paper,
-    search_all_papers,
+    search_paper_page,
     select_daily_push_papers_for_user,
     set_paper_mark,
     set_active_llm_provider,
@@ -116,8 +113,33 @@ from database import (
     update_user_last_login,
     update_user_password,
 )
+from async_database import (
+    close_async_connection_pool,
+    create_chat_session,
+    delete_chat_session,
+    delete_last_chat_message_pair,
+    get_async_connection_pool_stats,
+    get_chat_messages,
+    get_chat_session,
+    get_chat_sessions_for_account,
+    get_paper_marks,
+    get_presence_counts,
+    get_user_by_session_token_hash,
+    open_async_connection_pool,
+    publish_cache_invalidation,
+    record_presence,
+    save_chat_message,
+)
+import cache_bus
 from chat import ChatSession
-from background_tasks import BackgroundAnalyzer
+from result_cache import get_cache_stats
+from background_tasks import (
+    ANALYSIS_PRIORITY_FEISHU,
+    ANALYSIS_PRIORITY_HF_DAILY,
+    ANALYSIS_PRIORITY_INTERACTIVE,
+    MAX_ANALYSIS_CONCURRENCY,
+    BackgroundAnalyzer,
+)
 from markdown_utils import normalize_llm_markdown
 from prompt import build_open_in_ai_prompt
 
@@ -128,16 +150,36 @@ GITHUB_OAUTH_COOKIE_MAX_AGE_SECONDS = 600
 
 llm = ManagedLLM()
 chat_sessions: dict[str, ChatSession] = {}
-background_analyzer = BackgroundAnalyzer(llm, check_interval=settings.background_analysis.check_interval_seconds)
+background_analyzer = BackgroundAnalyzer(
+    llm,
+    check_interval=settings.background_analysis.check_interval_seconds,
+    job_settings=settings.analysis_jobs,
+    concurrency=settings.background_analysis.concurrency,
+)
 background_task = None
 presence_snapshot_task = None
 hf_daily_task = None
 feishu_push_task = None
+cache_invalidation_task = None
 hf_daily_analysis_tasks: set[asyncio.Task] = set()
 background_analysis_enabled = settings.background_analysis.enabled
 background_analysis_lock = asyncio.Lock()
 
 
+def drop_cached_chat_session(data: dict) -> None:
+    if data.get("resync"):
+        chat_sessions.clear()
+        return
+    chat_sessions.pop(str(data.get("session_id") or ""), None)
+
+
+cache_bus.subscribe("chat_sessions", drop_cached_chat_session)
+
+
+async def publish_chat_session_changed(session_id: str) -> None:
+    await publish_cache_invalidation("chat_sessions", {"session_id": session_id})
+
+
 async def run_presence_snapshots():
     while True:
         try:
@@ -192,17 +234,21 @@ def get_feishu_push_time() -> datetime_time:
 async def analyze_hf_daily_papers(paper_ids: list[str]) -> None:
     if not paper_ids:
         return
+    await asyncio.to_thread(
+        enqueue_analysis_jobs,
+        paper_ids,
+        "hf_daily",
+        ANALYSIS_PRIORITY_HF_DAILY,
+        settings.analysis_jobs.max_attempts,
+    )
     if not llm.is_configured():
-        logger.warning("HF Daily 已入库，但 LLM 未配置，跳过自动分析")
+        logger.warning("HF Daily 已入库并加入分析队列，但 LLM 未配置，暂不分析")
         return
 
-    seen: set[str] = set()
-    for paper_id in paper_ids:
-        if paper_id in seen:
-            continue
-        seen.add(paper_id)
-        await background_analyzer.analyze_paper(paper_id)
-        await asyncio.sleep(1)
+    await background_analyzer.drain_jobs(
+        min_priority=ANALYSIS_PRIORITY_HF_DAILY,
+        pool_name="hf_daily",
+    )
 
 
 def schedule_hf_daily_analysis(paper_ids: list[str]) -> None:
@@ -268,6 +314,7 @@ async def apply_background_analysis_runtime_config(
     *,
     enabled: bool,
     check_interval_seconds: int,
+    concurrency: int,
 ) -> None:
     global background_analysis_enabled
     async with background_analysis_lock:
@@ -275,9 +322,11 @@ async def apply_background_analysis_runtime_config(
             write_background_analysis_config,
             enabled,
             check_interval_seconds,
+            concurrency,
         )
 
         background_analysis_enabled = enabled
+        background_analyzer.set_concurrency(concurrency)
         background_analyzer.set_check_interval(check_interval_seconds)
         if enabled:
             start_background_analysis_task()
@@ -291,11 +340,13 @@ async def build_background_tasks_payload() -> dict:
         unanalyzed_count = await asyncio.to_thread(count_unanalyzed_papers)
         pending_code_count = await asyncio.to_thread(count_pending_code_availability)
         unchecked_code_count = await asyncio.to_thread(count_unchecked_code_availability)
+        analysis_job_counts = await asyncio.to_thread(count_analysis_jobs_by_status)
     except DatabaseError:
         raise
 
     analyzer_state = background_analyzer.status_snapshot()
     analysis_status = paper_analysis_status()
+    pool_stats = get_connection_pool_stats()
     return {
         "generated_at": datetime.now(timezone.utc),
         "llm_configured": llm.is_configured(),
@@ -310,10 +361,12 @@ async def build_background_tasks_payload() -> dict:
                 "description": "定期扫描未分析论文并写入 LLM 分析结果",
                 "metadata": {
                     **analyzer_state,
+                    "interactive_streams": analysis_stream_hub.status_snapshot(),
                     "total_paper_count": total_paper_count,
                     "unanalyzed_count": unanalyzed_count,
                     "pending_code_availability_count": pending_code_count,
                     "unchecked_code_availability_count": unchecked_code_count,
+                    "analysis_jobs": analysis_job_counts,
                 },
             },
             {
@@ -391,6 +444,55 @@ async def build_background_tasks_payload() -> dict:
                     "max_daily_push_count": settings.feishu_notifications.max_daily_push_count,
                 },
             },
+            {
+                "id": "llm_scheduler",
+                "name": "LLM 调度",
+                "owner": "system",
+                "status": "running" if llm_scheduler.status_snapshot()["active_total"] else "idle",
+                "enabled": True,
+                "manageable": False,
+                "description": "按交互 > 飞书 > HF Daily > 后台补齐的优先级分配 LLM 并发，交互请求排队时抢占后台任务",
+                "metadata": {
+                    **llm_scheduler.status_snapshot(),
+                    "clients": llm.client_stats(),
+                    "rate_limits": llm.rate_limit_stats(),
+                    "routing": llm.routing_stats(),
+                    "completion_cache": llm.completion_cache_stats(),
+                },
+            },
+            {
+                "id": "database_pool",
+                "name": "数据库连接池",
+                "owner": "system",
+                "status": "running" if pool_stats.get("open") else "idle",
+                "enabled": pool_stats.get("configured", False),
+                "manageable": False,
+                "description": "复用数据库连接，避免每次查询重新建连",
+                "metadata": {
+                    **pool_stats,
+                    "async_pool": get_async_connection_pool_stats(),
+                },
+            },
+            {
+                "id": "cache_invalidation_bus",
+                "name": "跨进程缓存失效",
+                "owner": "system",
+                "status": task_runtime_status(cache_invalidation_task, cache_bus.is_enabled()),
+                "enabled": cache_bus.is_enabled(),
+                "manageable": False,
+                "description": "通过 PostgreSQL LISTEN/NOTIFY 通知其他 worker 丢弃过期缓存",
+                "metadata": cache_bus.status_snapshot(),
+            },
+            {
+                "id": "result_cache",
+                "name": "查询结果缓存",
+                "owner": "system",
+                "status": "running",
+                "enabled": True,
+                "manageable": False,
+                "description": "缓存会议与搜索列表结果，论文写入时按需失效",
+                "metadata": get_cache_stats(),
+            },
         ],
     }
 
@@ -417,7 +519,7 @@ async def ensure_paper_has_analysis(paper: dict) -> dict | None:
         return None
 
     paper_id = paper["id"]
-    ok = await background_analyzer.analyze_paper(paper_id)
+    ok = await background_analyzer.analyze_paper_now(paper_id, "feishu", ANALYSIS_PRIORITY_FEISHU)
     if not ok:
         return None
     refreshed = await asyncio.to_thread(get_paper, paper_id)
@@ -636,13 +738,18 @@ def ensure_llm_configured() -> None:
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global background_task, presence_snapshot_task, hf_daily_task, feishu_push_task
+    global background_task, presence_snapshot_task, hf_daily_task, feishu_push_task, cache_invalidation_task
     try:
         await asyncio.to_thread(apply_migrations)
     except Exception as exc:
         logger.error("数据库 migration 失败: %s", exc)
         raise
 
+    if settings.database.url:
+        await open_async_connection_pool()
+    if cache_bus.is_enabled():
+        cache_invalidation_task = asyncio.create_task(cache_bus.run_listener())
+
     try:
         await asyncio.to_thread(bootstrap_admin_user)
     except DatabaseError as exc:
@@ -671,7 +778,15 @@ async def lifespan(app: FastAPI):
     yield
 
     background_analyzer.stop()
-    for task in (background_task, presence_snapshot_task, hf_daily_task, feishu_push_task, *hf_daily_analysis_tasks):
+    for task in (
+        background_task,
+        presence_snapshot_task,
+        hf_daily_task,
+        feishu_push_task,
+        cache_invalidation_task,
+        *hf_daily_analysis_tasks,
+        *analysis_stream_hub.running_tasks(),
+    ):
         if not task:
             continue
         task.cancel()
@@ -680,6 +795,9 @@ async def lifespan(app: FastAPI):
         except asyncio.CancelledError:
             pass
     logger.info("后台分析任务已停止")
+    await llm.aclose()
+    await asyncio.to_thread(close_connection_pool)
+    await close_async_connection_pool()
 
 app = FastAPI(lifespan=lifespan)
 
@@ -736,6 +854,7 @@ class AdminUserUpdateRequest(BaseModel):
 class AdminBackgroundAnalysisUpdateRequest(BaseModel):
     enabled: bool | None = None
     check_interval_seconds: int | None = None
+    concurrency: int | None = None
 
 
 class ResetPasswordRequest(BaseModel):
@@ -761,6 +880,9 @@ class LlmProviderUpdateRequest(BaseModel):
     base_url: str | None = None
     api_key: str | None = None
     is_enabled: bool | None = None
+    requests_per_minute: int | None = None
+    tokens_per_minute: int | None = None
+    max_concurrency: int | None = None
 
 
 class LlmModelCreateRequest(BaseModel):
@@ -779,6 +901,12 @@ def validate_read_status(read_status: str) -> str:
     return read_status
 
 
+def next_page_cursor(papers: list[dict], limit: int) -> str | None:
+    if not papers or len(papers) < limit:
+        return None
+    return papers[-1].get("cursor")
+
+
 def validate_code_filter(code_status: str) -> str:
     if code_status not in {"all", "open_source", "not_open_source"}:
         raise HTTPException(
@@ -862,6 +990,9 @@ def public_llm_provider(provider: dict) -> dict:
         "is_builtin": bool(provider.get("is_builtin")),
         "active_model": provider.get("active_model"),
         "default_parameters": provider.get("default_parameters") or {},
+        "requests_per_minute": provider.get("requests_per_minute"),
+        "tokens_per_minute": provider.get("tokens_per_minute"),
+        "max_concurrency": provider.get("max_concurrency"),
         "models_fetched_at": provider.get("models_fetched_at"),
         "created_at": provider.get("created_at"),
         "updated_at": provider.get("updated_at"),
@@ -933,16 +1064,16 @@ def current_session_token(request: Request) -> str | None:
     return request.cookies.get(settings.auth.session_cookie_name)
 
 
-def get_current_user_optional(request: Request) -> dict | None:
+async def get_current_user_optional(request: Request) -> dict | None:
     token = current_session_token(request)
     if not token:
         return None
-    return get_user_by_session_token_hash(hash_session_token(token))
+    return await get_user_by_session_token_hash(hash_session_token(token))
 
 
-def require_current_user(request: Request) -> dict:
+async def require_current_user(request: Request) -> dict:
     try:
-        user = get_current_user_optional(request)
+        user = await get_current_user_optional(request)
     except DatabaseError as exc:
         raise HTTPException(status_code=502, detail="Database temporarily unavailable") from exc
     if not user:
@@ -956,10 +1087,11 @@ def require_admin_user(user: dict = Depends(require_current_user)) -> dict:
     return user
 
 
-def create_login_session(user: dict, request: Request, response: Response) -> None:
+async def create_login_session(user: dict, request: Request, response: Response) -> None:
     token = generate_session_token()
     expires_at = datetime.now(timezone.utc) + timedelta(days=settings.auth.session_ttl_days)
-    create_user_session(
+    await asyncio.to_thread(
+        create_user_session,
         user["id"],
         hash_session_token(token),
         expires_at,
@@ -967,7 +1099,7 @@ def create_login_session(user: dict, request: Request, response: Response) -> No
         get_request_ip(request),
     )
     set_session_cookie(response, token)
-    update_user_last_login(user["id"])
+    await asyncio.to_thread(update_user_last_login, user["id"])
 
 
 def sanitize_frontend_path(value: str | None) -> str:
@@ -1030,8 +1162,8 @@ def redirect_to_auth_error(error_code: str) -> RedirectResponse:
     return response
 
 
-def assert_chat_owner(session_id: str, user_id: str) -> dict | None:
-    session_row = get_chat_session(session_id)
+async def assert_chat_owner(session_id: str, user_id: str) -> dict | None:
+    session_row = await get_chat_session(session_id)
     if session_row and session_row.get("account_user_id") != user_id:
         raise HTTPException(status_code=403, detail="无权访问该会话")
     return session_row
@@ -1099,7 +1231,7 @@ async def github_callback(request: Request, code: str | None = None, state: str
             return redirect_to_auth_error("github_login_failed")
         if not user["is_active"]:
             return redirect_to_auth_error("github_user_disabled")
-        create_login_session(user, request, redirect_response)
+        await create_login_session(user, request, redirect_response)
         return redirect_response
     except GithubOAuthError as exc:
         logger.warning("GitHub OAuth failed: %s", exc)
@@ -1113,16 +1245,16 @@ async def github_callback(request: Request, code: str | None = None, state: str
 async def login(req: AuthRequest, request: Request, response: Response):
     normalized = validate_email_and_password(req.email, req.password)
     try:
-        user = get_user_by_email(normalized)
+        user = await asyncio.to_thread(get_user_by_email, normalized)
         password_hash = user.get("password_hash") if user else None
         if not user or not password_hash or not verify_password(password_hash, req.password):
             raise HTTPException(status_code=401, detail="邮箱或密码错误")
         if not user["is_active"]:
             raise HTTPException(status_code=403, detail="账号已被停用")
         if password_needs_rehash(password_hash):
-            update_user_password(user["id"], hash_password(req.password))
-            user = get_user_by_id(user["id"]) or user
-        create_login_session(user, request, response)
+            await asyncio.to_thread(update_user_password, user["id"], hash_password(req.password))
+            user = await asyncio.to_thread(get_user_by_id, user["id"]) or user
+        await create_login_session(user, request, response)
         return {"user": public_user(user)}
     except DatabaseError as exc:
         raise HTTPException(status_code=502, detail="Database temporarily unavailable") from exc
@@ -1133,7 +1265,7 @@ async def logout(request: Request, response: Response):
     token = current_session_token(request)
     if token:
         try:
-            revoke_session(hash_session_token(token))
+            await asyncio.to_thread(revoke_session, hash_session_token(token))
         except DatabaseError as exc:
             raise HTTPException(status_code=502, detail="Database temporarily unavailable") from exc
     clear_session_cookie(response)
@@ -1160,8 +1292,8 @@ async def change_password(
     token = current_session_token(request)
     token_hash = hash_session_token(token) if token else None
     try:
-        update_user_password(user["id"], hash_password(req.new_password))
-        revoke_user_sessions(user["id"], except_token_hash=token_hash)
+        await asyncio.to_thread(update_user_password, user["id"], hash_password(req.new_password))
+        await asyncio.to_thread(revoke_user_sessions, user["id"], except_token_hash=token_hash)
         return {"ok": True}
     except DatabaseError as exc:
         raise HTTPException(status_code=502, detail="Database temporarily unavailable") from exc
@@ -1177,7 +1309,7 @@ async def migrate_anonymous(
         for paper_id, mark in req.paper_marks.items()
     }
     try:
-        return migrate_anonymous_data(user["id"], req.anonymous_user_id, marks)
+        return await asyncio.to_thread(migrate_anonymous_data, user["id"], req.anonymous_user_id, marks)
     except DatabaseError as exc:
         raise HTTPException(status_code=502, detail="Database temporarily unavailable") from exc
 
@@ -1188,8 +1320,8 @@ async def heartbeat(req: PresenceRequest, request: Request):
     if not client_id:
         raise HTTPException(status_code=400, detail="client_id is required")
     try:
-        user = get_current_user_optional(request)
-        record_presence(
+        user = await get_current_user_optional(request)
+        await record_presence(
             client_id,
             user["id"] if user else None,
             request.headers.get("user-agent"),
@@ -1203,7 +1335,7 @@ async def heartbeat(req: PresenceRequest, request: Request):
 @app.get("/online/count")
 async def get_online_count():
     try:
-        return get_presence_counts(settings.presence.online_timeout_seconds)
+        return await get_presence_counts(settings.presence.online_timeout_seconds)
     except DatabaseError as exc:
         raise HTTPException(status_code=502, detail="Database temporarily unavailable") from exc
 
@@ -1211,7 +1343,7 @@ async def get_online_count():
 @app.get("/llm/active")
 async def get_active_llm():
     try:
-        return public_active_llm_config(get_active_llm_config())
+        return public_active_llm_config(await asyncio.to_thread(get_active_llm_config))
     except DatabaseError as exc:
         raise HTTPException(status_code=502, detail="Database temporarily unavailable") from exc
 
@@ -1220,10 +1352,10 @@ async def get_active_llm():
 async def list_my_paper_marks(request: Request, paper_ids: str = ""):
     ids = [paper_id for paper_id in paper_ids.split(",") if paper_id]
     try:
-        user = get_current_user_optional(request)
+        user = await get_current_user_optional(request)
         if not user:
             return {"marks": {}}
-        return {"marks": get_paper_marks(user["id"], ids)}
+        return {"marks": await get_paper_marks(user["id"], ids)}
     except DatabaseError as exc:
         raise HTTPException(status_code=502, detail="Database temporarily unavailable") from exc
 
@@ -1231,7 +1363,7 @@ async def list_my_paper_marks(request: Request, paper_ids: str = ""):
 @app.get("/me/feishu-webhook")
 async def get_my_feishu_webhook(user: dict = Depends(require_current_user)):
     try:
-        return public_feishu_settings(get_feishu_settings(user["id"]))
+        return public_feishu_settings(await asyncio.to_thread(get_feishu_settings, user["id"]))
     except DatabaseError as exc:
         raise HTTPException(status_code=502, detail="Database temporarily unavailable") from exc
 
@@ -1246,7 +1378,7 @@ async def update_my_feishu_webhook(
         raise HTTPException(status_code=400, detail=f"每日推送篇数需要在 1 到 {max_count} 之间")
 
     try:
-        existing = get_feishu_settings(user["id"])
+        existing = await asyncio.to_thread(get_feishu_settings, user["id"])
         raw_webhook_url = (req.webhook_url or "").strip()
         if raw_webhook_url:
             webhook_url = validate_feishu_webhook_url(raw_webhook_url)
@@ -1255,7 +1387,8 @@ async def update_my_feishu_webhook(
         else:
             raise HTTPException(status_code=400, detail="请先填写飞书 webhook URL")
 
-        updated = upsert_feishu_settings(
+        updated = await asyncio.to_thread(
+            upsert_feishu_settings,
             user["id"],
             webhook_url,
             req.daily_push_count,
@@ -1271,7 +1404,7 @@ async def update_my_feishu_webhook(
 @app.post("/me/feishu-webhook/test")
 async def test_my_feishu_webhook(user: dict = Depends(require_current_user)):
     try:
-        settings_row = get_feishu_settings(user["id"])
+        settings_row = await asyncio.to_thread(get_feishu_settings, user["id"])
         if not settings_row:
             raise HTTPException(status_code=400, detail="请先保存飞书 webhook URL")
         result = await asyncio.to_thread(
@@ -1310,7 +1443,7 @@ async def list_my_papers(
     safe_limit = min(max(limit, 1), 50)
     offset = (safe_page - 1) * safe_limit
     try:
-        items, total = list_marked_papers(user["id"], filter, sort, offset, safe_limit)
+        items, total = await asyncio.to_thread(list_marked_papers, user["id"], filter, sort, offset, safe_limit)
     except DatabaseError as exc:
         raise HTTPException(status_code=502, detail="Database temporarily unavailable") from exc
 
@@ -1329,7 +1462,8 @@ async def update_my_paper_mark(
     user: dict = Depends(require_current_user),
 ):
     try:
-        return set_paper_mark(
+        return await asyncio.to_thread(
+            set_paper_mark,
             user["id"],
             paper_id,
             viewed=req.viewed,
@@ -1346,8 +1480,8 @@ async def admin_online_metrics(range: str = "24h", admin: dict = Depends(require
         raise HTTPException(status_code=400, detail="range must be 24h or 7d")
     try:
         return {
-            "current": get_presence_counts(settings.presence.online_timeout_seconds),
-            "trend": get_presence_trend(range),
+            "current": await get_presence_counts(settings.presence.online_timeout_seconds),
+            "trend": await asyncio.to_thread(get_presence_trend, range),
         }
     except DatabaseError as exc:
         raise HTTPException(status_code=502, detail="Database temporarily unavailable") from exc
@@ -1356,7 +1490,10 @@ async def admin_online_metrics(range: str = "24h", admin: dict = Depends(require
 @app.get("/admin/metrics/llm-token-usage")
 async def admin_llm_token_usage_metrics(admin: dict = Depends(require_admin_user)):
     try:
-        return get_llm_token_usage_metrics()
+        return {
+            **await asyncio.to_thread(get_llm_token_usage_metrics),
+            "completion_cache": await asyncio.to_thread(get_llm_completion_cache_metrics),
+        }
     except DatabaseError as exc:
         raise HTTPException(status_code=502, detail="Database temporarily unavailable") from exc
 
@@ -1384,11 +1521,18 @@ async def admin_update_paper_analysis_task(
         raise HTTPException(status_code=400, detail="check_interval_seconds must be at least 60")
     if check_interval_seconds > 60 * 60 * 24 * 30:
         raise HTTPException(status_code=400, detail="check_interval_seconds must be at most 2592000")
+    concurrency = background_analyzer.concurrency if req.concurrency is None else req.concurrency
+    if concurrency < 1 or concurrency > MAX_ANALYSIS_CONCURRENCY:
+        raise HTTPException(
+            status_code=400,
+            detail=f"concurrency must be between 1 and {MAX_ANALYSIS_CONCURRENCY}",
+        )
 
     try:
         await apply_background_analysis_runtime_config(
             enabled=enabled,
             check_interval_seconds=check_interval_seconds,
+            concurrency=concurrency,
         )
         return await build_background_tasks_payload()
     except DatabaseError as exc:
@@ -1412,7 +1556,7 @@ async def admin_sync_hf_daily_papers(admin: dict = Depends(require_admin_user)):
 @app.get("/admin/llm/providers")
 async def admin_list_llm_providers(admin: dict = Depends(require_admin_user)):
     try:
-        providers = list_llm_providers()
+        providers = await asyncio.to_thread(list_llm_providers)
         return {"providers": [public_llm_provider(provider) for provider in providers]}
     except DatabaseError as exc:
         raise HTTPException(status_code=502, detail="Database temporarily unavailable") from exc
@@ -1428,7 +1572,8 @@ async def admin_create_llm_provider(
     if not req.base_url.strip().startswith(("http://", "https://")):
         raise HTTPException(status_code=400, detail="Base URL 必须以 http:// 或 https:// 开头")
     try:
-        provider = create_llm_provider(
+        provider = await asyncio.to_thread(
+            create_llm_provider,
             req.name,
             req.base_url,
             req.api_key,
@@ -1452,14 +1597,24 @@ async def admin_update_llm_provider(
         raise HTTPException(status_code=400, detail="Base URL 必须以 http:// 或 https:// 开头")
 
     fields_set = getattr(req, "model_fields_set", set())
+    # Explicit null clears a limit; omitted fields stay unchanged.
+    rate_limits = {
+        column: getattr(req, column)
+        for column in LLM_PROVIDER_RATE_LIMIT_COLUMNS
+        if column in fields_set
+    }
+    if any(value is not None and value <= 0 for value in rate_limits.values()):
+        raise HTTPException(status_code=400, detail="限流参数必须为正整数，留空表示不限制")
     try:
-        provider = update_llm_provider(
+        provider = await asyncio.to_thread(
+            update_llm_provider,
             provider_id,
             name=req.name,
             base_url=req.base_url,
             api_key=req.api_key,
             api_key_provided="api_key" in fields_set,
             is_enabled=req.is_enabled,
+            rate_limits=rate_limits,
         )
         if not provider:
             raise HTTPException(status_code=404, detail="供应商不存在")
@@ -1477,7 +1632,7 @@ async def admin_add_llm_model(
     if not req.model_name.strip():
         raise HTTPException(status_code=400, detail="模型名称不能为空")
     try:
-        model = add_llm_model(provider_id, req.model_name, req.display_name)
+        model = await asyncio.to_thread(add_llm_model, provider_id, req.model_name, req.display_name)
         if not model:
             raise HTTPException(status_code=404, detail="供应商不存在")
         return public_llm_model(model)
@@ -1491,15 +1646,15 @@ async def admin_fetch_llm_models(
     admin: dict = Depends(require_admin_user),
 ):
     try:
-        provider = get_llm_provider(provider_id)
+        provider = await asyncio.to_thread(get_llm_provider, provider_id)
         if not provider:
             raise HTTPException(status_code=404, detail="供应商不存在")
         model_names = await fetch_openai_compatible_model_names(
             provider["base_url"],
             provider.get("api_key"),
         )
-        models, added_count = upsert_fetched_llm_models(provider_id, model_names)
-        refreshed = get_llm_provider(provider_id)
+        models, added_count = await asyncio.to_thread(upsert_fetched_llm_models, provider_id, model_names)
+        refreshed = await asyncio.to_thread(get_llm_provider, provider_id)
         return {
             "provider": public_llm_provider(refreshed),
             "models": [public_llm_model(model) for model in models],
@@ -1521,7 +1676,7 @@ async def admin_set_active_llm(
     admin: dict = Depends(require_admin_user),
 ):
     try:
-        provider = set_active_llm_provider(req.provider_id, req.model_name)
+        provider = await asyncio.to_thread(set_active_llm_provider, req.provider_id, req.model_name)
         if not provider:
             raise HTTPException(status_code=404, detail="供应商不存在或已停用")
         return public_llm_provider(provider)
@@ -1554,7 +1709,8 @@ async def admin_list_users(
     safe_limit = min(max(limit, 1), 100)
     offset = (safe_page - 1) * safe_limit
     try:
-        users, total = list_users(
+        users, total = await asyncio.to_thread(
+            list_users,
             search.strip() or None,
             offset,
             safe_limit,
@@ -1580,7 +1736,7 @@ async def admin_update_user(
     if req.role is not None and req.role not in {"user", "admin"}:
         raise HTTPException(status_code=400, detail="role must be user or admin")
     try:
-        target = get_user_by_id(user_id)
+        target = await asyncio.to_thread(get_user_by_id, user_id)
         if not target:
             raise HTTPException(status_code=404, detail="用户不存在")
         disabling_active_admin = (
@@ -1588,11 +1744,11 @@ async def admin_update_user(
             and target["is_active"]
             and (req.is_active is False or req.role == "user")
         )
-        if disabling_active_admin and count_active_admins() <= 1:
+        if disabling_active_admin and await asyncio.to_thread(count_active_admins) <= 1:
             raise HTTPException(status_code=400, detail="不能停用最后一个管理员")
-        updated = update_user_admin_fields(user_id, role=req.role, is_active=req.is_active)
+        updated = await asyncio.to_thread(update_user_admin_fields, user_id, role=req.role, is_active=req.is_active)
         if req.is_active is False:
-            revoke_user_sessions(user_id)
+            await asyncio.to_thread(revoke_user_sessions, user_id)
         return updated
     except DatabaseError as exc:
         raise HTTPException(status_code=502, detail="Database temporarily unavailable") from exc
@@ -1606,10 +1762,10 @@ async def admin_reset_user_password(
 ):
     validate_email_and_password("admin@example.com", req.password)
     try:
-        if not get_user_by_id(user_id):
+        if not await asyncio.to_thread(get_user_by_id, user_id):
             raise HTTPException(status_code=404, detail="用户不存在")
-        update_user_password(user_id, hash_password(req.password))
-        revoke_user_sessions(user_id)
+        await asyncio.to_thread(update_user_password, user_id, hash_password(req.password))
+        await asyncio.to_thread(revoke_user_sessions, user_id)
         return {"ok": True}
     except DatabaseError as exc:
         raise HTTPException(status_code=502, detail="Database temporarily unavailable") from exc
@@ -1623,12 +1779,12 @@ async def admin_delete_user(
     if user_id == admin["id"]:
         raise HTTPException(status_code=400, detail="不能删除当前登录管理员")
     try:
-        target = get_user_by_id(user_id)
+        target = await asyncio.to_thread(get_user_by_id, user_id)
         if not target:
             raise HTTPException(status_code=404, detail="用户不存在")
-        if target["role"] == "admin" and target["is_active"] and count_active_admins() <= 1:
+        if target["role"] == "admin" and target["is_active"] and await asyncio.to_thread(count_active_admins) <= 1:
             raise HTTPException(status_code=400, detail="不能删除最后一个管理员")
-        if not delete_user(user_id):
+        if not await asyncio.to_thread(delete_user, user_id):
             raise HTTPException(status_code=404, detail="用户不存在")
         return {"ok": True}
     except DatabaseError as exc:
@@ -1665,7 +1821,7 @@ def _openreview_error_status(error: OpenReviewError) -> int:
 async def get_paper_info(paper_id: str):
     """获取论文基本信息"""
     try:
-        paper_info = get_or_fetch_paper_info(paper_id)
+        paper_info = await asyncio.to_thread(get_or_fetch_paper_info, paper_id)
     except ArxivInvalidInputError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except ArxivNotFoundError as e:
@@ -1686,7 +1842,7 @@ async def get_paper_info(paper_id: str):
 @app.get("/paper/{paper_id}/open-in-ai-prompt")
 async def get_paper_open_in_ai_prompt(paper_id: str):
     try:
-        paper_info = get_or_fetch_paper_info(paper_id)
+        paper_info = await asyncio.to_thread(get_or_fetch_paper_info, paper_id)
     except ArxivInvalidInputError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except ArxivNotFoundError as e:
@@ -1705,7 +1861,7 @@ async def get_paper_open_in_ai_prompt(paper_id: str):
 @app.post("/arxiv-papers")
 async def create_arxiv_paper(req: ArxivPaperRequest, request: Request):
     try:
-        user = get_current_user_optional(request)
+        user = await get_current_user_optional(request)
     except DatabaseError as e:
         raise HTTPException(status_code=502, detail="Database temporarily unavailable") from e
 
@@ -1731,9 +1887,75 @@ async def create_arxiv_paper(req: ArxivPaperRequest, request: Request):
     return {"paper": paper}
 
 
+async def stream_paper_analysis(paper_id: str, paper_info: dict, reanalyze: bool):
+    # Take the paper's queue job so background workers skip it; if one of
+    # them is already analyzing it, wait for that result instead.
+    job = await background_analyzer.claim_paper_job(paper_id, "interactive", ANALYSIS_PRIORITY_INTERACTIVE)
+    if job is None and not reanalyze:
+        open_job = await asyncio.to_thread(get_open_analysis_job, paper_id)
+        if open_job and open_job["status"] == "running":
+            yield {"event": "status", "data": "后台任务正在分析该论文，完成后将直接显示..."}
+            if await background_analyzer.wait_for_paper_job(paper_id):
+                paper_info = await asyncio.to_thread(get_paper, paper_id)
+                yield {"data": paper_info["llm_response"]}
+                yield {"event": "done", "data": ""}
+                return
+
+    async with background_analyzer.hold_job(job):
+        # Perform AI analysis
+        yield {"event": "status", "data": "正在读取 PDF 内容..."}
+        paper_content = None
+        content_error = None
+        if paper_info.get("pdf"):
+            try:
+                paper_content = await asyncio.to_thread(
+                    get_or_cache_paper_content,
+                    paper_id,
+                    paper_info["pdf"],
+                )
+                paper_content = truncate_content_for_llm(paper_content)
+            except ReaderError as e:
+                content_error = str(e)
+                yield {"event": "status", "data": "PDF 正文读取失败，正在基于论文元数据分析..."}
+        else:
+            content_error = "论文没有可用 PDF 链接"
+            yield {"event": "status", "data": "未找到 PDF 链接，正在基于论文元数据分析..."}
+
+        yield {"event": "status", "data": "正在分析论文..."}
+
+        user_prompt = build_analysis_prompt(paper_info, paper_content, content_error)
+
+        full_response = []
+        async for stream_chunk in llm.get_response_stream_events(user_prompt):
+            if stream_chunk.kind == "reasoning":
+                yield {"event": "reasoning", "data": stream_chunk.content}
+                continue
+            full_response.append(stream_chunk.content)
+            yield {"data": stream_chunk.content}
+
+        normalized_response = normalize_llm_markdown("".join(full_response), analysis_mode=True)
+        await asyncio.to_thread(update_llm_response, paper_id, normalized_response)
+        paper_info["llm_response"] = normalized_response
+        await background_analyzer.update_code_availability(paper_info, normalized_response, "interactive")
+        yield {"event": "done", "data": ""}
+
+
 @app.get("/paper/{paper_id}")
-async def get_paper_analysis(paper_id: str, reanalyze: bool = False):
+async def get_paper_analysis(paper_id: str, request: Request, reanalyze: bool = False):
+    last_event_id = request.headers.get("last-event-id")
+
     async def generate():
+        # Reconnecting client: continue the server-side stream after its last event.
+        if last_event_id:
+            resumed = analysis_stream_hub.resume(paper_id, last_event_id)
+            if resumed:
+                stream, position = resumed
+                async for event in stream.subscribe(position):
+                    yield event
+                return
+            # The stream it came from is gone; it must discard its partial text.
+            yield {"event": "reset", "data": ""}
+
         if not llm.is_configured():
             yield {"event": "error", "data": "config.yaml 未配置有效 LLM API key"}
             return
@@ -1765,47 +1987,21 @@ async def get_paper_analysis(paper_id: str, reanalyze: bool = False):
                 await asyncio.to_thread(update_llm_response, paper_id, normalized_response)
                 paper_info["llm_response"] = normalized_response
             if not paper_info.get("code_checked_at"):
-                await background_analyzer.update_code_availability(paper_info, normalized_response)
+                await background_analyzer.update_code_availability(paper_info, normalized_response, "interactive")
             yield {"data": normalized_response}
             yield {"event": "done", "data": ""}
             return
 
-        # Perform AI analysis
-        yield {"event": "status", "data": "正在读取 PDF 内容..."}
-        paper_content = None
-        content_error = None
-        if paper_info.get("pdf"):
-            try:
-                paper_content = await asyncio.to_thread(
-                    get_or_cache_paper_content,
-                    paper_id,
-                    paper_info["pdf"],
-                )
-                paper_content = truncate_content_for_llm(paper_content)
-            except ReaderError as e:
-                content_error = str(e)
-                yield {"event": "status", "data": "PDF 正文读取失败，正在基于论文元数据分析..."}
-        else:
-            content_error = "论文没有可用 PDF 链接"
-            yield {"event": "status", "data": "未找到 PDF 链接，正在基于论文元数据分析..."}
-
-        yield {"event": "status", "data": "正在分析论文..."}
-
-        user_prompt = build_analysis_prompt(paper_info, paper_content, content_error)
-
-        full_response = []
-        async for stream_chunk in llm.get_response_stream_events(user_prompt):
-            if stream_chunk.kind == "reasoning":
-                yield {"event": "reasoning", "data": stream_chunk.content}
-                continue
-            full_response.append(stream_chunk.content)
-            yield {"data": stream_chunk.content}
-
-        normalized_response = normalize_llm_markdown("".join(full_response), analysis_mode=True)
-        await asyncio.to_thread(update_llm_response, paper_id, normalized_response)
-        paper_info["llm_response"] = normalized_response
-        await background_analyzer.update_code_availability(paper_info, normalized_response)
-        yield {"event": "done", "data": ""}
+        # Concurrent viewers of the same paper share one analysis task, which
+        # keeps running (and persists its result) after they disconnect.
+        stream, started = analysis_stream_hub.attach(
+            paper_id,
+            lambda: stream_paper_analysis(paper_id, paper_info, reanalyze),
+        )
+        if not started:
+            yield {"event": "status", "data": "该论文正在被分析，正在同步进度..."}
+        async for event in stream.subscribe():
+            yield event
 
     return EventSourceResponse(generate())
 
@@ -1817,7 +2013,7 @@ async def chat_with_paper(
     user: dict = Depends(require_current_user),
 ):
     ensure_llm_configured()
-    session_row = assert_chat_owner(req.session_id, user["id"])
+    session_row = await assert_chat_owner(req.session_id, user["id"])
     session = chat_sessions.get(req.session_id)
     is_new_session = session_row is None
 
@@ -1835,7 +2031,6 @@ async def chat_with_paper(
         except DatabaseError as e:
             raise HTTPException(status_code=502, detail="Database temporarily unavailable") from e
 
-        context_parts = []
         paper_content = None
         content_error = None
         if paper_info.get("pdf"):
@@ -1850,23 +2045,25 @@ async def chat_with_paper(
                 content_error = str(e)
         else:
             content_error = "论文没有可用 PDF 链接"
-        context_parts.extend(build_chat_context_parts(paper_info, paper_content, content_error))
-        if paper_info.get("llm_response"):
-            context_parts.append(f"论文分析：\n{paper_info['llm_response']}")
 
-        history_rows = get_chat_messages(req.session_id) if session_row else []
+        history_rows = await get_chat_messages(req.session_id) if session_row else []
         if history_rows:
             history = [{"role": r["role"], "content": r["content"]} for r in history_rows]
         else:
             history = None
 
-        session = ChatSession(llm, context="\n\n".join(context_parts), history=history)
+        session = ChatSession(
+            llm,
+            context=build_chat_context(paper_info, paper_content, content_error),
+            analysis=paper_info.get("llm_response") or "",
+            history=history,
+        )
         chat_sessions[req.session_id] = session
 
     async def generate():
         try:
             if is_new_session:
-                create_chat_session(
+                await create_chat_session(
                     req.session_id,
                     user["id"],
                     paper_id,
@@ -1883,8 +2080,9 @@ async def chat_with_paper(
                 yield {"data": stream_chunk.content}
 
             # Persist messages
-            save_chat_message(req.session_id, "user", req.message)
-            save_chat_message(req.session_id, "assistant", normalize_llm_markdown("".join(chunks)))
+            await save_chat_message(req.session_id, "user", req.message)
+            await save_chat_message(req.session_id, "assistant", normalize_llm_markdown("".join(chunks)))
+            await publish_chat_session_changed(req.session_id)
 
             yield {"event": "done", "data": ""}
         except DatabaseError:
@@ -1896,10 +2094,10 @@ async def chat_with_paper(
 @app.get("/paper/{paper_id}/chat/sessions")
 async def list_chat_sessions(paper_id: str, request: Request):
     try:
-        user = get_current_user_optional(request)
+        user = await get_current_user_optional(request)
         if not user:
             return []
-        return get_chat_sessions_for_account(user["id"], paper_id)
+        return await get_chat_sessions_for_account(user["id"], paper_id)
     except DatabaseError as e:
         raise HTTPException(status_code=502, detail="Database temporarily unavailable") from e
 
@@ -1907,8 +2105,8 @@ async def list_chat_sessions(paper_id: str, request: Request):
 @app.get("/chat/{session_id}/messages")
 async def list_chat_messages(session_id: str, user: dict = Depends(require_current_user)):
     try:
-        assert_chat_owner(session_id, user["id"])
-        return get_chat_messages(session_id)
+        await assert_chat_owner(session_id, user["id"])
+        return await get_chat_messages(session_id)
     except DatabaseError as e:
         raise HTTPException(status_code=502, detail="Database temporarily unavailable") from e
 
@@ -1917,8 +2115,9 @@ async def list_chat_messages(session_id: str, user: dict = Depends(require_curre
 async def delete_session(session_id: str, user: dict = Depends(require_current_user)):
     chat_sessions.pop(session_id, None)
     try:
-        assert_chat_owner(session_id, user["id"])
-        delete_chat_session(session_id)
+        await assert_chat_owner(session_id, user["id"])
+        await delete_chat_session(session_id)
+        await publish_chat_session_changed(session_id)
     except DatabaseError as e:
         raise HTTPException(status_code=502, detail="Database temporarily unavailable") from e
     return {"ok": True}
@@ -1932,7 +2131,7 @@ async def regenerate_chat(
 ):
     """Delete last message pair, then re-send the user message."""
     ensure_llm_configured()
-    session_row = assert_chat_owner(req.session_id, user["id"])
+    session_row = await assert_chat_owner(req.session_id, user["id"])
     if not session_row:
         raise HTTPException(status_code=404, detail="会话不存在")
 
@@ -1944,7 +2143,8 @@ async def regenerate_chat(
         session = None
 
     try:
-        delete_last_chat_message_pair(req.session_id)
+        await delete_last_chat_message_pair(req.session_id)
+        await publish_chat_session_changed(req.session_id)
     except DatabaseError as e:
         raise HTTPException(status_code=502, detail="Database temporarily unavailable") from e
 
@@ -1962,7 +2162,6 @@ async def regenerate_chat(
         except DatabaseError as e:
             raise HTTPException(status_code=502, detail="Database temporarily unavailable") from e
 
-        context_parts = []
         paper_content = None
         content_error = None
         if paper_info.get("pdf"):
@@ -1977,12 +2176,14 @@ async def regenerate_chat(
                 content_error = str(e)
         else:
             content_error = "论文没有可用 PDF 链接"
-        context_parts.extend(build_chat_context_parts(paper_info, paper_content, content_error))
-        if paper_info.get("llm_response"):
-            context_parts.append(f"论文分析：\n{paper_info['llm_response']}")
-        history_rows = get_chat_messages(req.session_id)
+        history_rows = await get_chat_messages(req.session_id)
         history = [{"role": r["role"], "content": r["content"]} for r in history_rows] if history_rows else None
-        session = ChatSession(llm, context="\n\n".join(context_parts), history=history)
+        session = ChatSession(
+            llm,
+            context=build_chat_context(paper_info, paper_content, content_error),
+            analysis=paper_info.get("llm_response") or "",
+            history=history,
+        )
         chat_sessions[req.session_id] = session
 
     async def generate():
@@ -1995,8 +2196,9 @@ async def regenerate_chat(
                 chunks.append(stream_chunk.content)
                 yield {"data": stream_chunk.content}
 
-            save_chat_message(req.session_id, "user", req.message)
-            save_chat_message(req.session_id, "assistant", "".join(chunks))
+            await save_chat_message(req.session_id, "user", req.message)
+            await save_chat_message(req.session_id, "assistant", "".join(chunks))
+            await publish_chat_session_changed(req.session_id)
 
             yield {"event": "done", "data": ""}
         except DatabaseError:
@@ -2017,6 +2219,7 @@ async def get_conference_papers_endpoint(
     search_keywords: bool = True,
     read_status: str = "all",
     code_status: str = "all",
+    cursor: str = "",
 ):
     venue_map = {
         "neurips_2025": "NeurIPS 2025",
@@ -2031,32 +2234,23 @@ async def get_conference_papers_endpoint(
 
     validated_read_status = validate_read_status(read_status)
     validated_code_filter = validate_code_filter(code_status)
-    user = get_current_user_optional(request)
+    user = await get_current_user_optional(request)
     require_user_for_read_filter(validated_read_status, user)
     user_id = user["id"] if user else None
-    offset = (page - 1) * limit
+    offset = 0 if cursor else (page - 1) * limit
     try:
-        papers, total = get_conference_papers(
+        papers, total, read_counts = await asyncio.to_thread(
+            search_paper_page,
             venue_name, offset, limit,
             search if search else None,
             search_title, search_abstract, search_keywords,
             user_id=user_id,
             read_status=validated_read_status,
             code_filter=validated_code_filter,
+            cursor=cursor or None,
         )
-        read_counts = (
-            count_search_paper_read_states(
-                venue_name,
-                search if search else None,
-                search_title,
-                search_abstract,
-                search_keywords,
-                user_id,
-                code_filter=validated_code_filter,
-            )
-            if user_id
-            else None
-        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail="Invalid page cursor") from e
     except DatabaseError as e:
         raise HTTPException(status_code=502, detail="Database temporarily unavailable") from e
 
@@ -2065,7 +2259,8 @@ async def get_conference_papers_endpoint(
         "total": total,
         "read_counts": read_counts,
         "page": page,
-        "pages": math.ceil(total / limit) if total > 0 else 1
+        "pages": math.ceil(total / limit) if total > 0 else 1,
+        "next_cursor": next_page_cursor(papers, limit),
     }
 
 
@@ -2080,17 +2275,19 @@ async def get_hf_daily_papers_endpoint(
     search_keywords: bool = True,
     read_status: str = "all",
     code_status: str = "all",
+    cursor: str = "",
 ):
     validated_read_status = validate_read_status(read_status)
     validated_code_filter = validate_code_filter(code_status)
-    user = get_current_user_optional(request)
+    user = await get_current_user_optional(request)
     require_user_for_read_filter(validated_read_status, user)
     user_id = user["id"] if user else None
     safe_page = max(page, 1)
     safe_limit = min(max(limit, 1), 100)
-    offset = (safe_page - 1) * safe_limit
+    offset = 0 if cursor else (safe_page - 1) * safe_limit
     try:
-        papers, total = get_hf_daily_papers(
+        papers, total = await asyncio.to_thread(
+            get_hf_daily_papers,
             offset,
             safe_limit,
             search if search else None,
@@ -2100,9 +2297,11 @@ async def get_hf_daily_papers_endpoint(
             user_id=user_id,
             read_status=validated_read_status,
             code_filter=validated_code_filter,
+            cursor=cursor or None,
         )
         read_counts = (
-            count_hf_daily_paper_read_states(
+            await asyncio.to_thread(
+                count_hf_daily_paper_read_states,
                 search if search else None,
                 search_title,
                 search_abstract,
@@ -2113,6 +2312,8 @@ async def get_hf_daily_papers_endpoint(
             if user_id
             else None
         )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail="Invalid page cursor") from e
     except DatabaseError as e:
         raise HTTPException(status_code=502, detail="Database temporarily unavailable") from e
 
@@ -2121,7 +2322,8 @@ async def get_hf_daily_papers_endpoint(
         "total": total,
         "read_counts": read_counts,
         "page": safe_page,
-        "pages": math.ceil(total / safe_limit) if total > 0 else 1
+        "pages": math.ceil(total / safe_limit) if total > 0 else 1,
+        "next_cursor": next_page_cursor(papers, safe_limit),
     }
 
 
@@ -2136,17 +2338,19 @@ async def get_arxiv_papers_endpoint(
     search_keywords: bool = True,
     read_status: str = "all",
     code_status: str = "all",
+    cursor: str = "",
 ):
     validated_read_status = validate_read_status(read_status)
     validated_code_filter = validate_code_filter(code_status)
-    user = get_current_user_optional(request)
+    user = await get_current_user_optional(request)
     require_user_for_read_filter(validated_read_status, user)
     user_id = user["id"] if user else None
     safe_page = max(page, 1)
     safe_limit = min(max(limit, 1), 24)
-    offset = (safe_page - 1) * safe_limit
+    offset = 0 if cursor else (safe_page - 1) * safe_limit
     try:
-        papers, total = get_arxiv_papers(
+        papers, total = await asyncio.to_thread(
+            get_arxiv_papers,
             offset,
             safe_limit,
             analyzed_only=True,
@@ -2157,9 +2361,11 @@ async def get_arxiv_papers_endpoint(
             user_id=user_id,
             read_status=validated_read_status,
             code_filter=validated_code_filter,
+            cursor=cursor or None,
         )
         read_counts = (
-            count_arxiv_paper_read_states(
+            await asyncio.to_thread(
+                count_arxiv_paper_read_states,
                 True,
                 search if search else None,
                 search_title,
@@ -2171,6 +2377,8 @@ async def get_arxiv_papers_endpoint(
             if user_id
             else None
         )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail="Invalid page cursor") from e
     except DatabaseError as e:
         raise HTTPException(status_code=502, detail="Database temporarily unavailable") from e
 
@@ -2179,7 +2387,8 @@ async def get_arxiv_papers_endpoint(
         "total": total,
         "read_counts": read_counts,
         "page": safe_page,
-        "pages": math.ceil(total / safe_limit) if total > 0 else 1
+        "pages": math.ceil(total / safe_limit) if total > 0 else 1,
+        "next_cursor": next_page_cursor(papers, safe_limit),
     }
 
 
@@ -2194,35 +2403,27 @@ async def search_all_papers_endpoint(
     search_keywords: bool = True,
     read_status: str = "all",
     code_status: str = "all",
+    cursor: str = "",
 ):
     validated_read_status = validate_read_status(read_status)
     validated_code_filter = validate_code_filter(code_status)
-    user = get_current_user_optional(request)
+    user = await get_current_user_optional(request)
     require_user_for_read_filter(validated_read_status, user)
     user_id = user["id"] if user else None
-    offset = (page - 1) * limit
+    offset = 0 if cursor else (page - 1) * limit
     try:
-        papers, total = search_all_papers(
-            offset, limit,
+        papers, total, read_counts = await asyncio.to_thread(
+            search_paper_page,
+            None, offset, limit,
             search if search else None,
             search_title, search_abstract, search_keywords,
             user_id=user_id,
             read_status=validated_read_status,
             code_filter=validated_code_filter,
+            cursor=cursor or None,
         )
-        read_counts = (
-            count_search_paper_read_states(
-                None,
-                search if search else None,
-                search_title,
-                search_abstract,
-                search_keywords,
-                user_id,
-                code_filter=validated_code_filter,
-            )
-            if user_id
-            else None
-        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail="Invalid page cursor") from e
     except DatabaseError as e:
         raise HTTPException(status_code=502, detail="Database temporarily unavailable") from e
 
@@ -2231,7 +2432,8 @@ async def search_all_papers_endpoint(
         "total": total,
         "read_counts": read_counts,
         "page": page,
-        "pages": math.ceil(total / limit) if total > 0 else 1
+        "pages": math.ceil(total / limit) if total > 0 else 1,
+        "next_cursor": next_page_cursor(papers, limit),
     }
 
 
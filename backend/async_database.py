@@ -0,0 +1,417 @@
+"""Async variants of the per-request queries used by FastAPI handlers.
+
+`database.py` stays the sync API for scripts and background threads.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Awaitable, Callable, TypeVar
+
+import psycopg
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool, PoolTimeout
+
+import cache_bus
+import database
+from config import settings
+from database import DatabaseError, _normalize_session_row, _normalize_user_row
+
+logger = logging.getLogger(__name__)
+T = TypeVar("T")
+
+_async_connection_pool: AsyncConnectionPool | None = None
+_async_connection_pool_lock: asyncio.Lock | None = None
+
+
+def _pool_lock() -> asyncio.Lock:
+    global _async_connection_pool_lock
+    if _async_connection_pool_lock is None:
+        _async_connection_pool_lock = asyncio.Lock()
+    return _async_connection_pool_lock
+
+
+async def open_async_connection_pool() -> AsyncConnectionPool:
+    global _async_connection_pool
+    if _async_connection_pool is not None:
+        return _async_connection_pool
+
+    async with _pool_lock():
+        if _async_connection_pool is None:
+            pool_settings = settings.database
+            max_size = max(pool_settings.pool_max_size, 1)
+            pool = AsyncConnectionPool(
+                database.DATABASE_URL,
+                min_size=min(max(pool_settings.pool_min_size, 0), max_size),
+                max_size=max_size,
+                max_lifetime=max(pool_settings.pool_max_lifetime_seconds, 60),
+                max_idle=max(pool_settings.pool_max_idle_seconds, 10),
+                timeout=max(pool_settings.pool_timeout_seconds, 1),
+                kwargs={"row_factory": dict_row},
+                check=AsyncConnectionPool.check_connection,
+                name="paper_online_async",
+                open=False,
+            )
+            await pool.open()
+            _async_connection_pool = pool
+            logger.info("异步数据库连接池已创建: min=%s max=%s", pool.min_size, pool.max_size)
+    return _async_connection_pool
+
+
+async def close_async_connection_pool() -> None:
+    global _async_connection_pool
+    pool = _async_connection_pool
+    _async_connection_pool = None
+    if pool is not None:
+        await pool.close()
+        logger.info("异步数据库连接池已关闭")
+
+
+def get_async_connection_pool_stats() -> dict:
+    pool = _async_connection_pool
+    if pool is None:
+        return {"open": False}
+    stats = pool.get_stats()
+    return {
+        "open": not pool.closed,
+        "size": stats.get("pool_size", 0),
+        "available": stats.get("pool_available", 0),
+        "requests_waiting": stats.get("requests_waiting", 0),
+        "requests_total": stats.get("requests_num", 0),
+        "requests_wait_ms": stats.get("requests_wait_ms", 0),
+        "requests_errors": stats.get("requests_errors", 0),
+    }
+
+
+@asynccontextmanager
+async def _get_async_connection() -> AsyncIterator[psycopg.AsyncConnection]:
+    if not database.DATABASE_URL:
+        raise DatabaseError("DATABASE_URL is not configured")
+
+    pool = await open_async_connection_pool()
+    try:
+        conn = await pool.getconn()
+    except PoolTimeout as exc:
+        raise DatabaseError("Timed out waiting for a pooled database connection") from exc
+
+    try:
+        yield conn
+    finally:
+        try:
+            if not conn.closed and conn.info.transaction_status != psycopg.pq.TransactionStatus.IDLE:
+                await conn.rollback()
+        except psycopg.Error:
+            logger.warning("归还异步连接前回滚失败，连接将被连接池丢弃")
+        await pool.putconn(conn)
+
+
+async def _run_with_retry(
+    operation: Callable[[], Awaitable[T]],
+    context: str,
+    retries: int = 3,
+    delay: float = 1.0,
+) -> T:
+    last_error: Exception | None = None
+
+    for attempt in range(retries):
+        try:
+            return await operation()
+        except Exception as exc:
+            last_error = exc
+            logger.warning(
+                "Async database operation failed for %s (attempt %s/%s): %s",
+                context,
+                attempt + 1,
+                retries,
+                exc,
+            )
+            if attempt < retries - 1:
+                await asyncio.sleep(delay)
+
+    raise DatabaseError(f"Database operation failed for {context}") from last_error
+
+
+async def get_user_by_session_token_hash(token_hash: str) -> dict | None:
+    if not database.DATABASE_URL:
+        return None
+
+    async def operation() -> dict | None:
+        async with _get_async_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    SELECT users.*
+                    FROM user_sessions
+                    JOIN users ON users.id = user_sessions.user_id
+                    WHERE user_sessions.token_hash = %s
+                      AND user_sessions.revoked_at IS NULL
+                      AND user_sessions.expires_at > NOW()
+                      AND users.is_active = TRUE
+                    """,
+                    (token_hash,),
+                )
+                user = await cur.fetchone()
+                if user:
+                    await cur.execute(
+                        """
+                        UPDATE user_sessions
+                        SET last_seen_at = NOW()
+                        WHERE token_hash = %s
+                        """,
+                        (token_hash,),
+                    )
+                    await conn.commit()
+                return _normalize_user_row(user)
+
+    return await _run_with_retry(operation, "get_user_by_session_token_hash")
+
+
+async def record_presence(
+    client_id: str,
+    user_id: str | None,
+    user_agent: str | None,
+    ip_address: str | None,
+) -> None:
+    async def operation() -> None:
+        async with _get_async_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    INSERT INTO presence_heartbeats (
+                        client_id, user_id, user_agent, ip_address, last_seen_at
+                    )
+                    VALUES (%s, %s, %s, %s, NOW())
+                    ON CONFLICT (client_id) DO UPDATE SET
+                        user_id = EXCLUDED.user_id,
+                        user_agent = EXCLUDED.user_agent,
+                        ip_address = EXCLUDED.ip_address,
+                        last_seen_at = NOW()
+                    """,
+                    (client_id, user_id, user_agent, ip_address),
+                )
+            await conn.commit()
+
+    await _run_with_retry(operation, f"record_presence:{client_id}")
+
+
+async def get_presence_counts(timeout_seconds: int) -> dict:
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=timeout_seconds)
+
+    async def operation() -> dict:
+        async with _get_async_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    SELECT
+                      COUNT(*) AS total_count,
+                      COUNT(*) FILTER (WHERE user_id IS NOT NULL) AS authenticated_count,
+                      COUNT(*) FILTER (WHERE user_id IS NULL) AS guest_count
+                    FROM presence_heartbeats
+                    WHERE last_seen_at > %s
+                    """,
+                    (cutoff,),
+                )
+                row = await cur.fetchone()
+        return {
+            "count": int(row["total_count"] or 0),
+            "authenticated_count": int(row["authenticated_count"] or 0),
+            "guest_count": int(row["guest_count"] or 0),
+        }
+
+    return await _run_with_retry(operation, "get_presence_counts")
+
+
+async def get_paper_marks(user_id: str, paper_ids: list[str]) -> dict[str, dict]:
+    if not paper_ids:
+        return {}
+
+    async def operation() -> dict[str, dict]:
+        async with _get_async_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    SELECT paper_id, viewed, liked, favorited, viewed_at, liked_at, favorited_at, updated_at
+                    FROM paper_marks
+                    WHERE user_id = %s AND paper_id = ANY(%s)
+                    """,
+                    (user_id, paper_ids),
+                )
+                rows = await cur.fetchall()
+        return {
+            row["paper_id"]: {
+                "viewed": bool(row["viewed"]),
+                "liked": bool(row["liked"]),
+                "favorited": bool(row["favorited"]),
+                "viewed_at": row["viewed_at"],
+                "liked_at": row["liked_at"],
+                "favorited_at": row["favorited_at"],
+                "updated_at": row["updated_at"],
+            }
+            for row in rows
+        }
+
+    return await _run_with_retry(operation, f"get_paper_marks:{user_id}")
+
+
+async def create_chat_session(
+    session_id: str,
+    user_id: str,
+    paper_id: str,
+    title: str,
+    account_user_id: str | None = None,
+):
+    if not database.DATABASE_URL:
+        return
+
+    async def operation() -> None:
+        async with _get_async_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    INSERT INTO chat_sessions (id, user_id, paper_id, title, account_user_id)
+                    VALUES (%s, %s, %s, %s, %s)
+                    ON CONFLICT (id) DO NOTHING
+                    """,
+                    (session_id, user_id, paper_id, title, account_user_id),
+                )
+            await conn.commit()
+
+    await _run_with_retry(operation, f"create_chat_session:{session_id}")
+
+
+async def get_chat_sessions_for_account(account_user_id: str, paper_id: str) -> list:
+    if not database.DATABASE_URL:
+        return []
+
+    async def operation() -> list:
+        async with _get_async_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    SELECT *
+                    FROM chat_sessions
+                    WHERE account_user_id = %s AND paper_id = %s
+                    ORDER BY created_at DESC
+                    """,
+                    (account_user_id, paper_id),
+                )
+                return [_normalize_session_row(row) for row in await cur.fetchall()]
+
+    return await _run_with_retry(operation, f"get_chat_sessions_for_account:{account_user_id}:{paper_id}")
+
+
+async def get_chat_session(session_id: str) -> dict | None:
+    if not database.DATABASE_URL:
+        return None
+
+    async def operation() -> dict | None:
+        async with _get_async_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute("SELECT * FROM chat_sessions WHERE id = %s", (session_id,))
+                return _normalize_session_row(await cur.fetchone())
+
+    return await _run_with_retry(operation, f"get_chat_session:{session_id}")
+
+
+async def get_chat_messages(session_id: str) -> list:
+    if not database.DATABASE_URL:
+        return []
+
+    async def operation() -> list:
+        async with _get_async_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    SELECT role, content, created_at
+                    FROM chat_messages
+                    WHERE session_id = %s
+                    ORDER BY created_at
+                    """,
+                    (session_id,),
+                )
+                return await cur.fetchall()
+
+    return await _run_with_retry(operation, f"get_chat_messages:{session_id}")
+
+
+async def save_chat_message(session_id: str, role: str, content: str):
+    if not database.DATABASE_URL:
+        return
+
+    async def operation() -> None:
+        async with _get_async_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    INSERT INTO chat_messages (session_id, role, content)
+                    VALUES (%s, %s, %s)
+                    """,
+                    (session_id, role, content),
+                )
+            await conn.commit()
+
+    await _run_with_retry(operation, f"save_chat_message:{session_id}:{role}")
+
+
+async def delete_chat_session(session_id: str):
+    if not database.DATABASE_URL:
+        return
+
+    async def operation() -> None:
+        async with _get_async_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute("DELETE FROM chat_messages WHERE session_id = %s", (session_id,))
+                await cur.execute("DELETE FROM chat_sessions WHERE id = %s", (session_id,))
+            await conn.commit()
+
+    await _run_with_retry(operation, f"delete_chat_session:{session_id}")
+
+
+async def delete_last_chat_message_pair(session_id: str):
+    """Delete the last user+assistant message pair from a session."""
+    if not database.DATABASE_URL:
+        return
+
+    async def operation() -> None:
+        async with _get_async_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    SELECT id
+                    FROM chat_messages
+                    WHERE session_id = %s
+                    ORDER BY created_at DESC
+                    LIMIT 2
+                    """,
+                    (session_id,),
+                )
+                rows = await cur.fetchall()
+                if rows:
+                    await cur.execute(
+                        "DELETE FROM chat_messages WHERE id = ANY(%s)",
+                        ([row["id"] for row in rows],),
+                    )
+            await conn.commit()
+
+    await _run_with_retry(operation, f"delete_last_chat_message_pair:{session_id}")
+
+
+
+async def publish_cache_invalidation(topic: str, data: dict) -> None:
+    if not database.DATABASE_URL or not settings.cache.invalidation_bus_enabled:
+        return
+
+    try:
+        async with _get_async_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    "SELECT pg_notify(%s, %s)",
+                    (cache_bus.CACHE_INVALIDATION_CHANNEL, cache_bus.encode_message(topic, data)),
+                )
+            await conn.commit()
+    except Exception as exc:
+        cache_bus.record_published(False)
+        logger.warning("缓存失效广播失败 topic=%s: %s", topic, exc)
+        return
+    cache_bus.record_published(True)
@@ -1,12 +1,29 @@
 import asyncio
 import logging
+import os
+import socket
+import time
+import uuid
+from collections import deque
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
+from typing import Callable
+
 from analysis_context import build_analysis_prompt
+from analysis_pipeline import AnalysisPipeline
 from code_availability import classify_code_availability_from_text
+from config import AnalysisJobsConfig
+from llm_scheduler import LLMPreempted
 from database import (
+    claim_analysis_jobs,
+    complete_analysis_job,
+    enqueue_analysis_jobs,
+    enqueue_unanalyzed_papers,
+    fail_analysis_job,
+    get_open_analysis_job,
     get_papers_pending_code_availability,
-    get_unanalyzed_papers,
     get_paper,
+    release_analysis_job,
     update_llm_response,
     update_paper_code_availability,
 )
@@ -15,10 +32,28 @@ from utils import get_or_cache_paper_content, ReaderError, truncate_content_for_
 
 logger = logging.getLogger(__name__)
 
+ANALYSIS_PRIORITY_BACKLOG = 0
+ANALYSIS_PRIORITY_HF_DAILY = 20
+ANALYSIS_PRIORITY_FEISHU = 30
+ANALYSIS_PRIORITY_INTERACTIVE = 40
+ANALYSIS_JOB_WAIT_POLL_SECONDS = 5
+THROUGHPUT_WINDOW_SECONDS = 3600
+MAX_ANALYSIS_CONCURRENCY = 32
+
+
 class BackgroundAnalyzer:
-    def __init__(self, llm, check_interval: int = 3600):
+    def __init__(
+        self,
+        llm,
+        check_interval: int = 3600,
+        job_settings: AnalysisJobsConfig | None = None,
+        concurrency: int = 1,
+    ):
         self.llm = llm
         self.check_interval = check_interval
+        self.concurrency = min(max(1, concurrency), MAX_ANALYSIS_CONCURRENCY)
+        self.job_settings = job_settings or AnalysisJobsConfig()
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
         self.running = False
         self.current_paper_id = None
         self.last_run_started_at = None
@@ -31,12 +66,19 @@ class BackgroundAnalyzer:
         self.last_analyzed_paper_id = None
         self.current_code_paper_id = None
         self.last_code_checked_paper_id = None
+        self.workers: dict[str, dict] = {}
+        self._completed_at: deque[float] = deque()
+        self._throughput_started_at: float | None = None
         self._wake_event = asyncio.Event()
 
     def status_snapshot(self) -> dict:
         return {
             "running": self.running,
             "check_interval_seconds": self.check_interval,
+            "concurrency": self.concurrency,
+            "papers_per_hour": self.papers_per_hour(),
+            "worker_id": self.worker_id,
+            "workers": [dict(state) for state in self.workers.values()],
             "current_paper_id": self.current_paper_id,
             "last_run_started_at": self.last_run_started_at,
             "last_run_finished_at": self.last_run_finished_at,
@@ -54,6 +96,23 @@ class BackgroundAnalyzer:
         self.check_interval = check_interval
         self._wake_event.set()
 
+    def set_concurrency(self, concurrency: int) -> None:
+        """调整并发数；缩小时多余的 worker 在当前论文完成后退出，增大时运行中的流水线会补充新的 worker"""
+        self.concurrency = min(max(1, concurrency), MAX_ANALYSIS_CONCURRENCY)
+
+    def _record_completion(self) -> None:
+        self._completed_at.append(time.monotonic())
+
+    def papers_per_hour(self) -> float:
+        """最近一小时内（不足一小时按实际运行时长）每小时完成的论文数"""
+        if self._throughput_started_at is None:
+            return 0.0
+        now = time.monotonic()
+        while self._completed_at and now - self._completed_at[0] > THROUGHPUT_WINDOW_SECONDS:
+            self._completed_at.popleft()
+        window = min(THROUGHPUT_WINDOW_SECONDS, max(now - self._throughput_started_at, 60))
+        return round(len(self._completed_at) * 3600 / window, 1)
+
     async def _sleep_until_next_check(self) -> None:
         self._wake_event.clear()
         try:
@@ -66,62 +125,204 @@ class BackgroundAnalyzer:
 
     async def analyze_paper(self, paper_id: str) -> bool:
         """分析单篇论文，返回是否成功"""
+        try:
+            return await self._analyze_paper(paper_id) is None
+        except LLMPreempted:
+            raise
+        except Exception as e:
+            logger.warning(f"[{paper_id}] 分析失败: {e}")
+            return False
+
+    async def _analyze_paper(self, paper_id: str, priority_class: str = "backlog") -> str | None:
+        """分析单篇论文，成功返回 None，无法分析时返回原因；异常直接抛出，由任务队列负责重试"""
         if not self.llm.is_configured():
             logger.warning("LLM 未配置，跳过论文分析: %s", paper_id)
-            return False
+            return "LLM is not configured"
 
-        max_retries = 3
         self.current_paper_id = paper_id
+        try:
+            paper_info = await asyncio.to_thread(get_paper, paper_id)
+            if not paper_info:
+                logger.error(f"论文 {paper_id} 不存在")
+                return "paper not found"
+            if (paper_info.get("llm_response") or "").strip():
+                logger.info(f"[{paper_id}] 已有分析结果，跳过")
+                return None
 
+            paper_content, content_error = await self.fetch_paper_content(paper_info)
+            user_prompt = await asyncio.to_thread(
+                self.build_prompt,
+                paper_info,
+                paper_content,
+                content_error,
+            )
+            response = await self.generate_analysis(paper_id, user_prompt, priority_class)
+            await self.persist_analysis(paper_info, response, priority_class)
+            return None
+        finally:
+            if self.current_paper_id == paper_id:
+                self.current_paper_id = None
+
+    async def fetch_paper_content(self, paper_info: dict) -> tuple[str | None, str | None]:
+        """抓取阶段：读取论文全文（命中缓存则直接返回），返回 (全文, 失败原因)"""
+        paper_id = paper_info["id"]
+        if not paper_info.get("pdf"):
+            logger.warning(f"[{paper_id}] 未找到 PDF 链接，改用论文元数据分析")
+            return None, "论文没有可用 PDF 链接"
+
+        logger.info(f"[{paper_id}] 读取 PDF...")
         try:
-            for attempt in range(max_retries):
-                try:
-                    paper_info = await asyncio.to_thread(get_paper, paper_id)
-                    if not paper_info:
-                        logger.error(f"论文 {paper_id} 不存在")
-                        return False
-
-                    logger.info(f"[{paper_id}] 读取 PDF...")
-                    paper_content = None
-                    content_error = None
-                    if paper_info.get("pdf"):
-                        try:
-                            paper_content = await asyncio.to_thread(
-                                get_or_cache_paper_content,
-                                paper_id,
-                                paper_info["pdf"],
-                            )
-                            paper_content = truncate_content_for_llm(paper_content)
-                        except ReaderError as e:
-                            content_error = str(e)
-                            logger.warning(f"[{paper_id}] PDF 读取失败，改用论文元数据分析: {e}")
-                    else:
-                        content_error = "论文没有可用 PDF 链接"
-                        logger.warning(f"[{paper_id}] 未找到 PDF 链接，改用论文元数据分析")
-
-                    logger.info(f"[{paper_id}] 生成分析...")
-                    user_prompt = build_analysis_prompt(paper_info, paper_content, content_error)
-                    response = await self.llm.get_response(user_prompt)
-                    response = normalize_llm_markdown(response, analysis_mode=True)
-
-                    await asyncio.to_thread(update_llm_response, paper_id, response)
-                    await self.update_code_availability(paper_info, response)
-                    self.last_analyzed_paper_id = paper_id
-                    logger.info(f"[{paper_id}] 分析完成: {paper_info.get('title', '')[:50]}")
-                    return True
-
-                except Exception as e:
-                    logger.warning(f"[{paper_id}] 分析失败 (尝试 {attempt + 1}/{max_retries}): {e}")
-
-                if attempt < max_retries - 1:
-                    await asyncio.sleep(2)
-
-            logger.error(f"[{paper_id}] 分析失败，已重试 {max_retries} 次")
+            paper_content = await asyncio.to_thread(
+                get_or_cache_paper_content,
+                paper_id,
+                paper_info["pdf"],
+            )
+            return paper_content, None
+        except ReaderError as e:
+            logger.warning(f"[{paper_id}] PDF 读取失败，改用论文元数据分析: {e}")
+            return None, str(e)
+
+    @staticmethod
+    def build_prompt(paper_info: dict, paper_content: str | None, content_error: str | None) -> str:
+        """抽取阶段：按 token 上限截断全文并构造分析 prompt"""
+        if paper_content:
+            paper_content = truncate_content_for_llm(paper_content)
+        return build_analysis_prompt(paper_info, paper_content, content_error)
+
+    async def generate_analysis(self, paper_id: str, user_prompt: str, priority_class: str = "backlog") -> str:
+        """LLM 阶段；priority_class 决定在 LLM 调度器中的优先级"""
+        logger.info(f"[{paper_id}] 生成分析...")
+        response = await self.llm.get_response(user_prompt, _llm_priority=priority_class)
+        return normalize_llm_markdown(response, analysis_mode=True)
+
+    async def persist_analysis(self, paper_info: dict, response: str, priority_class: str = "backlog") -> None:
+        """写入阶段：保存分析结果并判断代码开源状态"""
+        paper_id = paper_info["id"]
+        await asyncio.to_thread(update_llm_response, paper_id, response)
+        await self.update_code_availability(paper_info, response, priority_class)
+        self.last_analyzed_paper_id = paper_id
+        logger.info(f"[{paper_id}] 分析完成: {paper_info.get('title', '')[:50]}")
+
+    async def process_job(self, job: dict) -> bool:
+        """执行一个已领取的分析任务，并释放租约"""
+        try:
+            error = await self._analyze_paper(job["paper_id"], job.get("source") or "backlog")
+        except LLMPreempted:
+            logger.info("[%s] LLM 槽位被交互请求抢占，任务重新排队", job["paper_id"])
+            await asyncio.to_thread(release_analysis_job, job["id"], self.worker_id)
             return False
-        finally:
-            self.current_paper_id = None
+        except asyncio.CancelledError:
+            # Stopping the worker is not a failure of the job: hand it back
+            # without spending one of its attempts.
+            await asyncio.to_thread(release_analysis_job, job["id"], self.worker_id)
+            raise
+        except Exception as exc:
+            error = str(exc)
+
+        if error is None:
+            await asyncio.to_thread(complete_analysis_job, job["id"], self.worker_id)
+            self._record_completion()
+            return True
+
+        status = await asyncio.to_thread(
+            fail_analysis_job,
+            job["id"],
+            self.worker_id,
+            error,
+            self.job_settings.retry_delay_seconds,
+        )
+        logger.warning(
+            "[%s] 分析任务失败 (第 %s/%s 次，状态: %s): %s",
+            job["paper_id"],
+            job.get("attempts"),
+            job.get("max_attempts"),
+            status,
+            error,
+        )
+        return False
+
+    async def drain_jobs(
+        self,
+        min_priority: int | None = None,
+        continue_draining: Callable[[], bool] = lambda: True,
+        pool_name: str = "queue",
+    ) -> tuple[int, int]:
+        """通过抓取→抽取→LLM→写入的分阶段流水线执行队列中的任务，直到队列为空；返回 (成功数, 失败数)"""
+        if self._throughput_started_at is None:
+            self._throughput_started_at = time.monotonic()
+        pipeline = AnalysisPipeline(
+            self,
+            min_priority=min_priority,
+            continue_draining=continue_draining,
+            pool_name=pool_name,
+        )
+        return await pipeline.run()
+
+    async def analyze_paper_now(self, paper_id: str, source: str, priority: int) -> bool:
+        """入队并立即执行单篇论文的分析；若已被其他 worker 领取则等待其完成"""
+        job = await self.claim_paper_job(paper_id, source, priority)
+        if job:
+            return await self.process_job(job)
+        return await self.wait_for_paper_job(paper_id)
+
+    async def claim_paper_job(self, paper_id: str, source: str, priority: int) -> dict | None:
+        """入队并领取指定论文的任务；已被其他 worker 领取（或论文已分析）时返回 None"""
+        await asyncio.to_thread(
+            enqueue_analysis_jobs,
+            [paper_id],
+            source,
+            priority,
+            self.job_settings.max_attempts,
+        )
+        jobs = await asyncio.to_thread(
+            claim_analysis_jobs,
+            self.worker_id,
+            1,
+            self.job_settings.lease_seconds,
+            paper_id,
+        )
+        return jobs[0] if jobs else None
+
+    async def wait_for_paper_job(self, paper_id: str) -> bool:
+        """等待其他 worker 上该论文的任务结束，返回论文是否已有分析结果"""
+        deadline = asyncio.get_running_loop().time() + self.job_settings.lease_seconds
+        while asyncio.get_running_loop().time() < deadline:
+            open_job = await asyncio.to_thread(get_open_analysis_job, paper_id)
+            if not open_job or open_job["status"] != "running":
+                break
+            await asyncio.sleep(ANALYSIS_JOB_WAIT_POLL_SECONDS)
+
+        paper_info = await asyncio.to_thread(get_paper, paper_id)
+        return bool(paper_info and (paper_info.get("llm_response") or "").strip())
 
-    async def update_code_availability(self, paper_info: dict, llm_response: str | None) -> bool:
+    @asynccontextmanager
+    async def hold_job(self, job: dict | None):
+        """持有一个已领取的任务：块正常结束则完成，出错则按失败重试，被取消则原样放回队列"""
+        if job is None:
+            yield
+            return
+        try:
+            yield
+        except asyncio.CancelledError:
+            await asyncio.to_thread(release_analysis_job, job["id"], self.worker_id)
+            raise
+        except Exception as exc:
+            await asyncio.to_thread(
+                fail_analysis_job,
+                job["id"],
+                self.worker_id,
+                str(exc),
+                self.job_settings.retry_delay_seconds,
+            )
+            raise
+        await asyncio.to_thread(complete_analysis_job, job["id"], self.worker_id)
+
+    async def update_code_availability(
+        self,
+        paper_info: dict,
+        llm_response: str | None,
+        priority_class: str = "backlog",
+    ) -> bool:
         paper_id = paper_info.get("id")
         if not paper_id:
             return False
@@ -136,6 +337,7 @@ class BackgroundAnalyzer:
                 paper_info,
                 llm_response,
                 source="llm_response",
+                priority_class=priority_class,
             )
             await asyncio.to_thread(
                 update_paper_code_availability,
@@ -152,7 +354,8 @@ class BackgroundAnalyzer:
             logger.warning("[%s] 代码开源状态判断失败: %s", paper_id, exc)
             return False
         finally:
-            self.current_code_paper_id = None
+            if self.current_code_paper_id == paper_id:
+                self.current_code_paper_id = None
 
     async def run(self):
         """主循环：每小时检查一次"""
@@ -176,38 +379,45 @@ class BackgroundAnalyzer:
                     await self._sleep_until_next_check()
                     continue
 
-                papers = await asyncio.to_thread(get_unanalyzed_papers, limit=10)
-
-                if papers:
-                    logger.info(f"发现 {len(papers)} 篇未分析论文，开始处理...")
-
-                    for paper in papers:
-                        if not self.running:
-                            break
-
-                        ok = await self.analyze_paper(paper["id"])
-                        if ok:
-                            self.last_run_success_count += 1
-                        else:
-                            self.last_run_failed_count += 1
-                        await asyncio.sleep(1)
+                enqueued = await asyncio.to_thread(
+                    enqueue_unanalyzed_papers,
+                    self.job_settings.backlog_batch_size,
+                    self.job_settings.max_attempts,
+                    self.job_settings.failed_retry_seconds,
+                )
+                if enqueued:
+                    logger.info(f"发现 {enqueued} 篇未分析论文，已加入分析队列")
 
+                success_count, failed_count = await self.drain_jobs(
+                    continue_draining=lambda: self.running,
+                    pool_name="backlog",
+                )
+                self.last_run_success_count += success_count
+                self.last_run_failed_count += failed_count
+                if success_count or failed_count:
                     logger.info("本轮处理完成")
                 else:
-                    logger.info("没有未分析的论文")
+                    logger.info("没有待执行的分析任务")
 
                 pending_code_papers = await asyncio.to_thread(get_papers_pending_code_availability, limit=10)
                 if pending_code_papers:
                     logger.info("发现 %s 篇待判断代码开源状态的论文，开始处理...", len(pending_code_papers))
-                    for paper in pending_code_papers:
-                        if not self.running:
-                            break
-                        ok = await self.update_code_availability(paper, paper.get("llm_response"))
-                        if ok:
-                            self.last_run_code_success_count += 1
-                        else:
-                            self.last_run_code_failed_count += 1
-                        await asyncio.sleep(1)
+                    code_slots = asyncio.Semaphore(self.concurrency)
+
+                    async def check_code(paper: dict) -> None:
+                        async with code_slots:
+                            if not self.running:
+                                return
+                            ok = await self.update_code_availability(paper, paper.get("llm_response"))
+                            if ok:
+                                self.last_run_code_success_count += 1
+                            else:
+                                self.last_run_code_failed_count += 1
+                            await asyncio.sleep(1)
+
+                    async with asyncio.TaskGroup() as group:
+                        for paper in pending_code_papers:
+                            group.create_task(check_code(paper))
 
             except Exception as e:
                 self.last_run_error = str(e)[:500]
@@ -0,0 +1,133 @@
+"""Cross-worker cache invalidation over PostgreSQL LISTEN/NOTIFY.
+
+Each worker keeps its own in-process caches. Writers publish a small JSON
+message on one channel; every other worker's listener dispatches it to the
+handlers subscribed for that topic so they can drop the affected entries.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timezone
+from typing import Callable
+
+import psycopg
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+CACHE_INVALIDATION_CHANNEL = "paper_online_cache_invalidation"
+# NOTIFY payloads must stay below 8000 bytes.
+MAX_NOTIFY_PAYLOAD_BYTES = 7900
+LISTENER_RETRY_SECONDS = 5
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+_handlers: dict[str, list[Callable[[dict], None]]] = {}
+_bus_state = {
+    "connected": False,
+    "published_count": 0,
+    "received_count": 0,
+    "publish_failed_count": 0,
+    "last_received_at": None,
+    "last_error": None,
+}
+
+
+def is_enabled() -> bool:
+    return bool(settings.cache.invalidation_bus_enabled and settings.database.url)
+
+
+def subscribe(topic: str, handler: Callable[[dict], None]) -> None:
+    handlers = _handlers.setdefault(topic, [])
+    if handler not in handlers:
+        handlers.append(handler)
+
+
+def encode_message(topic: str, data: dict) -> str:
+    payload = json.dumps(
+        {"origin": WORKER_ID, "topic": topic, "data": data},
+        ensure_ascii=False,
+        default=str,
+    )
+    if len(payload.encode("utf-8")) <= MAX_NOTIFY_PAYLOAD_BYTES:
+        return payload
+    # Too large to describe precisely; receivers fall back to dropping everything.
+    return json.dumps({"origin": WORKER_ID, "topic": topic, "data": {"resync": True}})
+
+
+def record_published(ok: bool) -> None:
+    if ok:
+        _bus_state["published_count"] += 1
+    else:
+        _bus_state["publish_failed_count"] += 1
+
+
+def _run_handlers(topic: str, data: dict) -> None:
+    for handler in list(_handlers.get(topic, [])):
+        try:
+            handler(data)
+        except Exception as exc:
+            logger.warning("缓存失效消息处理失败 topic=%s: %s", topic, exc)
+
+
+def dispatch(payload: str) -> bool:
+    try:
+        message = json.loads(payload)
+    except (TypeError, json.JSONDecodeError):
+        logger.warning("忽略无法解析的缓存失效消息: %r", payload)
+        return False
+    if not isinstance(message, dict) or message.get("origin") == WORKER_ID:
+        return False
+
+    topic = str(message.get("topic") or "")
+    data = message.get("data") if isinstance(message.get("data"), dict) else {"resync": True}
+    _bus_state["received_count"] += 1
+    _bus_state["last_received_at"] = datetime.now(timezone.utc)
+    _run_handlers(topic, data)
+    return True
+
+
+def resync_all() -> None:
+    # Messages may have been missed while disconnected, so drop everything.
+    for topic in list(_handlers):
+        _run_handlers(topic, {"resync": True})
+
+
+async def run_listener() -> None:
+    has_connected = False
+    while True:
+        try:
+            async with await psycopg.AsyncConnection.connect(
+                settings.database.url,
+                autocommit=True,
+            ) as conn:
+                await conn.execute(f"LISTEN {CACHE_INVALIDATION_CHANNEL}")
+                _bus_state["connected"] = True
+                _bus_state["last_error"] = None
+                logger.info("缓存失效监听已连接: %s", WORKER_ID)
+                if has_connected:
+                    resync_all()
+                has_connected = True
+                async for notify in conn.notifies():
+                    dispatch(notify.payload)
+        except asyncio.CancelledError:
+            _bus_state["connected"] = False
+            raise
+        except Exception as exc:
+            _bus_state["connected"] = False
+            _bus_state["last_error"] = str(exc)[:500]
+            logger.warning("缓存失效监听断开，%s 秒后重连: %s", LISTENER_RETRY_SECONDS, exc)
+        await asyncio.sleep(LISTENER_RETRY_SECONDS)
+
+
+def status_snapshot() -> dict:
+    return {
+        "worker_id": WORKER_ID,
+        "channel": CACHE_INVALIDATION_CHANNEL,
+        "topics": sorted(_handlers),
+        **_bus_state,
+    }
@@ -1,19 +1,28 @@
-from prompt import CHAT_SYSTEM_PROMPT
+from analysis_context import build_paper_messages
+from prompt import CHAT_READY_REPLY, CHAT_TASK_PROMPT
 from markdown_utils import normalize_llm_markdown
 
 class ChatSession:
-    def __init__(self, llm, context: str = "", history: list = None):
+    def __init__(self, llm, context: str = "", history: list = None, analysis: str = ""):
         self.llm = llm
         self.context = context
+        self.analysis = analysis
         self.history = history or []
 
     def _build_messages(self):
-        messages = [{"role": "system", "content": CHAT_SYSTEM_PROMPT}]
-        if self.context:
-            messages.append({"role": "user", "content": f"以下是论文相关内容：\n{self.context}"})
-            messages.append({"role": "assistant", "content": "好的，我已了解这篇论文的内容，请问有什么问题？"})
-        messages.extend(self.history)
-        return messages
+        # The paper context leads so every turn, and the paper's analysis and
+        # code-availability calls, share one cacheable prefix.
+        instructions = CHAT_TASK_PROMPT
+        if self.analysis:
+            instructions += f"\n\n论文分析：\n{self.analysis}"
+        return build_paper_messages(
+            self.context,
+            [
+                {"role": "user", "content": instructions},
+                {"role": "assistant", "content": CHAT_READY_REPLY},
+                *self.history,
+            ],
+        )
 
     async def send(self, user_message: str, **kwargs) -> str:
         self.history.append({"role": "user", "content": user_message})
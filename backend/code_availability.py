@@ -4,6 +4,7 @@ import json
 import re
 from typing import Any
 
+from analysis_context import build_paper_messages
 from prompt import CODE_AVAILABILITY_PROMPT
 
 CODE_AVAILABILITY_STATUSES = {"open_source", "unavailable", "not_found", "unknown"}
@@ -49,6 +50,113 @@ def _is_provider_content_block_error(exc: Exception) -> bool:
     )
 
 
+# Repository hosts whose links count as code. Hugging Face only counts for
+# Spaces, which are git repositories holding the demo's source; model and
+# dataset pages are weights/data and leave the decision to the LLM.
+_REPO_URL_PATTERN = re.compile(
+    r"https?://(?:www\.)?"
+    r"(?P<host>github\.com|gitlab\.com|bitbucket\.org|huggingface\.co/spaces)"
+    r"/(?P<owner>[A-Za-z0-9_.-]+)/(?P<repo>[A-Za-z0-9_.-]+)",
+    flags=re.IGNORECASE,
+)
+_REPO_OWNER_STOPWORDS = {"about", "features", "orgs", "settings", "sponsors", "topics", "users"}
+_UNRELEASED_CODE_PATTERNS = [
+    re.compile(pattern, flags=re.IGNORECASE)
+    for pattern in (
+        r"\bcode\b[^.\n]{0,60}\bwill be\b[^.\n]{0,30}\b(?:released|available|open[- ]sourced|made public)",
+        r"\bwill (?:release|open[- ]source|publish) (?:the |our |all )?(?:source )?code\b",
+        r"\bcode\b[^.\n]{0,40}\b(?:upon|on) (?:reasonable )?request\b",
+        r"\bcode\b[^.\n]{0,40}\bcoming soon\b",
+        r"代码[^。\n]{0,20}(?:将|将会|会|计划|拟)[^。\n]{0,20}(?:公开|开源|发布|放出)",
+        r"(?:将|将会|即将|计划|拟)(?:公开|开源|发布)(?:相关|全部|其)?(?:代码|源码)",
+        r"(?:代码|源码)[^。\n]{0,10}(?:暂未|尚未|暂不)(?:公开|开源|发布)",
+        r"(?:代码|源码)[^。\n]{0,20}(?:按|根据|应)(?:需|请求|申请)",
+    )
+]
+_CODE_NOT_FOUND_PATTERNS = [
+    re.compile(pattern, flags=re.IGNORECASE)
+    for pattern in (
+        r"\b(?:no|without (?:a|any)) (?:public )?(?:code|source code|repository|repo|github) (?:link|url|repository)?\s*(?:is |was )?(?:provided|given|found|released)",
+        r"\bdoes not (?:provide|include|release) (?:a |any )?(?:public )?(?:code|source code|repository)",
+        r"(?:未|没有)(?:提供|给出|找到|发现)[^。\n]{0,10}(?:代码|源码|开源|仓库)",
+    )
+]
+# "Code is not mentioned" is unknown, not not_found, as in CODE_AVAILABILITY_PROMPT.
+_CODE_NOT_MENTIONED_PATTERNS = [
+    re.compile(pattern, flags=re.IGNORECASE)
+    for pattern in (
+        r"\bno (?:code|source code|repository) (?:link |url )?(?:is |was )?mentioned",
+        r"\bdoes not mention (?:a |any )?(?:public )?(?:code|source code|repository)",
+        r"(?:未|没有)(?:提及|提到)[^。\n]{0,10}(?:代码|源码|开源|仓库)",
+    )
+]
+_CODE_SIGNAL_PATTERN = re.compile(
+    r"\bcode\b|source code|open[- ]source|\brepo(?:sitory)?\b|https?://|github|gitlab|bitbucket|代码|源码|开源|仓库",
+    flags=re.IGNORECASE,
+)
+
+
+def extract_code_repository_urls(text: str) -> list[str]:
+    """Distinct repository URLs in ``text``, normalized to ``host/owner/repo``."""
+    urls: list[str] = []
+    for match in _REPO_URL_PATTERN.finditer(text):
+        owner = match.group("owner")
+        repo = match.group("repo").removesuffix(".git").rstrip(".")
+        if owner.lower() in _REPO_OWNER_STOPWORDS or not repo:
+            continue
+        url = f"https://{match.group('host').lower()}/{owner}/{repo}"
+        if url.lower() not in {known.lower() for known in urls}:
+            urls.append(url)
+    return urls
+
+
+def _matched_phrase(patterns: list[re.Pattern], text: str) -> str | None:
+    for pattern in patterns:
+        match = pattern.search(text)
+        if match:
+            return match.group(0)
+    return None
+
+
+def preclassify_code_availability(text: str) -> dict[str, Any] | None:
+    """Rule-based verdict for clear-cut texts, or None when the LLM should decide.
+
+    Only one kind of evidence may be present: a single repository link,
+    a "code will be released" phrasing, an explicit "no code found"
+    statement, a "code is not mentioned" statement, or no mention of code
+    at all. Anything mixed is escalated.
+    """
+    urls = extract_code_repository_urls(text)
+    unreleased = _matched_phrase(_UNRELEASED_CODE_PATTERNS, text)
+    not_found = _matched_phrase(_CODE_NOT_FOUND_PATTERNS, text)
+    not_mentioned = _matched_phrase(_CODE_NOT_MENTIONED_PATTERNS, text)
+
+    if urls and not unreleased and not not_found:
+        if len(urls) > 1:
+            return None
+        return _rule_result("open_source", urls[0], f"文本中给出代码仓库链接：{urls[0]}", 0.9, "repository_url")
+    if urls:
+        return None
+    if unreleased and not not_found:
+        return _rule_result("unavailable", None, unreleased, 0.85, "unreleased_phrase")
+    if not_found and not unreleased:
+        return _rule_result("not_found", None, not_found, 0.85, "not_found_phrase")
+    if not_mentioned and not unreleased:
+        return _rule_result("unknown", None, not_mentioned, 0.8, "not_mentioned_phrase")
+    if not unreleased and not _CODE_SIGNAL_PATTERN.search(text):
+        return _rule_result("unknown", None, "文本没有提到代码可用性。", 0.8, "no_code_signal")
+    return None
+
+
+def _rule_result(status: str, code_url: str | None, evidence: str, confidence: float, rule: str) -> dict[str, Any]:
+    return {
+        "status": status,
+        "code_url": code_url,
+        "evidence": evidence[:2000],
+        "meta": {"confidence": confidence, "reason": rule, "decided_by": "rules"},
+    }
+
+
 def normalize_code_availability_result(raw_result: dict[str, Any]) -> dict[str, Any]:
     status = normalize_code_availability_status(raw_result.get("status"))
     code_url = normalize_code_url(raw_result.get("code_url"))
@@ -79,6 +187,7 @@ async def classify_code_availability_from_text(
     source_text: str | None,
     *,
     source: str = "llm_response",
+    priority_class: str = "backlog",
 ) -> dict[str, Any]:
     text = (source_text or "").strip()
     if not text:
@@ -86,12 +195,17 @@ async def classify_code_availability_from_text(
             "status": "unknown",
             "code_url": None,
             "evidence": "没有可用于判断代码开源状态的文本。",
-            "meta": {"confidence": 0.0, "reason": "empty_source_text", "source": source},
+            "meta": {"confidence": 0.0, "reason": "empty_source_text", "source": source, "decided_by": "rules"},
         }
 
+    ruled = preclassify_code_availability(text)
+    if ruled is not None:
+        ruled["meta"]["source"] = source
+        return ruled
+
+    # No paper id here: the same text under hf:/arxiv: ids must hit the completion cache.
     user_prompt = "\n".join(
         [
-            f"paper_id: {paper_info.get('id') or ''}",
             f"title: {paper_info.get('title') or ''}",
             f"venue: {paper_info.get('venue') or ''}",
             f"source: {source}",
@@ -103,12 +217,10 @@ async def classify_code_availability_from_text(
 
     try:
         raw_response = await llm.chat(
-            [
-                {"role": "system", "content": CODE_AVAILABILITY_PROMPT},
-                {"role": "user", "content": user_prompt},
-            ],
+            build_paper_messages(None, [{"role": "user", "content": f"{CODE_AVAILABILITY_PROMPT}\n\n{user_prompt}"}]),
             temperature=0,
             _usage_context="code_availability",
+            _llm_priority=priority_class,
         )
     except Exception as exc:
         if not _is_provider_content_block_error(exc):
@@ -121,6 +233,7 @@ async def classify_code_availability_from_text(
                 "confidence": 0.0,
                 "reason": "provider_content_blocked",
                 "source": source,
+                "decided_by": "llm",
                 "provider_error": str(exc)[:2000],
             },
         }
@@ -137,6 +250,7 @@ async def classify_code_availability_from_text(
                 "confidence": 0.0,
                 "reason": "parse_error",
                 "source": source,
+                "decided_by": "llm",
                 "raw_response": (raw_response or "")[:2000],
             },
         }
@@ -144,5 +258,6 @@ async def classify_code_availability_from_text(
     normalized["meta"] = {
         **normalized["meta"],
         "source": source,
+        "decided_by": "llm",
     }
     return normalized
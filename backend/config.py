@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
@@ -34,6 +34,58 @@ class PresenceConfig:
 class BackgroundAnalysisConfig:
     enabled: bool = False
     check_interval_seconds: int = 86400
+    concurrency: int = 1
+
+
+@dataclass(frozen=True)
+class AnalysisJobsConfig:
+    lease_seconds: int = 1800
+    max_attempts: int = 3
+    retry_delay_seconds: int = 300
+    failed_retry_seconds: int = 86400
+    backlog_batch_size: int = 10
+    fetch_concurrency: int = 4
+    extract_concurrency: int = 2
+    persist_concurrency: int = 2
+    stage_queue_size: int = 4
+
+
+@dataclass(frozen=True)
+class LlmSchedulerConfig:
+    max_concurrency: int = 8
+    interactive_limit: int = 8
+    feishu_limit: int = 4
+    hf_daily_limit: int = 4
+    backlog_limit: int = 4
+    preempt_backlog: bool = True
+
+
+@dataclass(frozen=True)
+class LlmRouteConfig:
+    provider: str
+    model: str | None = None
+    weight: int = 1
+    priority: int = 0
+
+
+@dataclass(frozen=True)
+class LlmRoutingConfig:
+    mode: str = "active"
+    routes: dict[str, tuple[LlmRouteConfig, ...]] = field(default_factory=dict)
+    failure_threshold: int = 3
+    cooldown_seconds: int = 60
+    hedge_streams: bool = False
+    hedge_delay_ms: int = 0
+    hedge_default_delay_ms: int = 8000
+
+
+@dataclass(frozen=True)
+class LlmCompletionCacheConfig:
+    enabled: bool = False
+    request_types: tuple[str, ...] = ("analysis", "code_availability")
+    ttl_seconds: int = 30 * 86400
+    max_entries: int = 20000
+    max_bytes: int = 512 * 1024 * 1024
 
 
 @dataclass(frozen=True)
@@ -60,6 +112,24 @@ class CorsConfig:
 @dataclass(frozen=True)
 class DatabaseConfig:
     url: str | None = None
+    pool_min_size: int = 1
+    pool_max_size: int = 10
+    pool_max_lifetime_seconds: int = 1800
+    pool_max_idle_seconds: int = 300
+    pool_timeout_seconds: int = 10
+
+
+@dataclass(frozen=True)
+class CacheConfig:
+    search_max_entries: int = 512
+    search_max_bytes: int = 64 * 1024 * 1024
+    search_ttl_seconds: int = 86400
+    search_query_ttl_seconds: int = 3600
+    paper_max_entries: int = 1024
+    paper_max_bytes: int = 32 * 1024 * 1024
+    paper_ttl_seconds: int = 300
+    llm_config_ttl_seconds: int = 300
+    invalidation_bus_enabled: bool = True
 
 
 @dataclass(frozen=True)
@@ -93,6 +163,7 @@ class AdminConfig:
 @dataclass(frozen=True)
 class AppConfig:
     database: DatabaseConfig
+    cache: CacheConfig
     llm: LlmConfig
     paths: PathsConfig
     server: ServerConfig
@@ -100,6 +171,10 @@ class AppConfig:
     auth: AuthConfig
     presence: PresenceConfig
     background_analysis: BackgroundAnalysisConfig
+    analysis_jobs: AnalysisJobsConfig
+    llm_scheduler: LlmSchedulerConfig
+    llm_routing: LlmRoutingConfig
+    llm_completion_cache: LlmCompletionCacheConfig
     hf_daily: HfDailyConfig
     feishu_notifications: FeishuNotificationsConfig
     cors: CorsConfig
@@ -145,15 +220,50 @@ def _as_origins(value: object, default: tuple[str, ...]) -> tuple[str, ...]:
     return default
 
 
+def _as_str_tuple(value: object, default: tuple[str, ...]) -> tuple[str, ...]:
+    if isinstance(value, list):
+        return tuple(str(item).strip() for item in value if str(item).strip())
+    return default
+
+
+def _as_llm_routes(value: object) -> dict[str, tuple[LlmRouteConfig, ...]]:
+    if not isinstance(value, dict):
+        return {}
+    routes: dict[str, tuple[LlmRouteConfig, ...]] = {}
+    for request_type, entries in value.items():
+        if not isinstance(entries, list):
+            continue
+        parsed = tuple(
+            LlmRouteConfig(
+                provider=str(entry["provider"]).strip(),
+                model=str(entry["model"]).strip() if entry.get("model") else None,
+                weight=max(_as_int(entry.get("weight"), 1), 0),
+                priority=_as_int(entry.get("priority"), 0),
+            )
+            for entry in entries
+            if isinstance(entry, dict) and str(entry.get("provider") or "").strip()
+        )
+        if parsed:
+            routes[str(request_type)] = parsed
+    return routes
+
+
 def load_app_config() -> AppConfig:
     raw = _read_yaml_config()
     raw_auth = raw.get("auth") if isinstance(raw.get("auth"), dict) else {}
     raw_presence = raw.get("presence") if isinstance(raw.get("presence"), dict) else {}
     raw_background_analysis = raw.get("background_analysis") if isinstance(raw.get("background_analysis"), dict) else {}
+    raw_analysis_jobs = raw.get("analysis_jobs") if isinstance(raw.get("analysis_jobs"), dict) else {}
+    raw_llm_scheduler = raw.get("llm_scheduler") if isinstance(raw.get("llm_scheduler"), dict) else {}
+    raw_llm_routing = raw.get("llm_routing") if isinstance(raw.get("llm_routing"), dict) else {}
+    raw_llm_completion_cache = (
+        raw.get("llm_completion_cache") if isinstance(raw.get("llm_completion_cache"), dict) else {}
+    )
     raw_hf_daily = raw.get("hf_daily") if isinstance(raw.get("hf_daily"), dict) else {}
     raw_feishu_notifications = raw.get("feishu_notifications") if isinstance(raw.get("feishu_notifications"), dict) else {}
     raw_cors = raw.get("cors") if isinstance(raw.get("cors"), dict) else {}
     raw_database = raw.get("database") if isinstance(raw.get("database"), dict) else {}
+    raw_cache = raw.get("cache") if isinstance(raw.get("cache"), dict) else {}
     raw_llm = raw.get("llm") if isinstance(raw.get("llm"), dict) else {}
     raw_paths = raw.get("paths") if isinstance(raw.get("paths"), dict) else {}
     raw_server = raw.get("server") if isinstance(raw.get("server"), dict) else {}
@@ -220,6 +330,131 @@ def load_app_config() -> AppConfig:
             raw_background_analysis.get("check_interval_seconds"),
             default_background_analysis.check_interval_seconds,
         ),
+        concurrency=_as_int(
+            raw_background_analysis.get("concurrency"),
+            default_background_analysis.concurrency,
+        ),
+    )
+
+    default_analysis_jobs = AnalysisJobsConfig()
+    analysis_jobs = AnalysisJobsConfig(
+        lease_seconds=_as_int(
+            raw_analysis_jobs.get("lease_seconds"),
+            default_analysis_jobs.lease_seconds,
+        ),
+        max_attempts=_as_int(
+            raw_analysis_jobs.get("max_attempts"),
+            default_analysis_jobs.max_attempts,
+        ),
+        retry_delay_seconds=_as_int(
+            raw_analysis_jobs.get("retry_delay_seconds"),
+            default_analysis_jobs.retry_delay_seconds,
+        ),
+        failed_retry_seconds=_as_int(
+            raw_analysis_jobs.get("failed_retry_seconds"),
+            default_analysis_jobs.failed_retry_seconds,
+        ),
+        backlog_batch_size=_as_int(
+            raw_analysis_jobs.get("backlog_batch_size"),
+            default_analysis_jobs.backlog_batch_size,
+        ),
+        fetch_concurrency=_as_int(
+            raw_analysis_jobs.get("fetch_concurrency"),
+            default_analysis_jobs.fetch_concurrency,
+        ),
+        extract_concurrency=_as_int(
+            raw_analysis_jobs.get("extract_concurrency"),
+            default_analysis_jobs.extract_concurrency,
+        ),
+        persist_concurrency=_as_int(
+            raw_analysis_jobs.get("persist_concurrency"),
+            default_analysis_jobs.persist_concurrency,
+        ),
+        stage_queue_size=_as_int(
+            raw_analysis_jobs.get("stage_queue_size"),
+            default_analysis_jobs.stage_queue_size,
+        ),
+    )
+
+    default_llm_scheduler = LlmSchedulerConfig()
+    llm_scheduler = LlmSchedulerConfig(
+        max_concurrency=_as_int(
+            raw_llm_scheduler.get("max_concurrency"),
+            default_llm_scheduler.max_concurrency,
+        ),
+        interactive_limit=_as_int(
+            raw_llm_scheduler.get("interactive_limit"),
+            default_llm_scheduler.interactive_limit,
+        ),
+        feishu_limit=_as_int(
+            raw_llm_scheduler.get("feishu_limit"),
+            default_llm_scheduler.feishu_limit,
+        ),
+        hf_daily_limit=_as_int(
+            raw_llm_scheduler.get("hf_daily_limit"),
+            default_llm_scheduler.hf_daily_limit,
+        ),
+        backlog_limit=_as_int(
+            raw_llm_scheduler.get("backlog_limit"),
+            default_llm_scheduler.backlog_limit,
+        ),
+        preempt_backlog=_as_bool(
+            raw_llm_scheduler.get("preempt_backlog"),
+            default_llm_scheduler.preempt_backlog,
+        ),
+    )
+
+    default_llm_routing = LlmRoutingConfig()
+    llm_routing = LlmRoutingConfig(
+        mode=_as_str(
+            raw_llm_routing.get("mode"),
+            default_llm_routing.mode,
+        ),
+        routes=_as_llm_routes(raw_llm_routing.get("routes")),
+        failure_threshold=_as_int(
+            raw_llm_routing.get("failure_threshold"),
+            default_llm_routing.failure_threshold,
+        ),
+        cooldown_seconds=_as_int(
+            raw_llm_routing.get("cooldown_seconds"),
+            default_llm_routing.cooldown_seconds,
+        ),
+        hedge_streams=_as_bool(
+            raw_llm_routing.get("hedge_streams"),
+            default_llm_routing.hedge_streams,
+        ),
+        hedge_delay_ms=_as_int(
+            raw_llm_routing.get("hedge_delay_ms"),
+            default_llm_routing.hedge_delay_ms,
+        ),
+        hedge_default_delay_ms=_as_int(
+            raw_llm_routing.get("hedge_default_delay_ms"),
+            default_llm_routing.hedge_default_delay_ms,
+        ),
+    )
+
+    default_llm_completion_cache = LlmCompletionCacheConfig()
+    llm_completion_cache = LlmCompletionCacheConfig(
+        enabled=_as_bool(
+            raw_llm_completion_cache.get("enabled"),
+            default_llm_completion_cache.enabled,
+        ),
+        request_types=_as_str_tuple(
+            raw_llm_completion_cache.get("request_types"),
+            default_llm_completion_cache.request_types,
+        ),
+        ttl_seconds=_as_int(
+            raw_llm_completion_cache.get("ttl_seconds"),
+            default_llm_completion_cache.ttl_seconds,
+        ),
+        max_entries=_as_int(
+            raw_llm_completion_cache.get("max_entries"),
+            default_llm_completion_cache.max_entries,
+        ),
+        max_bytes=_as_int(
+            raw_llm_completion_cache.get("max_bytes"),
+            default_llm_completion_cache.max_bytes,
+        ),
     )
 
     default_hf_daily = HfDailyConfig()
@@ -267,8 +502,74 @@ def load_app_config() -> AppConfig:
         allowed_origins=_as_origins(raw_cors.get("allowed_origins"), default_cors.allowed_origins),
     )
 
+    default_database = DatabaseConfig()
+    database = DatabaseConfig(
+        url=raw_database.get("url"),
+        pool_min_size=_as_int(
+            raw_database.get("pool_min_size"),
+            default_database.pool_min_size,
+        ),
+        pool_max_size=_as_int(
+            raw_database.get("pool_max_size"),
+            default_database.pool_max_size,
+        ),
+        pool_max_lifetime_seconds=_as_int(
+            raw_database.get("pool_max_lifetime_seconds"),
+            default_database.pool_max_lifetime_seconds,
+        ),
+        pool_max_idle_seconds=_as_int(
+            raw_database.get("pool_max_idle_seconds"),
+            default_database.pool_max_idle_seconds,
+        ),
+        pool_timeout_seconds=_as_int(
+            raw_database.get("pool_timeout_seconds"),
+            default_database.pool_timeout_seconds,
+        ),
+    )
+
+    default_cache = CacheConfig()
+    cache = CacheConfig(
+        search_max_entries=_as_int(
+            raw_cache.get("search_max_entries"),
+            default_cache.search_max_entries,
+        ),
+        search_max_bytes=_as_int(
+            raw_cache.get("search_max_bytes"),
+            default_cache.search_max_bytes,
+        ),
+        search_ttl_seconds=_as_int(
+            raw_cache.get("search_ttl_seconds"),
+            default_cache.search_ttl_seconds,
+        ),
+        search_query_ttl_seconds=_as_int(
+            raw_cache.get("search_query_ttl_seconds"),
+            default_cache.search_query_ttl_seconds,
+        ),
+        paper_max_entries=_as_int(
+            raw_cache.get("paper_max_entries"),
+            default_cache.paper_max_entries,
+        ),
+        paper_max_bytes=_as_int(
+            raw_cache.get("paper_max_bytes"),
+            default_cache.paper_max_bytes,
+        ),
+        paper_ttl_seconds=_as_int(
+            raw_cache.get("paper_ttl_seconds"),
+            default_cache.paper_ttl_seconds,
+        ),
+        llm_config_ttl_seconds=_as_int(
+            raw_cache.get("llm_config_ttl_seconds"),
+            default_cache.llm_config_ttl_seconds,
+        ),
+        invalidation_bus_enabled=_as_bool(
+            raw_cache.get("invalidation_bus_enabled"),
+            default_cache.invalidation_bus_enabled,
+        ),
+    )
+
     return AppConfig(
-        database=DatabaseConfig(url=raw_database.get("url")),
+        database=database,
+        cache=cache,
         llm=LlmConfig(
             openai_api_key=raw_llm.get("openai_api_key"),
             siliconflow_api_key=raw_llm.get("siliconflow_api_key"),
@@ -290,6 +591,10 @@ def load_app_config() -> AppConfig:
         auth=auth,
         presence=presence,
         background_analysis=background_analysis,
+        analysis_jobs=analysis_jobs,
+        llm_scheduler=llm_scheduler,
+        llm_routing=llm_routing,
+        llm_completion_cache=llm_completion_cache,
         hf_daily=hf_daily,
         feishu_notifications=feishu_notifications,
         cors=cors,
@@ -299,12 +604,18 @@ def load_app_config() -> AppConfig:
 settings = load_app_config()
 
 
-def write_background_analysis_config(enabled: bool, check_interval_seconds: int) -> None:
+def write_background_analysis_config(
+    enabled: bool,
+    check_interval_seconds: int,
+    concurrency: int = 1,
+) -> None:
     section_lines = [
         "background_analysis:",
         "  # Disabled by default to avoid calling LLM APIs immediately on startup.",
         f"  enabled: {str(enabled).lower()}",
         f"  check_interval_seconds: {check_interval_seconds}",
+        "  # Number of papers analyzed in parallel.",
+        f"  concurrency: {concurrency}",
     ]
 
     if not CONFIG_PATH.exists():
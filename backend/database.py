@@ -1,16 +1,24 @@
+import base64
+import copy
+import heapq
+import json
 import logging
 import re
+import threading
 import time
 import uuid
 from contextlib import contextmanager
 from datetime import date, datetime, timedelta, timezone
-from typing import Callable, Iterator, TypeVar
+from typing import Callable, Iterable, Iterator, TypeVar
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 import psycopg
 from psycopg.rows import dict_row
 from psycopg.types.json import Jsonb
+from psycopg_pool import ConnectionPool, PoolTimeout
+import cache_bus
 from config import settings
+from result_cache import ResultCache
 from utils import get_openreview_pdf_url, normalize_paper_pdf_url
 
 DATABASE_URL = settings.database.url
@@ -18,11 +26,51 @@ DATABASE_URL = settings.database.url
 logger = logging.getLogger(__name__)
 T = TypeVar("T")
 
+_connection_pool: ConnectionPool | None = None
+_connection_pool_lock = threading.Lock()
+
 # Cache for conference/search results
-_conference_cache = {}
-_cache_timestamp = {}
-_CACHE_TTL_SECONDS = 86400
-_READ_FILTER_SEARCH_LIMIT = 1_000_000
+_search_cache = ResultCache(
+    "search",
+    max_entries=settings.cache.search_max_entries,
+    max_bytes=settings.cache.search_max_bytes,
+    default_ttl_seconds=settings.cache.search_ttl_seconds,
+)
+_paper_cache = ResultCache(
+    "paper",
+    max_entries=settings.cache.paper_max_entries,
+    max_bytes=settings.cache.paper_max_bytes,
+    default_ttl_seconds=settings.cache.paper_ttl_seconds,
+)
+_llm_config_cache = ResultCache(
+    "llm_config",
+    max_entries=2,
+    max_bytes=1024 * 1024,
+    default_ttl_seconds=settings.cache.llm_config_ttl_seconds,
+)
+_paper_change_listeners: list[Callable[[dict], None]] = []
+# Nullable per-provider limits; see db/migrations/027_llm_provider_rate_limits.sql.
+LLM_PROVIDER_RATE_LIMIT_COLUMNS = ("requests_per_minute", "tokens_per_minute", "max_concurrency")
+_llm_config_change_listeners: list[Callable[[dict], None]] = []
+# Explicit paper columns so the stored search vectors never leave the database.
+_PAPER_COLUMNS = (
+    "id",
+    "title",
+    "abstract",
+    "keywords",
+    "pdf",
+    "venue",
+    "primary_area",
+    "sort_order",
+    "llm_response",
+    "created_at",
+    "code_status",
+    "code_url",
+    "code_evidence",
+    "code_checked_at",
+    "code_meta",
+)
+_LEGACY_SEARCH_FETCH_SIZE = 500
 CODE_AVAILABILITY_STATUSES = {"open_source", "unavailable", "not_found", "unknown"}
 CODE_FILTERS = CODE_AVAILABILITY_STATUSES | {"all", "not_open_source"}
 
@@ -31,6 +79,15 @@ class DatabaseError(Exception):
     """Raised when database access fails after retries."""
 
 
+class InvalidCursorError(ValueError):
+    """Raised when a keyset page cursor is malformed or belongs to another listing."""
+
+
+def _paper_columns_sql(alias: str | None = None) -> str:
+    prefix = f"{alias}." if alias else ""
+    return ", ".join(f"{prefix}{column}" for column in _PAPER_COLUMNS)
+
+
 def _normalize_user_row(row: dict | None) -> dict | None:
     if not row:
         return None
@@ -124,16 +181,225 @@ def _run_with_retry(
     raise DatabaseError(f"Database operation failed for {context}") from last_error
 
 
+def _get_connection_pool() -> ConnectionPool:
+    global _connection_pool
+    if _connection_pool is not None:
+        return _connection_pool
+
+    with _connection_pool_lock:
+        if _connection_pool is None:
+            pool_settings = settings.database
+            max_size = max(pool_settings.pool_max_size, 1)
+            _connection_pool = ConnectionPool(
+                DATABASE_URL,
+                min_size=min(max(pool_settings.pool_min_size, 0), max_size),
+                max_size=max_size,
+                max_lifetime=max(pool_settings.pool_max_lifetime_seconds, 60),
+                max_idle=max(pool_settings.pool_max_idle_seconds, 10),
+                timeout=max(pool_settings.pool_timeout_seconds, 1),
+                kwargs={"row_factory": dict_row},
+                check=ConnectionPool.check_connection,
+                name="paper_online",
+                open=True,
+            )
+            logger.info(
+                "数据库连接池已创建: min=%s max=%s",
+                _connection_pool.min_size,
+                _connection_pool.max_size,
+            )
+    return _connection_pool
+
+
+def close_connection_pool() -> None:
+    global _connection_pool
+    with _connection_pool_lock:
+        pool = _connection_pool
+        _connection_pool = None
+    if pool is not None:
+        pool.close()
+        logger.info("数据库连接池已关闭")
+
+
+def get_connection_pool_stats() -> dict:
+    pool = _connection_pool
+    pool_settings = settings.database
+    if pool is None:
+        return {
+            "configured": bool(DATABASE_URL),
+            "open": False,
+            "min_size": pool_settings.pool_min_size,
+            "max_size": pool_settings.pool_max_size,
+            "max_lifetime_seconds": pool_settings.pool_max_lifetime_seconds,
+            "max_idle_seconds": pool_settings.pool_max_idle_seconds,
+            "timeout_seconds": pool_settings.pool_timeout_seconds,
+        }
+
+    stats = pool.get_stats()
+    return {
+        "configured": True,
+        "open": not pool.closed,
+        "min_size": pool.min_size,
+        "max_size": pool.max_size,
+        "max_lifetime_seconds": pool.max_lifetime,
+        "max_idle_seconds": pool.max_idle,
+        "timeout_seconds": pool.timeout,
+        "size": stats.get("pool_size", 0),
+        "available": stats.get("pool_available", 0),
+        "requests_waiting": stats.get("requests_waiting", 0),
+        "requests_total": stats.get("requests_num", 0),
+        "requests_queued": stats.get("requests_queued", 0),
+        "requests_wait_ms": stats.get("requests_wait_ms", 0),
+        "requests_errors": stats.get("requests_errors", 0),
+        "usage_ms": stats.get("usage_ms", 0),
+        "connections_total": stats.get("connections_num", 0),
+        "connections_errors": stats.get("connections_errors", 0),
+        "connections_lost": stats.get("connections_lost", 0),
+        "returns_bad": stats.get("returns_bad", 0),
+    }
+
+
 @contextmanager
 def _get_connection() -> Iterator[psycopg.Connection]:
     if not DATABASE_URL:
         raise DatabaseError("DATABASE_URL is not configured")
 
-    conn = psycopg.connect(DATABASE_URL, row_factory=dict_row)
+    pool = _get_connection_pool()
+    try:
+        conn = pool.getconn()
+    except PoolTimeout as exc:
+        raise DatabaseError("Timed out waiting for a pooled database connection") from exc
+
     try:
         yield conn
     finally:
-        conn.close()
+        # Match the old per-call connection semantics: anything not committed
+        # explicitly is discarded before the connection goes back to the pool.
+        try:
+            if not conn.closed and conn.info.transaction_status != psycopg.pq.TransactionStatus.IDLE:
+                conn.rollback()
+        except psycopg.Error:
+            logger.warning("归还连接前回滚失败，连接将被连接池丢弃")
+        pool.putconn(conn)
+
+
+def add_paper_change_listener(listener: Callable[[dict], None]) -> None:
+    """Register a callback fired after paper writes on this or another worker."""
+    if listener not in _paper_change_listeners:
+        _paper_change_listeners.append(listener)
+
+
+def _invalidate_search_cache(
+    paper_ids: list[str],
+    venues: list[str | None] | None,
+    membership_changed: bool,
+    code_changed: bool,
+) -> None:
+    stale_tags = {f"paper:{paper_id}" for paper_id in paper_ids}
+    if code_changed:
+        stale_tags.add("code_filter")
+    _search_cache.invalidate_tags(stale_tags)
+
+    if not membership_changed:
+        return
+    if venues is None:
+        _search_cache.clear()
+        return
+
+    normalized_venues = [(venue or "").lower() for venue in venues]
+
+    def is_stale(tags: frozenset[str]) -> bool:
+        for tag in tags:
+            if not tag.startswith("scope:"):
+                continue
+            scope = tag.removeprefix("scope:")
+            if scope == "*" or any(venue.startswith(scope) for venue in normalized_venues):
+                return True
+        return False
+
+    _search_cache.invalidate_where(is_stale)
+
+
+def publish_cache_invalidation(topic: str, data: dict) -> None:
+    """Tell the other workers to drop cache entries; never fails the write."""
+    if not DATABASE_URL or not settings.cache.invalidation_bus_enabled:
+        return
+
+    try:
+        with _get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT pg_notify(%s, %s)",
+                    (cache_bus.CACHE_INVALIDATION_CHANNEL, cache_bus.encode_message(topic, data)),
+                )
+            conn.commit()
+    except Exception as exc:
+        cache_bus.record_published(False)
+        logger.warning("缓存失效广播失败 topic=%s: %s", topic, exc)
+        return
+    cache_bus.record_published(True)
+
+
+def _apply_paper_change(event: dict) -> None:
+    if event.get("resync"):
+        _paper_cache.clear()
+        event = {"paper_ids": [], "venues": None, "membership_changed": True, "code_changed": True}
+    else:
+        _paper_cache.invalidate_tags(f"paper:{paper_id}" for paper_id in event.get("paper_ids") or [])
+    _invalidate_search_cache(
+        event.get("paper_ids") or [],
+        event.get("venues"),
+        bool(event.get("membership_changed")),
+        bool(event.get("code_changed")),
+    )
+    for listener in list(_paper_change_listeners):
+        try:
+            listener(event)
+        except Exception as exc:
+            logger.warning("论文变更回调执行失败: %s", exc)
+
+
+def _notify_papers_changed(
+    paper_ids: Iterable[str],
+    *,
+    venues: Iterable[str | None] | None = None,
+    membership_changed: bool = False,
+    code_changed: bool = False,
+) -> None:
+    event = {
+        "paper_ids": [paper_id for paper_id in paper_ids if paper_id],
+        "venues": list(venues) if venues is not None else None,
+        "membership_changed": membership_changed,
+        "code_changed": code_changed,
+    }
+    _apply_paper_change(event)
+    publish_cache_invalidation("papers", event)
+
+
+cache_bus.subscribe("papers", _apply_paper_change)
+
+
+def add_llm_config_change_listener(listener: Callable[[dict], None]) -> None:
+    """Register a callback fired after LLM provider writes on this or another worker."""
+    if listener not in _llm_config_change_listeners:
+        _llm_config_change_listeners.append(listener)
+
+
+def _apply_llm_config_change(event: dict) -> None:
+    _llm_config_cache.clear()
+    for listener in list(_llm_config_change_listeners):
+        try:
+            listener(event)
+        except Exception as exc:
+            logger.warning("LLM 配置变更回调执行失败: %s", exc)
+
+
+def _notify_llm_config_changed(provider_id: str | None) -> None:
+    event = {"provider_id": str(provider_id) if provider_id else None}
+    _apply_llm_config_change(event)
+    publish_cache_invalidation("llm_config", event)
+
+
+cache_bus.subscribe("llm_config", _apply_llm_config_change)
 
 
 def _fetch_keywords_for_papers(conn: psycopg.Connection, paper_ids: list[str]) -> dict[str, list[str]]:
@@ -173,6 +439,21 @@ def _arxiv_meta_from_row(row: dict | None) -> dict | None:
     }
 
 
+def _arxiv_meta_from_joined_row(row: dict) -> dict | None:
+    return _arxiv_meta_from_row(
+        {
+            "arxiv_id": row.get("arxiv_id"),
+            "arxiv_url": row.get("arxiv_url"),
+            "pdf_url": row.get("arxiv_pdf_url"),
+            "published_at": row.get("arxiv_published_at"),
+            "updated_at": row.get("arxiv_updated_at"),
+            "added_at": row.get("arxiv_added_at"),
+            "added_by_user_id": row.get("arxiv_added_by_user_id"),
+            "metadata": row.get("arxiv_metadata"),
+        }
+    )
+
+
 def _paper_from_arxiv_row(row: dict) -> dict:
     paper = {
         "id": row["id"],
@@ -188,18 +469,7 @@ def _paper_from_arxiv_row(row: dict) -> dict:
         "code_url": row.get("code_url"),
         "code_evidence": row.get("code_evidence"),
         "code_checked_at": row.get("code_checked_at"),
-        "arxiv": _arxiv_meta_from_row(
-            {
-                "arxiv_id": row.get("arxiv_id"),
-                "arxiv_url": row.get("arxiv_url"),
-                "pdf_url": row.get("arxiv_pdf_url"),
-                "published_at": row.get("arxiv_published_at"),
-                "updated_at": row.get("arxiv_updated_at"),
-                "added_at": row.get("arxiv_added_at"),
-                "added_by_user_id": row.get("arxiv_added_by_user_id"),
-                "metadata": row.get("arxiv_metadata"),
-            }
-        ),
+        "arxiv": _arxiv_meta_from_joined_row(row),
     }
     return paper
 
@@ -208,57 +478,58 @@ def get_paper(paper_id: str) -> dict | None:
     if not DATABASE_URL:
         return None
 
+    cached_paper = _paper_cache.get(paper_id)
+    if cached_paper is not None:
+        return copy.deepcopy(cached_paper)
+    # A change notification that lands while the row is being read must win.
+    cache_generation = _paper_cache.generation
+
     def operation() -> dict | None:
         with _get_connection() as conn:
             with conn.cursor() as cur:
-                cur.execute("SELECT * FROM papers WHERE id = %s", (paper_id,))
-                paper = cur.fetchone()
-                if not paper:
-                    return None
-
                 cur.execute(
-                    """
-                    SELECT author_name
-                    FROM authors
-                    WHERE paper_id = %s
-                    ORDER BY author_order
+                    f"""
+                    SELECT {_paper_columns_sql('p')},
+                           ARRAY(
+                               SELECT au.author_name
+                               FROM authors au
+                               WHERE au.paper_id = p.id
+                               ORDER BY au.author_order
+                           ) AS author_names,
+                           ARRAY(
+                               SELECT k.keyword
+                               FROM keywords k
+                               WHERE k.paper_id = p.id
+                               ORDER BY k.id
+                           ) AS keyword_names,
+                           a.arxiv_id,
+                           a.arxiv_url,
+                           a.pdf_url AS arxiv_pdf_url,
+                           a.published_at AS arxiv_published_at,
+                           a.arxiv_updated_at AS arxiv_updated_at,
+                           a.added_at AS arxiv_added_at,
+                           a.added_by_user_id AS arxiv_added_by_user_id,
+                           a.metadata AS arxiv_metadata
+                    FROM papers p
+                    LEFT JOIN arxiv_papers a ON a.paper_id = p.id
+                    WHERE p.id = %s
                     """,
                     (paper_id,),
                 )
-                paper["authors"] = [row["author_name"] for row in cur.fetchall()]
+                return cur.fetchone()
 
-                cur.execute(
-                    """
-                    SELECT keyword
-                    FROM keywords
-                    WHERE paper_id = %s
-                    ORDER BY id
-                    """,
-                    (paper_id,),
-                )
-                paper["keywords"] = [row["keyword"] for row in cur.fetchall()]
-                paper["pdf"] = normalize_paper_pdf_url(paper_id, paper.get("pdf")) or get_openreview_pdf_url(paper_id)
-                cur.execute(
-                    """
-                    SELECT arxiv_id,
-                           arxiv_url,
-                           pdf_url,
-                           published_at,
-                           arxiv_updated_at AS updated_at,
-                           added_at,
-                           added_by_user_id,
-                           metadata
-                    FROM arxiv_papers
-                    WHERE paper_id = %s
-                    """,
-                    (paper_id,),
-                )
-                arxiv_meta = _arxiv_meta_from_row(cur.fetchone())
-                if arxiv_meta:
-                    paper["arxiv"] = arxiv_meta
-                return paper
+    row = _run_with_retry(operation, f"get_paper:{paper_id}")
+    if not row:
+        return None
 
-    return _run_with_retry(operation, f"get_paper:{paper_id}")
+    paper = {column: row.get(column) for column in _PAPER_COLUMNS}
+    paper["authors"] = list(row.get("author_names") or [])
+    paper["keywords"] = list(row.get("keyword_names") or [])
+    paper["pdf"] = normalize_paper_pdf_url(paper_id, paper.get("pdf")) or get_openreview_pdf_url(paper_id)
+    if row.get("arxiv_id"):
+        paper["arxiv"] = _arxiv_meta_from_joined_row(row)
+    _paper_cache.set(paper_id, paper, tags={f"paper:{paper_id}"}, generation=cache_generation)
+    return copy.deepcopy(paper)
 
 
 def save_paper(paper_info: dict, llm_response: str = None):
@@ -323,16 +594,19 @@ def save_paper(paper_info: dict, llm_response: str = None):
                 cur.execute("DELETE FROM keywords WHERE paper_id = %s", (paper_info["id"],))
                 keywords = paper_info.get("keywords", [])
                 if keywords:
-                    cur.executemany(
+                    # One statement, so the keyword trigger refreshes the paper once.
+                    cur.execute(
                         """
                         INSERT INTO keywords (paper_id, keyword)
-                        VALUES (%s, %s)
+                        SELECT %s, keyword FROM unnest(%s::TEXT[]) AS keyword
                         """,
-                        [(paper_info["id"], keyword) for keyword in keywords],
+                        (paper_info["id"], list(keywords)),
                     )
 
             conn.commit()
 
+        _notify_papers_changed([paper_info["id"]], venues=[paper_info.get("venue")], membership_changed=True)
+
     _run_with_retry(operation, f"save_paper:{paper_info['id']}")
 
 
@@ -373,7 +647,7 @@ def upsert_arxiv_paper(
         with _get_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(
-                    """
+                    f"""
                     INSERT INTO papers (
                         id,
                         title,
@@ -391,7 +665,7 @@ def upsert_arxiv_paper(
                         pdf = EXCLUDED.pdf,
                         venue = EXCLUDED.venue,
                         primary_area = EXCLUDED.primary_area
-                    RETURNING *
+                    RETURNING {_paper_columns_sql()}
                     """,
                     (
                         paper_id,
@@ -419,12 +693,13 @@ def upsert_arxiv_paper(
                 cur.execute("DELETE FROM keywords WHERE paper_id = %s", (paper_id,))
                 keywords = paper_info.get("keywords", [])
                 if keywords:
-                    cur.executemany(
+                    # One statement, so the keyword trigger refreshes the paper once.
+                    cur.execute(
                         """
                         INSERT INTO keywords (paper_id, keyword)
-                        VALUES (%s, %s)
+                        SELECT %s, keyword FROM unnest(%s::TEXT[]) AS keyword
                         """,
-                        [(paper_id, keyword) for keyword in keywords],
+                        (paper_id, list(keywords)),
                     )
 
                 cur.execute(
@@ -475,8 +750,7 @@ def upsert_arxiv_paper(
 
             conn.commit()
 
-        _conference_cache.clear()
-        _cache_timestamp.clear()
+        _notify_papers_changed([paper_id], venues=[paper.get("venue")], membership_changed=True)
         paper["authors"] = authors
         paper["keywords"] = keywords
         paper["pdf"] = normalize_paper_pdf_url(paper_id, paper.get("pdf")) or paper.get("pdf")
@@ -500,9 +774,11 @@ def upsert_hf_daily_papers(daily_date: date, entries: list[dict]) -> list[str]:
                     DELETE FROM hf_daily_papers
                     WHERE daily_date = %s
                       AND paper_id <> ALL(%s)
+                    RETURNING paper_id
                     """,
                     (daily_date, selected_paper_ids),
                 )
+                removed_paper_ids = [row["paper_id"] for row in cur.fetchall()]
 
                 for entry in entries:
                     paper_info = entry["paper"]
@@ -600,12 +876,13 @@ def upsert_hf_daily_papers(daily_date: date, entries: list[dict]) -> list[str]:
                     cur.execute("DELETE FROM keywords WHERE paper_id = %s", (paper_id,))
                     keywords = paper_info.get("keywords", [])
                     if keywords:
-                        cur.executemany(
+                        # One statement, so the keyword trigger refreshes the paper once.
+                        cur.execute(
                             """
                             INSERT INTO keywords (paper_id, keyword)
-                            VALUES (%s, %s)
+                            SELECT %s, keyword FROM unnest(%s::TEXT[]) AS keyword
                             """,
-                            [(paper_id, keyword) for keyword in keywords],
+                            (paper_id, list(keywords)),
                         )
 
                     cur.execute(
@@ -651,10 +928,19 @@ def upsert_hf_daily_papers(daily_date: date, entries: list[dict]) -> list[str]:
                         ),
                     )
 
+                cur.execute(
+                    "SELECT refresh_hf_daily_latest_papers(%s)",
+                    ([*selected_paper_ids, *removed_paper_ids],),
+                )
+
             conn.commit()
 
-        _conference_cache.clear()
-        _cache_timestamp.clear()
+        _notify_papers_changed(
+            selected_paper_ids,
+            venues=[entry["paper"].get("venue") for entry in entries],
+            membership_changed=True,
+            code_changed=True,
+        )
         return analyzable_paper_ids
 
     return _run_with_retry(operation, f"upsert_hf_daily_papers:{daily_date.isoformat()}")
@@ -677,6 +963,8 @@ def update_llm_response(paper_id: str, response: str):
                 )
             conn.commit()
 
+        _notify_papers_changed([paper_id])
+
     _run_with_retry(operation, f"update_llm_response:{paper_id}")
 
 
@@ -714,8 +1002,7 @@ def update_paper_code_availability(
                 )
             conn.commit()
 
-        _conference_cache.clear()
-        _cache_timestamp.clear()
+        _notify_papers_changed([paper_id], code_changed=True)
 
     _run_with_retry(operation, f"update_paper_code_availability:{paper_id}")
 
@@ -1379,6 +1666,7 @@ def ensure_default_llm_providers(provider_specs: list[dict]) -> None:
             conn.commit()
 
     _run_with_retry(operation, "ensure_default_llm_providers")
+    _llm_config_cache.clear()
 
 
 def list_llm_providers(include_models: bool = True) -> list[dict]:
@@ -1388,7 +1676,8 @@ def list_llm_providers(include_models: bool = True) -> list[dict]:
                 cur.execute(
                     """
                     SELECT id, provider_key, name, base_url, api_key, is_active, is_enabled,
-                           is_builtin, active_model, default_parameters, models_fetched_at,
+                           is_builtin, active_model, default_parameters, requests_per_minute,
+                           tokens_per_minute, max_concurrency, models_fetched_at,
                            created_at, updated_at
                     FROM llm_providers
                     ORDER BY is_active DESC, is_builtin DESC, name
@@ -1417,7 +1706,8 @@ def get_llm_provider(provider_id: str, include_models: bool = True) -> dict | No
                 cur.execute(
                     """
                     SELECT id, provider_key, name, base_url, api_key, is_active, is_enabled,
-                           is_builtin, active_model, default_parameters, models_fetched_at,
+                           is_builtin, active_model, default_parameters, requests_per_minute,
+                           tokens_per_minute, max_concurrency, models_fetched_at,
                            created_at, updated_at
                     FROM llm_providers
                     WHERE id = %s
@@ -1436,6 +1726,11 @@ def get_llm_provider(provider_id: str, include_models: bool = True) -> dict | No
 
 
 def get_active_llm_config() -> dict | None:
+    cached = _llm_config_cache.get("active")
+    if cached is not None:
+        return copy.deepcopy(cached["config"])
+    cache_generation = _llm_config_cache.generation
+
     def operation() -> dict | None:
         with _get_connection() as conn:
             with conn.cursor() as cur:
@@ -1443,6 +1738,7 @@ def get_active_llm_config() -> dict | None:
                     """
                     SELECT p.id, p.provider_key, p.name, p.base_url, p.api_key, p.is_active,
                            p.is_enabled, p.is_builtin, p.active_model, p.default_parameters,
+                           p.requests_per_minute, p.tokens_per_minute, p.max_concurrency,
                            p.models_fetched_at, p.created_at, p.updated_at,
                            COALESCE(
                              NULLIF(p.active_model, ''),
@@ -1462,7 +1758,56 @@ def get_active_llm_config() -> dict | None:
                 row = cur.fetchone()
         return _normalize_llm_provider_row(row)
 
-    return _run_with_retry(operation, "get_active_llm_config")
+    config = _run_with_retry(operation, "get_active_llm_config")
+    _llm_config_cache.set("active", {"config": config}, generation=cache_generation)
+    return copy.deepcopy(config)
+
+
+def list_enabled_llm_configs() -> list[dict]:
+    """Every enabled provider as a call config, with its enabled model names, for routing pools."""
+    cached = _llm_config_cache.get("enabled")
+    if cached is not None:
+        return copy.deepcopy(cached["configs"])
+    cache_generation = _llm_config_cache.generation
+
+    def operation() -> list[dict]:
+        with _get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT p.id, p.provider_key, p.name, p.base_url, p.api_key, p.is_active,
+                           p.is_enabled, p.is_builtin, p.active_model, p.default_parameters,
+                           p.requests_per_minute, p.tokens_per_minute, p.max_concurrency,
+                           p.models_fetched_at, p.created_at, p.updated_at,
+                           COALESCE(
+                             NULLIF(p.active_model, ''),
+                             (
+                               SELECT m.model_name
+                               FROM llm_models m
+                               WHERE m.provider_id = p.id AND m.is_enabled
+                               ORDER BY m.created_at
+                               LIMIT 1
+                             )
+                           ) AS model_name,
+                           COALESCE(
+                             (
+                               SELECT ARRAY_AGG(m.model_name ORDER BY m.model_name)
+                               FROM llm_models m
+                               WHERE m.provider_id = p.id AND m.is_enabled
+                             ),
+                             ARRAY[]::TEXT[]
+                           ) AS model_names
+                    FROM llm_providers p
+                    WHERE p.is_enabled
+                    ORDER BY p.is_active DESC, p.name
+                    """
+                )
+                rows = cur.fetchall()
+        return [_normalize_llm_provider_row(row) for row in rows]
+
+    configs = _run_with_retry(operation, "list_enabled_llm_configs")
+    _llm_config_cache.set("enabled", {"configs": configs}, generation=cache_generation)
+    return copy.deepcopy(configs)
 
 
 def create_llm_provider(
@@ -1490,7 +1835,8 @@ def create_llm_provider(
                     )
                     VALUES (%s, %s, %s, %s, FALSE, %s)
                     RETURNING id, provider_key, name, base_url, api_key, is_active, is_enabled,
-                              is_builtin, active_model, default_parameters, models_fetched_at,
+                              is_builtin, active_model, default_parameters, requests_per_minute,
+                              tokens_per_minute, max_concurrency, models_fetched_at,
                               created_at, updated_at
                     """,
                     (
@@ -1518,7 +1864,9 @@ def create_llm_provider(
             provider["models"] = _fetch_llm_models_for_provider(conn, [provider_row["id"]]).get(provider["id"], [])
             return provider
 
-    return _run_with_retry(operation, f"create_llm_provider:{name}")
+    provider = _run_with_retry(operation, f"create_llm_provider:{name}")
+    _notify_llm_config_changed(provider["id"])
+    return provider
 
 
 def update_llm_provider(
@@ -1528,6 +1876,7 @@ def update_llm_provider(
     api_key: str | None = None,
     api_key_provided: bool = False,
     is_enabled: bool | None = None,
+    rate_limits: dict[str, int | None] | None = None,
 ) -> dict | None:
     def operation() -> dict | None:
         updates: list[str] = []
@@ -1545,6 +1894,10 @@ def update_llm_provider(
         if is_enabled is not None:
             updates.append("is_enabled = %s")
             params.append(is_enabled)
+        for column in LLM_PROVIDER_RATE_LIMIT_COLUMNS:
+            if rate_limits and column in rate_limits:
+                updates.append(f"{column} = %s")
+                params.append(rate_limits[column])
 
         if not updates:
             return get_llm_provider(provider_id)
@@ -1558,7 +1911,8 @@ def update_llm_provider(
                     SET {", ".join(updates)}, updated_at = NOW()
                     WHERE id = %s
                     RETURNING id, provider_key, name, base_url, api_key, is_active, is_enabled,
-                              is_builtin, active_model, default_parameters, models_fetched_at,
+                              is_builtin, active_model, default_parameters, requests_per_minute,
+                              tokens_per_minute, max_concurrency, models_fetched_at,
                               created_at, updated_at
                     """,
                     params,
@@ -1569,7 +1923,9 @@ def update_llm_provider(
             return None
         return get_llm_provider(str(row["id"]))
 
-    return _run_with_retry(operation, f"update_llm_provider:{provider_id}")
+    provider = _run_with_retry(operation, f"update_llm_provider:{provider_id}")
+    _notify_llm_config_changed(provider_id)
+    return provider
 
 
 def add_llm_model(
@@ -1613,7 +1969,9 @@ def add_llm_model(
             conn.commit()
         return _normalize_llm_model_row(model)
 
-    return _run_with_retry(operation, f"add_llm_model:{provider_id}:{model_name}")
+    model = _run_with_retry(operation, f"add_llm_model:{provider_id}:{model_name}")
+    _notify_llm_config_changed(provider_id)
+    return model
 
 
 def upsert_fetched_llm_models(provider_id: str, model_names: list[str]) -> tuple[list[dict], int]:
@@ -1681,7 +2039,9 @@ def upsert_fetched_llm_models(provider_id: str, model_names: list[str]) -> tuple
 
         return [_normalize_llm_model_row(row) for row in rows], added_count
 
-    return _run_with_retry(operation, f"upsert_fetched_llm_models:{provider_id}")
+    result = _run_with_retry(operation, f"upsert_fetched_llm_models:{provider_id}")
+    _notify_llm_config_changed(provider_id)
+    return result
 
 
 def set_active_llm_provider(provider_id: str, model_name: str | None = None) -> dict | None:
@@ -1732,7 +2092,8 @@ def set_active_llm_provider(provider_id: str, model_name: str | None = None) ->
                         updated_at = NOW()
                     WHERE id = %s
                     RETURNING id, provider_key, name, base_url, api_key, is_active, is_enabled,
-                              is_builtin, active_model, default_parameters, models_fetched_at,
+                              is_builtin, active_model, default_parameters, requests_per_minute,
+                              tokens_per_minute, max_concurrency, models_fetched_at,
                               created_at, updated_at
                     """,
                     (selected_model, provider_id),
@@ -1744,7 +2105,9 @@ def set_active_llm_provider(provider_id: str, model_name: str | None = None) ->
             return None
         return get_llm_provider(str(row["id"]))
 
-    return _run_with_retry(operation, f"set_active_llm_provider:{provider_id}")
+    provider = _run_with_retry(operation, f"set_active_llm_provider:{provider_id}")
+    _notify_llm_config_changed(provider_id)
+    return provider
 
 
 def record_llm_token_usage(
@@ -1760,6 +2123,7 @@ def record_llm_token_usage(
     cache_output_tokens: int = 0,
     total_tokens: int | None = None,
     metadata: dict | None = None,
+    hedged: bool = False,
 ) -> None:
     if not DATABASE_URL or not model_name:
         return
@@ -1789,9 +2153,10 @@ def record_llm_token_usage(
                         cache_input_tokens,
                         cache_output_tokens,
                         total_tokens,
-                        metadata
+                        metadata,
+                        hedged
                     )
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
                     """,
                     (
                         normalized_provider_id,
@@ -1805,6 +2170,7 @@ def record_llm_token_usage(
                         normalized_cache_output_tokens,
                         normalized_total_tokens,
                         Jsonb(metadata or {}),
+                        hedged,
                     ),
                 )
             conn.commit()
@@ -1844,6 +2210,7 @@ def _build_llm_usage_window(days: int, rows: list[dict], tz: ZoneInfo) -> dict:
         for day_key in day_keys
     }
     model_totals: dict[tuple[str | None, str, str], dict] = {}
+    provider_cache: dict[tuple[str | None, str], dict] = {}
     daily_rows: list[dict] = []
 
     for row in rows:
@@ -1881,6 +2248,19 @@ def _build_llm_usage_window(days: int, rows: list[dict], tz: ZoneInfo) -> dict:
         for key, value in payload.items():
             model_totals[model_key][key] += value
 
+        provider_entry = provider_cache.setdefault(
+            (provider_key, provider_name),
+            {
+                "provider_key": provider_key,
+                "provider_name": provider_name,
+                "request_count": 0,
+                "input_tokens": 0,
+                "cache_output_tokens": 0,
+            },
+        )
+        for key in ("request_count", "input_tokens", "cache_output_tokens"):
+            provider_entry[key] += payload[key]
+
         daily_rows.append(
             {
                 "date": date_key,
@@ -1898,12 +2278,25 @@ def _build_llm_usage_window(days: int, rows: list[dict], tz: ZoneInfo) -> dict:
         reverse=True,
     )
     daily_total_rows = [daily_totals[day_key] for day_key in day_keys]
+    # cache_output_tokens holds the prompt tokens served from the provider's
+    # prefix cache, so this is the share of input billed at the cached rate.
+    for provider_entry in provider_cache.values():
+        input_tokens = provider_entry["input_tokens"]
+        provider_entry["cache_read_ratio"] = (
+            round(min(provider_entry["cache_output_tokens"] / input_tokens, 1.0), 4) if input_tokens else 0.0
+        )
+    sorted_provider_cache = sorted(
+        provider_cache.values(),
+        key=lambda item: (item["input_tokens"], item["provider_name"]),
+        reverse=True,
+    )
 
     return {
         "days": day_keys,
         "totals": _usage_total_payload(daily_total_rows),
         "daily_totals": daily_total_rows,
         "model_totals": sorted_model_totals,
+        "provider_cache": sorted_provider_cache,
         "daily": daily_rows,
     }
 
@@ -1961,6 +2354,168 @@ def get_llm_token_usage_metrics() -> dict:
     return _run_with_retry(operation, "get_llm_token_usage_metrics")
 
 
+def get_cached_llm_completion(cache_keys: list[str]) -> dict | None:
+    """Return the first live cache entry in ``cache_keys`` order and count the hit."""
+    if not DATABASE_URL or not cache_keys:
+        return None
+
+    def operation() -> dict | None:
+        with _get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    UPDATE llm_completion_cache
+                    SET hit_count = hit_count + 1, last_hit_at = NOW()
+                    WHERE cache_key = (
+                      SELECT cache_key
+                      FROM llm_completion_cache
+                      WHERE cache_key = ANY(%s) AND expires_at > NOW()
+                      ORDER BY array_position(%s, cache_key)
+                      LIMIT 1
+                    )
+                    RETURNING cache_key, request_type, provider_key, model_name, response, total_tokens
+                    """,
+                    (cache_keys, cache_keys),
+                )
+                row = cur.fetchone()
+            conn.commit()
+        return dict(row) if row else None
+
+    return _run_with_retry(operation, "get_cached_llm_completion")
+
+
+def store_llm_completion(
+    *,
+    cache_key: str,
+    request_type: str,
+    provider_key: str | None,
+    model_name: str,
+    response: str,
+    total_tokens: int | None,
+    ttl_seconds: int,
+) -> None:
+    if not DATABASE_URL or not response:
+        return
+
+    def operation() -> None:
+        with _get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    INSERT INTO llm_completion_cache (
+                      cache_key, request_type, provider_key, model_name, response,
+                      total_tokens, size_bytes, expires_at
+                    )
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, NOW() + make_interval(secs => %s))
+                    ON CONFLICT (cache_key) DO UPDATE SET
+                      response = EXCLUDED.response,
+                      total_tokens = EXCLUDED.total_tokens,
+                      size_bytes = EXCLUDED.size_bytes,
+                      expires_at = EXCLUDED.expires_at
+                    """,
+                    (
+                        cache_key,
+                        request_type,
+                        provider_key,
+                        model_name,
+                        response,
+                        _as_nonnegative_int(total_tokens),
+                        len(response.encode("utf-8")),
+                        max(ttl_seconds, 0),
+                    ),
+                )
+            conn.commit()
+
+    _run_with_retry(operation, f"store_llm_completion:{request_type}")
+
+
+def prune_llm_completion_cache(max_entries: int, max_bytes: int) -> int:
+    """Drop expired entries, then the least recently used ones beyond the count/size limits."""
+    if not DATABASE_URL:
+        return 0
+
+    def operation() -> int:
+        with _get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("DELETE FROM llm_completion_cache WHERE expires_at <= NOW()")
+                deleted = cur.rowcount or 0
+                cur.execute(
+                    """
+                    DELETE FROM llm_completion_cache
+                    WHERE cache_key IN (
+                      SELECT cache_key
+                      FROM (
+                        SELECT cache_key,
+                               ROW_NUMBER() OVER recency AS recency_rank,
+                               SUM(size_bytes) OVER recency AS running_bytes
+                        FROM llm_completion_cache
+                        WINDOW recency AS (ORDER BY COALESCE(last_hit_at, created_at) DESC, cache_key)
+                      ) ranked
+                      WHERE recency_rank > %s OR running_bytes > %s
+                    )
+                    """,
+                    (max(max_entries, 0), max(max_bytes, 0)),
+                )
+                deleted += cur.rowcount or 0
+            conn.commit()
+        return deleted
+
+    return _run_with_retry(operation, "prune_llm_completion_cache")
+
+
+def get_llm_completion_cache_metrics() -> dict:
+    def operation() -> dict:
+        with _get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT request_type,
+                           COUNT(*) AS entry_count,
+                           COALESCE(SUM(hit_count), 0) AS hit_count,
+                           COALESCE(SUM(hit_count * total_tokens), 0) AS saved_tokens,
+                           COALESCE(SUM(size_bytes), 0) AS size_bytes
+                    FROM llm_completion_cache
+                    WHERE expires_at > NOW()
+                    GROUP BY request_type
+                    ORDER BY hit_count DESC, request_type
+                    """
+                )
+                rows = cur.fetchall()
+
+        request_types = []
+        for row in rows:
+            entry_count = _as_nonnegative_int(row.get("entry_count"))
+            hit_count = _as_nonnegative_int(row.get("hit_count"))
+            request_types.append(
+                {
+                    "request_type": row["request_type"],
+                    "entry_count": entry_count,
+                    "hit_count": hit_count,
+                    "saved_tokens": _as_nonnegative_int(row.get("saved_tokens")),
+                    "size_bytes": _as_nonnegative_int(row.get("size_bytes")),
+                    # Every entry was stored by one miss.
+                    "hit_rate": round(hit_count / (hit_count + entry_count), 4) if entry_count else 0.0,
+                }
+            )
+        totals = {
+            key: sum(item[key] for item in request_types)
+            for key in ("entry_count", "hit_count", "saved_tokens", "size_bytes")
+        }
+        totals["hit_rate"] = (
+            round(totals["hit_count"] / (totals["hit_count"] + totals["entry_count"]), 4)
+            if totals["entry_count"]
+            else 0.0
+        )
+        return {
+            "enabled": settings.llm_completion_cache.enabled,
+            "request_types_enabled": list(settings.llm_completion_cache.request_types),
+            "totals": totals,
+            "request_types": request_types,
+        }
+
+    return _run_with_retry(operation, "get_llm_completion_cache_metrics")
+
+
 def get_paper_marks(user_id: str, paper_ids: list[str]) -> dict[str, dict]:
     if not paper_ids:
         return {}
@@ -2512,6 +3067,60 @@ def delete_last_chat_message_pair(session_id: str):
     _run_with_retry(operation, f"delete_last_chat_message_pair:{session_id}")
 
 
+def encode_page_cursor(kind: str, values: Iterable[object]) -> str:
+    payload = [kind]
+    for value in values:
+        payload.append(value.isoformat() if isinstance(value, (date, datetime)) else value)
+    raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_page_cursor(cursor: str, kind: str, value_types: tuple[type, ...]) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (ValueError, UnicodeError) as exc:
+        raise InvalidCursorError("invalid page cursor") from exc
+    if (
+        not isinstance(payload, list)
+        or len(payload) != len(value_types) + 1
+        or payload[0] != kind
+    ):
+        raise InvalidCursorError("invalid page cursor")
+    values = payload[1:]
+    for index, (value, value_type) in enumerate(zip(values, value_types)):
+        # Dates travel as ISO strings (see encode_page_cursor) and are parsed back here.
+        if value_type in (date, datetime):
+            try:
+                values[index] = value_type.fromisoformat(value)
+            except (TypeError, ValueError) as exc:
+                raise InvalidCursorError("invalid page cursor") from exc
+        elif not isinstance(value, value_type):
+            raise InvalidCursorError("invalid page cursor")
+    return values
+
+
+def _keyset_after_clause(columns: list[tuple[str, str]], values: list[object]) -> tuple[str, list[object]]:
+    """Build "row sorts after values" for ORDER BY columns with mixed directions."""
+    (expression, direction), *rest = columns
+    operator = "<" if direction == "DESC" else ">"
+    if not rest:
+        return f"{expression} {operator} %s", [values[0]]
+    inner_clause, inner_params = _keyset_after_clause(rest, values[1:])
+    return (
+        f"({expression} {operator} %s OR ({expression} = %s AND {inner_clause}))",
+        [values[0], values[0], *inner_params],
+    )
+
+
+_PAPER_CURSOR_KIND = "papers"
+_PAPER_CURSOR_TYPES = (int | float | None, int, int, str, str)
+_HF_DAILY_CURSOR_KIND = "hf_daily"
+_HF_DAILY_CURSOR_TYPES = (date, int, int, str, str)
+_ARXIV_CURSOR_KIND = "arxiv"
+_ARXIV_CURSOR_TYPES = (datetime, int)
+
+
 def _build_cache_key(
     venue_prefix: str | None,
     offset: int,
@@ -2521,26 +3130,35 @@ def _build_cache_key(
     search_abstract: bool,
     search_keywords: bool,
     code_filter: str = "all",
+    cursor: str | None = None,
 ) -> str:
     scope = venue_prefix if venue_prefix is not None else "all"
     return (
         f"{scope}:{offset}:{limit}:{search or ''}:"
-        f"{search_title}:{search_abstract}:{search_keywords}:{code_filter}"
+        f"{search_title}:{search_abstract}:{search_keywords}:{code_filter}:{cursor or ''}"
     )
 
 
 def _get_cached_result(cache_key: str):
-    current_time = time.time()
-    if cache_key in _conference_cache and (
-        current_time - _cache_timestamp.get(cache_key, 0)
-    ) < _CACHE_TTL_SECONDS:
-        return _conference_cache[cache_key]
-    return None
+    return _search_cache.get(cache_key)
 
 
-def _set_cached_result(cache_key: str, papers: list, total: int):
-    _conference_cache[cache_key] = (papers, total)
-    _cache_timestamp[cache_key] = time.time()
+def _set_cached_result(
+    cache_key: str,
+    papers: list,
+    total: int,
+    *,
+    venue_prefix: str | None = None,
+    search: str | None = None,
+    code_filter: str = "all",
+    generation: int | None = None,
+):
+    tags = {f"scope:{(venue_prefix or '*').lower()}"}
+    tags.update(f"paper:{paper['id']}" for paper in papers if paper.get("id"))
+    if code_filter != "all":
+        tags.add("code_filter")
+    ttl_seconds = settings.cache.search_query_ttl_seconds if search else None
+    _search_cache.set(cache_key, (papers, total), ttl_seconds=ttl_seconds, tags=tags, generation=generation)
 
 
 def _load_keywords_for_papers(papers: list[dict]) -> tuple[list[dict], bool]:
@@ -2585,13 +3203,56 @@ def _paper_code_filter_clause(code_filter: str = "all", paper_alias: str = "p")
     raise ValueError(f"unsupported code_filter: {code_filter}")
 
 
-def _paper_read_filter_clause(
-    user_id: str | None,
-    read_status: str,
+def _like_substring_pattern(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _paper_substring_search_clause(
+    search: str,
+    search_title: bool,
+    search_abstract: bool,
+    search_keywords: bool,
     paper_alias: str = "p",
 ) -> tuple[str, list[object]]:
-    if read_status == "all":
-        return "", []
+    """Substring match as a UNION of per-column lookups.
+
+    Each branch is a plain ``column ILIKE`` on a single table so it can use the
+    pg_trgm GIN index from migration 023; an OR across papers and an EXISTS on
+    keywords forces a sequential scan of both tables instead.
+    """
+    pattern = _like_substring_pattern(search)
+    branches: list[str] = []
+    params: list[object] = []
+    if search_title:
+        branches.append("SELECT title_match.id FROM papers title_match WHERE title_match.title ILIKE %s")
+        params.append(pattern)
+    if search_abstract:
+        branches.append(
+            "SELECT abstract_match.id FROM papers abstract_match WHERE abstract_match.abstract ILIKE %s"
+        )
+        params.append(pattern)
+    if search_keywords:
+        branches.append("SELECT keywords.paper_id FROM keywords WHERE keywords.keyword ILIKE %s")
+        params.append(pattern)
+    union_sql = "\n                UNION\n                ".join(branches)
+    return (
+        f"""
+            {paper_alias}.id IN (
+                {union_sql}
+            )
+            """,
+        params,
+    )
+
+
+def _paper_read_filter_clause(
+    user_id: str | None,
+    read_status: str,
+    paper_alias: str = "p",
+) -> tuple[str, list[object]]:
+    if read_status == "all":
+        return "", []
     if not user_id:
         raise ValueError("user_id is required for read status filtering")
 
@@ -2660,14 +3321,17 @@ def _search_papers_via_rpc(
     search_abstract: bool,
     search_keywords: bool,
     code_filter: str = "all",
-) -> tuple[list[dict], int]:
-    def operation() -> tuple[list[dict], int]:
+    after: list | None = None,
+    reader_user_id: str | None = None,
+    read_status: str = "all",
+) -> tuple[list[dict], int, dict[str, int] | None]:
+    def operation() -> list[dict]:
         with _get_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(
                     """
                     SELECT *
-                    FROM search_papers_optimized(%s, %s, %s, %s, %s, %s, %s, %s)
+                    FROM search_papers_page(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
                     """,
                     (
                         search,
@@ -2678,30 +3342,51 @@ def _search_papers_via_rpc(
                         code_filter,
                         limit,
                         offset,
+                        *(after or [None] * len(_PAPER_CURSOR_TYPES)),
+                        reader_user_id,
+                        read_status,
                     ),
                 )
-                papers = cur.fetchall()
-                papers, _ = _load_keywords_for_papers(papers)
+                return cur.fetchall()
 
-                cur.execute(
-                    """
-                    SELECT count_papers_optimized(%s, %s, %s, %s, %s, %s) AS total
-                    """,
-                    (
-                        search,
-                        venue_prefix,
-                        search_title,
-                        search_abstract,
-                        search_keywords,
-                        code_filter,
-                    ),
-                )
-                row = cur.fetchone()
-                total = int(row["total"] or 0)
+    rows = _run_with_retry(operation, "search_papers_via_rpc")
+    return _page_from_rows(rows, reader_user_id)
 
-        return papers, total
 
-    return _run_with_retry(operation, "search_papers_via_rpc")
+def _page_from_rows(rows: list[dict], reader_user_id: str | None) -> tuple[list[dict], int, dict[str, int] | None]:
+    first_row = rows[0] if rows else {}
+    total = _as_nonnegative_int(first_row.get("total_count"))
+    read_counts = (
+        _read_counts_payload(first_row.get("scope_count"), first_row.get("read_count"))
+        if reader_user_id
+        else None
+    )
+
+    papers = []
+    for row in rows:
+        if row.get("id") is None:
+            continue
+        row.pop("total_count", None)
+        row.pop("scope_count", None)
+        row.pop("read_count", None)
+        papers.append(row)
+    papers, _ = _load_keywords_for_papers(_attach_paper_cursors(papers))
+    return papers, total, read_counts
+
+
+def _attach_paper_cursors(rows: list[dict]) -> list[dict]:
+    for paper in rows:
+        paper["cursor"] = encode_page_cursor(
+            _PAPER_CURSOR_KIND,
+            [
+                paper.pop("rank_score", None),
+                paper.pop("sort_priority", None),
+                paper.pop("sort_order_key", None),
+                paper.pop("sort_title", None),
+                paper["id"],
+            ],
+        )
+    return rows
 
 
 def _paper_type_priority(paper: dict) -> int:
@@ -2743,16 +3428,15 @@ def _legacy_search_rank_score(
     normalized_search: str,
     search_title: bool,
     search_abstract: bool,
-    matched_keyword_paper_ids: set[str],
+    keyword_match: bool,
 ) -> float:
     score = 0.0
     title = (paper.get("title") or "").casefold()
     abstract = (paper.get("abstract") or "").casefold()
-    paper_id = paper.get("id") or ""
 
     if search_title and normalized_search in title:
         score += 1.0
-    if paper_id in matched_keyword_paper_ids:
+    if keyword_match:
         score += 0.55
     if search_abstract and normalized_search in abstract:
         score += 0.35
@@ -2769,74 +3453,116 @@ def _search_papers_legacy(
     search_abstract: bool,
     search_keywords: bool,
     code_filter: str = "all",
+    after: list | None = None,
 ) -> tuple[list[dict], int]:
+    """Fallback search that streams matches and keeps only the best offset+limit rows."""
     normalized_search = (search or "").casefold()
-    matched_keyword_paper_ids: set[str] = set()
+    pattern = _like_substring_pattern(search or "")
 
-    with _get_connection() as conn:
-        with conn.cursor() as cur:
-            if search and search_keywords:
-                cur.execute(
-                    """
-                    SELECT DISTINCT paper_id
-                    FROM keywords
-                    WHERE keyword ILIKE %s
-                    """,
-                    (f"%{search}%",),
-                )
-                matched_keyword_paper_ids = {
-                    row["paper_id"] for row in cur.fetchall()
-                }
+    select_params: list[object] = []
+    keyword_match_sql = "FALSE"
+    if search and search_keywords:
+        keyword_match_sql = """
+            EXISTS (
+                SELECT 1
+                FROM keywords
+                WHERE keywords.paper_id = papers.id
+                  AND keywords.keyword ILIKE %s
+            )
+        """
+        select_params.append(pattern)
+
+    where_parts: list[str] = []
+    where_params: list[object] = []
+    if venue_prefix:
+        where_parts.append("venue ILIKE %s")
+        where_params.append(f"{venue_prefix}%")
+    code_clause = _paper_code_filter_clause(code_filter, "papers")
+    if code_clause:
+        where_parts.append(code_clause)
+    if search:
+        search_parts = []
+        if search_title:
+            search_parts.append("title ILIKE %s")
+            where_params.append(pattern)
+        if search_abstract:
+            search_parts.append("abstract ILIKE %s")
+            where_params.append(pattern)
+        if search_keywords:
+            search_parts.append(keyword_match_sql)
+            where_params.append(pattern)
+        where_parts.append(f"({' OR '.join(search_parts)})")
+    where_clause = f"WHERE {' AND '.join(where_parts)}" if where_parts else ""
+
+    # llm_response is the bulk of a paper row; it is fetched for the final page only.
+    query = f"""
+        SELECT id,
+               title,
+               abstract,
+               venue,
+               primary_area,
+               created_at,
+               sort_order,
+               code_status,
+               code_url,
+               code_evidence,
+               code_checked_at,
+               {keyword_match_sql} AS keyword_match
+        FROM papers
+        {where_clause}
+    """
+    after_key = (-(after[0] or 0.0), *after[1:]) if after is not None else None
+    page_end = offset + limit
+    total = 0
 
-            query = "SELECT * FROM papers"
-            params: list[object] = []
-            where_parts: list[str] = []
-            if venue_prefix:
-                where_parts.append("venue ILIKE %s")
-                params.append(f"{venue_prefix}%")
-            code_clause = _paper_code_filter_clause(code_filter, "papers")
-            if code_clause:
-                where_parts.append(code_clause)
-            if where_parts:
-                query += f" WHERE {' AND '.join(where_parts)}"
-            cur.execute(query, params)
-            all_papers = cur.fetchall()
+    with _get_connection() as conn:
+        with conn.cursor(name="legacy_paper_search") as cur:
+            cur.itersize = _LEGACY_SEARCH_FETCH_SIZE
+            cur.execute(query, [*select_params, *where_params])
+
+            def ranked_candidates() -> Iterator[tuple[tuple, dict]]:
+                nonlocal total
+                for paper in cur:
+                    total += 1
+                    rank_score = (
+                        _legacy_search_rank_score(
+                            paper,
+                            normalized_search,
+                            search_title,
+                            search_abstract,
+                            bool(paper.get("keyword_match")),
+                        )
+                        if search
+                        else None
+                    )
+                    paper["rank_score"] = rank_score
+                    sort_key = (-(rank_score or 0.0), *_stable_paper_sort_key(paper))
+                    if after_key is not None and sort_key <= after_key:
+                        continue
+                    yield sort_key, paper
 
-    if search:
-        filtered_papers = []
-        for paper in all_papers:
-            title = (paper.get("title") or "").casefold()
-            abstract = (paper.get("abstract") or "").casefold()
-            paper_id = paper.get("id") or ""
-
-            if (
-                (search_title and normalized_search in title)
-                or (search_abstract and normalized_search in abstract)
-                or (paper_id in matched_keyword_paper_ids)
-            ):
-                filtered_papers.append(paper)
-        all_papers = filtered_papers
+            top_candidates = heapq.nsmallest(page_end, ranked_candidates(), key=lambda item: item[0])
 
-    if search:
-        sorted_papers = sorted(
-            all_papers,
-            key=lambda paper: (
-                -_legacy_search_rank_score(
-                    paper,
-                    normalized_search,
-                    search_title,
-                    search_abstract,
-                    matched_keyword_paper_ids,
-                ),
-                *_stable_paper_sort_key(paper),
-            ),
+        paginated_papers = [paper for _, paper in top_candidates[offset:page_end]]
+        if paginated_papers:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT id, llm_response FROM papers WHERE id = ANY(%s)",
+                    ([paper["id"] for paper in paginated_papers],),
+                )
+                llm_responses = {row["id"]: row.get("llm_response") for row in cur.fetchall()}
+            for paper in paginated_papers:
+                paper["llm_response"] = llm_responses.get(paper["id"])
+
+    for paper in paginated_papers:
+        paper["cursor"] = encode_page_cursor(
+            _PAPER_CURSOR_KIND,
+            [paper.pop("rank_score"), *_stable_paper_sort_key(paper)],
         )
-    else:
-        sorted_papers = sorted(all_papers, key=_stable_paper_sort_key)
-
-    paginated_papers = sorted_papers[offset : offset + limit]
+        paper.pop("keyword_match", None)
+        paper.pop("sort_order", None)
     paginated_papers, _ = _load_keywords_for_papers(paginated_papers)
-    return paginated_papers, len(sorted_papers)
+    return paginated_papers, total
 
 
 def _search_papers(
@@ -2848,22 +3574,61 @@ def _search_papers(
     search_abstract: bool,
     search_keywords: bool,
     code_filter: str = "all",
-) -> tuple[list[dict], int]:
+    cursor: str | None = None,
+    reader_user_id: str | None = None,
+    read_status: str = "all",
+) -> tuple[list[dict], int, dict[str, int] | None]:
+    after = decode_page_cursor(cursor, _PAPER_CURSOR_KIND, _PAPER_CURSOR_TYPES) if cursor else None
+    if read_status != "all" and not reader_user_id:
+        raise ValueError("user_id is required for read status filtering")
+    empty_read_counts = _read_counts_payload(0, 0) if reader_user_id else None
     if not DATABASE_URL:
-        return [], 0
+        return [], 0, empty_read_counts
 
     if search and not (search_title or search_abstract or search_keywords):
-        return [], 0
+        return [], 0, empty_read_counts
+
+    def read_counts_for_scope() -> dict[str, int] | None:
+        if not reader_user_id:
+            return None
+        return count_search_paper_read_states(
+            venue_prefix,
+            search,
+            search_title,
+            search_abstract,
+            search_keywords,
+            reader_user_id,
+            code_filter,
+        )
+
+    if read_status != "all":
+        # Read-filtered pages are per user, so they bypass the shared cache.
+        return _search_papers_via_rpc(
+            venue_prefix,
+            offset,
+            limit,
+            search,
+            search_title,
+            search_abstract,
+            search_keywords,
+            code_filter,
+            after,
+            reader_user_id,
+            read_status,
+        )
 
     cache_key = _build_cache_key(
-        venue_prefix, offset, limit, search, search_title, search_abstract, search_keywords, code_filter
+        venue_prefix, offset, limit, search, search_title, search_abstract, search_keywords, code_filter, cursor
     )
     cached_result = _get_cached_result(cache_key)
     if cached_result is not None:
-        return cached_result
+        papers, total = cached_result
+        return papers, total, read_counts_for_scope()
 
+    # A write that invalidates while the query runs must not be overwritten by its stale page.
+    cache_generation = _search_cache.generation
     try:
-        papers, total = _search_papers_via_rpc(
+        papers, total, read_counts = _search_papers_via_rpc(
             venue_prefix,
             offset,
             limit,
@@ -2872,6 +3637,8 @@ def _search_papers(
             search_abstract,
             search_keywords,
             code_filter,
+            after,
+            reader_user_id,
         )
     except Exception as exc:
         logger.warning(
@@ -2889,97 +3656,20 @@ def _search_papers(
             search_abstract,
             search_keywords,
             code_filter,
+            after,
         )
-
-    _set_cached_result(cache_key, papers, total)
-    return papers, total
-
-
-def _search_papers_with_read_filter(
-    venue_prefix: str | None,
-    offset: int,
-    limit: int,
-    search: str | None,
-    search_title: bool,
-    search_abstract: bool,
-    search_keywords: bool,
-    user_id: str,
-    read_status: str,
-    code_filter: str = "all",
-) -> tuple[list[dict], int]:
-    if read_status == "all":
-        return _search_papers(
-            venue_prefix,
-            offset,
-            limit,
-            search,
-            search_title,
-            search_abstract,
-            search_keywords,
-            code_filter,
-        )
-    if search and not (search_title or search_abstract or search_keywords):
-        return [], 0
-
-    read_clause, read_params = _paper_read_filter_clause(user_id, read_status, "p")
-
-    def operation() -> tuple[list[dict], int]:
-        with _get_connection() as conn:
-            with conn.cursor() as cur:
-                scoped_params = [
-                    search,
-                    venue_prefix,
-                    search_title,
-                    search_abstract,
-                    search_keywords,
-                    code_filter,
-                    _READ_FILTER_SEARCH_LIMIT,
-                    0,
-                ]
-                cur.execute(
-                    f"""
-                    WITH scoped_papers AS (
-                        SELECT ROW_NUMBER() OVER () AS scoped_order, *
-                        FROM search_papers_optimized(%s, %s, %s, %s, %s, %s, %s, %s)
-                    )
-                    SELECT p.id,
-                           p.title,
-                           p.abstract,
-                           p.venue,
-                           p.primary_area,
-                           p.llm_response,
-                           p.created_at,
-                           p.code_status,
-                           p.code_url,
-                           p.code_evidence,
-                           p.code_checked_at
-                    FROM scoped_papers p
-                    WHERE {read_clause}
-                    ORDER BY p.scoped_order
-                    LIMIT %s OFFSET %s
-                    """,
-                    [*scoped_params, *read_params, limit, offset],
-                )
-                papers = cur.fetchall()
-                papers, _ = _load_keywords_for_papers(papers)
-
-                cur.execute(
-                    f"""
-                    WITH scoped_papers AS (
-                        SELECT *
-                        FROM search_papers_optimized(%s, %s, %s, %s, %s, %s, %s, %s)
-                    )
-                    SELECT COUNT(*) AS total
-                    FROM scoped_papers p
-                    WHERE {read_clause}
-                    """,
-                    [*scoped_params, *read_params],
-                )
-                total = int((cur.fetchone() or {}).get("total") or 0)
-
-        return papers, total
-
-    return _run_with_retry(operation, f"search_papers_with_read_filter:{user_id}:{read_status}")
+        read_counts = read_counts_for_scope()
+
+    _set_cached_result(
+        cache_key,
+        papers,
+        total,
+        venue_prefix=venue_prefix,
+        search=search,
+        code_filter=code_filter,
+        generation=cache_generation,
+    )
+    return papers, total, read_counts
 
 
 def count_search_paper_read_states(
@@ -2999,28 +3689,58 @@ def count_search_paper_read_states(
     def operation() -> dict[str, int]:
         with _get_connection() as conn:
             with conn.cursor() as cur:
-                return _count_read_states_from_scoped_sql(
-                    cur,
+                # A zero-row page still returns the scope totals.
+                cur.execute(
                     """
-                    SELECT id
-                    FROM search_papers_optimized(%s, %s, %s, %s, %s, %s, %s, %s)
+                    SELECT scope_count, read_count
+                    FROM search_papers_page(%s, %s, %s, %s, %s, %s, 0, 0, NULL, NULL, NULL, NULL, NULL, %s)
+                    LIMIT 1
                     """,
-                    [
+                    (
                         search,
                         venue_prefix,
                         search_title,
                         search_abstract,
                         search_keywords,
                         code_filter,
-                        _READ_FILTER_SEARCH_LIMIT,
-                        0,
-                    ],
-                    user_id,
+                        user_id,
+                    ),
                 )
+                row = cur.fetchone() or {}
+                return _read_counts_payload(row.get("scope_count"), row.get("read_count"))
 
     return _run_with_retry(operation, f"count_search_paper_read_states:{user_id}:{venue_prefix}:{search}")
 
 
+def search_paper_page(
+    venue_prefix: str | None,
+    offset: int,
+    limit: int,
+    search: str = None,
+    search_title: bool = True,
+    search_abstract: bool = True,
+    search_keywords: bool = True,
+    user_id: str | None = None,
+    read_status: str = "all",
+    code_filter: str = "all",
+    cursor: str | None = None,
+) -> tuple[list[dict], int, dict[str, int] | None]:
+    """Page rows, total and (for a signed-in user) read counts in one search pass."""
+    return _search_papers(
+        venue_prefix,
+        offset,
+        limit,
+        search,
+        search_title,
+        search_abstract,
+        search_keywords,
+        code_filter,
+        cursor,
+        reader_user_id=user_id,
+        read_status=read_status,
+    )
+
+
 def get_conference_papers(
     venue: str,
     offset: int,
@@ -3032,22 +3752,9 @@ def get_conference_papers(
     user_id: str | None = None,
     read_status: str = "all",
     code_filter: str = "all",
+    cursor: str | None = None,
 ):
-    if read_status != "all":
-        return _search_papers_with_read_filter(
-            venue,
-            offset,
-            limit,
-            search,
-            search_title,
-            search_abstract,
-            search_keywords,
-            user_id or "",
-            read_status,
-            code_filter,
-        )
-
-    return _search_papers(
+    papers, total, _ = _search_papers(
         venue,
         offset,
         limit,
@@ -3056,7 +3763,11 @@ def get_conference_papers(
         search_abstract,
         search_keywords,
         code_filter,
+        cursor,
+        reader_user_id=user_id if read_status != "all" else None,
+        read_status=read_status,
     )
+    return papers, total
 
 
 def search_all_papers(
@@ -3069,22 +3780,9 @@ def search_all_papers(
     user_id: str | None = None,
     read_status: str = "all",
     code_filter: str = "all",
+    cursor: str | None = None,
 ):
-    if read_status != "all":
-        return _search_papers_with_read_filter(
-            None,
-            offset,
-            limit,
-            search,
-            search_title,
-            search_abstract,
-            search_keywords,
-            user_id or "",
-            read_status,
-            code_filter,
-        )
-
-    return _search_papers(
+    return get_conference_papers(
         None,
         offset,
         limit,
@@ -3092,7 +3790,10 @@ def search_all_papers(
         search_title,
         search_abstract,
         search_keywords,
-        code_filter,
+        user_id=user_id,
+        read_status=read_status,
+        code_filter=code_filter,
+        cursor=cursor,
     )
 
 
@@ -3153,8 +3854,8 @@ def select_daily_push_papers_for_user(user_id: str, daily_date: date, limit: int
         with _get_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(
-                    """
-                    SELECT p.*,
+                    f"""
+                    SELECT {_paper_columns_sql('p')},
                            h.daily_date AS hf_daily_date,
                            h.rank AS hf_daily_rank,
                            h.upvotes AS hf_daily_upvotes,
@@ -3243,7 +3944,9 @@ def get_hf_daily_papers(
     user_id: str | None = None,
     read_status: str = "all",
     code_filter: str = "all",
+    cursor: str | None = None,
 ) -> tuple[list[dict], int]:
+    after = decode_page_cursor(cursor, _HF_DAILY_CURSOR_KIND, _HF_DAILY_CURSOR_TYPES) if cursor else None
     if not DATABASE_URL:
         return [], 0
 
@@ -3254,26 +3957,11 @@ def get_hf_daily_papers(
         base_where_parts: list[str] = []
         params: list[object] = []
         if search:
-            search_parts = []
-            if search_title:
-                search_parts.append("p.title ILIKE %s")
-                params.append(f"%{search}%")
-            if search_abstract:
-                search_parts.append("p.abstract ILIKE %s")
-                params.append(f"%{search}%")
-            if search_keywords:
-                search_parts.append(
-                    """
-                    EXISTS (
-                        SELECT 1
-                        FROM keywords
-                        WHERE keywords.paper_id = p.id
-                          AND keywords.keyword ILIKE %s
-                    )
-                    """
-                )
-                params.append(f"%{search}%")
-            base_where_parts.append(f"({' OR '.join(search_parts)})")
+            search_clause, search_params = _paper_substring_search_clause(
+                search, search_title, search_abstract, search_keywords, "p"
+            )
+            base_where_parts.append(search_clause)
+            params.extend(search_params)
 
         code_clause = _paper_code_filter_clause(code_filter, "p")
         if code_clause:
@@ -3284,17 +3972,30 @@ def get_hf_daily_papers(
         if read_clause:
             list_where_parts.append(read_clause)
         list_where_clause = f"WHERE {' AND '.join(list_where_parts)}" if list_where_parts else ""
+        page_where_clause = ""
+        page_params: list[object] = []
+        if after is not None:
+            after_clause, page_params = _keyset_after_clause(
+                [
+                    ("l.daily_date", "DESC"),
+                    ("l.upvotes", "DESC"),
+                    ("l.rank", "ASC"),
+                    ("l.sort_title", "ASC"),
+                    ("l.paper_id", "ASC"),
+                ],
+                after,
+            )
+            page_where_clause = f"{'AND' if list_where_parts else 'WHERE'} {after_clause}"
         with _get_connection() as conn:
             with conn.cursor() as cur:
+                # Unfiltered feeds count the projection alone (an index-only scan).
+                paper_join = "JOIN papers p ON p.id = l.paper_id" if list_where_parts else ""
                 cur.execute(
                     f"""
                     SELECT COUNT(*) AS total
-                    FROM (
-                        SELECT DISTINCT h.paper_id
-                        FROM hf_daily_papers h
-                        JOIN papers p ON p.id = h.paper_id
-                        {list_where_clause}
-                    ) unique_hf_daily_papers
+                    FROM hf_daily_latest_papers l
+                    {paper_join}
+                    {list_where_clause}
                     """,
                     [*params, *read_params],
                 )
@@ -3302,44 +4003,47 @@ def get_hf_daily_papers(
 
                 cur.execute(
                     f"""
-                    SELECT *
-                    FROM (
-                        SELECT DISTINCT ON (h.paper_id)
-                               p.*,
-                               h.daily_date AS hf_daily_date,
-                               h.rank AS hf_daily_rank,
-                               h.upvotes AS hf_daily_upvotes,
-                               h.thumbnail AS hf_daily_thumbnail,
-                               h.discussion_id AS hf_daily_discussion_id,
-                               h.project_page AS hf_daily_project_page,
-                               h.github_repo AS hf_daily_github_repo,
-                               h.github_stars AS hf_daily_github_stars,
-                               h.num_comments AS hf_daily_num_comments
-                        FROM hf_daily_papers h
-                        JOIN papers p ON p.id = h.paper_id
-                        {list_where_clause}
-                        ORDER BY
-                            h.paper_id ASC,
-                            h.daily_date DESC,
-                            h.upvotes DESC,
-                            h.rank ASC,
-                            h.id DESC
-                    ) latest_hf_daily_papers
+                    SELECT {_paper_columns_sql('p')},
+                           l.daily_date AS hf_daily_date,
+                           l.rank AS hf_daily_rank,
+                           l.upvotes AS hf_daily_upvotes,
+                           l.sort_title AS hf_daily_sort_title,
+                           h.thumbnail AS hf_daily_thumbnail,
+                           h.discussion_id AS hf_daily_discussion_id,
+                           h.project_page AS hf_daily_project_page,
+                           h.github_repo AS hf_daily_github_repo,
+                           h.github_stars AS hf_daily_github_stars,
+                           h.num_comments AS hf_daily_num_comments
+                    FROM hf_daily_latest_papers l
+                    JOIN papers p ON p.id = l.paper_id
+                    JOIN hf_daily_papers h ON h.id = l.hf_daily_id
+                    {list_where_clause}
+                    {page_where_clause}
                     ORDER BY
-                        hf_daily_date DESC,
-                        hf_daily_upvotes DESC,
-                        hf_daily_rank ASC,
-                        title ASC,
-                        id ASC
+                        l.daily_date DESC,
+                        l.upvotes DESC,
+                        l.rank ASC,
+                        l.sort_title ASC,
+                        l.paper_id ASC
                     LIMIT %s OFFSET %s
                     """,
-                    [*params, *read_params, limit, offset],
+                    [*params, *read_params, *page_params, limit, offset],
                 )
                 rows = cur.fetchall()
 
         papers: list[dict] = []
         for row in rows:
             paper = dict(row)
+            paper["cursor"] = encode_page_cursor(
+                _HF_DAILY_CURSOR_KIND,
+                [
+                    paper.get("hf_daily_date"),
+                    paper.get("hf_daily_upvotes"),
+                    paper.get("hf_daily_rank"),
+                    paper.pop("hf_daily_sort_title", None) or paper.get("title") or "",
+                    paper["id"],
+                ],
+            )
             paper["code_status"] = paper.get("code_status") or "unknown"
             paper.setdefault("code_url", None)
             paper.setdefault("code_evidence", None)
@@ -3380,26 +4084,11 @@ def count_hf_daily_paper_read_states(
         where_parts: list[str] = []
         params: list[object] = []
         if search:
-            search_parts = []
-            if search_title:
-                search_parts.append("p.title ILIKE %s")
-                params.append(f"%{search}%")
-            if search_abstract:
-                search_parts.append("p.abstract ILIKE %s")
-                params.append(f"%{search}%")
-            if search_keywords:
-                search_parts.append(
-                    """
-                    EXISTS (
-                        SELECT 1
-                        FROM keywords
-                        WHERE keywords.paper_id = p.id
-                          AND keywords.keyword ILIKE %s
-                    )
-                    """
-                )
-                params.append(f"%{search}%")
-            where_parts.append(f"({' OR '.join(search_parts)})")
+            search_clause, search_params = _paper_substring_search_clause(
+                search, search_title, search_abstract, search_keywords, "p"
+            )
+            where_parts.append(search_clause)
+            params.extend(search_params)
 
         code_clause = _paper_code_filter_clause(code_filter, "p")
         if code_clause:
@@ -3411,9 +4100,9 @@ def count_hf_daily_paper_read_states(
                 return _count_read_states_from_scoped_sql(
                     cur,
                     f"""
-                    SELECT DISTINCT h.paper_id AS id
-                    FROM hf_daily_papers h
-                    JOIN papers p ON p.id = h.paper_id
+                    SELECT l.paper_id AS id
+                    FROM hf_daily_latest_papers l
+                    JOIN papers p ON p.id = l.paper_id
                     {where_clause}
                     """,
                     params,
@@ -3434,7 +4123,9 @@ def get_arxiv_papers(
     user_id: str | None = None,
     read_status: str = "all",
     code_filter: str = "all",
+    cursor: str | None = None,
 ) -> tuple[list[dict], int]:
+    after = decode_page_cursor(cursor, _ARXIV_CURSOR_KIND, _ARXIV_CURSOR_TYPES) if cursor else None
     if not DATABASE_URL:
         return [], 0
 
@@ -3447,26 +4138,11 @@ def get_arxiv_papers(
         if analyzed_only:
             where_parts.append("p.llm_response IS NOT NULL")
         if search:
-            search_parts = []
-            if search_title:
-                search_parts.append("p.title ILIKE %s")
-                params.append(f"%{search}%")
-            if search_abstract:
-                search_parts.append("p.abstract ILIKE %s")
-                params.append(f"%{search}%")
-            if search_keywords:
-                search_parts.append(
-                    """
-                    EXISTS (
-                        SELECT 1
-                        FROM keywords
-                        WHERE keywords.paper_id = p.id
-                          AND keywords.keyword ILIKE %s
-                    )
-                    """
-                )
-                params.append(f"%{search}%")
-            where_parts.append(f"({' OR '.join(search_parts)})")
+            search_clause, search_params = _paper_substring_search_clause(
+                search, search_title, search_abstract, search_keywords, "p"
+            )
+            where_parts.append(search_clause)
+            params.extend(search_params)
         code_clause = _paper_code_filter_clause(code_filter, "p")
         if code_clause:
             where_parts.append(code_clause)
@@ -3475,6 +4151,10 @@ def get_arxiv_papers(
             where_parts.append(read_clause)
 
         where_clause = f"WHERE {' AND '.join(where_parts)}" if where_parts else ""
+        list_where_parts = [*where_parts]
+        if after is not None:
+            list_where_parts.append("(a.added_at, a.id) < (%s, %s)")
+        list_where_clause = f"WHERE {' AND '.join(list_where_parts)}" if list_where_parts else ""
         with _get_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(
@@ -3490,7 +4170,7 @@ def get_arxiv_papers(
 
                 cur.execute(
                     f"""
-                    SELECT p.*,
+                    SELECT {_paper_columns_sql('p')},
                            a.arxiv_id,
                            a.arxiv_url,
                            a.pdf_url AS arxiv_pdf_url,
@@ -3498,18 +4178,26 @@ def get_arxiv_papers(
                            a.arxiv_updated_at AS arxiv_updated_at,
                            a.added_at AS arxiv_added_at,
                            a.added_by_user_id AS arxiv_added_by_user_id,
-                           a.metadata AS arxiv_metadata
+                           a.metadata AS arxiv_metadata,
+                           a.id AS arxiv_row_id
                     FROM arxiv_papers a
                     JOIN papers p ON p.id = a.paper_id
-                    {where_clause}
+                    {list_where_clause}
                     ORDER BY a.added_at DESC, a.id DESC
                     LIMIT %s OFFSET %s
                     """,
-                    [*params, *read_params, limit, offset],
+                    [*params, *read_params, *(after or []), limit, offset],
                 )
                 rows = cur.fetchall()
 
-        papers = [_paper_from_arxiv_row(row) for row in rows]
+        papers = []
+        for row in rows:
+            paper = _paper_from_arxiv_row(row)
+            paper["cursor"] = encode_page_cursor(
+                _ARXIV_CURSOR_KIND,
+                [row.get("arxiv_added_at"), row.get("arxiv_row_id")],
+            )
+            papers.append(paper)
         papers, _ = _load_keywords_for_papers(papers)
         return papers, total
 
@@ -3536,26 +4224,11 @@ def count_arxiv_paper_read_states(
         if analyzed_only:
             where_parts.append("p.llm_response IS NOT NULL")
         if search:
-            search_parts = []
-            if search_title:
-                search_parts.append("p.title ILIKE %s")
-                params.append(f"%{search}%")
-            if search_abstract:
-                search_parts.append("p.abstract ILIKE %s")
-                params.append(f"%{search}%")
-            if search_keywords:
-                search_parts.append(
-                    """
-                    EXISTS (
-                        SELECT 1
-                        FROM keywords
-                        WHERE keywords.paper_id = p.id
-                          AND keywords.keyword ILIKE %s
-                    )
-                    """
-                )
-                params.append(f"%{search}%")
-            where_parts.append(f"({' OR '.join(search_parts)})")
+            search_clause, search_params = _paper_substring_search_clause(
+                search, search_title, search_abstract, search_keywords, "p"
+            )
+            where_parts.append(search_clause)
+            params.extend(search_params)
 
         code_clause = _paper_code_filter_clause(code_filter, "p")
         if code_clause:
@@ -3579,27 +4252,311 @@ def count_arxiv_paper_read_states(
     return _run_with_retry(operation, f"count_arxiv_paper_read_states:{user_id}:{search}")
 
 
-def get_unanalyzed_papers(limit: int = 10) -> list:
-    """获取未分析的论文（llm_response 为空或 NULL）"""
-    if not DATABASE_URL:
-        return []
+def enqueue_analysis_jobs(
+    paper_ids: list[str],
+    source: str,
+    priority: int = 0,
+    max_attempts: int = 3,
+) -> int:
+    """Queue unanalyzed papers; an open job for the same paper keeps the higher priority."""
+    unique_ids = list(dict.fromkeys(paper_id for paper_id in paper_ids if paper_id))
+    if not DATABASE_URL or not unique_ids:
+        return 0
 
-    def operation() -> list:
+    def operation() -> int:
         with _get_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(
                     """
-                    SELECT id, title, venue
-                    FROM papers
-                    WHERE llm_response IS NULL
-                       OR BTRIM(llm_response) = ''
+                    INSERT INTO analysis_jobs (paper_id, source, priority, max_attempts)
+                    SELECT p.id, %s, %s, %s
+                    FROM papers p
+                    WHERE p.id = ANY(%s)
+                      AND (p.llm_response IS NULL OR BTRIM(p.llm_response) = '')
+                    ON CONFLICT (paper_id) WHERE status IN ('queued', 'running') DO UPDATE SET
+                        priority = GREATEST(analysis_jobs.priority, EXCLUDED.priority),
+                        source = CASE
+                            WHEN EXCLUDED.priority > analysis_jobs.priority THEN EXCLUDED.source
+                            ELSE analysis_jobs.source
+                        END,
+                        available_at = LEAST(analysis_jobs.available_at, NOW()),
+                        updated_at = NOW()
+                    """,
+                    (source, priority, max_attempts, unique_ids),
+                )
+                enqueued = cur.rowcount
+            conn.commit()
+        return enqueued
+
+    return _run_with_retry(operation, f"enqueue_analysis_jobs:{source}:{len(unique_ids)}")
+
+
+def enqueue_unanalyzed_papers(
+    limit: int,
+    max_attempts: int = 3,
+    failed_retry_seconds: int = 86400,
+) -> int:
+    """Queue a batch of backlog papers that have no analysis and no open or recently failed job."""
+    if not DATABASE_URL or limit <= 0:
+        return 0
+
+    def operation() -> int:
+        with _get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    INSERT INTO analysis_jobs (paper_id, source, priority, max_attempts)
+                    SELECT p.id, 'backlog', 0, %s
+                    FROM papers p
+                    WHERE (p.llm_response IS NULL OR BTRIM(p.llm_response) = '')
+                      AND NOT EXISTS (
+                          SELECT 1
+                          FROM analysis_jobs j
+                          WHERE j.paper_id = p.id
+                            AND (
+                                j.status IN ('queued', 'running')
+                                OR (
+                                    j.status = 'failed'
+                                    AND j.finished_at > NOW() - make_interval(secs => %s)
+                                )
+                            )
+                      )
+                    ORDER BY p.id
                     LIMIT %s
+                    ON CONFLICT DO NOTHING
                     """,
-                    (limit,),
+                    (max_attempts, failed_retry_seconds, limit),
                 )
-                return cur.fetchall()
+                enqueued = cur.rowcount
+            conn.commit()
+        return enqueued
+
+    return _run_with_retry(operation, f"enqueue_unanalyzed_papers:{limit}")
+
+
+def claim_analysis_jobs(
+    worker_id: str,
+    limit: int = 1,
+    lease_seconds: int = 1800,
+    paper_id: str | None = None,
+    min_priority: int | None = None,
+) -> list[dict]:
+    """Lease the next queued jobs; concurrent workers skip rows another worker has locked."""
+    if not DATABASE_URL or limit <= 0:
+        return []
+
+    filter_parts: list[str] = []
+    filter_params: list[object] = []
+    if paper_id:
+        filter_parts.append("AND paper_id = %s")
+        filter_params.append(paper_id)
+    if min_priority is not None:
+        filter_parts.append("AND priority >= %s")
+        filter_params.append(min_priority)
+    filter_clause = "\n                          ".join(filter_parts)
+
+    def operation() -> list[dict]:
+        with _get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    UPDATE analysis_jobs
+                    SET
+                        status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'queued' END,
+                        finished_at = CASE WHEN attempts >= max_attempts THEN NOW() ELSE NULL END,
+                        last_error = 'lease expired',
+                        lease_owner = NULL,
+                        lease_expires_at = NULL,
+                        updated_at = NOW()
+                    WHERE status = 'running'
+                      AND lease_expires_at < NOW()
+                    """
+                )
+                cur.execute(
+                    f"""
+                    WITH next_jobs AS (
+                        SELECT id
+                        FROM analysis_jobs
+                        WHERE status = 'queued'
+                          AND available_at <= NOW()
+                          {filter_clause}
+                        ORDER BY priority DESC, available_at ASC, id ASC
+                        LIMIT %s
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    UPDATE analysis_jobs j
+                    SET
+                        status = 'running',
+                        attempts = j.attempts + 1,
+                        lease_owner = %s,
+                        lease_expires_at = NOW() + make_interval(secs => %s),
+                        updated_at = NOW()
+                    FROM next_jobs
+                    WHERE j.id = next_jobs.id
+                    RETURNING j.id, j.paper_id, j.source, j.priority, j.attempts, j.max_attempts
+                    """,
+                    [*filter_params, limit, worker_id, lease_seconds],
+                )
+                jobs = cur.fetchall()
+            conn.commit()
+        return sorted(jobs, key=lambda job: (-job["priority"], job["id"]))
+
+    return _run_with_retry(operation, f"claim_analysis_jobs:{worker_id}:{limit}")
+
+
+def complete_analysis_job(job_id: int, worker_id: str) -> bool:
+    if not DATABASE_URL:
+        return False
+
+    def operation() -> bool:
+        with _get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    UPDATE analysis_jobs
+                    SET
+                        status = 'succeeded',
+                        finished_at = NOW(),
+                        last_error = NULL,
+                        lease_owner = NULL,
+                        lease_expires_at = NULL,
+                        updated_at = NOW()
+                    WHERE id = %s
+                      AND lease_owner = %s
+                      AND status = 'running'
+                    """,
+                    (job_id, worker_id),
+                )
+                completed = cur.rowcount == 1
+            conn.commit()
+        return completed
+
+    return _run_with_retry(operation, f"complete_analysis_job:{job_id}")
+
+
+def fail_analysis_job(
+    job_id: int,
+    worker_id: str,
+    error: str | None,
+    retry_delay_seconds: int = 300,
+) -> str | None:
+    """Release a failed lease; returns the new status ("queued" or "failed")."""
+    if not DATABASE_URL:
+        return None
+
+    def operation() -> str | None:
+        with _get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    UPDATE analysis_jobs
+                    SET
+                        status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'queued' END,
+                        finished_at = CASE WHEN attempts >= max_attempts THEN NOW() ELSE NULL END,
+                        available_at = NOW() + make_interval(secs => %s),
+                        last_error = %s,
+                        lease_owner = NULL,
+                        lease_expires_at = NULL,
+                        updated_at = NOW()
+                    WHERE id = %s
+                      AND lease_owner = %s
+                      AND status = 'running'
+                    RETURNING status
+                    """,
+                    (retry_delay_seconds, (error or "")[:500] or None, job_id, worker_id),
+                )
+                row = cur.fetchone()
+            conn.commit()
+        return row["status"] if row else None
+
+    return _run_with_retry(operation, f"fail_analysis_job:{job_id}")
+
+
+def release_analysis_job(job_id: int, worker_id: str) -> bool:
+    """Put a running job back in the queue without charging the attempt (preempted work)."""
+    if not DATABASE_URL:
+        return False
+
+    def operation() -> bool:
+        with _get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    UPDATE analysis_jobs
+                    SET
+                        status = 'queued',
+                        attempts = GREATEST(attempts - 1, 0),
+                        available_at = NOW(),
+                        lease_owner = NULL,
+                        lease_expires_at = NULL,
+                        updated_at = NOW()
+                    WHERE id = %s
+                      AND lease_owner = %s
+                      AND status = 'running'
+                    """,
+                    (job_id, worker_id),
+                )
+                released = cur.rowcount > 0
+            conn.commit()
+        return released
+
+    return _run_with_retry(operation, f"release_analysis_job:{job_id}")
+
+
+def get_open_analysis_job(paper_id: str) -> dict | None:
+    if not DATABASE_URL:
+        return None
+
+    def operation() -> dict | None:
+        with _get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT id, paper_id, source, priority, status, attempts, lease_owner, lease_expires_at
+                    FROM analysis_jobs
+                    WHERE paper_id = %s
+                      AND status IN ('queued', 'running')
+                    """,
+                    (paper_id,),
+                )
+                return cur.fetchone()
+
+    return _run_with_retry(operation, f"get_open_analysis_job:{paper_id}")
+
+
+def count_analysis_jobs_by_status() -> dict[str, int]:
+    """Open and failed job counts, plus jobs finished in the last hour across all workers."""
+    counts = {"queued": 0, "running": 0, "failed": 0, "succeeded_last_hour": 0}
+    if not DATABASE_URL:
+        return counts
+
+    def operation() -> dict[str, int]:
+        with _get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT status, COUNT(*) AS total
+                    FROM analysis_jobs
+                    WHERE status IN ('queued', 'running', 'failed')
+                    GROUP BY status
+                    """
+                )
+                rows = cur.fetchall()
+                cur.execute(
+                    """
+                    SELECT COUNT(*) AS total
+                    FROM analysis_jobs
+                    WHERE status = 'succeeded'
+                      AND finished_at > NOW() - INTERVAL '1 hour'
+                    """
+                )
+                succeeded_row = cur.fetchone()
+        for row in rows:
+            counts[row["status"]] = int(row["total"] or 0)
+        counts["succeeded_last_hour"] = int(succeeded_row["total"] or 0)
+        return counts
 
-    return _run_with_retry(operation, f"get_unanalyzed_papers:{limit}")
+    return _run_with_retry(operation, "count_analysis_jobs_by_status")
 
 
 def count_unanalyzed_papers() -> int:
@@ -1,15 +1,49 @@
-from openai import AsyncOpenAI, APIError, APITimeoutError, RateLimitError
+from openai import (
+    AsyncOpenAI,
+    APIConnectionError,
+    APIError,
+    APIStatusError,
+    APITimeoutError,
+    DefaultAsyncHttpxClient,
+    RateLimitError,
+)
 import asyncio
+import hashlib
+import httpx
 import logging
-from dataclasses import dataclass
-from typing import Any
+import threading
+import time
+from contextlib import aclosing, asynccontextmanager, suppress
+from dataclasses import dataclass, field
+from typing import Any, Callable
 from config import settings
+from llm_cache import completion_cache_key, llm_completion_cache
+from llm_rate_limiter import LLMRateLimiters, estimate_request_tokens, retry_after_seconds
+from llm_router import llm_router
+from llm_scheduler import llm_scheduler
+from analysis_context import build_paper_messages
 from prompt import PAPER_ANALYSIS_PROMPT
 
 MISSING_API_KEY_PLACEHOLDER = "missing-api-key"
+LLM_MAX_CONNECTIONS = 100
+LLM_MAX_KEEPALIVE_CONNECTIONS = 20
+# httpx drops idle connections after 5s by default; LLM calls are bursty.
+LLM_KEEPALIVE_EXPIRY_SECONDS = 120
 logger = logging.getLogger(__name__)
 
 
+def is_transient_llm_error(exc: BaseException) -> bool:
+    """Connection problems, timeouts, 429 and 5xx: worth retrying or moving to the next provider.
+
+    Other 4xx responses (context too long, content blocked, bad key) fail the
+    same way everywhere, so they are raised at once and do not count against
+    the route's health.
+    """
+    if isinstance(exc, APIStatusError):
+        return isinstance(exc, RateLimitError) or exc.status_code >= 500
+    return isinstance(exc, (APIConnectionError, httpx.TransportError))
+
+
 @dataclass(frozen=True)
 class LLMStreamChunk:
     kind: str
@@ -139,6 +173,11 @@ def _response_usage(response: Any) -> Any:
     return getattr(response, "usage", None)
 
 
+def _usage_total_tokens(usage: Any) -> int | None:
+    tokens = extract_llm_usage_tokens(usage)
+    return tokens.total_tokens if tokens else None
+
+
 def _response_model(response: Any, default_model: str) -> str:
     if response is None:
         return default_model
@@ -152,6 +191,15 @@ def _pop_usage_context(params: dict, default_request_type: str) -> str:
     return str(request_type or default_request_type)
 
 
+def _pop_priority_class(params: dict, default_priority_class: str) -> str:
+    return llm_scheduler.normalize_priority_class(params.pop("_llm_priority", None), default_priority_class)
+
+
+def _pop_hedge(params: dict, default: bool) -> bool:
+    hedge = params.pop("_llm_hedge", None)
+    return default if hedge is None else bool(hedge)
+
+
 def _stream_params_with_usage(params: dict) -> dict:
     next_params = dict(params)
     stream_options = next_params.get("stream_options")
@@ -181,6 +229,8 @@ def _record_llm_usage(
     provider_name: str | None,
     model_name: str,
     request_type: str,
+    hedged: bool = False,
+    metadata: dict | None = None,
 ) -> None:
     tokens = extract_llm_usage_tokens(usage)
     if not tokens:
@@ -199,11 +249,17 @@ def _record_llm_usage(
             cache_input_tokens=tokens.cache_input_tokens,
             cache_output_tokens=tokens.cache_output_tokens,
             total_tokens=tokens.total_tokens,
+            metadata=metadata,
+            hedged=hedged,
         )
     except Exception as exc:
         logger.warning("LLM token usage 记录失败: %s", exc)
 
 
+def analysis_messages(prompt: str) -> list[dict]:
+    return build_paper_messages(prompt, [{"role": "user", "content": PAPER_ANALYSIS_PROMPT}])
+
+
 def _delta_to_dict(delta) -> dict:
     if delta is None:
         return {}
@@ -242,15 +298,18 @@ def iter_llm_stream_chunks(chunk):
     if content:
         yield LLMStreamChunk(kind="content", content=content)
 
-async def retry_on_error(func, max_retries=3, delay=1.0):
-    """Simple retry wrapper for async functions"""
+async def retry_on_error(func, max_retries=3, delay=1.0, on_rate_limited=None):
+    """Simple retry wrapper for async functions; waits Retry-After when the provider sends one"""
     for attempt in range(max_retries):
         try:
             return await func()
         except (APIError, APITimeoutError, RateLimitError) as e:
-            if attempt == max_retries - 1:
+            retry_after = retry_after_seconds(e)
+            if isinstance(e, RateLimitError) and on_rate_limited is not None:
+                on_rate_limited(retry_after)
+            if attempt == max_retries - 1 or not is_transient_llm_error(e):
                 raise
-            await asyncio.sleep(delay * (attempt + 1))
+            await asyncio.sleep(retry_after if retry_after is not None else delay * (attempt + 1))
 
 class BaseLLM:
     def __init__(self, model: str, api_key: str = None, base_url: str = None):
@@ -269,10 +328,7 @@ class BaseLLM:
         async def _call():
             response = await self.client.chat.completions.create(
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant for academic research."},
-                    {"role": "user", "content": prompt + "\n\n" + PAPER_ANALYSIS_PROMPT}
-                ],
+                messages=analysis_messages(prompt),
                 **params,
             )
             _record_llm_usage(
@@ -295,10 +351,7 @@ class BaseLLM:
             {
                 "model": self.model,
                 "stream": True,
-                "messages": [
-                    {"role": "system", "content": "You are a helpful assistant for academic research."},
-                    {"role": "user", "content": prompt + "\n\n" + PAPER_ANALYSIS_PROMPT}
-                ],
+                "messages": analysis_messages(prompt),
                 **params,
             },
         )
@@ -380,14 +433,157 @@ class BaseLLM:
                 yield stream_chunk.content
 
 
+@dataclass(eq=False)
+class _StreamAttempt:
+    config: dict
+    stream: Any = None
+    first: asyncio.Task | None = None
+    started_at: float = field(default_factory=time.monotonic)
+    hedged: bool = False
+    is_hedge: bool = False
+    cache_key: str | None = None
+
+
+async def _next_stream_chunk(stream):
+    return await anext(stream)
+
+
+@dataclass(eq=False)
+class _PooledClient:
+    client: AsyncOpenAI
+    provider_ids: set[str]
+    in_use: int = 0
+    retired: bool = False
+
+
+async def _close_client(client: AsyncOpenAI) -> None:
+    close = getattr(client, "close", None)
+    if close is None:
+        return
+    try:
+        await close()
+    except Exception as exc:
+        logger.warning("关闭 LLM 客户端失败: %s", exc)
+
+
+class LLMClientRegistry:
+    """Share one AsyncOpenAI client (and its keep-alive pool) per base URL and API key.
+
+    Clients of a changed provider are retired: new calls get a fresh client,
+    and the old one is closed once its in-flight requests finish.
+    """
+
+    def __init__(self, factory: Callable[[dict], AsyncOpenAI]):
+        self._factory = factory
+        self._entries: dict[tuple[str, str], _PooledClient] = {}
+        self._closable: list[_PooledClient] = []
+        self._lock = threading.Lock()
+        self.created_count = 0
+        self.reused_count = 0
+        self.retired_count = 0
+
+    @staticmethod
+    def _key(config: dict) -> tuple[str, str]:
+        api_key = str(config.get("api_key") or "")
+        return (
+            str(config.get("base_url") or "").rstrip("/"),
+            hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16],
+        )
+
+    def _checkout(self, config: dict) -> _PooledClient:
+        key = self._key(config)
+        provider_id = str(config["id"]) if config.get("id") else None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _PooledClient(client=self._factory(config), provider_ids=set())
+                self._entries[key] = entry
+                self.created_count += 1
+            else:
+                self.reused_count += 1
+            if provider_id:
+                entry.provider_ids.add(provider_id)
+            entry.in_use += 1
+        return entry
+
+    def _checkin(self, entry: _PooledClient) -> bool:
+        with self._lock:
+            entry.in_use -= 1
+            return entry.retired and entry.in_use == 0
+
+    @asynccontextmanager
+    async def use(self, config: dict):
+        await self._close_retired()
+        entry = self._checkout(config)
+        try:
+            yield entry.client
+        finally:
+            if self._checkin(entry):
+                await _close_client(entry.client)
+
+    def retire(self, provider_id: str | None = None) -> int:
+        """Stop handing out the provider's clients (every client when provider_id is None)."""
+        with self._lock:
+            keys = [
+                key
+                for key, entry in self._entries.items()
+                if provider_id is None or provider_id in entry.provider_ids
+            ]
+            for key in keys:
+                entry = self._entries.pop(key)
+                entry.retired = True
+                if entry.in_use == 0:
+                    self._closable.append(entry)
+            self.retired_count += len(keys)
+        return len(keys)
+
+    async def _close_retired(self) -> None:
+        with self._lock:
+            closable, self._closable = self._closable, []
+        for entry in closable:
+            await _close_client(entry.client)
+
+    async def aclose(self) -> None:
+        self.retire()
+        await self._close_retired()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "client_count": len(self._entries),
+                "in_use_count": sum(entry.in_use for entry in self._entries.values()),
+                "created_count": self.created_count,
+                "reused_count": self.reused_count,
+                "retired_count": self.retired_count,
+            }
+
+
 class ManagedLLM:
+    def __init__(self):
+        self._clients = LLMClientRegistry(lambda config: self._client_for_config(config))
+        self._rate_limiters = LLMRateLimiters()
+        self._router = llm_router
+        self._completion_cache = llm_completion_cache
+        from database import add_llm_config_change_listener
+
+        add_llm_config_change_listener(lambda event: self._clients.retire(event.get("provider_id")))
+
     def _get_active_config(self) -> dict | None:
         from database import get_active_llm_config
 
         return get_active_llm_config()
 
+    def _routed_configs(self, request_type: str) -> list[dict]:
+        if not self._router.pooled:
+            return []
+        from database import list_enabled_llm_configs
+
+        return self._router.candidates(request_type, list_enabled_llm_configs())
+
     def is_configured(self) -> bool:
         try:
+            if self._routed_configs("analysis"):
+                return True
             config = self._get_active_config()
         except Exception as exc:
             logger.warning("LLM 配置读取失败: %s", exc)
@@ -398,8 +594,30 @@ class ManagedLLM:
         return AsyncOpenAI(
             api_key=config.get("api_key") or MISSING_API_KEY_PLACEHOLDER,
             base_url=config.get("base_url"),
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=LLM_MAX_CONNECTIONS,
+                    max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=LLM_KEEPALIVE_EXPIRY_SECONDS,
+                ),
+            ),
         )
 
+    def client_stats(self) -> dict:
+        return self._clients.stats()
+
+    def rate_limit_stats(self) -> list[dict]:
+        return self._rate_limiters.stats()
+
+    def routing_stats(self) -> dict:
+        return self._router.stats()
+
+    def completion_cache_stats(self) -> dict:
+        return self._completion_cache.stats()
+
+    async def aclose(self) -> None:
+        await self._clients.aclose()
+
     def _default_parameters(self, config: dict) -> dict:
         params = config.get("default_parameters") or {}
         return dict(params) if isinstance(params, dict) else {}
@@ -414,64 +632,143 @@ class ManagedLLM:
             raise RuntimeError("LLM base URL is not configured")
         return config
 
+    def _candidate_configs(self, request_type: str) -> list[dict]:
+        """Providers to try in order: the routing pool, or just the active provider."""
+        candidates = self._routed_configs(request_type)
+        if candidates:
+            return candidates
+        if self._router.pooled:
+            logger.warning("LLM 路由 %s 没有可用供应商，使用当前激活的供应商", request_type)
+        return [self._require_config()]
+
     def _parameters(self, config: dict, overrides: dict) -> dict:
         params = self._default_parameters(config)
         params.update(overrides)
         return params
 
-    async def get_response(self, prompt: str, **kwargs) -> str:
-        config = self._require_config()
-        client = self._client_for_config(config)
-        params = self._parameters(config, kwargs)
-        request_type = _pop_usage_context(params, "analysis")
+    def _call_parameters(self, config: dict, overrides: dict) -> dict:
+        params = self._parameters(config, overrides)
         params.setdefault("temperature", 1.0)
+        return params
 
-        async def _call():
+    def _cache_keys(self, candidates: list[dict], messages: list, overrides: dict, request_type: str) -> list[str | None]:
+        if not self._completion_cache.enabled_for(request_type):
+            return [None] * len(candidates)
+        return [
+            completion_cache_key(messages, config["model_name"], self._call_parameters(config, overrides))
+            for config in candidates
+        ]
+
+    async def _cached_completion(self, cache_keys: list[str | None]) -> str | None:
+        keys = [key for key in cache_keys if key]
+        if not keys:
+            return None
+        entry = await self._completion_cache.lookup(keys)
+        return entry["response"] if entry else None
+
+    async def _create_completion(
+        self,
+        config: dict,
+        client: AsyncOpenAI,
+        messages: list,
+        params: dict,
+        request_type: str,
+        cache_key: str | None = None,
+    ) -> str:
+        limiter = self._rate_limiters.for_config(config)
+        async with limiter.lease(estimate_request_tokens(messages, params)) as lease:
             response = await client.chat.completions.create(
                 model=config["model_name"],
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant for academic research."},
-                    {"role": "user", "content": prompt + "\n\n" + PAPER_ANALYSIS_PROMPT},
-                ],
+                messages=messages,
                 **params,
             )
-            _record_llm_usage(
-                _response_usage(response),
-                provider_id=str(config.get("id")) if config.get("id") else None,
-                provider_key=config.get("provider_key"),
-                provider_name=config.get("name"),
-                model_name=_response_model(response, config["model_name"]),
-                request_type=request_type,
-            )
-            return response.choices[0].message.content
-
-        return await retry_on_error(_call)
-
-    async def get_response_stream_events(self, prompt: str, **kwargs):
-        config = self._require_config()
-        client = self._client_for_config(config)
-        params = self._parameters(config, kwargs)
-        request_type = _pop_usage_context(params, "analysis_stream")
-        params.setdefault("temperature", 1.0)
-        response = await _create_streaming_completion(
-            client,
-            {
-                "model": config["model_name"],
-                "stream": True,
-                "messages": [
-                    {"role": "system", "content": "You are a helpful assistant for academic research."},
-                    {"role": "user", "content": prompt + "\n\n" + PAPER_ANALYSIS_PROMPT},
-                ],
-                **params,
-            },
+            usage = _response_usage(response)
+            lease.record_usage(_usage_total_tokens(usage))
+        model_name = _response_model(response, config["model_name"])
+        _record_llm_usage(
+            usage,
+            provider_id=str(config.get("id")) if config.get("id") else None,
+            provider_key=config.get("provider_key"),
+            provider_name=config.get("name"),
+            model_name=model_name,
+            request_type=request_type,
         )
-        usage = None
-        model_name = config["model_name"]
-        async for chunk in response:
-            usage = _response_usage(chunk) or usage
-            model_name = _response_model(chunk, model_name)
-            for stream_chunk in iter_llm_stream_chunks(chunk):
-                yield stream_chunk
+        content = response.choices[0].message.content
+        if cache_key and content:
+            await self._completion_cache.store(
+                cache_key, request_type, config, model_name, content, _usage_total_tokens(usage)
+            )
+        return content
+
+    async def _complete(self, messages: list, kwargs: dict, default_request_type: str, default_priority_class: str) -> str:
+        overrides = dict(kwargs)
+        request_type = _pop_usage_context(overrides, default_request_type)
+        priority_class = _pop_priority_class(overrides, default_priority_class)
+        candidates = self._candidate_configs(request_type)
+        cache_keys = self._cache_keys(candidates, messages, overrides, request_type)
+        cached = await self._cached_completion(cache_keys)
+        if cached is not None:
+            return cached
+
+        async def attempt() -> str:
+            for index, (config, cache_key) in enumerate(zip(candidates, cache_keys)):
+                is_last = index == len(candidates) - 1
+                params = self._call_parameters(config, overrides)
+                limiter = self._rate_limiters.for_config(config)
+                started_at = time.monotonic()
+                try:
+                    async with self._clients.use(config) as client:
+                        output = await retry_on_error(
+                            lambda: self._create_completion(config, client, messages, params, request_type, cache_key),
+                            # Retry in place only when there is nowhere left to fail over to.
+                            max_retries=3 if is_last else 1,
+                            on_rate_limited=limiter.penalize,
+                        )
+                except Exception as exc:
+                    if not is_transient_llm_error(exc):
+                        raise
+                    self._router.record_failure(config, exc, failing_over=not is_last)
+                    if is_last:
+                        raise
+                    continue
+                self._router.record_success(config, time.monotonic() - started_at)
+                return output
+            raise RuntimeError("LLM provider is not configured")
+
+        return await llm_scheduler.run(priority_class, attempt)
+
+    async def _stream_from(self, attempt: _StreamAttempt, messages: list, overrides: dict, request_type: str):
+        config = attempt.config
+        params = self._call_parameters(config, overrides)
+        limiter = self._rate_limiters.for_config(config)
+        content_parts: list[str] = []
+        async with (
+            self._clients.use(config) as client,
+            limiter.lease(estimate_request_tokens(messages, params)) as lease,
+        ):
+            try:
+                response = await _create_streaming_completion(
+                    client,
+                    {
+                        "model": config["model_name"],
+                        "stream": True,
+                        "messages": messages,
+                        **params,
+                    },
+                )
+            except RateLimitError as exc:
+                limiter.penalize(retry_after_seconds(exc))
+                raise
+            usage = None
+            model_name = config["model_name"]
+            async for chunk in response:
+                usage = _response_usage(chunk) or usage
+                model_name = _response_model(chunk, model_name)
+                for stream_chunk in iter_llm_stream_chunks(chunk):
+                    if stream_chunk.kind == "content":
+                        content_parts.append(stream_chunk.content)
+                    yield stream_chunk
+            lease.record_usage(_usage_total_tokens(usage))
         _record_llm_usage(
             usage,
             provider_id=str(config.get("id")) if config.get("id") else None,
@@ -479,68 +776,149 @@ class ManagedLLM:
             provider_name=config.get("name"),
             model_name=model_name,
             request_type=request_type,
+            hedged=attempt.hedged,
+            metadata={"hedge": "won"} if attempt.hedged else None,
+        )
+        if attempt.cache_key and content_parts:
+            await self._completion_cache.store(
+                attempt.cache_key,
+                request_type,
+                config,
+                model_name,
+                "".join(content_parts),
+                _usage_total_tokens(usage),
+            )
+
+    def _begin_stream(
+        self,
+        config: dict,
+        cache_key: str | None,
+        messages: list,
+        overrides: dict,
+        request_type: str,
+    ) -> _StreamAttempt:
+        attempt = _StreamAttempt(config, cache_key=cache_key)
+        attempt.stream = self._stream_from(attempt, messages, overrides, request_type)
+        attempt.first = asyncio.ensure_future(_next_stream_chunk(attempt.stream))
+        return attempt
+
+    async def _cancel_stream(self, attempt: _StreamAttempt, messages: list, request_type: str) -> None:
+        attempt.first.cancel()
+        with suppress(BaseException):
+            await attempt.first
+        await attempt.stream.aclose()
+        if not attempt.hedged:
+            return
+        # The losing provider never reports usage; bill its prompt as an estimate.
+        config = attempt.config
+        _record_llm_usage(
+            {"prompt_tokens": estimate_request_tokens(messages, {})},
+            provider_id=str(config.get("id")) if config.get("id") else None,
+            provider_key=config.get("provider_key"),
+            provider_name=config.get("name"),
+            model_name=config["model_name"],
+            request_type=request_type,
+            hedged=True,
+            metadata={"hedge": "cancelled", "estimated": True},
         )
 
+    async def _start_stream(
+        self,
+        candidates: list[dict],
+        cache_keys: list[str | None],
+        messages: list,
+        overrides: dict,
+        request_type: str,
+        hedge: bool,
+    ) -> _StreamAttempt:
+        """Return the first attempt that produced output, failing over and optionally hedging slow starts."""
+        pending = list(zip(candidates, cache_keys))
+        racing: list[_StreamAttempt] = []
+        try:
+            while True:
+                if not racing:
+                    racing.append(self._begin_stream(*pending.pop(0), messages, overrides, request_type))
+                hedge_delay = self._router.hedge_delay(racing[0].config) if hedge and pending and len(racing) == 1 else None
+                done, _ = await asyncio.wait(
+                    [attempt.first for attempt in racing],
+                    timeout=hedge_delay,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    secondary = self._begin_stream(*pending.pop(0), messages, overrides, request_type)
+                    secondary.is_hedge = True
+                    self._router.record_hedge(racing[0].config, secondary.config)
+                    racing.append(secondary)
+                    for attempt in racing:
+                        attempt.hedged = True
+                    continue
+
+                for attempt in [attempt for attempt in racing if attempt.first in done]:
+                    racing.remove(attempt)
+                    error = attempt.first.exception()
+                    if error is None or isinstance(error, StopAsyncIteration):
+                        self._router.record_success(
+                            attempt.config,
+                            time.monotonic() - attempt.started_at,
+                            first_token=True,
+                        )
+                        if attempt.hedged:
+                            self._router.record_hedge_winner(secondary_won=attempt.is_hedge)
+                        return attempt
+                    await attempt.stream.aclose()
+                    can_fail_over = is_transient_llm_error(error) and bool(pending or racing)
+                    if is_transient_llm_error(error):
+                        self._router.record_failure(attempt.config, error, failing_over=can_fail_over)
+                    if not can_fail_over:
+                        raise error
+        finally:
+            for attempt in racing:
+                await self._cancel_stream(attempt, messages, request_type)
+
+    async def _stream_events(self, messages: list, kwargs: dict, default_request_type: str):
+        overrides = dict(kwargs)
+        request_type = _pop_usage_context(overrides, default_request_type)
+        priority_class = _pop_priority_class(overrides, "interactive")
+        hedge = _pop_hedge(overrides, self._router.hedge_streams)
+        candidates = self._candidate_configs(request_type)
+        cache_keys = self._cache_keys(candidates, messages, overrides, request_type)
+        cached = await self._cached_completion(cache_keys)
+        if cached is not None:
+            yield LLMStreamChunk(kind="content", content=cached)
+            return
+        async with llm_scheduler.slot(priority_class):
+            attempt = await self._start_stream(candidates, cache_keys, messages, overrides, request_type, hedge)
+            async with aclosing(attempt.stream) as stream:
+                if attempt.first.exception() is not None:
+                    return
+                try:
+                    yield attempt.first.result()
+                    async for stream_chunk in stream:
+                        yield stream_chunk
+                except Exception as exc:
+                    # Once text has reached the caller the stream cannot switch providers.
+                    if is_transient_llm_error(exc):
+                        self._router.record_failure(attempt.config, exc, failing_over=False)
+                    raise
+
+    async def get_response(self, prompt: str, **kwargs) -> str:
+        return await self._complete(analysis_messages(prompt), kwargs, "analysis", "backlog")
+
+    async def get_response_stream_events(self, prompt: str, **kwargs):
+        async for stream_chunk in self._stream_events(analysis_messages(prompt), kwargs, "analysis_stream"):
+            yield stream_chunk
+
     async def get_response_stream(self, prompt: str, **kwargs):
         async for stream_chunk in self.get_response_stream_events(prompt, **kwargs):
             if stream_chunk.kind == "content":
                 yield stream_chunk.content
 
     async def chat(self, messages: list, **kwargs) -> str:
-        config = self._require_config()
-        client = self._client_for_config(config)
-        params = self._parameters(config, kwargs)
-        request_type = _pop_usage_context(params, "chat")
-        params.setdefault("temperature", 1.0)
-
-        async def _call():
-            response = await client.chat.completions.create(
-                model=config["model_name"],
-                messages=messages,
-                **params,
-            )
-            _record_llm_usage(
-                _response_usage(response),
-                provider_id=str(config.get("id")) if config.get("id") else None,
-                provider_key=config.get("provider_key"),
-                provider_name=config.get("name"),
-                model_name=_response_model(response, config["model_name"]),
-                request_type=request_type,
-            )
-            return response.choices[0].message.content
-
-        return await retry_on_error(_call)
+        return await self._complete(messages, kwargs, "chat", "interactive")
 
     async def chat_stream_events(self, messages: list, **kwargs):
-        config = self._require_config()
-        client = self._client_for_config(config)
-        params = self._parameters(config, kwargs)
-        request_type = _pop_usage_context(params, "chat_stream")
-        params.setdefault("temperature", 1.0)
-        response = await _create_streaming_completion(
-            client,
-            {
-                "model": config["model_name"],
-                "stream": True,
-                "messages": messages,
-                **params,
-            },
-        )
-        usage = None
-        model_name = config["model_name"]
-        async for chunk in response:
-            usage = _response_usage(chunk) or usage
-            model_name = _response_model(chunk, model_name)
-            for stream_chunk in iter_llm_stream_chunks(chunk):
-                yield stream_chunk
-        _record_llm_usage(
-            usage,
-            provider_id=str(config.get("id")) if config.get("id") else None,
-            provider_key=config.get("provider_key"),
-            provider_name=config.get("name"),
-            model_name=model_name,
-            request_type=request_type,
-        )
+        async for stream_chunk in self._stream_events(messages, kwargs, "chat_stream"):
+            yield stream_chunk
 
     async def chat_stream(self, messages: list, **kwargs):
         async for stream_chunk in self.chat_stream_events(messages, **kwargs):
@@ -549,41 +927,30 @@ class ManagedLLM:
 
     async def test_one_token(self) -> dict:
         config = self._require_config()
-        client = self._client_for_config(config)
         messages = [{"role": "user", "content": "Output exactly one digit."}]
-        base_params = self._default_parameters(config)
-
-        async def _call(params: dict):
-            response = await client.chat.completions.create(
-                model=config["model_name"],
-                temperature=0,
-                messages=messages,
-                **params,
-            )
-            _record_llm_usage(
-                _response_usage(response),
-                provider_id=str(config.get("id")) if config.get("id") else None,
-                provider_key=config.get("provider_key"),
-                provider_name=config.get("name"),
-                model_name=_response_model(response, config["model_name"]),
-                request_type="admin_test",
-            )
-            return response.choices[0].message.content or ""
-
-        try:
-            params = {**base_params, "max_tokens": 1}
-            params.pop("max_completion_tokens", None)
-            output = await retry_on_error(lambda: _call(params), max_retries=1)
-        except Exception:
-            params = {**base_params, "max_completion_tokens": 1}
-            params.pop("max_tokens", None)
-            output = await retry_on_error(lambda: _call(params), max_retries=1)
+        base_params = {**self._default_parameters(config), "temperature": 0}
+
+        async with self._clients.use(config) as client:
+            try:
+                params = {**base_params, "max_tokens": 1}
+                params.pop("max_completion_tokens", None)
+                output = await retry_on_error(
+                    lambda: self._create_completion(config, client, messages, params, "admin_test"),
+                    max_retries=1,
+                )
+            except Exception:
+                params = {**base_params, "max_completion_tokens": 1}
+                params.pop("max_tokens", None)
+                output = await retry_on_error(
+                    lambda: self._create_completion(config, client, messages, params, "admin_test"),
+                    max_retries=1,
+                )
 
         return {
             "provider_id": str(config["id"]),
             "provider_name": config["name"],
             "model_name": config["model_name"],
-            "output": output,
+            "output": output or "",
         }
 
 
@@ -0,0 +1,101 @@
+import asyncio
+import hashlib
+import json
+import logging
+
+from config import LlmCompletionCacheConfig, settings
+
+logger = logging.getLogger(__name__)
+
+# Expired and over-limit entries are pruned after this many stores per process.
+PRUNE_EVERY_STORES = 100
+
+
+def completion_cache_key(messages: list, model_name: str, params: dict) -> str:
+    """SHA-256 over the full message list, model name and sampling parameters."""
+    payload = json.dumps(
+        {"model": model_name, "messages": messages, "params": params},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCompletionCache:
+    """Read-through completion cache backed by the llm_completion_cache table.
+
+    Cache failures never fail the LLM call: lookups fall back to a miss and
+    stores are dropped with a warning.
+    """
+
+    def __init__(self, cache_settings: LlmCompletionCacheConfig):
+        self.hit_count = 0
+        self.miss_count = 0
+        self._stores_since_prune = 0
+        self.configure(cache_settings)
+
+    def configure(self, cache_settings: LlmCompletionCacheConfig) -> None:
+        self.enabled = cache_settings.enabled
+        self.request_types = frozenset(cache_settings.request_types)
+        self.ttl_seconds = cache_settings.ttl_seconds
+        self.max_entries = cache_settings.max_entries
+        self.max_bytes = cache_settings.max_bytes
+
+    def enabled_for(self, request_type: str) -> bool:
+        return self.enabled and request_type in self.request_types
+
+    async def lookup(self, cache_keys: list[str]) -> dict | None:
+        from database import get_cached_llm_completion
+
+        try:
+            entry = await asyncio.to_thread(get_cached_llm_completion, cache_keys)
+        except Exception as exc:
+            logger.warning("LLM 响应缓存读取失败: %s", exc)
+            return None
+        if entry is None:
+            self.miss_count += 1
+        else:
+            self.hit_count += 1
+        return entry
+
+    async def store(
+        self,
+        cache_key: str,
+        request_type: str,
+        config: dict,
+        model_name: str,
+        response: str,
+        total_tokens: int | None,
+    ) -> None:
+        from database import prune_llm_completion_cache, store_llm_completion
+
+        try:
+            await asyncio.to_thread(
+                lambda: store_llm_completion(
+                    cache_key=cache_key,
+                    request_type=request_type,
+                    provider_key=config.get("provider_key"),
+                    model_name=model_name,
+                    response=response,
+                    total_tokens=total_tokens,
+                    ttl_seconds=self.ttl_seconds,
+                )
+            )
+            self._stores_since_prune += 1
+            if self._stores_since_prune >= PRUNE_EVERY_STORES:
+                self._stores_since_prune = 0
+                await asyncio.to_thread(prune_llm_completion_cache, self.max_entries, self.max_bytes)
+        except Exception as exc:
+            logger.warning("LLM 响应缓存写入失败: %s", exc)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "request_types": sorted(self.request_types),
+            "hit_count": self.hit_count,
+            "miss_count": self.miss_count,
+        }
+
+
+llm_completion_cache = LLMCompletionCache(settings.llm_completion_cache)
@@ -0,0 +1,238 @@
+import asyncio
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on how long one Retry-After header may pause a provider.
+MAX_RETRY_AFTER_SECONDS = 120.0
+# Rough prompt size when the provider does not tell us: ~4 characters per token.
+CHARS_PER_TOKEN = 4
+
+
+@dataclass(frozen=True)
+class ProviderLimits:
+    requests_per_minute: int | None = None
+    tokens_per_minute: int | None = None
+    max_concurrency: int | None = None
+
+    @classmethod
+    def from_config(cls, config: dict) -> "ProviderLimits":
+        return cls(
+            requests_per_minute=_positive_int(config.get("requests_per_minute")),
+            tokens_per_minute=_positive_int(config.get("tokens_per_minute")),
+            max_concurrency=_positive_int(config.get("max_concurrency")),
+        )
+
+
+def _positive_int(value: object) -> int | None:
+    try:
+        parsed = int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed and parsed > 0 else None
+
+
+def estimate_request_tokens(messages: list[dict], params: dict) -> int:
+    """Tokens to reserve up front: prompt size estimate plus the requested completion budget."""
+    prompt_chars = sum(len(message.get("content") or "") for message in messages if isinstance(message, dict))
+    completion_budget = _positive_int(params.get("max_completion_tokens") or params.get("max_tokens")) or 0
+    return max(prompt_chars // CHARS_PER_TOKEN, 1) + completion_budget
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    """Read Retry-After / retry-after-ms from a provider error response."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        with suppress(ValueError):
+            return min(max(float(retry_after_ms) / 1000, 0.0), MAX_RETRY_AFTER_SECONDS)
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        seconds = float(retry_after)
+    except ValueError:
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        seconds = (retry_at - datetime.now(timezone.utc)).total_seconds()
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER_SECONDS)
+
+
+class _TokenBucket:
+    def __init__(self, per_minute: int, now: float):
+        self.capacity = float(per_minute)
+        self.level = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated_at = now
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def wait_seconds(self, amount: float) -> float:
+        # A single request larger than the bucket may proceed once it is full.
+        deficit = min(amount, self.capacity) - self.level
+        return max(deficit / self.rate, 0.0)
+
+
+class RateLimitLease:
+    def __init__(self, reserved_tokens: int):
+        self.reserved_tokens = reserved_tokens
+        self.actual_tokens: int | None = None
+
+    def record_usage(self, total_tokens: int | None) -> None:
+        if total_tokens:
+            self.actual_tokens = total_tokens
+
+
+class ProviderRateLimiter:
+    """Token buckets (requests and tokens per minute) plus a concurrency cap for one provider.
+
+    Callers queue FIFO behind a lock; the caller at the head sleeps until the
+    buckets and the concurrency cap admit it. Reserved tokens are reconciled
+    with the real usage when the call finishes.
+    """
+
+    def __init__(self, name: str, limits: ProviderLimits, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.limits = limits
+        self._clock = clock
+        now = clock()
+        self._requests = _TokenBucket(limits.requests_per_minute, now) if limits.requests_per_minute else None
+        self._tokens = _TokenBucket(limits.tokens_per_minute, now) if limits.tokens_per_minute else None
+        self._lock = asyncio.Lock()
+        self._released = asyncio.Event()
+        self.blocked_until = 0.0
+        self.in_flight = 0
+        self.waiting = 0
+        self.acquired_count = 0
+        self.delayed_count = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.throttled_count = 0
+
+    def _admission_delay(self, now: float, tokens: int) -> float:
+        delay = self.blocked_until - now
+        if self._requests is not None:
+            self._requests.refill(now)
+            delay = max(delay, self._requests.wait_seconds(1))
+        if self._tokens is not None:
+            self._tokens.refill(now)
+            delay = max(delay, self._tokens.wait_seconds(tokens))
+        return max(delay, 0.0)
+
+    def _concurrency_full(self) -> bool:
+        return bool(self.limits.max_concurrency and self.in_flight >= self.limits.max_concurrency)
+
+    async def _acquire(self, tokens: int) -> None:
+        started_at = self._clock()
+        self.waiting += 1
+        try:
+            async with self._lock:
+                while True:
+                    delay = self._admission_delay(self._clock(), tokens)
+                    if self._concurrency_full():
+                        released = self._released
+                        with suppress(asyncio.TimeoutError):
+                            await asyncio.wait_for(released.wait(), timeout=delay or None)
+                        continue
+                    if delay <= 0:
+                        break
+                    await asyncio.sleep(delay)
+                if self._requests is not None:
+                    self._requests.level -= 1
+                if self._tokens is not None:
+                    self._tokens.level -= tokens
+                self.in_flight += 1
+        finally:
+            self.waiting -= 1
+
+        waited = self._clock() - started_at
+        self.acquired_count += 1
+        if waited > 0.001:
+            self.delayed_count += 1
+            self.total_wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def _release(self, lease: RateLimitLease) -> None:
+        self.in_flight -= 1
+        if self._tokens is not None and lease.actual_tokens is not None:
+            # Refund an overestimate or charge the overrun (the bucket may go negative).
+            self._tokens.level = min(
+                self._tokens.capacity,
+                self._tokens.level + lease.reserved_tokens - lease.actual_tokens,
+            )
+        released, self._released = self._released, asyncio.Event()
+        released.set()
+
+    @asynccontextmanager
+    async def lease(self, estimated_tokens: int):
+        await self._acquire(estimated_tokens)
+        lease = RateLimitLease(estimated_tokens)
+        try:
+            yield lease
+        finally:
+            self._release(lease)
+
+    def penalize(self, retry_after: float | None) -> None:
+        """The provider answered 429: pause every caller for Retry-After seconds."""
+        self.throttled_count += 1
+        if retry_after:
+            self.blocked_until = max(self.blocked_until, self._clock() + retry_after)
+            logger.warning("LLM 供应商 %s 限流，暂停 %.1f 秒", self.name, retry_after)
+
+    def stats(self) -> dict:
+        now = self._clock()
+        return {
+            "provider": self.name,
+            "requests_per_minute": self.limits.requests_per_minute,
+            "tokens_per_minute": self.limits.tokens_per_minute,
+            "max_concurrency": self.limits.max_concurrency,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "acquired_count": self.acquired_count,
+            "delayed_count": self.delayed_count,
+            "throttled_count": self.throttled_count,
+            "avg_wait_seconds": round(self.total_wait_seconds / self.acquired_count, 3) if self.acquired_count else 0.0,
+            "max_wait_seconds": round(self.max_wait_seconds, 3),
+            "blocked_seconds": round(max(self.blocked_until - now, 0.0), 3),
+        }
+
+
+class LLMRateLimiters:
+    """One limiter per provider; rebuilt when the provider's limits change."""
+
+    def __init__(self):
+        self._limiters: dict[str, ProviderRateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def for_config(self, config: dict[str, Any]) -> ProviderRateLimiter:
+        key = str(config.get("id") or config.get("base_url") or "default")
+        limits = ProviderLimits.from_config(config)
+        with self._lock:
+            limiter = self._limiters.get(key)
+            if limiter is None or limiter.limits != limits:
+                limiter = ProviderRateLimiter(str(config.get("name") or key), limits)
+                self._limiters[key] = limiter
+            return limiter
+
+    def stats(self) -> list[dict]:
+        with self._lock:
+            limiters = list(self._limiters.values())
+        return [limiter.stats() for limiter in limiters]
@@ -0,0 +1,236 @@
+import logging
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable
+
+from config import LlmRouteConfig, LlmRoutingConfig, settings
+
+logger = logging.getLogger(__name__)
+
+ROUTING_MODES = ("active", "pool")
+DEFAULT_ROUTE_KEY = "default"
+# Smoothing factor of the latency and error-rate moving averages.
+HEALTH_EWMA_ALPHA = 0.2
+# A route with a bad recent error rate still keeps a trickle of traffic so it can recover.
+MIN_HEALTH_FACTOR = 0.05
+# Hedge delay percentile over recent time-to-first-token samples of a route.
+HEDGE_PERCENTILE = 0.95
+HEDGE_MIN_SAMPLES = 20
+FIRST_TOKEN_SAMPLE_SIZE = 200
+
+
+@dataclass
+class RouteHealth:
+    provider_key: str
+    model_name: str
+    latency_ewma: float | None = None
+    error_rate: float = 0.0
+    consecutive_failures: int = 0
+    open_until: float = 0.0
+    success_count: int = 0
+    failure_count: int = 0
+    first_token_samples: deque[float] = field(default_factory=lambda: deque(maxlen=FIRST_TOKEN_SAMPLE_SIZE))
+
+    def record_success(self, latency_seconds: float, first_token: bool = False) -> None:
+        if first_token:
+            self.first_token_samples.append(latency_seconds)
+        self.success_count += 1
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.error_rate *= 1 - HEALTH_EWMA_ALPHA
+        if self.latency_ewma is None:
+            self.latency_ewma = latency_seconds
+        else:
+            self.latency_ewma += HEALTH_EWMA_ALPHA * (latency_seconds - self.latency_ewma)
+
+    def record_failure(self, now: float, failure_threshold: int, cooldown_seconds: int) -> bool:
+        """Returns True when this failure takes the route out of rotation."""
+        self.failure_count += 1
+        self.consecutive_failures += 1
+        self.error_rate += HEALTH_EWMA_ALPHA * (1 - self.error_rate)
+        if self.consecutive_failures >= max(failure_threshold, 1) and self.open_until <= now:
+            self.open_until = now + max(cooldown_seconds, 0)
+            return True
+        return False
+
+
+def _route_key(config: dict) -> tuple[str, str]:
+    return (
+        str(config.get("provider_key") or config.get("id") or config.get("name") or "default"),
+        str(config.get("model_name") or ""),
+    )
+
+
+class LLMRouter:
+    """Orders provider+model candidates for one LLM call.
+
+    In ``active`` mode every call goes to the provider marked active. In
+    ``pool`` mode the routes configured for the request type are tried by
+    priority; within one priority the order is a weighted shuffle scaled by
+    each route's recent error rate and latency. Routes that failed
+    ``failure_threshold`` times in a row sit out ``cooldown_seconds`` and are
+    only tried as a last resort.
+    """
+
+    def __init__(
+        self,
+        routing_settings: LlmRoutingConfig,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Callable[[], float] = random.random,
+    ):
+        self._clock = clock
+        self._rng = rng
+        self._health: dict[tuple[str, str], RouteHealth] = {}
+        self._lock = threading.Lock()
+        self.failover_count = 0
+        self.hedged_count = 0
+        self.hedge_secondary_wins = 0
+        self.configure(routing_settings)
+
+    def configure(self, routing_settings: LlmRoutingConfig) -> None:
+        self.mode = routing_settings.mode if routing_settings.mode in ROUTING_MODES else "active"
+        self.routes = dict(routing_settings.routes)
+        self.failure_threshold = routing_settings.failure_threshold
+        self.cooldown_seconds = routing_settings.cooldown_seconds
+        self.hedge_streams = routing_settings.hedge_streams
+        self.hedge_delay_ms = routing_settings.hedge_delay_ms
+        self.hedge_default_delay_ms = routing_settings.hedge_default_delay_ms
+
+    @property
+    def pooled(self) -> bool:
+        return self.mode == "pool" and bool(self.routes)
+
+    def routes_for(self, request_type: str) -> tuple[LlmRouteConfig, ...]:
+        for key in (request_type, request_type.removesuffix("_stream"), DEFAULT_ROUTE_KEY):
+            if key in self.routes:
+                return self.routes[key]
+        return ()
+
+    def candidates(self, request_type: str, providers: list[dict]) -> list[dict]:
+        """Call configs for ``request_type`` built from the enabled providers, best first."""
+        providers_by_key = {provider.get("provider_key"): provider for provider in providers}
+        entries = []
+        for route in self.routes_for(request_type):
+            provider = providers_by_key.get(route.provider)
+            if provider is None:
+                continue
+            model_name = route.model or provider.get("model_name")
+            if not (provider.get("api_key") and provider.get("base_url") and model_name):
+                continue
+            entries.append((route, {**provider, "model_name": model_name}))
+        return self._order(entries)
+
+    def _health_for(self, config: dict) -> RouteHealth:
+        key = _route_key(config)
+        health = self._health.get(key)
+        if health is None:
+            health = RouteHealth(provider_key=key[0], model_name=key[1])
+            self._health[key] = health
+        return health
+
+    def _order(self, entries: list[tuple[LlmRouteConfig, dict]]) -> list[dict]:
+        now = self._clock()
+        with self._lock:
+            scored = [(route, config, self._health_for(config)) for route, config in entries]
+        available = [item for item in scored if item[2].open_until <= now]
+        cooling = sorted((item for item in scored if item[2].open_until > now), key=lambda item: item[2].open_until)
+
+        latencies = [health.latency_ewma for _, _, health in available if health.latency_ewma]
+        fastest = min(latencies) if latencies else None
+        ordered: list[dict] = []
+        for priority in sorted({route.priority for route, _, _ in available}):
+            tier = []
+            for route, config, health in available:
+                if route.priority != priority:
+                    continue
+                weight = route.weight * max(1 - health.error_rate, MIN_HEALTH_FACTOR)
+                if fastest and health.latency_ewma:
+                    weight *= fastest / health.latency_ewma
+                # Weighted sampling without replacement; weight-0 routes are standbys.
+                sort_key = self._rng() ** (1 / weight) if weight > 0 else -1.0
+                tier.append((sort_key, config))
+            tier.sort(key=lambda item: item[0], reverse=True)
+            ordered.extend(config for _, config in tier)
+        ordered.extend(config for _, config, _ in cooling)
+        return ordered
+
+    def record_success(self, config: dict, latency_seconds: float, first_token: bool = False) -> None:
+        with self._lock:
+            self._health_for(config).record_success(latency_seconds, first_token)
+
+    def hedge_delay(self, config: dict) -> float:
+        """Seconds to wait for the first token from ``config`` before hedging to the next route."""
+        if self.hedge_delay_ms > 0:
+            return self.hedge_delay_ms / 1000
+        with self._lock:
+            samples = sorted(self._health_for(config).first_token_samples)
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return max(self.hedge_default_delay_ms, 0) / 1000
+        return samples[min(int(len(samples) * HEDGE_PERCENTILE), len(samples) - 1)]
+
+    def record_hedge(self, primary: dict, secondary: dict) -> None:
+        with self._lock:
+            self.hedged_count += 1
+        logger.info(
+            "LLM 路由 %s/%s 首个 token 超时，对冲请求 %s/%s",
+            *_route_key(primary),
+            *_route_key(secondary),
+        )
+
+    def record_hedge_winner(self, secondary_won: bool) -> None:
+        if secondary_won:
+            with self._lock:
+                self.hedge_secondary_wins += 1
+
+    def record_failure(self, config: dict, exc: BaseException, failing_over: bool) -> None:
+        with self._lock:
+            opened = self._health_for(config).record_failure(
+                self._clock(),
+                self.failure_threshold,
+                self.cooldown_seconds,
+            )
+            if failing_over:
+                self.failover_count += 1
+        provider_key, model_name = _route_key(config)
+        if opened:
+            logger.warning(
+                "LLM 路由 %s/%s 连续失败，暂停 %s 秒: %s",
+                provider_key,
+                model_name,
+                self.cooldown_seconds,
+                exc,
+            )
+        elif failing_over:
+            logger.warning("LLM 路由 %s/%s 调用失败，切换到下一个供应商: %s", provider_key, model_name, exc)
+
+    def stats(self) -> dict:
+        now = self._clock()
+        with self._lock:
+            routes = [
+                {
+                    "provider_key": health.provider_key,
+                    "model_name": health.model_name,
+                    "latency_ms": round(health.latency_ewma * 1000) if health.latency_ewma is not None else None,
+                    "error_rate": round(health.error_rate, 3),
+                    "consecutive_failures": health.consecutive_failures,
+                    "cooldown_seconds": round(max(health.open_until - now, 0.0), 1),
+                    "success_count": health.success_count,
+                    "failure_count": health.failure_count,
+                    "first_token_samples": len(health.first_token_samples),
+                }
+                for health in self._health.values()
+            ]
+        return {
+            "mode": self.mode,
+            "failover_count": self.failover_count,
+            "hedge_streams": self.hedge_streams,
+            "hedged_count": self.hedged_count,
+            "hedge_secondary_wins": self.hedge_secondary_wins,
+            "routes": routes,
+        }
+
+
+llm_router = LLMRouter(settings.llm_routing)
@@ -0,0 +1,170 @@
+import asyncio
+import logging
+from collections import deque
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, TypeVar
+
+from config import LlmSchedulerConfig, settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Highest priority first.
+LLM_PRIORITY_CLASSES = ("interactive", "feishu", "hf_daily", "backlog")
+PREEMPTIBLE_PRIORITY_CLASSES = frozenset({"backlog"})
+
+
+class LLMPreempted(Exception):
+    """Backlog work gave its LLM slot up to interactive demand."""
+
+
+@dataclass(eq=False)
+class _Grant:
+    priority_class: str
+    preempt_event: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+class LLMScheduler:
+    """Admission control for LLM calls shared by every caller in the process.
+
+    Each call waits for a slot: at most ``max_concurrency`` calls run at once
+    and each priority class has its own cap. Free slots go to the highest
+    waiting class first. When interactive requests are waiting and every slot
+    is taken, running backlog calls are preempted and re-queued by their
+    caller.
+    """
+
+    def __init__(self, scheduler_settings: LlmSchedulerConfig):
+        self._active: dict[str, set[_Grant]] = {name: set() for name in LLM_PRIORITY_CLASSES}
+        self._waiters: dict[str, deque[asyncio.Future]] = {name: deque() for name in LLM_PRIORITY_CLASSES}
+        self.preempted_count = 0
+        self.configure(scheduler_settings)
+
+    def configure(self, scheduler_settings: LlmSchedulerConfig) -> None:
+        self.max_concurrency = max(1, scheduler_settings.max_concurrency)
+        self.class_limits = {
+            "interactive": max(1, scheduler_settings.interactive_limit),
+            "feishu": max(1, scheduler_settings.feishu_limit),
+            "hf_daily": max(1, scheduler_settings.hf_daily_limit),
+            "backlog": max(1, scheduler_settings.backlog_limit),
+        }
+        self.preempt_backlog = scheduler_settings.preempt_backlog
+
+    @staticmethod
+    def normalize_priority_class(priority_class: str | None, default: str) -> str:
+        return priority_class if priority_class in LLM_PRIORITY_CLASSES else default
+
+    def _active_total(self) -> int:
+        return sum(len(grants) for grants in self._active.values())
+
+    def _dispatch(self) -> None:
+        for priority_class in LLM_PRIORITY_CLASSES:
+            waiters = self._waiters[priority_class]
+            while waiters:
+                if self._active_total() >= self.max_concurrency:
+                    return
+                if len(self._active[priority_class]) >= self.class_limits[priority_class]:
+                    break
+                waiter = waiters.popleft()
+                if waiter.done():
+                    continue
+                grant = _Grant(priority_class)
+                self._active[priority_class].add(grant)
+                waiter.set_result(grant)
+
+    def _preempt_for_interactive(self) -> None:
+        if not self.preempt_backlog or self._active_total() < self.max_concurrency:
+            return
+        if len(self._active["interactive"]) >= self.class_limits["interactive"]:
+            return
+        pending_preemptions = sum(
+            1
+            for priority_class in PREEMPTIBLE_PRIORITY_CLASSES
+            for grant in self._active[priority_class]
+            if grant.preempt_event.is_set()
+        )
+        if pending_preemptions >= len(self._waiters["interactive"]):
+            return
+        for priority_class in PREEMPTIBLE_PRIORITY_CLASSES:
+            for grant in self._active[priority_class]:
+                if not grant.preempt_event.is_set():
+                    grant.preempt_event.set()
+                    self.preempted_count += 1
+                    logger.info("交互请求等待 LLM 槽位，抢占一个 %s 任务", priority_class)
+                    return
+
+    async def _acquire(self, priority_class: str) -> _Grant:
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters[priority_class].append(waiter)
+        self._dispatch()
+        if priority_class == "interactive" and not waiter.done():
+            self._preempt_for_interactive()
+        try:
+            return await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self._release(waiter.result())
+            else:
+                with suppress(ValueError):
+                    self._waiters[priority_class].remove(waiter)
+            raise
+
+    def _release(self, grant: _Grant) -> None:
+        self._active[grant.priority_class].discard(grant)
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, priority_class: str):
+        """Hold a slot for the duration of the block (used for streams, never preempted)."""
+        grant = await self._acquire(priority_class)
+        try:
+            yield
+        finally:
+            self._release(grant)
+
+    async def run(self, priority_class: str, operation: Callable[[], Awaitable[T]]) -> T:
+        """Run ``operation`` in a slot; preemptible classes raise LLMPreempted when bumped."""
+        grant = await self._acquire(priority_class)
+        try:
+            if priority_class not in PREEMPTIBLE_PRIORITY_CLASSES:
+                return await operation()
+
+            work = asyncio.ensure_future(operation())
+            preempted = asyncio.ensure_future(grant.preempt_event.wait())
+            try:
+                await asyncio.wait({work, preempted}, return_when=asyncio.FIRST_COMPLETED)
+            except asyncio.CancelledError:
+                work.cancel()
+                preempted.cancel()
+                raise
+            if work.done():
+                preempted.cancel()
+                return work.result()
+            work.cancel()
+            with suppress(asyncio.CancelledError):
+                await work
+            raise LLMPreempted(f"{priority_class} LLM call preempted by interactive demand")
+        finally:
+            self._release(grant)
+
+    def status_snapshot(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "active_total": self._active_total(),
+            "preempt_backlog": self.preempt_backlog,
+            "preempted_count": self.preempted_count,
+            "classes": [
+                {
+                    "priority_class": priority_class,
+                    "limit": self.class_limits[priority_class],
+                    "active": len(self._active[priority_class]),
+                    "waiting": sum(1 for waiter in self._waiters[priority_class] if not waiter.done()),
+                }
+                for priority_class in LLM_PRIORITY_CLASSES
+            ],
+        }
+
+
+llm_scheduler = LLMScheduler(settings.llm_scheduler)
@@ -53,7 +53,17 @@ def build_open_in_ai_prompt(pdf_url: str) -> str:
     return OPEN_IN_AI_PROMPT_TEMPLATE.format(pdf_url=pdf_url)
 
 
-CHAT_SYSTEM_PROMPT = """你是一个学术论文助手，基于提供的论文内容和分析结果回答用户问题。请使用中文回答。
+# Leading messages shared by analysis, code-availability and chat calls for
+# one paper. Keep them byte-stable so provider-side prompt caches can reuse
+# the prefix.
+PAPER_SYSTEM_PROMPT = "You are a helpful assistant for academic research."
+PAPER_CONTEXT_ACK = "好的，我已了解这篇论文的内容。"
+
+CHAT_READY_REPLY = "好的，请问有什么问题？"
+
+# Sent as the first user turn after the shared prefix rather than as a system
+# message: the system message has to stay byte-identical to the analysis call.
+CHAT_TASK_PROMPT = """在接下来的对话中，请你作为学术论文助手，基于上面的论文内容和已有的分析结果回答我的问题。请使用中文回答。
 
 **输出格式要求：**
 - 使用 Markdown 格式
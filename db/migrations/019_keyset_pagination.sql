@@ -0,0 +1,235 @@
+-- Keyset pagination: the listing order (type priority, sort_order, title, id)
+-- is backed by an expression index so "rows after this cursor" is an index
+-- range scan instead of sorting and skipping every earlier row.
+CREATE OR REPLACE FUNCTION paper_list_priority(venue TEXT)
+RETURNS SMALLINT AS $$
+  SELECT CASE
+    WHEN venue ILIKE '%oral%' THEN 1
+    WHEN venue ILIKE '%spotlight%' THEN 2
+    WHEN venue ILIKE '%poster%' THEN 3
+    ELSE 4
+  END::SMALLINT
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+CREATE INDEX IF NOT EXISTS idx_papers_list_keyset
+ON papers(paper_list_priority(venue), COALESCE(sort_order, 2147483647), COALESCE(LOWER(title), ''), id);
+
+DROP FUNCTION IF EXISTS search_papers_optimized(TEXT, TEXT, BOOLEAN, BOOLEAN, BOOLEAN, TEXT, INT, INT);
+DROP FUNCTION IF EXISTS search_papers_optimized(
+  TEXT, TEXT, BOOLEAN, BOOLEAN, BOOLEAN, TEXT, INT, INT,
+  DOUBLE PRECISION, INT, INT, TEXT, TEXT
+);
+CREATE OR REPLACE FUNCTION search_papers_optimized(
+  search_term TEXT,
+  venue_prefix TEXT,
+  search_title BOOLEAN,
+  search_abstract BOOLEAN,
+  search_keywords BOOLEAN,
+  code_filter TEXT,
+  page_limit INT,
+  page_offset INT,
+  after_rank_score DOUBLE PRECISION DEFAULT NULL,
+  after_priority INT DEFAULT NULL,
+  after_sort_order INT DEFAULT NULL,
+  after_title TEXT DEFAULT NULL,
+  after_id TEXT DEFAULT NULL
+)
+RETURNS TABLE(
+  id TEXT,
+  title TEXT,
+  abstract TEXT,
+  venue TEXT,
+  primary_area TEXT,
+  llm_response TEXT,
+  created_at TIMESTAMPTZ,
+  code_status TEXT,
+  code_url TEXT,
+  code_evidence TEXT,
+  code_checked_at TIMESTAMPTZ,
+  sort_priority INT,
+  sort_order_key INT,
+  sort_title TEXT,
+  rank_score DOUBLE PRECISION
+) AS $$
+DECLARE
+  normalized_search_term TEXT;
+  normalized_code_filter TEXT;
+  query_text tsquery;
+BEGIN
+  normalized_search_term := NULLIF(BTRIM(search_term), '');
+  normalized_code_filter := COALESCE(NULLIF(BTRIM(code_filter), ''), 'all');
+
+  IF normalized_search_term IS NULL THEN
+    RETURN QUERY
+    SELECT
+      p.id,
+      p.title,
+      p.abstract,
+      p.venue,
+      p.primary_area,
+      p.llm_response,
+      p.created_at,
+      p.code_status,
+      p.code_url,
+      p.code_evidence,
+      p.code_checked_at,
+      paper_list_priority(p.venue)::INT,
+      COALESCE(p.sort_order, 2147483647),
+      COALESCE(LOWER(p.title), ''),
+      NULL::DOUBLE PRECISION
+    FROM papers p
+    WHERE
+      (venue_prefix IS NULL OR venue_prefix = '' OR p.venue ILIKE venue_prefix || '%')
+      AND (
+        normalized_code_filter = 'all'
+        OR (normalized_code_filter = 'open_source' AND p.code_status = 'open_source')
+        OR (normalized_code_filter = 'not_open_source' AND COALESCE(p.code_status, 'unknown') <> 'open_source')
+        OR p.code_status = normalized_code_filter
+      )
+      AND (
+        after_id IS NULL
+        OR (
+          paper_list_priority(p.venue),
+          COALESCE(p.sort_order, 2147483647),
+          COALESCE(LOWER(p.title), ''),
+          p.id
+        ) > (after_priority::SMALLINT, after_sort_order, after_title, after_id)
+      )
+    ORDER BY
+      paper_list_priority(p.venue) ASC,
+      COALESCE(p.sort_order, 2147483647) ASC,
+      COALESCE(LOWER(p.title), '') ASC,
+      p.id ASC
+    LIMIT page_limit OFFSET page_offset;
+
+    RETURN;
+  END IF;
+
+  query_text := websearch_to_tsquery('english', normalized_search_term);
+
+  RETURN QUERY
+  WITH title_matches AS (
+    SELECT
+      p.id,
+      ts_rank(to_tsvector('english', COALESCE(p.title, '')), query_text)::DOUBLE PRECISION * 1.0 AS rank_score
+    FROM papers p
+    WHERE
+      search_title
+      AND (venue_prefix IS NULL OR venue_prefix = '' OR p.venue ILIKE venue_prefix || '%')
+      AND (
+        normalized_code_filter = 'all'
+        OR (normalized_code_filter = 'open_source' AND p.code_status = 'open_source')
+        OR (normalized_code_filter = 'not_open_source' AND COALESCE(p.code_status, 'unknown') <> 'open_source')
+        OR p.code_status = normalized_code_filter
+      )
+      AND to_tsvector('english', COALESCE(p.title, '')) @@ query_text
+  ),
+  keyword_matches AS (
+    SELECT
+      k.paper_id AS id,
+      MAX(ts_rank(to_tsvector('english', COALESCE(k.keyword, '')), query_text)::DOUBLE PRECISION * 0.55) AS rank_score
+    FROM keywords k
+    JOIN papers p ON p.id = k.paper_id
+    WHERE
+      search_keywords
+      AND (venue_prefix IS NULL OR venue_prefix = '' OR p.venue ILIKE venue_prefix || '%')
+      AND (
+        normalized_code_filter = 'all'
+        OR (normalized_code_filter = 'open_source' AND p.code_status = 'open_source')
+        OR (normalized_code_filter = 'not_open_source' AND COALESCE(p.code_status, 'unknown') <> 'open_source')
+        OR p.code_status = normalized_code_filter
+      )
+      AND to_tsvector('english', COALESCE(k.keyword, '')) @@ query_text
+    GROUP BY k.paper_id
+  ),
+  abstract_matches AS (
+    SELECT
+      p.id,
+      ts_rank(to_tsvector('english', COALESCE(p.abstract, '')), query_text)::DOUBLE PRECISION * 0.35 AS rank_score
+    FROM papers p
+    WHERE
+      search_abstract
+      AND (venue_prefix IS NULL OR venue_prefix = '' OR p.venue ILIKE venue_prefix || '%')
+      AND (
+        normalized_code_filter = 'all'
+        OR (normalized_code_filter = 'open_source' AND p.code_status = 'open_source')
+        OR (normalized_code_filter = 'not_open_source' AND COALESCE(p.code_status, 'unknown') <> 'open_source')
+        OR p.code_status = normalized_code_filter
+      )
+      AND to_tsvector('english', COALESCE(p.abstract, '')) @@ query_text
+  ),
+  ranked_papers AS (
+    SELECT
+      candidates.id,
+      SUM(candidates.rank_score) AS rank_score
+    FROM (
+      SELECT tm.id, tm.rank_score FROM title_matches tm
+      UNION ALL
+      SELECT km.id, km.rank_score FROM keyword_matches km
+      UNION ALL
+      SELECT am.id, am.rank_score FROM abstract_matches am
+    ) candidates
+    GROUP BY candidates.id
+  ),
+  matched_papers AS (
+    SELECT
+      p.id,
+      p.title,
+      p.abstract,
+      p.venue,
+      p.primary_area,
+      p.llm_response,
+      p.created_at,
+      p.sort_order,
+      p.code_status,
+      p.code_url,
+      p.code_evidence,
+      p.code_checked_at,
+      rp.rank_score
+    FROM ranked_papers rp
+    JOIN papers p ON p.id = rp.id
+  )
+  SELECT
+    mp.id,
+    mp.title,
+    mp.abstract,
+    mp.venue,
+    mp.primary_area,
+    mp.llm_response,
+    mp.created_at,
+    mp.code_status,
+    mp.code_url,
+    mp.code_evidence,
+    mp.code_checked_at,
+    paper_list_priority(mp.venue)::INT,
+    COALESCE(mp.sort_order, 2147483647),
+    COALESCE(LOWER(mp.title), ''),
+    mp.rank_score
+  FROM matched_papers mp
+  WHERE
+    after_id IS NULL
+    OR (
+      -ROUND(mp.rank_score::NUMERIC, 4),
+      paper_list_priority(mp.venue),
+      -mp.rank_score,
+      COALESCE(mp.sort_order, 2147483647),
+      COALESCE(LOWER(mp.title), ''),
+      mp.id
+    ) > (
+      -ROUND(after_rank_score::NUMERIC, 4),
+      after_priority::SMALLINT,
+      -after_rank_score,
+      after_sort_order,
+      after_title,
+      after_id
+    )
+  ORDER BY
+    ROUND(mp.rank_score::NUMERIC, 4) DESC,
+    paper_list_priority(mp.venue) ASC,
+    mp.rank_score DESC,
+    COALESCE(mp.sort_order, 2147483647) ASC,
+    COALESCE(LOWER(mp.title), '') ASC,
+    mp.id ASC
+  LIMIT page_limit OFFSET page_offset;
+END;
+$$ LANGUAGE plpgsql;
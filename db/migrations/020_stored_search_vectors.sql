@@ -0,0 +1,345 @@
+-- Stored search vectors: parse title/abstract/keywords once at write time
+-- instead of calling to_tsvector() for every candidate row on every search.
+ALTER TABLE papers
+  ADD COLUMN IF NOT EXISTS title_tsv TSVECTOR
+    GENERATED ALWAYS AS (to_tsvector('english', COALESCE(title, ''))) STORED,
+  ADD COLUMN IF NOT EXISTS abstract_tsv TSVECTOR
+    GENERATED ALWAYS AS (to_tsvector('english', COALESCE(abstract, ''))) STORED,
+  ADD COLUMN IF NOT EXISTS keywords_tsv TSVECTOR,
+  ADD COLUMN IF NOT EXISTS search_tsv TSVECTOR;
+
+-- Generated columns cannot see other tables or run before BEFORE triggers,
+-- so the keyword aggregate and the weighted combined vector are trigger-maintained.
+-- Weights: title A, keywords B, abstract C (ranked as 1.0 / 0.55 / 0.35).
+CREATE OR REPLACE FUNCTION papers_refresh_search_tsv()
+RETURNS TRIGGER AS $$
+BEGIN
+  NEW.keywords_tsv := COALESCE(NEW.keywords_tsv, ''::TSVECTOR);
+  NEW.search_tsv :=
+    setweight(to_tsvector('english', COALESCE(NEW.title, '')), 'A')
+    || setweight(NEW.keywords_tsv, 'B')
+    || setweight(to_tsvector('english', COALESCE(NEW.abstract, '')), 'C');
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_papers_refresh_search_tsv ON papers;
+CREATE TRIGGER trg_papers_refresh_search_tsv
+BEFORE INSERT OR UPDATE OF title, abstract, keywords_tsv ON papers
+FOR EACH ROW EXECUTE FUNCTION papers_refresh_search_tsv();
+
+CREATE OR REPLACE FUNCTION refresh_papers_keywords_tsv(target_paper_ids TEXT[])
+RETURNS VOID AS $$
+  UPDATE papers p
+  SET keywords_tsv = COALESCE(
+    (
+      SELECT to_tsvector('english', string_agg(k.keyword, ' '))
+      FROM keywords k
+      WHERE k.paper_id = p.id
+    ),
+    ''::TSVECTOR
+  )
+  WHERE p.id = ANY(target_paper_ids);
+$$ LANGUAGE sql;
+
+-- Statement-level: each touched paper is rewritten once per statement rather
+-- than once per keyword row. Transition tables cannot be shared between
+-- events, so INSERT, UPDATE and DELETE each get their own trigger.
+CREATE OR REPLACE FUNCTION keywords_refresh_paper_tsv()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    PERFORM refresh_papers_keywords_tsv(ARRAY(SELECT DISTINCT paper_id FROM new_keywords));
+  ELSIF TG_OP = 'DELETE' THEN
+    PERFORM refresh_papers_keywords_tsv(ARRAY(SELECT DISTINCT paper_id FROM old_keywords));
+  ELSE
+    PERFORM refresh_papers_keywords_tsv(
+      ARRAY(SELECT paper_id FROM old_keywords UNION SELECT paper_id FROM new_keywords)
+    );
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_keywords_refresh_paper_tsv ON keywords;
+DROP TRIGGER IF EXISTS trg_keywords_insert_refresh_paper_tsv ON keywords;
+DROP TRIGGER IF EXISTS trg_keywords_update_refresh_paper_tsv ON keywords;
+DROP TRIGGER IF EXISTS trg_keywords_delete_refresh_paper_tsv ON keywords;
+CREATE TRIGGER trg_keywords_insert_refresh_paper_tsv
+AFTER INSERT ON keywords
+REFERENCING NEW TABLE AS new_keywords
+FOR EACH STATEMENT EXECUTE FUNCTION keywords_refresh_paper_tsv();
+CREATE TRIGGER trg_keywords_update_refresh_paper_tsv
+AFTER UPDATE ON keywords
+REFERENCING OLD TABLE AS old_keywords NEW TABLE AS new_keywords
+FOR EACH STATEMENT EXECUTE FUNCTION keywords_refresh_paper_tsv();
+CREATE TRIGGER trg_keywords_delete_refresh_paper_tsv
+AFTER DELETE ON keywords
+REFERENCING OLD TABLE AS old_keywords
+FOR EACH STATEMENT EXECUTE FUNCTION keywords_refresh_paper_tsv();
+
+-- Backfill rows written before the triggers existed; a no-op on later startups.
+UPDATE papers p
+SET keywords_tsv = COALESCE(
+  (
+    SELECT to_tsvector('english', string_agg(k.keyword, ' '))
+    FROM keywords k
+    WHERE k.paper_id = p.id
+  ),
+  ''::TSVECTOR
+)
+WHERE p.keywords_tsv IS NULL OR p.search_tsv IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_papers_title_tsv ON papers USING GIN (title_tsv);
+CREATE INDEX IF NOT EXISTS idx_papers_abstract_tsv ON papers USING GIN (abstract_tsv);
+CREATE INDEX IF NOT EXISTS idx_papers_keywords_tsv ON papers USING GIN (keywords_tsv);
+CREATE INDEX IF NOT EXISTS idx_papers_search_tsv ON papers USING GIN (search_tsv);
+
+CREATE OR REPLACE FUNCTION search_papers_optimized(
+  search_term TEXT,
+  venue_prefix TEXT,
+  search_title BOOLEAN,
+  search_abstract BOOLEAN,
+  search_keywords BOOLEAN,
+  code_filter TEXT,
+  page_limit INT,
+  page_offset INT,
+  after_rank_score DOUBLE PRECISION DEFAULT NULL,
+  after_priority INT DEFAULT NULL,
+  after_sort_order INT DEFAULT NULL,
+  after_title TEXT DEFAULT NULL,
+  after_id TEXT DEFAULT NULL
+)
+RETURNS TABLE(
+  id TEXT,
+  title TEXT,
+  abstract TEXT,
+  venue TEXT,
+  primary_area TEXT,
+  llm_response TEXT,
+  created_at TIMESTAMPTZ,
+  code_status TEXT,
+  code_url TEXT,
+  code_evidence TEXT,
+  code_checked_at TIMESTAMPTZ,
+  sort_priority INT,
+  sort_order_key INT,
+  sort_title TEXT,
+  rank_score DOUBLE PRECISION
+) AS $$
+DECLARE
+  normalized_search_term TEXT;
+  normalized_code_filter TEXT;
+  query_text tsquery;
+  all_fields BOOLEAN;
+BEGIN
+  normalized_search_term := NULLIF(BTRIM(search_term), '');
+  normalized_code_filter := COALESCE(NULLIF(BTRIM(code_filter), ''), 'all');
+
+  IF normalized_search_term IS NULL THEN
+    RETURN QUERY
+    SELECT
+      p.id,
+      p.title,
+      p.abstract,
+      p.venue,
+      p.primary_area,
+      p.llm_response,
+      p.created_at,
+      p.code_status,
+      p.code_url,
+      p.code_evidence,
+      p.code_checked_at,
+      paper_list_priority(p.venue)::INT,
+      COALESCE(p.sort_order, 2147483647),
+      COALESCE(LOWER(p.title), ''),
+      NULL::DOUBLE PRECISION
+    FROM papers p
+    WHERE
+      (venue_prefix IS NULL OR venue_prefix = '' OR p.venue ILIKE venue_prefix || '%')
+      AND (
+        normalized_code_filter = 'all'
+        OR (normalized_code_filter = 'open_source' AND p.code_status = 'open_source')
+        OR (normalized_code_filter = 'not_open_source' AND COALESCE(p.code_status, 'unknown') <> 'open_source')
+        OR p.code_status = normalized_code_filter
+      )
+      AND (
+        after_id IS NULL
+        OR (
+          paper_list_priority(p.venue),
+          COALESCE(p.sort_order, 2147483647),
+          COALESCE(LOWER(p.title), ''),
+          p.id
+        ) > (after_priority::SMALLINT, after_sort_order, after_title, after_id)
+      )
+    ORDER BY
+      paper_list_priority(p.venue) ASC,
+      COALESCE(p.sort_order, 2147483647) ASC,
+      COALESCE(LOWER(p.title), '') ASC,
+      p.id ASC
+    LIMIT page_limit OFFSET page_offset;
+
+    RETURN;
+  END IF;
+
+  query_text := websearch_to_tsquery('english', normalized_search_term);
+  all_fields := search_title AND search_abstract AND search_keywords;
+
+  RETURN QUERY
+  WITH ranked_papers AS (
+    -- Default search over every field: one GIN lookup on the weighted vector.
+    SELECT
+      p.id,
+      ts_rank('{0.0, 0.35, 0.55, 1.0}', p.search_tsv, query_text)::DOUBLE PRECISION AS rank_score
+    FROM papers p
+    WHERE
+      all_fields
+      AND p.search_tsv @@ query_text
+      AND (venue_prefix IS NULL OR venue_prefix = '' OR p.venue ILIKE venue_prefix || '%')
+      AND (
+        normalized_code_filter = 'all'
+        OR (normalized_code_filter = 'open_source' AND p.code_status = 'open_source')
+        OR (normalized_code_filter = 'not_open_source' AND COALESCE(p.code_status, 'unknown') <> 'open_source')
+        OR p.code_status = normalized_code_filter
+      )
+
+    UNION ALL
+
+    -- Field subsets: BitmapOr over the per-field GIN indexes.
+    SELECT
+      p.id,
+      (
+        CASE WHEN search_title AND p.title_tsv @@ query_text
+          THEN ts_rank(p.title_tsv, query_text) * 1.0 ELSE 0 END
+        + CASE WHEN search_keywords AND p.keywords_tsv @@ query_text
+          THEN ts_rank(p.keywords_tsv, query_text) * 0.55 ELSE 0 END
+        + CASE WHEN search_abstract AND p.abstract_tsv @@ query_text
+          THEN ts_rank(p.abstract_tsv, query_text) * 0.35 ELSE 0 END
+      )::DOUBLE PRECISION AS rank_score
+    FROM papers p
+    WHERE
+      NOT all_fields
+      AND (
+        (search_title AND p.title_tsv @@ query_text)
+        OR (search_abstract AND p.abstract_tsv @@ query_text)
+        OR (search_keywords AND p.keywords_tsv @@ query_text)
+      )
+      AND (venue_prefix IS NULL OR venue_prefix = '' OR p.venue ILIKE venue_prefix || '%')
+      AND (
+        normalized_code_filter = 'all'
+        OR (normalized_code_filter = 'open_source' AND p.code_status = 'open_source')
+        OR (normalized_code_filter = 'not_open_source' AND COALESCE(p.code_status, 'unknown') <> 'open_source')
+        OR p.code_status = normalized_code_filter
+      )
+  ),
+  matched_papers AS (
+    SELECT
+      p.id,
+      p.title,
+      p.abstract,
+      p.venue,
+      p.primary_area,
+      p.llm_response,
+      p.created_at,
+      p.sort_order,
+      p.code_status,
+      p.code_url,
+      p.code_evidence,
+      p.code_checked_at,
+      rp.rank_score
+    FROM ranked_papers rp
+    JOIN papers p ON p.id = rp.id
+  )
+  SELECT
+    mp.id,
+    mp.title,
+    mp.abstract,
+    mp.venue,
+    mp.primary_area,
+    mp.llm_response,
+    mp.created_at,
+    mp.code_status,
+    mp.code_url,
+    mp.code_evidence,
+    mp.code_checked_at,
+    paper_list_priority(mp.venue)::INT,
+    COALESCE(mp.sort_order, 2147483647),
+    COALESCE(LOWER(mp.title), ''),
+    mp.rank_score
+  FROM matched_papers mp
+  WHERE
+    after_id IS NULL
+    OR (
+      -ROUND(mp.rank_score::NUMERIC, 4),
+      paper_list_priority(mp.venue),
+      -mp.rank_score,
+      COALESCE(mp.sort_order, 2147483647),
+      COALESCE(LOWER(mp.title), ''),
+      mp.id
+    ) > (
+      -ROUND(after_rank_score::NUMERIC, 4),
+      after_priority::SMALLINT,
+      -after_rank_score,
+      after_sort_order,
+      after_title,
+      after_id
+    )
+  ORDER BY
+    ROUND(mp.rank_score::NUMERIC, 4) DESC,
+    paper_list_priority(mp.venue) ASC,
+    mp.rank_score DESC,
+    COALESCE(mp.sort_order, 2147483647) ASC,
+    COALESCE(LOWER(mp.title), '') ASC,
+    mp.id ASC
+  LIMIT page_limit OFFSET page_offset;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION count_papers_optimized(
+  search_term TEXT,
+  venue_prefix TEXT,
+  search_title BOOLEAN,
+  search_abstract BOOLEAN,
+  search_keywords BOOLEAN,
+  code_filter TEXT
+)
+RETURNS INTEGER AS $$
+DECLARE
+  normalized_search_term TEXT;
+  normalized_code_filter TEXT;
+  query_text tsquery;
+  total_count INTEGER;
+BEGIN
+  normalized_search_term := NULLIF(BTRIM(search_term), '');
+  normalized_code_filter := COALESCE(NULLIF(BTRIM(code_filter), ''), 'all');
+  query_text := CASE
+    WHEN normalized_search_term IS NULL THEN NULL
+    ELSE websearch_to_tsquery('english', normalized_search_term)
+  END;
+
+  SELECT COUNT(*)::INTEGER INTO total_count
+  FROM papers p
+  WHERE
+    (venue_prefix IS NULL OR venue_prefix = '' OR p.venue ILIKE venue_prefix || '%')
+    AND (
+      normalized_code_filter = 'all'
+      OR (normalized_code_filter = 'open_source' AND p.code_status = 'open_source')
+      OR (normalized_code_filter = 'not_open_source' AND COALESCE(p.code_status, 'unknown') <> 'open_source')
+      OR p.code_status = normalized_code_filter
+    )
+    AND (
+      query_text IS NULL
+      OR (search_title AND search_abstract AND search_keywords AND p.search_tsv @@ query_text)
+      OR (
+        NOT (search_title AND search_abstract AND search_keywords)
+        AND (
+          (search_title AND p.title_tsv @@ query_text)
+          OR (search_abstract AND p.abstract_tsv @@ query_text)
+          OR (search_keywords AND p.keywords_tsv @@ query_text)
+        )
+      )
+    );
+
+  RETURN total_count;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,280 @@
+-- One call per listing request: the page rows plus the total and read
+-- counts, instead of separate search, count and read-state passes.
+-- Every returned row repeats total_count/read_count; an empty page still
+-- returns one row whose paper columns are NULL so the totals come back.
+DROP FUNCTION IF EXISTS search_papers_page(
+  TEXT, TEXT, BOOLEAN, BOOLEAN, BOOLEAN, TEXT, INT, INT,
+  DOUBLE PRECISION, INT, INT, TEXT, TEXT, UUID
+);
+CREATE OR REPLACE FUNCTION search_papers_page(
+  search_term TEXT,
+  venue_prefix TEXT,
+  search_title BOOLEAN,
+  search_abstract BOOLEAN,
+  search_keywords BOOLEAN,
+  code_filter TEXT,
+  page_limit INT,
+  page_offset INT,
+  after_rank_score DOUBLE PRECISION DEFAULT NULL,
+  after_priority INT DEFAULT NULL,
+  after_sort_order INT DEFAULT NULL,
+  after_title TEXT DEFAULT NULL,
+  after_id TEXT DEFAULT NULL,
+  reader_user_id UUID DEFAULT NULL
+)
+RETURNS TABLE(
+  id TEXT,
+  title TEXT,
+  abstract TEXT,
+  venue TEXT,
+  primary_area TEXT,
+  llm_response TEXT,
+  created_at TIMESTAMPTZ,
+  code_status TEXT,
+  code_url TEXT,
+  code_evidence TEXT,
+  code_checked_at TIMESTAMPTZ,
+  sort_priority INT,
+  sort_order_key INT,
+  sort_title TEXT,
+  rank_score DOUBLE PRECISION,
+  total_count BIGINT,
+  read_count BIGINT
+) AS $$
+DECLARE
+  normalized_search_term TEXT;
+  normalized_code_filter TEXT;
+  query_text tsquery;
+  all_fields BOOLEAN;
+  scope_total BIGINT;
+  scope_read_total BIGINT;
+BEGIN
+  normalized_search_term := NULLIF(BTRIM(search_term), '');
+  normalized_code_filter := COALESCE(NULLIF(BTRIM(code_filter), ''), 'all');
+
+  IF normalized_search_term IS NULL THEN
+    -- Unranked listings keep the keyset index scan for the page; the
+    -- totals are a separate aggregate inside the same call.
+    SELECT
+      COUNT(*),
+      COUNT(*) FILTER (WHERE pm.paper_id IS NOT NULL)
+    INTO scope_total, scope_read_total
+    FROM papers p
+    LEFT JOIN paper_marks pm
+      ON pm.user_id = reader_user_id
+     AND pm.paper_id = p.id
+     AND pm.viewed = TRUE
+    WHERE
+      (venue_prefix IS NULL OR venue_prefix = '' OR p.venue ILIKE venue_prefix || '%')
+      AND (
+        normalized_code_filter = 'all'
+        OR (normalized_code_filter = 'open_source' AND p.code_status = 'open_source')
+        OR (normalized_code_filter = 'not_open_source' AND COALESCE(p.code_status, 'unknown') <> 'open_source')
+        OR p.code_status = normalized_code_filter
+      );
+
+    RETURN QUERY
+    SELECT
+      pg.id,
+      pg.title,
+      pg.abstract,
+      pg.venue,
+      pg.primary_area,
+      pg.llm_response,
+      pg.created_at,
+      pg.code_status,
+      pg.code_url,
+      pg.code_evidence,
+      pg.code_checked_at,
+      pg.sort_priority,
+      pg.sort_order_key,
+      pg.sort_title,
+      NULL::DOUBLE PRECISION,
+      scope_total,
+      scope_read_total
+    FROM (SELECT 1) totals
+    LEFT JOIN LATERAL (
+      SELECT
+        p.id,
+        p.title,
+        p.abstract,
+        p.venue,
+        p.primary_area,
+        p.llm_response,
+        p.created_at,
+        p.code_status,
+        p.code_url,
+        p.code_evidence,
+        p.code_checked_at,
+        paper_list_priority(p.venue)::INT AS sort_priority,
+        COALESCE(p.sort_order, 2147483647) AS sort_order_key,
+        COALESCE(LOWER(p.title), '') AS sort_title
+      FROM papers p
+      WHERE
+        (venue_prefix IS NULL OR venue_prefix = '' OR p.venue ILIKE venue_prefix || '%')
+        AND (
+          normalized_code_filter = 'all'
+          OR (normalized_code_filter = 'open_source' AND p.code_status = 'open_source')
+          OR (normalized_code_filter = 'not_open_source' AND COALESCE(p.code_status, 'unknown') <> 'open_source')
+          OR p.code_status = normalized_code_filter
+        )
+        AND (
+          after_id IS NULL
+          OR (
+            paper_list_priority(p.venue),
+            COALESCE(p.sort_order, 2147483647),
+            COALESCE(LOWER(p.title), ''),
+            p.id
+          ) > (after_priority::SMALLINT, after_sort_order, after_title, after_id)
+        )
+      ORDER BY
+        paper_list_priority(p.venue) ASC,
+        COALESCE(p.sort_order, 2147483647) ASC,
+        COALESCE(LOWER(p.title), '') ASC,
+        p.id ASC
+      LIMIT page_limit OFFSET page_offset
+    ) pg ON TRUE
+    ORDER BY pg.sort_priority, pg.sort_order_key, pg.sort_title, pg.id;
+
+    RETURN;
+  END IF;
+
+  query_text := websearch_to_tsquery('english', normalized_search_term);
+  all_fields := search_title AND search_abstract AND search_keywords;
+
+  -- Ranked search: match and rank once, then derive totals and the page
+  -- from the same materialized candidate set.
+  RETURN QUERY
+  WITH ranked_papers AS (
+    SELECT
+      p.id,
+      ts_rank('{0.0, 0.35, 0.55, 1.0}', p.search_tsv, query_text)::DOUBLE PRECISION AS rank_score
+    FROM papers p
+    WHERE
+      all_fields
+      AND p.search_tsv @@ query_text
+      AND (venue_prefix IS NULL OR venue_prefix = '' OR p.venue ILIKE venue_prefix || '%')
+      AND (
+        normalized_code_filter = 'all'
+        OR (normalized_code_filter = 'open_source' AND p.code_status = 'open_source')
+        OR (normalized_code_filter = 'not_open_source' AND COALESCE(p.code_status, 'unknown') <> 'open_source')
+        OR p.code_status = normalized_code_filter
+      )
+
+    UNION ALL
+
+    SELECT
+      p.id,
+      (
+        CASE WHEN search_title AND p.title_tsv @@ query_text
+          THEN ts_rank(p.title_tsv, query_text) * 1.0 ELSE 0 END
+        + CASE WHEN search_keywords AND p.keywords_tsv @@ query_text
+          THEN ts_rank(p.keywords_tsv, query_text) * 0.55 ELSE 0 END
+        + CASE WHEN search_abstract AND p.abstract_tsv @@ query_text
+          THEN ts_rank(p.abstract_tsv, query_text) * 0.35 ELSE 0 END
+      )::DOUBLE PRECISION AS rank_score
+    FROM papers p
+    WHERE
+      NOT all_fields
+      AND (
+        (search_title AND p.title_tsv @@ query_text)
+        OR (search_abstract AND p.abstract_tsv @@ query_text)
+        OR (search_keywords AND p.keywords_tsv @@ query_text)
+      )
+      AND (venue_prefix IS NULL OR venue_prefix = '' OR p.venue ILIKE venue_prefix || '%')
+      AND (
+        normalized_code_filter = 'all'
+        OR (normalized_code_filter = 'open_source' AND p.code_status = 'open_source')
+        OR (normalized_code_filter = 'not_open_source' AND COALESCE(p.code_status, 'unknown') <> 'open_source')
+        OR p.code_status = normalized_code_filter
+      )
+  ),
+  matched_papers AS MATERIALIZED (
+    SELECT
+      p.id,
+      p.title,
+      p.abstract,
+      p.venue,
+      p.primary_area,
+      p.llm_response,
+      p.created_at,
+      p.code_status,
+      p.code_url,
+      p.code_evidence,
+      p.code_checked_at,
+      paper_list_priority(p.venue)::INT AS sort_priority,
+      COALESCE(p.sort_order, 2147483647) AS sort_order_key,
+      COALESCE(LOWER(p.title), '') AS sort_title,
+      rp.rank_score,
+      pm.paper_id IS NOT NULL AS is_read
+    FROM ranked_papers rp
+    JOIN papers p ON p.id = rp.id
+    LEFT JOIN paper_marks pm
+      ON pm.user_id = reader_user_id
+     AND pm.paper_id = p.id
+     AND pm.viewed = TRUE
+  ),
+  totals AS (
+    SELECT
+      COUNT(*) AS total_count,
+      COUNT(*) FILTER (WHERE mp.is_read) AS read_count
+    FROM matched_papers mp
+  ),
+  page AS (
+    SELECT mp.*
+    FROM matched_papers mp
+    WHERE
+      after_id IS NULL
+      OR (
+        -ROUND(mp.rank_score::NUMERIC, 4),
+        mp.sort_priority,
+        -mp.rank_score,
+        mp.sort_order_key,
+        mp.sort_title,
+        mp.id
+      ) > (
+        -ROUND(after_rank_score::NUMERIC, 4),
+        after_priority,
+        -after_rank_score,
+        after_sort_order,
+        after_title,
+        after_id
+      )
+    ORDER BY
+      ROUND(mp.rank_score::NUMERIC, 4) DESC,
+      mp.sort_priority ASC,
+      mp.rank_score DESC,
+      mp.sort_order_key ASC,
+      mp.sort_title ASC,
+      mp.id ASC
+    LIMIT page_limit OFFSET page_offset
+  )
+  SELECT
+    pg.id,
+    pg.title,
+    pg.abstract,
+    pg.venue,
+    pg.primary_area,
+    pg.llm_response,
+    pg.created_at,
+    pg.code_status,
+    pg.code_url,
+    pg.code_evidence,
+    pg.code_checked_at,
+    pg.sort_priority,
+    pg.sort_order_key,
+    pg.sort_title,
+    pg.rank_score,
+    t.total_count,
+    t.read_count
+  FROM totals t
+  LEFT JOIN page pg ON TRUE
+  ORDER BY
+    ROUND(pg.rank_score::NUMERIC, 4) DESC,
+    pg.sort_priority ASC,
+    pg.rank_score DESC,
+    pg.sort_order_key ASC,
+    pg.sort_title ASC,
+    pg.id ASC;
+END;
+$$ LANGUAGE plpgsql;
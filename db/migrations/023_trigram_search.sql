@@ -0,0 +1,13 @@
+-- Substring search on the HF Daily and arXiv listings ('%term%' ILIKE on
+-- title, abstract and keyword) is served by trigram GIN indexes instead of
+-- sequential scans over papers and keywords.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_papers_title_trgm
+ON papers USING GIN (title gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_papers_abstract_trgm
+ON papers USING GIN (abstract gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_keywords_keyword_trgm
+ON keywords USING GIN (keyword gin_trgm_ops);
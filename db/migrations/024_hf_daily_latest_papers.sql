@@ -0,0 +1,68 @@
+-- One row per HF Daily paper holding its latest appearance, so the feed and
+-- its count read an index in display order instead of DISTINCT ON over the
+-- whole archive. Maintained by upsert_hf_daily_papers through
+-- refresh_hf_daily_latest_papers(); sort_title follows papers.title through
+-- a trigger, since titles also change via save_paper/upsert_arxiv_paper.
+CREATE TABLE IF NOT EXISTS hf_daily_latest_papers (
+  paper_id TEXT PRIMARY KEY REFERENCES papers(id) ON DELETE CASCADE,
+  hf_daily_id BIGINT NOT NULL REFERENCES hf_daily_papers(id) ON DELETE CASCADE,
+  daily_date DATE NOT NULL,
+  rank INTEGER NOT NULL,
+  upvotes INTEGER NOT NULL,
+  sort_title TEXT NOT NULL DEFAULT ''
+);
+
+CREATE INDEX IF NOT EXISTS idx_hf_daily_latest_papers_display
+ON hf_daily_latest_papers(daily_date DESC, upvotes DESC, rank ASC, sort_title ASC, paper_id ASC);
+
+CREATE OR REPLACE FUNCTION refresh_hf_daily_latest_papers(target_paper_ids TEXT[])
+RETURNS VOID AS $$
+  DELETE FROM hf_daily_latest_papers
+  WHERE paper_id = ANY(target_paper_ids);
+
+  INSERT INTO hf_daily_latest_papers (paper_id, hf_daily_id, daily_date, rank, upvotes, sort_title)
+  SELECT DISTINCT ON (h.paper_id)
+    h.paper_id,
+    h.id,
+    h.daily_date,
+    h.rank,
+    h.upvotes,
+    COALESCE(p.title, '')
+  FROM hf_daily_papers h
+  JOIN papers p ON p.id = h.paper_id
+  WHERE h.paper_id = ANY(target_paper_ids)
+  ORDER BY h.paper_id ASC, h.daily_date DESC, h.upvotes DESC, h.rank ASC, h.id DESC;
+$$ LANGUAGE sql;
+
+-- Backfill papers that predate the projection; a no-op once it is populated.
+SELECT refresh_hf_daily_latest_papers(ARRAY(
+  SELECT DISTINCT h.paper_id
+  FROM hf_daily_papers h
+  WHERE NOT EXISTS (
+    SELECT 1 FROM hf_daily_latest_papers l WHERE l.paper_id = h.paper_id
+  )
+));
+
+CREATE OR REPLACE FUNCTION papers_refresh_hf_daily_sort_title()
+RETURNS TRIGGER AS $$
+BEGIN
+  UPDATE hf_daily_latest_papers
+  SET sort_title = COALESCE(NEW.title, '')
+  WHERE paper_id = NEW.id;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_papers_refresh_hf_daily_sort_title ON papers;
+CREATE TRIGGER trg_papers_refresh_hf_daily_sort_title
+AFTER UPDATE OF title ON papers
+FOR EACH ROW
+WHEN (OLD.title IS DISTINCT FROM NEW.title)
+EXECUTE FUNCTION papers_refresh_hf_daily_sort_title();
+
+-- Repair titles that went stale before the trigger existed.
+UPDATE hf_daily_latest_papers l
+SET sort_title = COALESCE(p.title, '')
+FROM papers p
+WHERE p.id = l.paper_id
+  AND l.sort_title IS DISTINCT FROM COALESCE(p.title, '');
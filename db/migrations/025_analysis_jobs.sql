@@ -0,0 +1,41 @@
+-- Durable LLM analysis queue. Workers claim jobs with FOR UPDATE SKIP LOCKED
+-- and hold a lease; a job whose lease expires (crashed worker) is re-queued.
+CREATE TABLE IF NOT EXISTS analysis_jobs (
+  id BIGSERIAL PRIMARY KEY,
+  paper_id TEXT NOT NULL REFERENCES papers(id) ON DELETE CASCADE,
+  source TEXT NOT NULL DEFAULT 'backlog',
+  priority INTEGER NOT NULL DEFAULT 0,
+  status TEXT NOT NULL DEFAULT 'queued'
+    CHECK (status IN ('queued', 'running', 'succeeded', 'failed')),
+  attempts INTEGER NOT NULL DEFAULT 0,
+  max_attempts INTEGER NOT NULL DEFAULT 3,
+  available_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  lease_owner TEXT,
+  lease_expires_at TIMESTAMPTZ,
+  last_error TEXT,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  finished_at TIMESTAMPTZ
+);
+
+-- At most one open job per paper; enqueueing again only raises its priority.
+CREATE UNIQUE INDEX IF NOT EXISTS idx_analysis_jobs_open_paper
+ON analysis_jobs(paper_id)
+WHERE status IN ('queued', 'running');
+
+CREATE INDEX IF NOT EXISTS idx_analysis_jobs_claim
+ON analysis_jobs(priority DESC, available_at ASC, id ASC)
+WHERE status = 'queued';
+
+CREATE INDEX IF NOT EXISTS idx_analysis_jobs_lease
+ON analysis_jobs(lease_expires_at)
+WHERE status = 'running';
+
+CREATE INDEX IF NOT EXISTS idx_analysis_jobs_paper_finished
+ON analysis_jobs(paper_id, finished_at DESC)
+WHERE status = 'failed';
+
+-- The backlog scan looks for papers without an analysis.
+CREATE INDEX IF NOT EXISTS idx_papers_unanalyzed
+ON papers(id)
+WHERE llm_response IS NULL OR BTRIM(llm_response) = '';
@@ -0,0 +1,5 @@
+-- Cluster-wide analysis throughput (jobs finished in the last hour) for the
+-- admin dashboard.
+CREATE INDEX IF NOT EXISTS idx_analysis_jobs_succeeded_finished
+ON analysis_jobs(finished_at)
+WHERE status = 'succeeded';
@@ -0,0 +1,6 @@
+-- Per-provider admission limits enforced by the in-process LLM rate limiter.
+-- NULL means unlimited.
+ALTER TABLE llm_providers
+  ADD COLUMN IF NOT EXISTS requests_per_minute INTEGER CHECK (requests_per_minute IS NULL OR requests_per_minute > 0),
+  ADD COLUMN IF NOT EXISTS tokens_per_minute INTEGER CHECK (tokens_per_minute IS NULL OR tokens_per_minute > 0),
+  ADD COLUMN IF NOT EXISTS max_concurrency INTEGER CHECK (max_concurrency IS NULL OR max_concurrency > 0);
@@ -0,0 +1,4 @@
+-- Hedged interactive streams send one request to two providers; both calls
+-- are recorded and flagged so the duplicate spend is visible.
+ALTER TABLE llm_token_usage
+  ADD COLUMN IF NOT EXISTS hedged BOOLEAN NOT NULL DEFAULT FALSE;
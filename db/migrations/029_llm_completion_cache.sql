@@ -0,0 +1,21 @@
+-- Content-addressed cache of LLM completions. cache_key is a SHA-256 of the
+-- message list, model name and sampling parameters.
+CREATE TABLE IF NOT EXISTS llm_completion_cache (
+  cache_key TEXT PRIMARY KEY,
+  request_type TEXT NOT NULL,
+  provider_key TEXT,
+  model_name TEXT NOT NULL,
+  response TEXT NOT NULL,
+  total_tokens BIGINT NOT NULL DEFAULT 0,
+  size_bytes INTEGER NOT NULL DEFAULT 0,
+  hit_count BIGINT NOT NULL DEFAULT 0,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  last_hit_at TIMESTAMPTZ,
+  expires_at TIMESTAMPTZ NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_llm_completion_cache_expires
+ON llm_completion_cache(expires_at);
+
+CREATE INDEX IF NOT EXISTS idx_llm_completion_cache_recency
+ON llm_completion_cache((COALESCE(last_hit_at, created_at)) DESC);
@@ -56,6 +56,7 @@ export function githubAuthUrl(nextPath = '/'): string {
 interface StreamOptions {
   onChunk?: (chunk: string) => void;
   onEvent?: (event: string, data: string) => void;
+  onEventId?: (id: string) => void;
 }
 
 function buildSearchRequestParams(
@@ -334,6 +335,7 @@ export async function fetchAdminBackgroundTasks(): Promise<AdminBackgroundTasksR
 export async function updateAdminPaperAnalysisTask(payload: {
   enabled?: boolean;
   check_interval_seconds?: number;
+  concurrency?: number;
 }): Promise<AdminBackgroundTasksResponse> {
   return apiFetch<AdminBackgroundTasksResponse>('/admin/background-tasks/paper-analysis', {
     method: 'PATCH',
@@ -387,6 +389,9 @@ export async function updateAdminLlmProvider(
     base_url?: string;
     api_key?: string | null;
     is_enabled?: boolean;
+    requests_per_minute?: number | null;
+    tokens_per_minute?: number | null;
+    max_concurrency?: number | null;
   },
 ): Promise<AdminLlmProvider> {
   return apiFetch<AdminLlmProvider>(`/admin/llm/providers/${providerId}`, {
@@ -462,6 +467,11 @@ function dispatchEvent(block: string, handlers: StreamOptions): void {
 
     if (line.startsWith('data:')) {
       dataLines.push(line.slice(5).trimStart());
+      continue;
+    }
+
+    if (line.startsWith('id:')) {
+      handlers.onEventId?.(line.slice(3).trim());
     }
   }
 
@@ -8,6 +8,7 @@ import {
   ChevronRight,
   Clock3,
   KeyRound,
+  Layers,
   ListChecks,
   Loader2,
   Plus,
@@ -82,8 +83,26 @@ type LlmProviderDraft = {
   base_url: string;
   api_key: string;
   active_model: string;
+  requests_per_minute: string;
+  tokens_per_minute: string;
+  max_concurrency: string;
 };
 
+const LLM_RATE_LIMIT_FIELDS = [
+  { key: 'requests_per_minute', label: '每分钟请求数' },
+  { key: 'tokens_per_minute', label: '每分钟 Token 数' },
+  { key: 'max_concurrency', label: '最大并发' },
+] as const;
+
+function parseRateLimitDraft(value: string): number | null | undefined {
+  const trimmed = value.trim();
+  if (!trimmed) {
+    return null;
+  }
+  const parsed = Number(trimmed);
+  return Number.isInteger(parsed) && parsed > 0 ? parsed : undefined;
+}
+
 function formatTrendTick(value: string, range: '24h' | '7d') {
   const parsed = new Date(value);
   if (Number.isNaN(parsed.getTime())) {
@@ -286,6 +305,7 @@ export function AdminPage() {
   const [backgroundTasks, setBackgroundTasks] = useState<AdminBackgroundTasksResponse | null>(null);
   const [paperAnalysisEnabled, setPaperAnalysisEnabled] = useState(false);
   const [paperAnalysisIntervalMinutes, setPaperAnalysisIntervalMinutes] = useState('');
+  const [paperAnalysisConcurrency, setPaperAnalysisConcurrency] = useState('1');
   const [activeAdminTaskIndex, setActiveAdminTaskIndex] = useState(0);
   const [users, setUsers] = useState<AdminUserListResponse | null>(null);
   const [llmProviders, setLlmProviders] = useState<AdminLlmProvider[]>([]);
@@ -344,6 +364,7 @@ export function AdminPage() {
       const nextIntervalSeconds = metadataNumber(nextPaperAnalysisTask, 'check_interval_seconds') ?? 86400;
       setPaperAnalysisEnabled(Boolean(nextPaperAnalysisTask?.enabled));
       setPaperAnalysisIntervalMinutes(String(Math.max(1, Math.round(nextIntervalSeconds / 60))));
+      setPaperAnalysisConcurrency(String(metadataNumber(nextPaperAnalysisTask, 'concurrency') ?? 1));
       setUsers(nextUsers);
       setLlmProviders(nextLlmProviders.providers);
       setSelectedLlmProviderId((current) => {
@@ -362,6 +383,9 @@ export function AdminPage() {
             base_url: provider.base_url,
             api_key: '',
             active_model: provider.active_model ?? provider.models[0]?.model_name ?? '',
+            requests_per_minute: provider.requests_per_minute?.toString() ?? '',
+            tokens_per_minute: provider.tokens_per_minute?.toString() ?? '',
+            max_concurrency: provider.max_concurrency?.toString() ?? '',
           },
         ]),
       ));
@@ -443,6 +467,9 @@ export function AdminPage() {
       base_url: selectedProvider.base_url,
       api_key: '',
       active_model: selectedProvider.active_model ?? selectedProvider.models[0]?.model_name ?? '',
+      requests_per_minute: selectedProvider.requests_per_minute?.toString() ?? '',
+      tokens_per_minute: selectedProvider.tokens_per_minute?.toString() ?? '',
+      max_concurrency: selectedProvider.max_concurrency?.toString() ?? '',
     })
     : null;
   const paperAnalysisTask = useMemo(
@@ -466,6 +493,8 @@ export function AdminPage() {
   const tokenDailyTotals = selectedTokenUsage?.daily_totals ?? [];
   const tokenDailyRows = selectedTokenUsage?.daily ?? [];
   const tokenTotals = selectedTokenUsage?.totals;
+  const completionCache = tokenUsage?.completion_cache;
+  const providerPromptCache = selectedTokenUsage?.provider_cache ?? [];
   const tokenAxisWidth = tokenYAxisWidth(tokenDailyTotals);
   const tokenDetailPages = Math.max(1, Math.ceil(tokenDailyRows.length / TOKEN_DETAIL_PAGE_SIZE));
   const currentTokenDetailPage = Math.min(tokenDetailPage, tokenDetailPages);
@@ -546,6 +575,14 @@ export function AdminPage() {
       if (draft.api_key.trim()) {
         payload.api_key = draft.api_key.trim();
       }
+      for (const field of LLM_RATE_LIMIT_FIELDS) {
+        const value = parseRateLimitDraft(draft[field.key]);
+        if (value === undefined) {
+          setError(`${field.label}必须为正整数，留空表示不限制`);
+          return;
+        }
+        payload[field.key] = value;
+      }
       await updateAdminLlmProvider(provider.id, payload);
       setLlmMessage('供应商配置已保存');
       await load();
@@ -690,6 +727,11 @@ export function AdminPage() {
       setError('后台分析间隔至少需要 1 分钟');
       return;
     }
+    const concurrency = Number(paperAnalysisConcurrency);
+    if (!Number.isInteger(concurrency) || concurrency < 1 || concurrency > 32) {
+      setError('并发数需要是 1 到 32 之间的整数');
+      return;
+    }
 
     setError(null);
     setBackgroundTaskMessage(null);
@@ -698,6 +740,7 @@ export function AdminPage() {
       const payload = await updateAdminPaperAnalysisTask({
         enabled: paperAnalysisEnabled,
         check_interval_seconds: Math.round(intervalMinutes * 60),
+        concurrency,
       });
       setBackgroundTasks(payload);
       setBackgroundTaskMessage('论文后台分析配置已更新');
@@ -906,7 +949,7 @@ export function AdminPage() {
                       </div>
 
                       {isPaperAnalysisTask ? (
-                        <div className="mt-3 grid gap-2.5 lg:grid-cols-[minmax(0,1fr)_auto]">
+                        <div className="mt-3 grid gap-2.5 lg:grid-cols-[minmax(0,1fr)_minmax(0,1fr)_auto]">
                           <label className="space-y-1.5">
                             <span className="text-sm font-medium text-[#475569]">检查间隔（分钟）</span>
                             <div className="flex items-center gap-2">
@@ -921,6 +964,21 @@ export function AdminPage() {
                               />
                             </div>
                           </label>
+                          <label className="space-y-1.5">
+                            <span className="text-sm font-medium text-[#475569]">并发数</span>
+                            <div className="flex items-center gap-2">
+                              <Layers className="h-4 w-4 shrink-0 text-[#94a3b8]" />
+                              <Input
+                                type="number"
+                                min={1}
+                                max={32}
+                                step={1}
+                                value={paperAnalysisConcurrency}
+                                onChange={(event) => setPaperAnalysisConcurrency(event.target.value)}
+                                className="h-10 rounded-2xl bg-[#f8fafc]"
+                              />
+                            </div>
+                          </label>
                           <div className="flex items-end">
                             <Button
                               className="h-10 rounded-2xl bg-[#2563eb] text-white hover:bg-[#1d4ed8]"
@@ -957,6 +1015,11 @@ export function AdminPage() {
                         <div className="min-w-0 truncate">
                           上次结束：{lastRunFinishedAt ? new Date(lastRunFinishedAt).toLocaleString() : '-'}
                         </div>
+                        {isPaperAnalysisTask ? (
+                          <div className="min-w-0 truncate">
+                            吞吐：{metadataNumber(task, 'papers_per_hour') ?? 0} 篇/小时
+                          </div>
+                        ) : null}
                       </div>
 
                       {isActiveTask && adminTasks.length > 1 ? (
@@ -1244,6 +1307,24 @@ export function AdminPage() {
                       {selectedProvider.has_api_key ? selectedProvider.api_key_masked : '未配置'}
                     </div>
                   </div>
+                  <div className="grid gap-3 sm:grid-cols-3 lg:col-span-2">
+                    {LLM_RATE_LIMIT_FIELDS.map((field) => (
+                      <label key={field.key} className="space-y-2">
+                        <span className="text-sm font-medium text-[#475569]">{field.label}</span>
+                        <Input
+                          type="number"
+                          min={1}
+                          value={selectedProviderDraft[field.key]}
+                          onChange={(event) => setProviderDrafts((drafts) => ({
+                            ...drafts,
+                            [selectedProvider.id]: { ...selectedProviderDraft, [field.key]: event.target.value },
+                          }))}
+                          placeholder="不限制"
+                          className="h-11 rounded-2xl bg-[#f8fafc]"
+                        />
+                      </label>
+                    ))}
+                  </div>
                 </div>
 
                 <div className="border-t border-[#edf2f7] pt-5">
@@ -1379,6 +1460,44 @@ export function AdminPage() {
           ))}
         </div>
 
+        {providerPromptCache.length > 0 ? (
+          <div className="mt-3 rounded-2xl bg-[#f8fafc] px-4 py-3 ring-1 ring-[#e5eaf2]">
+            <div className="text-xs font-medium text-[#728095]">Prompt 缓存命中（cache out / input）</div>
+            <div className="mt-2 flex flex-wrap gap-x-4 gap-y-1 text-sm text-[#475569]">
+              {providerPromptCache.map((item) => (
+                <span key={item.provider_key ?? item.provider_name}>
+                  {item.provider_name}：{(item.cache_read_ratio * 100).toFixed(1)}% · {formatTokenCount(item.cache_output_tokens)} / {formatTokenCount(item.input_tokens)}
+                </span>
+              ))}
+            </div>
+          </div>
+        ) : null}
+
+        {completionCache ? (
+          <div className="mt-3 rounded-2xl bg-[#f8fafc] px-4 py-3 ring-1 ring-[#e5eaf2]">
+            <div className="flex flex-wrap items-center justify-between gap-2">
+              <div className="text-xs font-medium text-[#728095]">
+                响应缓存{completionCache.enabled ? `（${completionCache.request_types_enabled.join(' / ') || '未选择请求类型'}）` : '（未启用）'}
+              </div>
+              <div className="flex flex-wrap gap-4 text-sm text-[#475569]">
+                <span>命中 {formatTokenCount(completionCache.totals.hit_count)}</span>
+                <span>命中率 {(completionCache.totals.hit_rate * 100).toFixed(1)}%</span>
+                <span>节省 tokens {formatTokenCount(completionCache.totals.saved_tokens)}</span>
+                <span>缓存条目 {formatTokenCount(completionCache.totals.entry_count)}</span>
+              </div>
+            </div>
+            {completionCache.request_types.length > 0 ? (
+              <div className="mt-2 flex flex-wrap gap-x-4 gap-y-1 text-xs text-[#728095]">
+                {completionCache.request_types.map((item) => (
+                  <span key={item.request_type}>
+                    {item.request_type}：{formatTokenCount(item.hit_count)} 次命中 · {(item.hit_rate * 100).toFixed(1)}%
+                  </span>
+                ))}
+              </div>
+            ) : null}
+          </div>
+        ) : null}
+
         <div className="mt-5">
           <div className="min-w-0">
             <div className="mb-3 flex flex-col gap-2 sm:flex-row sm:items-center sm:justify-between">
@@ -29,6 +29,8 @@ interface PaperPageProps {
 const BACK_BUTTON_FADE_DISTANCE = 72;
 const BACK_BUTTON_MAX_TRANSLATE_Y = 8;
 const AUTO_VIEWED_DELAY_MS = 10_000;
+const ANALYSIS_RESUME_ATTEMPTS = 5;
+const ANALYSIS_RESUME_DELAY_MS = 1_000;
 const EMPTY_MARKS = { viewed: false, liked: false, favorited: false };
 
 function buildChatGptUrl(prompt: string) {
@@ -162,60 +164,97 @@ export function PaperPage({ paperId }: PaperPageProps) {
     setAnalysisStreaming(true);
     setAnalysisStatus(reanalyze ? '正在重新分析论文...' : '正在获取论文信息...');
 
-    try {
-      await streamSse(
-        paperApiPath(paperId, reanalyze ? '?reanalyze=true' : ''),
-        { method: 'GET', signal: controller.signal },
-        {
-          onChunk: (chunk) => {
-            if (analysisRequestIdRef.current !== requestId) {
-              return;
-            }
-            setAnalysisLoading(false);
-            setAnalysisText((current) => current + chunk);
+    // The analysis keeps running on the server when the connection drops;
+    // reconnect with Last-Event-ID to pick the stream up where it stopped.
+    let lastEventId = '';
+    let finished = false;
+    for (let attempt = 0; !finished; attempt += 1) {
+      try {
+        await streamSse(
+          paperApiPath(paperId, reanalyze ? '?reanalyze=true' : ''),
+          {
+            method: 'GET',
+            signal: controller.signal,
+            headers: lastEventId ? { 'Last-Event-ID': lastEventId } : undefined,
           },
-          onEvent: (event, data) => {
-            if (analysisRequestIdRef.current !== requestId) {
-              return;
-            }
-            if (event === 'status') {
-              setAnalysisStatus(data);
-            }
-            if (event === 'reasoning') {
-              setAnalysisLoading(false);
-              setAnalysisReasoning((current) => current + data);
-            }
-            if (event === 'error') {
-              setAnalysisLoading(false);
-              setAnalysisStreaming(false);
-              setAnalysisReasoning('');
-              setAnalysisError(data || '分析失败');
-            }
-            if (event === 'done') {
+          {
+            onEventId: (id) => {
+              lastEventId = id;
+            },
+            onChunk: (chunk) => {
+              if (analysisRequestIdRef.current !== requestId) {
+                return;
+              }
               setAnalysisLoading(false);
-              setAnalysisStreaming(false);
-              setAnalysisReasoning('');
-              setAnalysisStatus('');
-              void fetchPaperInfo(paperId).then(setPaper).catch(() => {
-                // The analysis result is already available; keep the existing metadata if refresh fails.
-              });
-            }
+              setAnalysisText((current) => current + chunk);
+            },
+            onEvent: (event, data) => {
+              if (analysisRequestIdRef.current !== requestId) {
+                return;
+              }
+              if (event === 'reset') {
+                setAnalysisText('');
+                setAnalysisReasoning('');
+              }
+              if (event === 'status') {
+                setAnalysisStatus(data);
+              }
+              if (event === 'reasoning') {
+                setAnalysisLoading(false);
+                setAnalysisReasoning((current) => current + data);
+              }
+              if (event === 'error') {
+                finished = true;
+                setAnalysisLoading(false);
+                setAnalysisStreaming(false);
+                setAnalysisReasoning('');
+                setAnalysisError(data || '分析失败');
+              }
+              if (event === 'done') {
+                finished = true;
+                setAnalysisLoading(false);
+                setAnalysisStreaming(false);
+                setAnalysisReasoning('');
+                setAnalysisStatus('');
+                void fetchPaperInfo(paperId).then(setPaper).catch(() => {
+                  // The analysis result is already available; keep the existing metadata if refresh fails.
+                });
+              }
+            },
           },
-        },
-      );
-    } catch (error) {
-      if (controller.signal.aborted) {
-        return;
+        );
+        if (!finished && !lastEventId) {
+          break;
+        }
+      } catch (error) {
+        if (controller.signal.aborted) {
+          return;
+        }
+        if (!lastEventId || attempt >= ANALYSIS_RESUME_ATTEMPTS) {
+          setAnalysisLoading(false);
+          setAnalysisStreaming(false);
+          setAnalysisReasoning('');
+          setAnalysisError(error instanceof Error ? error.message : '分析失败');
+          break;
+        }
       }
-      setAnalysisLoading(false);
-      setAnalysisStreaming(false);
-      setAnalysisReasoning('');
-      setAnalysisError(error instanceof Error ? error.message : '分析失败');
-    } finally {
-      if (analysisAbortRef.current === controller) {
-        analysisAbortRef.current = null;
+      if (!finished) {
+        if (attempt >= ANALYSIS_RESUME_ATTEMPTS) {
+          setAnalysisLoading(false);
+          setAnalysisStreaming(false);
+          setAnalysisError('分析连接中断，请刷新重试');
+          break;
+        }
+        setAnalysisStatus('连接中断，正在恢复分析进度...');
+        await new Promise((resolve) => window.setTimeout(resolve, ANALYSIS_RESUME_DELAY_MS));
+        if (controller.signal.aborted) {
+          return;
+        }
       }
     }
+    if (analysisAbortRef.current === controller) {
+      analysisAbortRef.current = null;
+    }
   }, [paperId]);
 
   useEffect(() => {
@@ -235,19 +235,49 @@ export interface LlmTokenUsageDailyRow extends LlmTokenUsageModelTotal {
   date: string;
 }
 
+export interface LlmProviderPromptCacheStats {
+  provider_key?: string | null;
+  provider_name: string;
+  request_count: number;
+  input_tokens: number;
+  cache_output_tokens: number;
+  cache_read_ratio: number;
+}
+
 export interface LlmTokenUsageWindow {
   days: string[];
   totals: LlmTokenUsageStats;
   daily_totals: LlmTokenUsageDailyTotal[];
   model_totals: LlmTokenUsageModelTotal[];
+  provider_cache?: LlmProviderPromptCacheStats[];
   daily: LlmTokenUsageDailyRow[];
 }
 
+export interface LlmCompletionCacheStats {
+  entry_count: number;
+  hit_count: number;
+  saved_tokens: number;
+  size_bytes: number;
+  hit_rate: number;
+}
+
+export interface LlmCompletionCacheRequestTypeStats extends LlmCompletionCacheStats {
+  request_type: string;
+}
+
+export interface LlmCompletionCacheMetrics {
+  enabled: boolean;
+  request_types_enabled: string[];
+  totals: LlmCompletionCacheStats;
+  request_types: LlmCompletionCacheRequestTypeStats[];
+}
+
 export interface AdminLlmTokenUsageMetrics {
   timezone: string;
   generated_at: string;
   weekly: LlmTokenUsageWindow;
   monthly: LlmTokenUsageWindow;
+  completion_cache?: LlmCompletionCacheMetrics;
 }
 
 export type AdminBackgroundTaskOwner = 'admin' | 'system';
@@ -301,6 +331,9 @@ export interface AdminLlmProvider {
   is_builtin: boolean;
   active_model?: string | null;
   default_parameters?: Record<string, unknown>;
+  requests_per_minute?: number | null;
+  tokens_per_minute?: number | null;
+  max_concurrency?: number | null;
   models_fetched_at?: string | null;
   created_at?: string;
   updated_at?: string;
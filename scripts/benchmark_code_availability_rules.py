@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Measure how many code-availability LLM calls the rule-based fast path saves.
+
+Runs the pre-classifier over the stored analyses (papers.llm_response) and
+compares its local verdicts with the code_status previously decided by the LLM.
+"""
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+repo_root = Path(__file__).parent.parent
+sys.path.insert(0, str(repo_root / "backend"))
+
+from code_availability import preclassify_code_availability
+
+# code_meta reasons of rows stored without a real LLM verdict.
+NON_LLM_REASONS = {"empty_source_text", "provider_content_blocked", "parse_error"}
+
+
+def load_rows_from_database(limit: int | None) -> list[dict]:
+    import psycopg
+    from psycopg.rows import dict_row
+
+    from config import settings
+
+    if not settings.database.url:
+        print("Error: database.url not found in config.yaml")
+        sys.exit(1)
+
+    query = """
+        SELECT id, llm_response, code_status, code_meta
+        FROM papers
+        WHERE COALESCE(llm_response, '') <> ''
+        ORDER BY id
+    """
+    params: tuple = ()
+    if limit:
+        query += " LIMIT %s"
+        params = (limit,)
+    with psycopg.connect(settings.database.url, row_factory=dict_row) as conn:
+        return list(conn.execute(query, params))
+
+
+def load_rows_from_jsonl(path: Path, limit: int | None) -> list[dict]:
+    rows = []
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                rows.append(json.loads(line))
+            if limit and len(rows) >= limit:
+                break
+    return rows
+
+
+def benchmark(rows: list[dict]) -> dict:
+    rule_counts: Counter[str] = Counter()
+    agreement: Counter[str] = Counter()
+    mismatches = []
+    started_at = time.perf_counter()
+    for row in rows:
+        text = (row.get("llm_response") or "").strip()
+        if not text:
+            continue
+        ruled = preclassify_code_availability(text)
+        if ruled is None:
+            rule_counts["llm"] += 1
+            continue
+        rule_counts[ruled["meta"]["reason"]] += 1
+
+        # Only statuses the LLM actually decided are a reference for the rules.
+        meta = row.get("code_meta") or {}
+        reference = row.get("code_status")
+        if not reference or meta.get("decided_by") == "rules" or meta.get("reason") in NON_LLM_REASONS:
+            continue
+        if ruled["status"] == reference:
+            agreement["agree"] += 1
+        else:
+            agreement["disagree"] += 1
+            mismatches.append(
+                {"id": row.get("id"), "rules": ruled["status"], "llm": reference, "rule": ruled["meta"]["reason"]}
+            )
+    elapsed = time.perf_counter() - started_at
+
+    total = sum(rule_counts.values())
+    resolved = total - rule_counts["llm"]
+    compared = agreement["agree"] + agreement["disagree"]
+    return {
+        "papers": total,
+        "llm_calls_before": total,
+        "llm_calls_after": rule_counts["llm"],
+        "llm_call_reduction": round(resolved / total, 4) if total else 0.0,
+        "resolved_by_rule": {rule: count for rule, count in rule_counts.most_common() if rule != "llm"},
+        "compared_with_llm": compared,
+        "agreement_rate": round(agreement["agree"] / compared, 4) if compared else None,
+        "rules_seconds": round(elapsed, 3),
+        "mismatches": mismatches,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the rule-based code availability pre-classifier")
+    parser.add_argument("--jsonl", type=Path, help="Read papers (llm_response, code_status, code_meta) from a JSONL file instead of the database")
+    parser.add_argument("--limit", type=int, default=None, help="Only check the first N papers")
+    parser.add_argument("--show-mismatches", type=int, default=20, help="Print up to N papers where rules and LLM disagree")
+    args = parser.parse_args(argv)
+
+    rows = load_rows_from_jsonl(args.jsonl, args.limit) if args.jsonl else load_rows_from_database(args.limit)
+    report = benchmark(rows)
+    mismatches = report.pop("mismatches")
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    for mismatch in mismatches[: args.show_mismatches]:
+        print(json.dumps(mismatch, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
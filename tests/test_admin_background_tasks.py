@@ -54,7 +54,8 @@ def test_write_background_analysis_config_inserts_before_hf_daily(tmp_path, monk
 
     updated = config_path.read_text(encoding="utf-8")
     assert "presence:\n  snapshot_interval_seconds: 60\n\nbackground_analysis:" in updated
-    assert "  enabled: true\n  check_interval_seconds: 300\n\nhf_daily:" in updated
+    assert "  enabled: true\n  check_interval_seconds: 300\n" in updated
+    assert "  concurrency: 1\n\nhf_daily:" in updated
 
 
 def test_write_background_analysis_config_replaces_existing_section(tmp_path, monkeypatch):
@@ -75,12 +76,13 @@ def test_write_background_analysis_config_replaces_existing_section(tmp_path, mo
     )
     monkeypatch.setattr(config, "CONFIG_PATH", config_path)
 
-    config.write_background_analysis_config(enabled=False, check_interval_seconds=600)
+    config.write_background_analysis_config(enabled=False, check_interval_seconds=600, concurrency=4)
 
     updated = config_path.read_text(encoding="utf-8")
     background_section = updated.split("hf_daily:", 1)[0]
     assert "  enabled: true" not in background_section
     assert "  enabled: false\n  check_interval_seconds: 600" in updated
+    assert "  concurrency: 4" in updated
     assert "hf_daily:\n  enabled: true" in updated
 
 
@@ -1,9 +1,14 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
 
-from analysis_context import build_analysis_prompt, build_chat_context_parts
+from analysis_context import build_analysis_prompt, build_chat_context, build_paper_messages
+from chat import ChatSession
+from code_availability import classify_code_availability_from_text
+from llm import analysis_messages
 
 
 def test_build_analysis_prompt_uses_full_content_when_available():
@@ -32,9 +37,51 @@ def test_build_analysis_prompt_falls_back_to_metadata_without_inventing():
     assert "目标页面被访问验证或反爬拦截" in prompt
 
 
-def test_build_chat_context_parts_falls_back_to_metadata():
-    parts = build_chat_context_parts({"title": "A CHI Paper", "abstract": "Abstract"}, None, "blocked")
+def test_build_chat_context_shares_full_text_but_not_the_screening_instruction():
+    paper = {"title": "A CHI Paper", "abstract": "Abstract"}
+
+    assert build_chat_context(paper, "full paper text") == build_analysis_prompt(paper, "full paper text")
+    metadata_context = build_chat_context(paper, None, "blocked")
+    assert "A CHI Paper" in metadata_context
+    assert "初筛分析" not in metadata_context
+
+
+class RecordingLLM:
+    def __init__(self, reply: str = "ok"):
+        self.reply = reply
+        self.messages = []
+
+    async def chat(self, messages, **kwargs):
+        self.messages.append(messages)
+        return self.reply
+
+
+@pytest.mark.asyncio
+async def test_analysis_and_chat_share_the_paper_prefix():
+    paper_context = build_analysis_prompt({"title": "Paper"}, "full paper text")
+    llm = RecordingLLM()
+    session = ChatSession(llm, context=paper_context, analysis="earlier analysis")
+
+    await session.send("first question")
+    await session.send("second question")
+
+    prefix = build_paper_messages(paper_context, [])
+    analysis = analysis_messages(paper_context)
+    first_turn, second_turn = llm.messages
+    assert len(prefix) == 3
+    assert analysis[: len(prefix)] == prefix
+    assert first_turn[: len(prefix)] == prefix
+    # Later turns only append to the previous request.
+    assert second_turn[: len(first_turn)] == first_turn
+    assert "earlier analysis" in first_turn[len(prefix)]["content"]
+    assert [message["role"] for message in first_turn] == ["system", "user", "assistant", "user", "assistant", "user"]
+
+
+@pytest.mark.asyncio
+async def test_code_availability_starts_with_the_shared_system_prompt():
+    llm = RecordingLLM('{"status": "not_found", "code_url": null, "evidence": "", "confidence": 0.9}')
+
+    await classify_code_availability_from_text(llm, {"title": "Paper"}, "论文未开源代码。", source="paper_content")
 
-    assert len(parts) == 1
-    assert "论文元数据" in parts[0]
-    assert "A CHI Paper" in parts[0]
+    assert llm.messages[0][0] == build_paper_messages(None, [])[0]
+    assert llm.messages[0][1]["role"] == "user"
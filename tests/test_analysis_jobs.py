@@ -0,0 +1,348 @@
+import asyncio
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+import analysis_pipeline
+import background_tasks
+import database
+from background_tasks import BackgroundAnalyzer
+
+
+class FakeCursor:
+    def __init__(self, rows=None):
+        self.calls = []
+        self.rows = rows or []
+        self.rowcount = len(self.rows)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return None
+
+    def execute(self, query, params=None):
+        self.calls.append((query, params))
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return list(self.rows)
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self.cursor_instance = cursor
+        self.commits = 0
+
+    def cursor(self):
+        return self.cursor_instance
+
+    def commit(self):
+        self.commits += 1
+
+
+def use_fake_connection(monkeypatch, cursor):
+    @contextmanager
+    def fake_get_connection():
+        yield FakeConnection(cursor)
+
+    monkeypatch.setattr(database, "DATABASE_URL", "postgresql://test/paper_online")
+    monkeypatch.setattr(database, "_get_connection", fake_get_connection)
+
+
+class FakeLLM:
+    def is_configured(self):
+        return True
+
+
+def test_claim_analysis_jobs_requeues_expired_leases_and_skips_locked_rows(monkeypatch):
+    cursor = FakeCursor(
+        [
+            {"id": 2, "paper_id": "paper-b", "source": "backlog", "priority": 0, "attempts": 1, "max_attempts": 3},
+            {"id": 1, "paper_id": "paper-a", "source": "feishu", "priority": 30, "attempts": 1, "max_attempts": 3},
+        ]
+    )
+    use_fake_connection(monkeypatch, cursor)
+
+    jobs = database.claim_analysis_jobs("worker-1", limit=2, lease_seconds=60, min_priority=0)
+
+    expire_sql, _ = cursor.calls[0]
+    claim_sql, claim_params = cursor.calls[1]
+    assert "lease_expires_at < NOW()" in expire_sql
+    assert "FOR UPDATE SKIP LOCKED" in claim_sql
+    assert "ORDER BY priority DESC, available_at ASC, id ASC" in claim_sql
+    assert "AND priority >= %s" in claim_sql
+    assert claim_params == [0, 2, "worker-1", 60]
+    assert [job["paper_id"] for job in jobs] == ["paper-a", "paper-b"]
+
+
+def test_enqueue_analysis_jobs_deduplicates_and_keeps_the_higher_priority(monkeypatch):
+    cursor = FakeCursor()
+    use_fake_connection(monkeypatch, cursor)
+
+    database.enqueue_analysis_jobs(["paper-a", "paper-a", "", "paper-b"], "hf_daily", 20)
+
+    sql, params = cursor.calls[0]
+    assert "ON CONFLICT (paper_id) WHERE status IN ('queued', 'running')" in sql
+    assert "GREATEST(analysis_jobs.priority, EXCLUDED.priority)" in sql
+    assert params == ("hf_daily", 20, 3, ["paper-a", "paper-b"])
+
+
+def test_process_job_completes_or_releases_the_lease(monkeypatch):
+    analyzer = BackgroundAnalyzer(FakeLLM())
+    calls = []
+    outcomes = iter([None, "timeout"])
+
+    async def fake_analyze(paper_id, priority_class):
+        return next(outcomes)
+
+    monkeypatch.setattr(analyzer, "_analyze_paper", fake_analyze)
+    monkeypatch.setattr(
+        background_tasks,
+        "complete_analysis_job",
+        lambda job_id, worker_id: calls.append(("complete", job_id, worker_id)),
+    )
+    monkeypatch.setattr(
+        background_tasks,
+        "fail_analysis_job",
+        lambda job_id, worker_id, error, delay: calls.append(("fail", job_id, error, delay)) or "queued",
+    )
+
+    assert asyncio.run(analyzer.process_job({"id": 7, "paper_id": "paper-a"})) is True
+    assert asyncio.run(analyzer.process_job({"id": 8, "paper_id": "paper-b"})) is False
+    assert calls == [
+        ("complete", 7, analyzer.worker_id),
+        ("fail", 8, "timeout", analyzer.job_settings.retry_delay_seconds),
+    ]
+
+
+def test_process_job_hands_back_cancelled_work_without_spending_an_attempt(monkeypatch):
+    analyzer = BackgroundAnalyzer(FakeLLM())
+    calls = []
+
+    async def fake_analyze(paper_id, priority_class):
+        raise asyncio.CancelledError
+
+    monkeypatch.setattr(analyzer, "_analyze_paper", fake_analyze)
+    monkeypatch.setattr(
+        background_tasks,
+        "release_analysis_job",
+        lambda job_id, worker_id: calls.append(("release", job_id)) or True,
+    )
+    monkeypatch.setattr(
+        background_tasks,
+        "fail_analysis_job",
+        lambda job_id, worker_id, error, delay: calls.append(("fail", job_id)) or "queued",
+    )
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(analyzer.process_job({"id": 9, "paper_id": "paper-c"}))
+    assert calls == [("release", 9)]
+
+
+def test_analysis_errors_are_retried_by_the_queue_not_inline(monkeypatch):
+    llm = FakeLLM()
+    analyzer = BackgroundAnalyzer(llm)
+    calls = []
+
+    async def failing_generate(paper_id, user_prompt, priority_class="backlog"):
+        calls.append(paper_id)
+        raise RuntimeError("provider down")
+
+    monkeypatch.setattr(background_tasks, "get_paper", lambda paper_id: {"id": paper_id, "title": "Paper"})
+    monkeypatch.setattr(analyzer, "generate_analysis", failing_generate)
+    monkeypatch.setattr(
+        background_tasks,
+        "fail_analysis_job",
+        lambda job_id, worker_id, error, delay: calls.append(("fail", error)) or "queued",
+    )
+
+    assert asyncio.run(analyzer.process_job({"id": 10, "paper_id": "paper-d"})) is False
+    assert calls == ["paper-d", ("fail", "provider down")]
+
+
+def test_drain_jobs_overlaps_fetching_with_bounded_llm_concurrency(monkeypatch):
+    analyzer = BackgroundAnalyzer(FakeLLM(), concurrency=2)
+    queue = [{"id": index, "paper_id": f"paper-{index}"} for index in range(6)]
+    events = []
+    llm_in_flight = {"now": 0, "peak": 0}
+    completed = []
+    failed = []
+
+    def fake_claim(worker_id, limit, lease_seconds, paper_id=None, min_priority=None):
+        return [queue.pop(0)] if queue else []
+
+    async def fake_fetch(paper_info):
+        events.append(("fetched", paper_info["id"]))
+        return f"content of {paper_info['id']}", None
+
+    async def fake_generate(paper_id, user_prompt, priority_class):
+        llm_in_flight["now"] += 1
+        llm_in_flight["peak"] = max(llm_in_flight["peak"], llm_in_flight["now"])
+        await asyncio.sleep(0.01)
+        llm_in_flight["now"] -= 1
+        if paper_id == "paper-3":
+            raise RuntimeError("rate limited")
+        events.append(("analyzed", paper_id))
+        return f"analysis of {paper_id}"
+
+    async def fake_persist(paper_info, response, priority_class):
+        return None
+
+    monkeypatch.setattr(analysis_pipeline, "claim_analysis_jobs", fake_claim)
+    monkeypatch.setattr(analysis_pipeline, "get_paper", lambda paper_id: {"id": paper_id, "pdf": "x"})
+    monkeypatch.setattr(
+        analysis_pipeline,
+        "complete_analysis_job",
+        lambda job_id, worker_id: completed.append(job_id),
+    )
+    monkeypatch.setattr(
+        analysis_pipeline,
+        "fail_analysis_job",
+        lambda job_id, worker_id, error, delay: failed.append((job_id, error)) or "queued",
+    )
+    monkeypatch.setattr(analyzer, "fetch_paper_content", fake_fetch)
+    monkeypatch.setattr(analyzer, "build_prompt", lambda paper_info, content, error: content)
+    monkeypatch.setattr(analyzer, "generate_analysis", fake_generate)
+    monkeypatch.setattr(analyzer, "persist_analysis", fake_persist)
+
+    success_count, failed_count = asyncio.run(analyzer.drain_jobs(pool_name="backlog"))
+
+    assert (success_count, failed_count) == (5, 1)
+    assert sorted(completed) == [0, 1, 2, 4, 5]
+    assert failed == [(3, "rate limited")]
+    assert llm_in_flight["peak"] == 2
+    first_analyzed = events.index(next(event for event in events if event[0] == "analyzed"))
+    assert sum(1 for event in events[:first_analyzed] if event[0] == "fetched") > 2
+    snapshot = analyzer.status_snapshot()
+    stages = [worker["stage"] for worker in snapshot["workers"]]
+    assert stages.count("llm") == 2
+    assert stages.count("fetch") == analyzer.job_settings.fetch_concurrency
+    assert all(worker["paper_id"] is None for worker in snapshot["workers"])
+    assert snapshot["papers_per_hour"] == 5 * 60
+
+
+def test_raising_llm_concurrency_mid_drain_starts_more_workers(monkeypatch):
+    analyzer = BackgroundAnalyzer(FakeLLM(), concurrency=1)
+    queue = [{"id": index, "paper_id": f"paper-{index}"} for index in range(8)]
+    llm_in_flight = {"now": 0, "peak": 0}
+
+    async def fake_fetch(paper_info):
+        return "content", None
+
+    async def fake_generate(paper_id, user_prompt, priority_class):
+        analyzer.set_concurrency(3)
+        llm_in_flight["now"] += 1
+        llm_in_flight["peak"] = max(llm_in_flight["peak"], llm_in_flight["now"])
+        await asyncio.sleep(0.05)
+        llm_in_flight["now"] -= 1
+        return "analysis"
+
+    async def fake_persist(paper_info, response, priority_class):
+        return None
+
+    monkeypatch.setattr(analysis_pipeline, "WORKER_SCALE_INTERVAL_SECONDS", 0.01)
+    monkeypatch.setattr(
+        analysis_pipeline,
+        "claim_analysis_jobs",
+        lambda worker_id, limit, lease_seconds, paper_id=None, min_priority=None: [queue.pop(0)] if queue else [],
+    )
+    monkeypatch.setattr(analysis_pipeline, "get_paper", lambda paper_id: {"id": paper_id, "pdf": "x"})
+    monkeypatch.setattr(analysis_pipeline, "complete_analysis_job", lambda job_id, worker_id: None)
+    monkeypatch.setattr(analyzer, "fetch_paper_content", fake_fetch)
+    monkeypatch.setattr(analyzer, "build_prompt", lambda paper_info, content, error: content)
+    monkeypatch.setattr(analyzer, "generate_analysis", fake_generate)
+    monkeypatch.setattr(analyzer, "persist_analysis", fake_persist)
+
+    assert asyncio.run(analyzer.drain_jobs()) == (8, 0)
+    assert llm_in_flight["peak"] == 3
+    stages = [worker["stage"] for worker in analyzer.status_snapshot()["workers"]]
+    assert stages.count("llm") == 3
+
+
+def test_preempted_pipeline_job_is_requeued_without_failing(monkeypatch):
+    analyzer = BackgroundAnalyzer(FakeLLM())
+    queue = [{"id": 9, "paper_id": "paper-9", "source": "backlog"}]
+    released = []
+    failed = []
+
+    async def fake_generate(paper_id, user_prompt, priority_class):
+        assert priority_class == "backlog"
+        raise analysis_pipeline.LLMPreempted("preempted")
+
+    async def fake_fetch(paper_info):
+        return "content", None
+
+    monkeypatch.setattr(
+        analysis_pipeline,
+        "claim_analysis_jobs",
+        lambda worker_id, limit, lease_seconds, paper_id=None, min_priority=None: [queue.pop(0)] if queue else [],
+    )
+    monkeypatch.setattr(analysis_pipeline, "get_paper", lambda paper_id: {"id": paper_id, "pdf": "x"})
+    monkeypatch.setattr(
+        analysis_pipeline,
+        "release_analysis_job",
+        lambda job_id, worker_id: released.append(job_id) or True,
+    )
+    monkeypatch.setattr(
+        analysis_pipeline,
+        "fail_analysis_job",
+        lambda job_id, worker_id, error, delay: failed.append(job_id) or "queued",
+    )
+    monkeypatch.setattr(analyzer, "fetch_paper_content", fake_fetch)
+    monkeypatch.setattr(analyzer, "build_prompt", lambda paper_info, content, error: content)
+    monkeypatch.setattr(analyzer, "generate_analysis", fake_generate)
+
+    assert asyncio.run(analyzer.drain_jobs()) == (0, 0)
+    assert released == [9]
+    assert failed == []
+
+
+def test_stopping_the_pipeline_releases_in_flight_jobs(monkeypatch):
+    analyzer = BackgroundAnalyzer(FakeLLM())
+    queue = [{"id": 11, "paper_id": "paper-11"}]
+    released = []
+    failed = []
+
+    async def blocked_generate(paper_id, user_prompt, priority_class):
+        await asyncio.Event().wait()
+
+    async def fake_fetch(paper_info):
+        return "content", None
+
+    monkeypatch.setattr(
+        analysis_pipeline,
+        "claim_analysis_jobs",
+        lambda worker_id, limit, lease_seconds, paper_id=None, min_priority=None: [queue.pop(0)] if queue else [],
+    )
+    monkeypatch.setattr(analysis_pipeline, "get_paper", lambda paper_id: {"id": paper_id, "pdf": "x"})
+    monkeypatch.setattr(
+        analysis_pipeline,
+        "release_analysis_job",
+        lambda job_id, worker_id: released.append(job_id) or True,
+    )
+    monkeypatch.setattr(
+        analysis_pipeline,
+        "fail_analysis_job",
+        lambda job_id, worker_id, error, delay: failed.append(job_id) or "queued",
+    )
+    monkeypatch.setattr(analyzer, "fetch_paper_content", fake_fetch)
+    monkeypatch.setattr(analyzer, "build_prompt", lambda paper_info, content, error: content)
+    monkeypatch.setattr(analyzer, "generate_analysis", blocked_generate)
+
+    async def stop_mid_run():
+        task = asyncio.create_task(analyzer.drain_jobs())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(stop_mid_run())
+    assert released == [11]
+    assert failed == []
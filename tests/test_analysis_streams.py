@@ -0,0 +1,74 @@
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+from analysis_streams import AnalysisStreamHub
+
+
+def test_concurrent_viewers_share_one_producer_and_replay_buffered_chunks():
+    hub = AnalysisStreamHub()
+    producer_runs = []
+
+    async def scenario():
+        gate = asyncio.Event()
+
+        async def producer():
+            producer_runs.append(True)
+            yield {"data": "first"}
+            await gate.wait()
+            yield {"data": "second"}
+            yield {"event": "done", "data": ""}
+
+        async def collect(stream):
+            return [event async for event in stream.subscribe()]
+
+        first_stream, first_started = hub.attach("paper-1", producer)
+        first_viewer = asyncio.create_task(collect(first_stream))
+        await asyncio.sleep(0.01)
+        second_stream, second_started = hub.attach("paper-1", producer)
+        second_viewer = asyncio.create_task(collect(second_stream))
+        await asyncio.sleep(0.01)
+        assert hub.status_snapshot()["viewer_count"] == 2
+        gate.set()
+        return first_started, second_started, await first_viewer, await second_viewer
+
+    first_started, second_started, first_events, second_events = asyncio.run(scenario())
+
+    expected = [{"data": "first"}, {"data": "second"}, {"event": "done", "data": ""}]
+    assert (first_started, second_started) == (True, False)
+    assert [{key: value for key, value in event.items() if key != "id"} for event in first_events] == expected
+    assert second_events == first_events
+    assert producer_runs == [True]
+    assert hub.status_snapshot()["in_flight_count"] == 0
+
+
+def test_analysis_outlives_disconnects_and_resumes_after_last_event_id():
+    hub = AnalysisStreamHub()
+    persisted = []
+
+    async def producer():
+        yield {"data": "first"}
+        await asyncio.sleep(0.01)
+        yield {"data": "second"}
+        persisted.append("first second")
+        yield {"event": "done", "data": ""}
+
+    async def scenario():
+        stream, _ = hub.attach("paper-1", producer)
+        events = stream.subscribe()
+        first = await events.__anext__()
+        await events.aclose()
+        await stream.task
+        assert hub.resume("paper-1", "other-stream:1") is None
+        resumed_stream, position = hub.resume("paper-1", first["id"])
+        return first, [event async for event in resumed_stream.subscribe(position)]
+
+    first, rest = asyncio.run(scenario())
+
+    assert first["data"] == "first"
+    assert [event["data"] for event in rest] == ["second", ""]
+    assert [int(event["id"].split(":")[1]) for event in rest] == [2, 3]
+    assert persisted == ["first second"]
+    assert hub.status_snapshot()["resumed_count"] == 1
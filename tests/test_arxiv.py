@@ -164,8 +164,8 @@ def test_get_arxiv_papers_applies_search_filters(monkeypatch):
     list_params = cursor.calls[1][1]
 
     assert "p.llm_response IS NOT NULL" in count_sql
-    assert "p.title ILIKE %s" in count_sql
-    assert "p.abstract ILIKE %s" not in count_sql
+    assert "title_match.title ILIKE %s" in count_sql
+    assert "abstract_match.abstract ILIKE %s" not in count_sql
     assert "keywords.keyword ILIKE %s" in count_sql
     assert count_params == ["%agent%", "%agent%"]
     assert list_params == ["%agent%", "%agent%", 6, 0]
@@ -0,0 +1,121 @@
+import sys
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+import async_database
+import database
+
+
+class FakeAsyncCursor:
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return None
+
+    async def execute(self, query, params=None):
+        self.calls.append((query, params))
+
+    async def fetchone(self):
+        return self.rows.pop(0) if self.rows else None
+
+    async def fetchall(self):
+        rows, self.rows = self.rows, []
+        return rows
+
+
+class FakeAsyncConnection:
+    def __init__(self, cursor):
+        self.cursor_instance = cursor
+        self.commit_count = 0
+
+    def cursor(self):
+        return self.cursor_instance
+
+    async def commit(self):
+        self.commit_count += 1
+
+
+def install_fake_connection(monkeypatch, rows):
+    cursor = FakeAsyncCursor(rows)
+    conn = FakeAsyncConnection(cursor)
+
+    @asynccontextmanager
+    async def fake_get_async_connection():
+        yield conn
+
+    monkeypatch.setattr(database, "DATABASE_URL", "postgresql://test/paper_online")
+    monkeypatch.setattr(async_database, "_get_async_connection", fake_get_async_connection)
+    return cursor, conn
+
+
+@pytest.mark.asyncio
+async def test_get_user_by_session_token_hash_touches_session(monkeypatch):
+    cursor, conn = install_fake_connection(
+        monkeypatch,
+        [{"id": 7, "email": "user@example.com", "role": "user", "is_active": True}],
+    )
+
+    user = await async_database.get_user_by_session_token_hash("hash-1")
+
+    assert user["id"] == "7"
+    assert "FROM user_sessions" in cursor.calls[0][0]
+    assert "SET last_seen_at = NOW()" in cursor.calls[1][0]
+    assert cursor.calls[1][1] == ("hash-1",)
+    assert conn.commit_count == 1
+
+
+@pytest.mark.asyncio
+async def test_get_paper_marks_returns_marks_by_paper(monkeypatch):
+    cursor, _ = install_fake_connection(
+        monkeypatch,
+        [
+            {
+                "paper_id": "paper-1",
+                "viewed": True,
+                "liked": None,
+                "favorited": False,
+                "viewed_at": None,
+                "liked_at": None,
+                "favorited_at": None,
+                "updated_at": None,
+            }
+        ],
+    )
+
+    marks = await async_database.get_paper_marks("user-1", ["paper-1", "paper-2"])
+
+    assert marks["paper-1"]["viewed"] is True
+    assert marks["paper-1"]["liked"] is False
+    assert cursor.calls[0][1] == ("user-1", ["paper-1", "paper-2"])
+
+
+@pytest.mark.asyncio
+async def test_async_operations_raise_database_error_after_retries(monkeypatch):
+    attempts = []
+
+    @asynccontextmanager
+    async def failing_connection():
+        attempts.append(1)
+        raise RuntimeError("connection refused")
+        yield
+
+    async def no_sleep(_delay):
+        return None
+
+    monkeypatch.setattr(database, "DATABASE_URL", "postgresql://test/paper_online")
+    monkeypatch.setattr(async_database, "_get_async_connection", failing_connection)
+    monkeypatch.setattr(async_database.asyncio, "sleep", no_sleep)
+
+    with pytest.raises(database.DatabaseError):
+        await async_database.get_chat_session("session-1")
+
+    assert len(attempts) == 3
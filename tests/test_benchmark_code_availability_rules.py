@@ -0,0 +1,37 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+
+SCRIPT_PATH = Path(__file__).resolve().parent.parent / "scripts" / "benchmark_code_availability_rules.py"
+SPEC = importlib.util.spec_from_file_location("benchmark_code_availability_rules", SCRIPT_PATH)
+assert SPEC and SPEC.loader
+bench = importlib.util.module_from_spec(SPEC)
+sys.modules[SPEC.name] = bench
+SPEC.loader.exec_module(bench)
+
+
+def test_benchmark_reports_llm_call_reduction_and_agreement():
+    rows = [
+        {"id": "a", "llm_response": "代码：https://github.com/a/b", "code_status": "open_source", "code_meta": {"reason": ""}},
+        {"id": "b", "llm_response": "论文未开源代码。", "code_status": "not_found", "code_meta": {}},
+        {"id": "c", "llm_response": "论文中未提及代码。", "code_status": "unknown", "code_meta": {"reason": ""}},
+        {"id": "d", "llm_response": "论文没有提供代码链接。", "code_status": "not_found", "code_meta": {"reason": ""}},
+        {"id": "e", "llm_response": "任务是图像分类。", "code_status": "unknown", "code_meta": {"reason": "empty_source_text"}},
+        {"id": "f", "llm_response": "", "code_status": None, "code_meta": None},
+    ]
+
+    report = bench.benchmark(rows)
+
+    assert report["papers"] == 5
+    assert report["llm_calls_after"] == 1
+    assert report["llm_call_reduction"] == 0.8
+    assert report["resolved_by_rule"] == {
+        "repository_url": 1,
+        "not_mentioned_phrase": 1,
+        "not_found_phrase": 1,
+        "no_code_signal": 1,
+    }
+    assert report["compared_with_llm"] == 3
+    assert report["agreement_rate"] == 1.0
+    assert report["mismatches"] == []
@@ -0,0 +1,94 @@
+import json
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+import cache_bus
+import database
+
+
+class FakeCursor:
+    def __init__(self):
+        self.calls = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return None
+
+    def execute(self, query, params=None):
+        self.calls.append((query, params))
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self.cursor_instance = cursor
+
+    def cursor(self):
+        return self.cursor_instance
+
+    def commit(self):
+        return None
+
+
+def remote_message(topic, data):
+    return json.dumps({"origin": "other-host:1:abcd", "topic": topic, "data": data})
+
+
+def test_dispatch_runs_handlers_for_remote_messages_only(monkeypatch):
+    received = []
+    monkeypatch.setattr(cache_bus, "_handlers", {"demo": [received.append]})
+
+    assert cache_bus.dispatch(remote_message("demo", {"key": "a"})) is True
+    assert cache_bus.dispatch(cache_bus.encode_message("demo", {"key": "own"})) is False
+    assert cache_bus.dispatch("not json") is False
+
+    assert received == [{"key": "a"}]
+
+
+def test_encode_message_degrades_to_resync_when_payload_is_too_large():
+    message = json.loads(cache_bus.encode_message("papers", {"paper_ids": ["x" * 100] * 200}))
+
+    assert message["origin"] == cache_bus.WORKER_ID
+    assert message["data"] == {"resync": True}
+
+
+def test_remote_paper_change_invalidates_local_search_cache(monkeypatch):
+    published = []
+    monkeypatch.setattr(database, "publish_cache_invalidation", lambda topic, data: published.append(topic))
+    database._search_cache.clear()
+    database._set_cached_result("iclr-page", [{"id": "paper-1"}], 1, venue_prefix="ICLR 2026")
+    database._set_cached_result("cvpr-page", [{"id": "paper-2"}], 1, venue_prefix="CVPR 2026")
+
+    cache_bus.dispatch(remote_message("papers", {"paper_ids": ["paper-1"]}))
+
+    assert database._get_cached_result("iclr-page") is None
+    assert database._get_cached_result("cvpr-page") == ([{"id": "paper-2"}], 1)
+    assert published == []
+
+    cache_bus.dispatch(remote_message("papers", {"resync": True}))
+
+    assert database._get_cached_result("cvpr-page") is None
+
+
+def test_paper_write_publishes_invalidation_notify(monkeypatch):
+    cursor = FakeCursor()
+
+    @contextmanager
+    def fake_get_connection():
+        yield FakeConnection(cursor)
+
+    monkeypatch.setattr(database, "DATABASE_URL", "postgresql://test/paper_online")
+    monkeypatch.setattr(database, "_get_connection", fake_get_connection)
+
+    database.update_llm_response("paper-1", "analysis")
+
+    notify_sql, notify_params = cursor.calls[-1]
+    assert notify_sql == "SELECT pg_notify(%s, %s)"
+    assert notify_params[0] == cache_bus.CACHE_INVALIDATION_CHANNEL
+    payload = json.loads(notify_params[1])
+    assert payload["topic"] == "papers"
+    assert payload["data"]["paper_ids"] == ["paper-1"]
@@ -5,7 +5,11 @@ import pytest
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
 
-from code_availability import classify_code_availability_from_text
+from code_availability import (
+    classify_code_availability_from_text,
+    extract_code_repository_urls,
+    preclassify_code_availability,
+)
 
 
 class BlockedLLM:
@@ -21,9 +25,73 @@ async def test_code_availability_content_block_is_recordable_unknown():
     result = await classify_code_availability_from_text(
         BlockedLLM(),
         {"id": "paper-1", "title": "Adversarial paper"},
-        "analysis text",
+        "论文未开源代码。",
     )
 
     assert result["status"] == "unknown"
     assert result["code_url"] is None
     assert result["meta"]["reason"] == "provider_content_blocked"
+
+
+class RecordingLLM:
+    def __init__(self):
+        self.calls = 0
+
+    async def chat(self, messages, **kwargs):
+        self.calls += 1
+        return '{"status": "not_found", "code_url": null, "evidence": "", "confidence": 0.7, "reason": ""}'
+
+
+def test_repository_urls_are_normalized_and_deduplicated():
+    text = "代码：https://github.com/foo/bar.git ，镜像 https://GitHub.com/foo/bar ，demo https://huggingface.co/spaces/foo/demo"
+
+    assert extract_code_repository_urls(text) == [
+        "https://github.com/foo/bar",
+        "https://huggingface.co/spaces/foo/demo",
+    ]
+
+
+@pytest.mark.parametrize(
+    ("text", "status", "reason"),
+    [
+        ("**代码开源情况**：已开源，仓库地址：https://gitlab.com/lab/tool。", "open_source", "repository_url"),
+        ("The code will be released upon acceptance.", "unavailable", "unreleased_phrase"),
+        ("作者表示代码将在论文录用后公开。", "unavailable", "unreleased_phrase"),
+        ("论文没有提供代码仓库链接。", "not_found", "not_found_phrase"),
+        ("论文中未提及代码开源情况。", "unknown", "not_mentioned_phrase"),
+        ("The paper does not mention any code release.", "unknown", "not_mentioned_phrase"),
+        ("1. 任务是图像分类。2. 指标是准确率。", "unknown", "no_code_signal"),
+    ],
+)
+def test_clear_cut_texts_are_classified_by_rules(text, status, reason):
+    result = preclassify_code_availability(text)
+
+    assert result["status"] == status
+    assert result["meta"]["reason"] == reason
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "论文未开源代码。",
+        "基于 https://github.com/huggingface/transformers 和 https://github.com/foo/bar 实现。",
+        "Code will be available at https://github.com/foo/bar.",
+        "模型权重：https://huggingface.co/foo/model",
+    ],
+)
+def test_mixed_or_weak_signals_escalate_to_the_llm(text):
+    assert preclassify_code_availability(text) is None
+
+
+@pytest.mark.asyncio
+async def test_decision_source_is_recorded_in_meta():
+    llm = RecordingLLM()
+
+    ruled = await classify_code_availability_from_text(llm, {"title": "Paper"}, "代码：https://github.com/foo/bar")
+    escalated = await classify_code_availability_from_text(llm, {"title": "Paper"}, "论文未开源代码。")
+
+    assert llm.calls == 1
+    assert ruled["code_url"] == "https://github.com/foo/bar"
+    assert ruled["meta"]["decided_by"] == "rules"
+    assert ruled["meta"]["source"] == "llm_response"
+    assert escalated["meta"]["decided_by"] == "llm"
@@ -0,0 +1,99 @@
+import sys
+from pathlib import Path
+
+import pytest
+import psycopg
+from psycopg_pool import PoolTimeout
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+import database
+
+
+class FakeInfo:
+    def __init__(self, status):
+        self.transaction_status = status
+
+
+class FakePooledConnection:
+    def __init__(self, status=psycopg.pq.TransactionStatus.INTRANS):
+        self.closed = False
+        self.info = FakeInfo(status)
+        self.rollback_count = 0
+
+    def rollback(self):
+        self.rollback_count += 1
+        self.info.transaction_status = psycopg.pq.TransactionStatus.IDLE
+
+
+class FakePool:
+    def __init__(self, conn=None, error=None):
+        self.conn = conn
+        self.error = error
+        self.returned = []
+        self.closed = False
+        self.min_size = 1
+        self.max_size = 4
+        self.max_lifetime = 1800
+        self.max_idle = 300
+        self.timeout = 10
+
+    def getconn(self):
+        if self.error:
+            raise self.error
+        return self.conn
+
+    def putconn(self, conn):
+        self.returned.append(conn)
+
+    def get_stats(self):
+        return {"pool_size": 2, "pool_available": 1, "requests_num": 7, "requests_waiting": 0}
+
+    def close(self):
+        self.closed = True
+
+
+def test_get_connection_reuses_pool_and_discards_uncommitted_work(monkeypatch):
+    conn = FakePooledConnection()
+    pool = FakePool(conn)
+    monkeypatch.setattr(database, "DATABASE_URL", "postgresql://test/paper_online")
+    monkeypatch.setattr(database, "_connection_pool", pool)
+
+    with database._get_connection() as first:
+        assert first is conn
+    with database._get_connection() as second:
+        assert second is conn
+
+    assert pool.returned == [conn, conn]
+    assert conn.rollback_count == 1
+
+
+def test_get_connection_wraps_pool_timeout(monkeypatch):
+    pool = FakePool(error=PoolTimeout("no connection available"))
+    monkeypatch.setattr(database, "DATABASE_URL", "postgresql://test/paper_online")
+    monkeypatch.setattr(database, "_connection_pool", pool)
+
+    with pytest.raises(database.DatabaseError):
+        with database._get_connection():
+            pass
+
+    assert pool.returned == []
+
+
+def test_connection_pool_stats_and_close(monkeypatch):
+    pool = FakePool(FakePooledConnection())
+    monkeypatch.setattr(database, "_connection_pool", pool)
+
+    stats = database.get_connection_pool_stats()
+
+    assert stats["open"] is True
+    assert stats["max_size"] == 4
+    assert stats["size"] == 2
+    assert stats["available"] == 1
+    assert stats["requests_total"] == 7
+
+    database.close_connection_pool()
+
+    assert pool.closed is True
+    assert database._connection_pool is None
+    assert database.get_connection_pool_stats()["open"] is False
@@ -123,7 +123,7 @@ def test_select_top_hf_daily_entries_skips_invalid_entries():
     assert selected == []
 
 
-def test_get_hf_daily_papers_deduplicates_papers_by_latest_daily_record(monkeypatch):
+def test_get_hf_daily_papers_reads_latest_appearance_projection(monkeypatch):
     cursor = FakeCursor()
 
     @contextmanager
@@ -152,10 +152,13 @@ def test_get_hf_daily_papers_deduplicates_papers_by_latest_daily_record(monkeypa
 
     count_sql = cursor.calls[0][0]
     list_sql = cursor.calls[1][0]
-    assert "SELECT DISTINCT h.paper_id" in count_sql
-    assert "DISTINCT ON (h.paper_id)" in list_sql
-    assert "h.daily_date DESC" in list_sql
-    assert "h.upvotes DESC" in list_sql
+    assert "FROM hf_daily_latest_papers l" in count_sql
+    assert "JOIN papers" not in count_sql
+    assert "DISTINCT" not in list_sql
+    assert "FROM hf_daily_latest_papers l" in list_sql
+    assert "JOIN hf_daily_papers h ON h.id = l.hf_daily_id" in list_sql
+    assert "l.daily_date DESC" in list_sql
+    assert "l.upvotes DESC" in list_sql
 
 
 def test_get_hf_daily_papers_applies_read_filter(monkeypatch):
@@ -189,3 +192,70 @@ def test_get_hf_daily_papers_applies_read_filter(monkeypatch):
     assert "EXISTS" in list_sql
     assert count_params == ["user-1"]
     assert list_params == ["user-1", 8, 0]
+
+
+def test_get_hf_daily_papers_search_uses_trigram_indexable_branches(monkeypatch):
+    cursor = FakeCursor()
+
+    @contextmanager
+    def fake_get_connection():
+        yield FakeConnection(cursor)
+
+    monkeypatch.setattr(database, "DATABASE_URL", "postgresql://test/paper_online")
+    monkeypatch.setattr(database, "_get_connection", fake_get_connection)
+    monkeypatch.setattr(database, "_load_keywords_for_papers", lambda papers: (papers, {}))
+
+    database.get_hf_daily_papers(offset=0, limit=8, search="50%_off")
+
+    count_sql, count_params = cursor.calls[0]
+    list_sql, list_params = cursor.calls[1]
+    for sql in (count_sql, list_sql):
+        assert "p.id IN (" in sql
+        assert "title_match.title ILIKE %s" in sql
+        assert "abstract_match.abstract ILIKE %s" in sql
+        assert "keywords.keyword ILIKE %s" in sql
+        assert "keywords.paper_id = p.id" not in sql
+    assert count_params == ["%50\\%\\_off%"] * 3
+    assert list_params == ["%50\\%\\_off%"] * 3 + [8, 0]
+
+
+def test_upsert_hf_daily_papers_refreshes_latest_appearances(monkeypatch):
+    class UpsertCursor(FakeCursor):
+        def fetchone(self):
+            return {"llm_response": None}
+
+        def fetchall(self):
+            return [{"paper_id": "hf:2604.00009"}]
+
+        def executemany(self, query, params_seq):
+            self.calls.append((query, list(params_seq)))
+
+    class UpsertConnection(FakeConnection):
+        def commit(self):
+            return None
+
+    cursor = UpsertCursor()
+
+    @contextmanager
+    def fake_get_connection():
+        yield UpsertConnection(cursor)
+
+    monkeypatch.setattr(database, "DATABASE_URL", "postgresql://test/paper_online")
+    monkeypatch.setattr(database, "_get_connection", fake_get_connection)
+    monkeypatch.setattr(database, "_notify_papers_changed", lambda *args, **kwargs: None)
+
+    analyzable = database.upsert_hf_daily_papers(
+        date(2026, 6, 2),
+        [
+            {
+                "paper": {"id": "hf:2604.00001", "title": "New Paper", "venue": "Hugging Face Daily"},
+                "daily": {"rank": 1, "upvotes": 10},
+            }
+        ],
+    )
+
+    assert analyzable == ["hf:2604.00001"]
+    assert "RETURNING paper_id" in cursor.calls[0][0]
+    refresh_sql, refresh_params = cursor.calls[-1]
+    assert refresh_sql == "SELECT refresh_hf_daily_latest_papers(%s)"
+    assert refresh_params == (["hf:2604.00001", "hf:2604.00009"],)
@@ -0,0 +1,261 @@
+import sys
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+import database
+from app import next_page_cursor
+
+
+class FakeCursor:
+    def __init__(self, rows=None):
+        self.calls = []
+        self.rows = rows or []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return None
+
+    def execute(self, query, params=None):
+        self.calls.append((query, params))
+
+    def fetchone(self):
+        return {"total": len(self.rows)}
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def fetchall(self):
+        return [dict(row) for row in self.rows]
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self.cursor_instance = cursor
+
+    def cursor(self, *args, **kwargs):
+        return self.cursor_instance
+
+
+def use_fake_connection(monkeypatch, cursor):
+    @contextmanager
+    def fake_get_connection():
+        yield FakeConnection(cursor)
+
+    monkeypatch.setattr(database, "DATABASE_URL", "postgresql://test/paper_online")
+    monkeypatch.setattr(database, "_get_connection", fake_get_connection)
+    monkeypatch.setattr(database, "_load_keywords_for_papers", lambda papers: (papers, True))
+    database._search_cache.clear()
+
+
+def test_page_cursor_round_trips_and_rejects_tampering():
+    cursor = database.encode_page_cursor("hf_daily", [date(2026, 6, 2), 200, 1, "title", "hf:1"])
+
+    assert database.decode_page_cursor(cursor, "hf_daily", database._HF_DAILY_CURSOR_TYPES) == [
+        date(2026, 6, 2),
+        200,
+        1,
+        "title",
+        "hf:1",
+    ]
+    with pytest.raises(database.InvalidCursorError):
+        database.decode_page_cursor(cursor, "arxiv", database._ARXIV_CURSOR_TYPES)
+    with pytest.raises(database.InvalidCursorError):
+        database.decode_page_cursor("not-a-cursor", "hf_daily", database._HF_DAILY_CURSOR_TYPES)
+    with pytest.raises(database.InvalidCursorError):
+        database.decode_page_cursor(
+            database.encode_page_cursor("arxiv", ["2026-06-02", "1"]),
+            "arxiv",
+            database._ARXIV_CURSOR_TYPES,
+        )
+
+
+
+def test_listing_cursors_with_unparseable_dates_are_invalid():
+    with pytest.raises(database.InvalidCursorError):
+        database.get_arxiv_papers(offset=0, limit=6, cursor=database.encode_page_cursor("arxiv", ["garbage", 1]))
+    with pytest.raises(database.InvalidCursorError):
+        database.get_hf_daily_papers(
+            offset=0,
+            limit=6,
+            cursor=database.encode_page_cursor("hf_daily", ["garbage", 200, 1, "title", "hf:1"]),
+        )
+
+def test_keyset_after_clause_handles_mixed_directions():
+    clause, params = database._keyset_after_clause([("d", "DESC"), ("t", "ASC")], ["2026-06-02", "abc"])
+
+    assert clause == "(d < %s OR (d = %s AND t > %s))"
+    assert params == ["2026-06-02", "2026-06-02", "abc"]
+
+
+def test_conference_papers_pass_cursor_to_search_function(monkeypatch):
+    cursor = FakeCursor(
+        [
+            {
+                "id": "paper-2",
+                "title": "Second",
+                "venue": "ICLR 2026 Oral",
+                "sort_priority": 1,
+                "sort_order_key": 2,
+                "sort_title": "second",
+                "rank_score": None,
+                "total_count": 2,
+                "read_count": 0,
+            }
+        ]
+    )
+    use_fake_connection(monkeypatch, cursor)
+    page_cursor = database.encode_page_cursor("papers", [None, 1, 1, "first", "paper-1"])
+
+    papers, total = database.get_conference_papers("ICLR 2026", 0, 1, cursor=page_cursor)
+
+    list_sql, list_params = cursor.calls[0]
+    assert "search_papers_page(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)" in list_sql
+    assert list_params[6:] == (1, 0, None, 1, 1, "first", "paper-1", None, "all")
+    assert total == 2
+    assert "sort_priority" not in papers[0]
+    assert "total_count" not in papers[0]
+    assert database.decode_page_cursor(papers[0]["cursor"], "papers", database._PAPER_CURSOR_TYPES) == [
+        None,
+        1,
+        2,
+        "second",
+        "paper-2",
+    ]
+    assert next_page_cursor(papers, 1) == papers[0]["cursor"]
+    assert next_page_cursor(papers, 2) is None
+
+
+def test_legacy_search_resumes_after_cursor(monkeypatch):
+    rows = [
+        {"id": "paper-a", "title": "Alpha", "venue": "ICLR 2026 Oral", "sort_order": 1},
+        {"id": "paper-b", "title": "Beta", "venue": "ICLR 2026 Oral", "sort_order": 2},
+        {"id": "paper-c", "title": "Gamma", "venue": "ICLR 2026 Poster", "sort_order": 1},
+    ]
+    use_fake_connection(monkeypatch, FakeCursor(rows))
+
+    first_page, total = database._search_papers_legacy("ICLR 2026", 0, 2, None, True, True, True)
+    after = database.decode_page_cursor(
+        first_page[-1]["cursor"], "papers", database._PAPER_CURSOR_TYPES
+    )
+    second_page, _ = database._search_papers_legacy(
+        "ICLR 2026", 0, 2, None, True, True, True, after=after
+    )
+
+    assert total == 3
+    assert [paper["id"] for paper in first_page] == ["paper-a", "paper-b"]
+    assert [paper["id"] for paper in second_page] == ["paper-c"]
+
+
+def test_hf_daily_papers_filter_latest_rows_after_cursor(monkeypatch):
+    cursor = FakeCursor()
+    use_fake_connection(monkeypatch, cursor)
+    page_cursor = database.encode_page_cursor("hf_daily", [date(2026, 6, 2), 200, 1, "title", "hf:1"])
+
+    database.get_hf_daily_papers(offset=0, limit=8, cursor=page_cursor)
+
+    list_sql, list_params = cursor.calls[1]
+    assert "WHERE (l.daily_date < %s OR (l.daily_date = %s AND (l.upvotes < %s" in list_sql
+    assert list_params[:2] == [date(2026, 6, 2), date(2026, 6, 2)]
+    assert list_params[-2:] == [8, 0]
+
+
+def test_arxiv_papers_seek_by_added_at_and_id(monkeypatch):
+    added_at = datetime(2026, 5, 27, 8, 0, tzinfo=timezone.utc)
+    cursor = FakeCursor(
+        [{"id": "arxiv:2605.29707", "arxiv_added_at": added_at, "arxiv_row_id": 41}]
+    )
+    use_fake_connection(monkeypatch, cursor)
+    page_cursor = database.encode_page_cursor("arxiv", [added_at, 42])
+
+    papers, _ = database.get_arxiv_papers(offset=0, limit=6, cursor=page_cursor)
+
+    count_sql = cursor.calls[0][0]
+    list_sql, list_params = cursor.calls[1]
+    assert "(a.added_at, a.id) < (%s, %s)" not in count_sql
+    assert "(a.added_at, a.id) < (%s, %s)" in list_sql
+    assert list_params == [added_at, 42, 6, 0]
+    assert database.decode_page_cursor(papers[0]["cursor"], "arxiv", database._ARXIV_CURSOR_TYPES) == [
+        added_at,
+        41,
+    ]
+
+
+def test_search_page_returns_rows_total_and_read_counts_from_one_call(monkeypatch):
+    cursor = FakeCursor(
+        [
+            {"id": "paper-1", "title": "One", "rank_score": 0.5, "total_count": 7, "scope_count": 7, "read_count": 3},
+            {"id": "paper-2", "title": "Two", "rank_score": 0.4, "total_count": 7, "scope_count": 7, "read_count": 3},
+        ]
+    )
+    use_fake_connection(monkeypatch, cursor)
+
+    papers, total, read_counts = database.search_paper_page(
+        "ICLR 2026", 0, 2, "agents", user_id="user-1"
+    )
+
+    assert len(cursor.calls) == 1
+    assert cursor.calls[0][1][-2:] == ("user-1", "all")
+    assert [paper["id"] for paper in papers] == ["paper-1", "paper-2"]
+    assert total == 7
+    assert read_counts == {"all": 7, "unread": 4, "read": 3}
+
+
+def test_search_page_keeps_totals_when_page_is_empty(monkeypatch):
+    cursor = FakeCursor([{"id": None, "total_count": 7, "read_count": 0}])
+    use_fake_connection(monkeypatch, cursor)
+
+    papers, total, read_counts = database.search_paper_page("ICLR 2026", 40, 8)
+
+    assert papers == []
+    assert total == 7
+    assert read_counts is None
+
+
+def test_read_filter_is_a_search_function_parameter(monkeypatch):
+    cursor = FakeCursor(
+        [{"id": "paper-3", "title": "Three", "total_count": 4, "scope_count": 7, "read_count": 3}]
+    )
+    use_fake_connection(monkeypatch, cursor)
+
+    for _ in range(2):
+        papers, total, read_counts = database.search_paper_page(
+            "ICLR 2026", 0, 8, user_id="user-1", read_status="unread"
+        )
+
+    assert len(cursor.calls) == 2
+    query, params = cursor.calls[0]
+    assert "paper_marks" not in query
+    assert params[-2:] == ("user-1", "unread")
+    assert [paper["id"] for paper in papers] == ["paper-3"]
+    assert total == 4
+    assert read_counts == {"all": 7, "unread": 4, "read": 3}
+
+
+def test_legacy_search_streams_matches_and_ranks_top_k(monkeypatch):
+    rows = [
+        {"id": f"paper-{index:03d}", "title": f"Paper {index}", "abstract": "agents", "venue": "ICLR 2026 Poster"}
+        for index in range(200)
+    ]
+    rows[150] = {**rows[150], "title": "Agents everywhere"}
+    rows[42] = {**rows[42], "keyword_match": True}
+    cursor = FakeCursor(rows)
+    use_fake_connection(monkeypatch, cursor)
+
+    papers, total = database._search_papers_legacy(None, 0, 2, "agents", True, True, True)
+
+    stream_sql, stream_params = cursor.calls[0]
+    assert "llm_response" not in stream_sql
+    assert "title ILIKE %s" in stream_sql
+    assert stream_params == ["%agents%", "%agents%", "%agents%", "%agents%"]
+    assert cursor.calls[1][0] == "SELECT id, llm_response FROM papers WHERE id = ANY(%s)"
+    assert cursor.calls[1][1] == (["paper-150", "paper-042"],)
+    assert total == 200
+    assert [paper["id"] for paper in papers] == ["paper-150", "paper-042"]
+    assert "keyword_match" not in papers[0]
@@ -0,0 +1,160 @@
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+import database
+import llm as llm_module
+from config import LlmCompletionCacheConfig
+from llm import LLMStreamChunk, ManagedLLM
+from llm_cache import LLMCompletionCache, completion_cache_key
+
+
+class FakeCompletions:
+    def __init__(self, chunks: list[str] | None = None):
+        self.calls = []
+        self.chunks = chunks or []
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        if kwargs.get("stream"):
+            return self._stream()
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content="fresh"))],
+            usage=SimpleNamespace(prompt_tokens=90, completion_tokens=10),
+            model=kwargs["model"],
+        )
+
+    async def _stream(self):
+        for text in self.chunks:
+            yield SimpleNamespace(choices=[SimpleNamespace(delta={"content": text})], usage=None, model=None)
+
+
+def cached_llm(monkeypatch, completions: FakeCompletions, request_types=("chat", "chat_stream")):
+    entries = {}
+
+    def fake_get(cache_keys):
+        for key in cache_keys:
+            if key in entries:
+                return {"cache_key": key, "response": entries[key]["response"]}
+        return None
+
+    monkeypatch.setattr(database, "get_cached_llm_completion", fake_get)
+    monkeypatch.setattr(database, "store_llm_completion", lambda **entry: entries.__setitem__(entry["cache_key"], entry))
+    monkeypatch.setattr(llm_module, "_record_llm_usage", lambda usage, **context: None)
+
+    llm = ManagedLLM()
+    llm._completion_cache = LLMCompletionCache(LlmCompletionCacheConfig(enabled=True, request_types=request_types))
+    llm._get_active_config = lambda: {
+        "id": "provider-1",
+        "provider_key": "test",
+        "name": "Test Provider",
+        "base_url": "https://example.test/v1",
+        "api_key": "test-key",
+        "model_name": "test-model",
+        "default_parameters": {},
+    }
+    llm._client_for_config = lambda config: SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return llm, entries
+
+
+def test_cache_key_covers_messages_model_and_parameters():
+    messages = [{"role": "user", "content": "hello"}]
+
+    key = completion_cache_key(messages, "model-a", {"temperature": 0, "max_tokens": 10})
+
+    assert key == completion_cache_key(messages, "model-a", {"max_tokens": 10, "temperature": 0})
+    assert key != completion_cache_key(messages, "model-b", {"temperature": 0, "max_tokens": 10})
+    assert key != completion_cache_key(messages, "model-a", {"temperature": 1, "max_tokens": 10})
+    assert key != completion_cache_key([{"role": "user", "content": "hello!"}], "model-a", {"temperature": 0, "max_tokens": 10})
+
+
+@pytest.mark.asyncio
+async def test_identical_completion_is_served_from_cache(monkeypatch):
+    completions = FakeCompletions()
+    llm, entries = cached_llm(monkeypatch, completions)
+    messages = [{"role": "user", "content": "hello"}]
+
+    first = await llm.chat(messages, temperature=0)
+    second = await llm.chat(messages, temperature=0)
+    different = await llm.chat(messages, temperature=0.5)
+
+    assert first == second == different == "fresh"
+    assert len(completions.calls) == 2
+    assert [entry["total_tokens"] for entry in entries.values()] == [100, 100]
+    assert llm.completion_cache_stats()["hit_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_streams_store_and_replay_the_full_text(monkeypatch):
+    completions = FakeCompletions(chunks=["Hel", "lo"])
+    llm, entries = cached_llm(monkeypatch, completions)
+    messages = [{"role": "user", "content": "hello"}]
+
+    first = [chunk async for chunk in llm.chat_stream_events(messages)]
+    replay = [chunk async for chunk in llm.chat_stream_events(messages)]
+
+    assert [chunk.content for chunk in first] == ["Hel", "lo"]
+    assert replay == [LLMStreamChunk("content", "Hello")]
+    assert len(completions.calls) == 1
+    assert [entry["response"] for entry in entries.values()] == ["Hello"]
+
+
+@pytest.mark.asyncio
+async def test_request_types_must_opt_in(monkeypatch):
+    completions = FakeCompletions()
+    llm, entries = cached_llm(monkeypatch, completions, request_types=("code_availability",))
+
+    await llm.chat([{"role": "user", "content": "hello"}])
+    await llm.chat([{"role": "user", "content": "hello"}])
+
+    assert len(completions.calls) == 2
+    assert entries == {}
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return None
+
+    def execute(self, query, params=None):
+        self.calls.append((query, params))
+
+    def fetchall(self):
+        return [dict(row) for row in self.rows]
+
+
+def test_cache_metrics_report_hit_rate_and_saved_tokens(monkeypatch):
+    cursor = FakeCursor(
+        [
+            {"request_type": "code_availability", "entry_count": 3, "hit_count": 9, "saved_tokens": 4500, "size_bytes": 600},
+            {"request_type": "analysis", "entry_count": 1, "hit_count": 0, "saved_tokens": 0, "size_bytes": 9000},
+        ]
+    )
+
+    @contextmanager
+    def fake_get_connection():
+        yield SimpleNamespace(cursor=lambda *args, **kwargs: cursor)
+
+    monkeypatch.setattr(database, "_get_connection", fake_get_connection)
+
+    metrics = database.get_llm_completion_cache_metrics()
+
+    assert metrics["totals"] == {
+        "entry_count": 4,
+        "hit_count": 9,
+        "saved_tokens": 4500,
+        "size_bytes": 9600,
+        "hit_rate": 0.6923,
+    }
+    assert metrics["request_types"][0]["hit_rate"] == 0.75
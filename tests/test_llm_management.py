@@ -146,3 +146,78 @@ async def test_one_token_falls_back_to_max_completion_tokens():
     assert result["output"] == "7"
     assert completions.calls[0]["max_tokens"] == 1
     assert completions.calls[1]["max_completion_tokens"] == 1
+
+
+class ClosableClient:
+    def __init__(self, config):
+        self.config = config
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_client_registry_reuses_clients_and_closes_retired_ones_when_idle():
+    registry = llm_module.LLMClientRegistry(ClosableClient)
+    config = {"id": "provider-1", "base_url": "https://example.test/v1/", "api_key": "key-1"}
+
+    async with registry.use(config) as first:
+        async with registry.use({**config, "base_url": "https://example.test/v1"}) as second:
+            assert second is first
+        assert registry.retire("provider-1") == 1
+        assert first.closed is False
+    assert first.closed is True
+
+    async with registry.use({**config, "api_key": "key-2"}) as rotated:
+        assert rotated is not first
+    assert registry.stats()["created_count"] == 2
+    assert registry.stats()["reused_count"] == 1
+
+
+def test_active_llm_config_is_cached_until_a_provider_changes(monkeypatch):
+    import database
+
+    queries = []
+    retired = []
+    row = {"id": "provider-1", "name": "Test Provider", "model_name": "test-model", "api_key": "key"}
+
+    monkeypatch.setattr(database, "_run_with_retry", lambda operation, label: queries.append(label) or dict(row))
+    monkeypatch.setattr(database, "publish_cache_invalidation", lambda topic, data: None)
+    monkeypatch.setattr(database, "_llm_config_change_listeners", [])
+    database._llm_config_cache.clear()
+    database.add_llm_config_change_listener(lambda event: retired.append(event["provider_id"]))
+
+    first = database.get_active_llm_config()
+    first["api_key"] = "mutated"
+    assert database.get_active_llm_config()["api_key"] == "key"
+    assert queries == ["get_active_llm_config"]
+
+    database._notify_llm_config_changed("provider-1")
+    database.get_active_llm_config()
+
+    assert queries == ["get_active_llm_config", "get_active_llm_config"]
+    assert retired == ["provider-1"]
+
+
+def test_llm_config_read_racing_a_provider_change_is_not_cached(monkeypatch):
+    import database
+
+    queries = []
+
+    def read_while_disabled(operation, label):
+        queries.append(label)
+        database._notify_llm_config_changed("provider-1")
+        return [] if label == "list_enabled_llm_configs" else {"id": "provider-1", "api_key": "old"}
+
+    monkeypatch.setattr(database, "_run_with_retry", read_while_disabled)
+    monkeypatch.setattr(database, "publish_cache_invalidation", lambda topic, data: None)
+    monkeypatch.setattr(database, "_llm_config_change_listeners", [])
+    database._llm_config_cache.clear()
+
+    database.get_active_llm_config()
+    database.list_enabled_llm_configs()
+
+    assert database._llm_config_cache.get("active") is None
+    assert database._llm_config_cache.get("enabled") is None
+    assert queries == ["get_active_llm_config", "list_enabled_llm_configs"]
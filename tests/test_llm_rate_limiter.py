@@ -0,0 +1,101 @@
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+from llm_rate_limiter import (
+    LLMRateLimiters,
+    ProviderLimits,
+    ProviderRateLimiter,
+    estimate_request_tokens,
+    retry_after_seconds,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_request_bucket_delays_callers_beyond_the_per_minute_budget(monkeypatch):
+    clock = FakeClock()
+    limiter = ProviderRateLimiter("provider", ProviderLimits(requests_per_minute=2), clock=clock)
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+        clock.now += seconds
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+
+    async def scenario():
+        for _ in range(3):
+            async with limiter.lease(10):
+                pass
+
+    asyncio.run(scenario())
+
+    assert sleeps == [30.0]
+    stats = limiter.stats()
+    assert stats["acquired_count"] == 3
+    assert stats["delayed_count"] == 1
+    assert stats["max_wait_seconds"] == 30.0
+
+
+def test_token_bucket_reconciles_reservations_with_actual_usage():
+    clock = FakeClock()
+    limiter = ProviderRateLimiter("provider", ProviderLimits(tokens_per_minute=1000), clock=clock)
+
+    async def scenario():
+        async with limiter.lease(800) as lease:
+            lease.record_usage(200)
+
+    asyncio.run(scenario())
+
+    assert limiter._tokens.level == 800
+    assert estimate_request_tokens([{"role": "user", "content": "x" * 400}], {"max_tokens": 50}) == 150
+
+
+def test_concurrency_cap_queues_callers_until_a_slot_is_released():
+    limiter = ProviderRateLimiter("provider", ProviderLimits(max_concurrency=1))
+    order = []
+
+    async def call(name):
+        async with limiter.lease(1):
+            order.append(f"{name}-start")
+            await asyncio.sleep(0.01)
+            order.append(f"{name}-end")
+
+    async def scenario():
+        await asyncio.gather(call("a"), call("b"))
+
+    asyncio.run(scenario())
+
+    assert order == ["a-start", "a-end", "b-start", "b-end"]
+
+
+def test_retry_after_headers_pause_the_provider():
+    clock = FakeClock()
+    limiter = ProviderRateLimiter("provider", ProviderLimits(), clock=clock)
+    error = SimpleNamespace(response=SimpleNamespace(headers={"retry-after": "7"}))
+
+    limiter.penalize(retry_after_seconds(error))
+
+    assert retry_after_seconds(SimpleNamespace(response=SimpleNamespace(headers={"retry-after-ms": "1500"}))) == 1.5
+    assert retry_after_seconds(SimpleNamespace(response=None)) is None
+    assert limiter.stats()["blocked_seconds"] == 7.0
+    assert limiter.stats()["throttled_count"] == 1
+
+
+def test_limiters_are_rebuilt_when_provider_limits_change():
+    limiters = LLMRateLimiters()
+    config = {"id": "provider-1", "name": "Provider", "requests_per_minute": 60}
+
+    first = limiters.for_config(config)
+    assert limiters.for_config(dict(config)) is first
+    assert limiters.for_config({**config, "requests_per_minute": 120}) is not first
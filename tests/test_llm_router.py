@@ -0,0 +1,237 @@
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from openai import APIConnectionError, BadRequestError
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+import database
+import llm as llm_module
+from config import LlmRouteConfig, LlmRoutingConfig
+from llm import LLMStreamChunk, ManagedLLM
+from llm_router import LLMRouter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+PROVIDERS = [
+    {"id": "p-1", "provider_key": "fast", "name": "Fast", "base_url": "https://fast.test", "api_key": "k1", "model_name": "fast-chat"},
+    {"id": "p-2", "provider_key": "strong", "name": "Strong", "base_url": "https://strong.test", "api_key": "k2", "model_name": "strong-chat"},
+    {"id": "p-3", "provider_key": "nokey", "name": "No Key", "base_url": "https://nokey.test", "api_key": None, "model_name": "x"},
+]
+
+
+def routing(hedge_delay_ms: int = 0, **routes) -> LlmRoutingConfig:
+    return LlmRoutingConfig(
+        mode="pool",
+        routes={name: tuple(LlmRouteConfig(**entry) for entry in entries) for name, entries in routes.items()},
+        failure_threshold=2,
+        cooldown_seconds=30,
+        hedge_delay_ms=hedge_delay_ms,
+    )
+
+
+def connection_error() -> APIConnectionError:
+    return APIConnectionError(request=httpx.Request("POST", "https://provider.test/chat/completions"))
+
+
+def test_routes_follow_request_type_priority_and_skip_unusable_providers():
+    router = LLMRouter(
+        routing(
+            default=[{"provider": "fast"}],
+            analysis=[
+                {"provider": "nokey", "priority": 0},
+                {"provider": "missing", "priority": 0},
+                {"provider": "strong", "model": "strong-reasoner", "priority": 0},
+                {"provider": "fast", "priority": 1},
+            ],
+        )
+    )
+
+    analysis = router.candidates("analysis_stream", PROVIDERS)
+    chat = router.candidates("chat", PROVIDERS)
+
+    assert [(config["provider_key"], config["model_name"]) for config in analysis] == [
+        ("strong", "strong-reasoner"),
+        ("fast", "fast-chat"),
+    ]
+    assert [config["provider_key"] for config in chat] == ["fast"]
+
+
+def test_failing_route_cools_down_then_returns():
+    clock = FakeClock()
+    router = LLMRouter(routing(default=[{"provider": "fast"}, {"provider": "strong", "priority": 1}]), clock=clock)
+    fast = router.candidates("chat", PROVIDERS)[0]
+
+    router.record_failure(fast, connection_error(), failing_over=True)
+    assert [config["provider_key"] for config in router.candidates("chat", PROVIDERS)] == ["fast", "strong"]
+    router.record_failure(fast, connection_error(), failing_over=True)
+    assert [config["provider_key"] for config in router.candidates("chat", PROVIDERS)] == ["strong", "fast"]
+
+    clock.now = 31
+    assert [config["provider_key"] for config in router.candidates("chat", PROVIDERS)] == ["fast", "strong"]
+    stats = router.stats()
+    assert stats["failover_count"] == 2
+    assert stats["routes"][0]["failure_count"] == 2
+
+
+def test_weighted_order_prefers_healthy_and_fast_routes():
+    draws = iter([0.5, 0.5])
+    router = LLMRouter(routing(default=[{"provider": "fast"}, {"provider": "strong"}]), rng=lambda: next(draws))
+    fast, strong = PROVIDERS[:2]
+    router.record_success(fast, 1.0)
+    router.record_success(strong, 4.0)
+
+    assert [config["provider_key"] for config in router.candidates("chat", PROVIDERS)] == ["fast", "strong"]
+
+
+class RoutedCompletions:
+    def __init__(
+        self,
+        name: str,
+        fail: bool = False,
+        chunks: list[str] | None = None,
+        delay: float = 0,
+        error: Exception | None = None,
+    ):
+        self.name = name
+        self.fail = fail
+        self.error = error
+        self.chunks = chunks or []
+        self.delay = delay
+        self.calls = []
+        self.cancelled = False
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        if self.error is not None:
+            raise self.error
+        if self.fail:
+            raise connection_error()
+        if kwargs.get("stream"):
+            return self._stream()
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=self.name))],
+            usage=None,
+            model=kwargs["model"],
+        )
+
+    async def _stream(self):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        for text in self.chunks:
+            yield SimpleNamespace(choices=[SimpleNamespace(delta={"content": text})], usage=None, model=None)
+
+
+def routed_llm(monkeypatch, completions_by_key: dict[str, RoutedCompletions], records=None, **settings) -> ManagedLLM:
+    llm = ManagedLLM()
+    llm._router = LLMRouter(routing(default=[{"provider": "fast"}, {"provider": "strong", "priority": 1}], **settings))
+    llm._client_for_config = lambda config: SimpleNamespace(
+        chat=SimpleNamespace(completions=completions_by_key[config["provider_key"]])
+    )
+    monkeypatch.setattr(database, "list_enabled_llm_configs", lambda: [dict(provider) for provider in PROVIDERS])
+    monkeypatch.setattr(
+        llm_module,
+        "_record_llm_usage",
+        lambda usage, **context: records.append((usage, context)) if records is not None else None,
+    )
+    return llm
+
+
+@pytest.mark.asyncio
+async def test_completion_fails_over_to_the_next_route(monkeypatch):
+    fast = RoutedCompletions("fast", fail=True)
+    strong = RoutedCompletions("strong")
+    llm = routed_llm(monkeypatch, {"fast": fast, "strong": strong})
+
+    output = await llm.chat([{"role": "user", "content": "hi"}])
+
+    assert output == "strong"
+    assert len(fast.calls) == 1
+    assert strong.calls[0]["model"] == "strong-chat"
+    assert llm.routing_stats()["failover_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_request_errors_are_not_retried_on_other_routes(monkeypatch):
+    request = httpx.Request("POST", "https://fast.test/chat/completions")
+    too_long = BadRequestError(
+        "context length exceeded",
+        response=httpx.Response(400, request=request),
+        body=None,
+    )
+    fast = RoutedCompletions("fast", error=too_long)
+    strong = RoutedCompletions("strong")
+    llm = routed_llm(monkeypatch, {"fast": fast, "strong": strong})
+
+    with pytest.raises(BadRequestError):
+        await llm.chat([{"role": "user", "content": "hi"}])
+
+    assert len(fast.calls) == 1
+    assert strong.calls == []
+    stats = llm.routing_stats()
+    assert stats["failover_count"] == 0
+    assert all(route["failure_count"] == 0 for route in stats["routes"])
+
+
+@pytest.mark.asyncio
+async def test_stream_fails_over_before_the_first_token(monkeypatch):
+    fast = RoutedCompletions("fast", fail=True)
+    strong = RoutedCompletions("strong", chunks=["Hel", "lo"])
+    llm = routed_llm(monkeypatch, {"fast": fast, "strong": strong})
+
+    chunks = [chunk async for chunk in llm.chat_stream_events([{"role": "user", "content": "hi"}])]
+
+    assert chunks == [LLMStreamChunk("content", "Hel"), LLMStreamChunk("content", "lo")]
+    routes = {route["provider_key"]: route for route in llm.routing_stats()["routes"]}
+    assert routes["fast"]["failure_count"] == 1
+    assert routes["strong"]["success_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_first_token_is_hedged_to_the_next_route(monkeypatch):
+    slow = RoutedCompletions("fast", chunks=["late"], delay=5)
+    quick = RoutedCompletions("strong", chunks=["early"])
+    records = []
+    llm = routed_llm(monkeypatch, {"fast": slow, "strong": quick}, records, hedge_delay_ms=10)
+
+    chunks = [
+        chunk.content
+        async for chunk in llm.chat_stream_events([{"role": "user", "content": "hi"}], _llm_hedge=True)
+    ]
+
+    assert chunks == ["early"]
+    assert slow.cancelled is True
+    hedge_records = sorted((context["provider_key"], context["hedged"], context["metadata"]) for _, context in records)
+    assert hedge_records == [
+        ("fast", True, {"hedge": "cancelled", "estimated": True}),
+        ("strong", True, {"hedge": "won"}),
+    ]
+    stats = llm.routing_stats()
+    assert stats["hedged_count"] == 1
+    assert stats["hedge_secondary_wins"] == 1
+
+
+@pytest.mark.asyncio
+async def test_streams_are_not_hedged_unless_enabled(monkeypatch):
+    slow = RoutedCompletions("fast", chunks=["late"], delay=0.05)
+    quick = RoutedCompletions("strong", chunks=["early"])
+    llm = routed_llm(monkeypatch, {"fast": slow, "strong": quick}, hedge_delay_ms=10)
+
+    chunks = [chunk.content async for chunk in llm.chat_stream_events([{"role": "user", "content": "hi"}])]
+
+    assert chunks == ["late"]
+    assert quick.calls == []
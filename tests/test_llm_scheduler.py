@@ -0,0 +1,71 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+from config import LlmSchedulerConfig
+from llm_scheduler import LLMPreempted, LLMScheduler
+
+
+def test_free_slots_go_to_the_highest_waiting_class_within_its_cap():
+    scheduler = LLMScheduler(LlmSchedulerConfig(max_concurrency=1, interactive_limit=1, hf_daily_limit=1, backlog_limit=1))
+    order = []
+
+    async def call(priority_class, name):
+        async with scheduler.slot(priority_class):
+            order.append(name)
+            await asyncio.sleep(0)
+
+    async def scenario():
+        async with scheduler.slot("hf_daily"):
+            tasks = [
+                asyncio.create_task(call("backlog", "backlog")),
+                asyncio.create_task(call("hf_daily", "hf_daily")),
+                asyncio.create_task(call("interactive", "interactive")),
+            ]
+            await asyncio.sleep(0)
+            snapshot = scheduler.status_snapshot()
+            assert snapshot["active_total"] == 1
+            assert {row["priority_class"]: row["waiting"] for row in snapshot["classes"]} == {
+                "interactive": 1,
+                "feishu": 0,
+                "hf_daily": 1,
+                "backlog": 1,
+            }
+        await asyncio.gather(*tasks)
+
+    asyncio.run(scenario())
+
+    assert order == ["interactive", "hf_daily", "backlog"]
+    assert scheduler.status_snapshot()["active_total"] == 0
+
+
+def test_interactive_demand_preempts_running_backlog_work():
+    scheduler = LLMScheduler(LlmSchedulerConfig(max_concurrency=1))
+    backlog_cancelled = []
+
+    async def backlog_call():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            backlog_cancelled.append(True)
+            raise
+
+    async def interactive_call():
+        return "answer"
+
+    async def scenario():
+        backlog = asyncio.create_task(scheduler.run("backlog", backlog_call))
+        await asyncio.sleep(0)
+        answer = await asyncio.wait_for(scheduler.run("interactive", interactive_call), timeout=1)
+        with pytest.raises(LLMPreempted):
+            await backlog
+        return answer
+
+    assert asyncio.run(scenario()) == "answer"
+    assert backlog_cancelled == [True]
+    assert scheduler.preempted_count == 1
+    assert scheduler.status_snapshot()["active_total"] == 0
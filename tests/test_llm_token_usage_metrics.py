@@ -125,3 +125,38 @@ def test_build_llm_usage_window_returns_daily_and_model_aggregates():
     assert window["model_totals"][0]["model_name"] == "step-test"
     assert window["model_totals"][0]["cache_output_tokens"] == 42
     assert window["daily"][0]["date"] == today.isoformat()
+
+
+def test_build_llm_usage_window_reports_prompt_cache_ratio_per_provider():
+    tz = ZoneInfo("UTC")
+    today = datetime.now(tz).date()
+    base = {"usage_date": today, "output_tokens": 0, "cache_input_tokens": 0, "total_tokens": 0}
+    rows = [
+        {**base, "provider_key": "deepseek", "provider_name": "DeepSeek", "model_name": "deepseek-chat",
+         "request_count": 3, "input_tokens": 3000, "cache_output_tokens": 1800},
+        {**base, "provider_key": "deepseek", "provider_name": "DeepSeek", "model_name": "deepseek-reasoner",
+         "request_count": 1, "input_tokens": 1000, "cache_output_tokens": 0},
+        {**base, "provider_key": "step", "provider_name": "Step", "model_name": "step-test",
+         "request_count": 1, "input_tokens": 0, "cache_output_tokens": 0},
+    ]
+
+    window = database._build_llm_usage_window(7, rows, tz)
+
+    assert window["provider_cache"] == [
+        {
+            "provider_key": "deepseek",
+            "provider_name": "DeepSeek",
+            "request_count": 4,
+            "input_tokens": 4000,
+            "cache_output_tokens": 1800,
+            "cache_read_ratio": 0.45,
+        },
+        {
+            "provider_key": "step",
+            "provider_name": "Step",
+            "request_count": 1,
+            "input_tokens": 0,
+            "cache_output_tokens": 0,
+            "cache_read_ratio": 0.0,
+        },
+    ]
@@ -0,0 +1,96 @@
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+import database
+
+
+class FakeCursor:
+    def __init__(self):
+        self.calls = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return None
+
+    def execute(self, query, params=None):
+        self.calls.append((query, params))
+
+    def fetchone(self):
+        return {
+            "id": "arxiv:2605.29707",
+            "title": "A Useful Paper",
+            "abstract": "Summary",
+            "pdf": "https://arxiv.org/pdf/2605.29707v1",
+            "venue": "arXiv",
+            "llm_response": "analysis",
+            "author_names": ["Alice Example", "Bob Example"],
+            "keyword_names": ["cs.AI"],
+            "arxiv_id": "2605.29707",
+            "arxiv_url": "https://arxiv.org/abs/2605.29707",
+            "arxiv_published_at": datetime(2026, 5, 27, tzinfo=timezone.utc),
+            "arxiv_metadata": {},
+        }
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self.cursor_instance = cursor
+
+    def cursor(self):
+        return self.cursor_instance
+
+    def commit(self):
+        return None
+
+
+def use_fake_connection(monkeypatch, cursor):
+    @contextmanager
+    def fake_get_connection():
+        yield FakeConnection(cursor)
+
+    monkeypatch.setattr(database, "DATABASE_URL", "postgresql://test/paper_online")
+    monkeypatch.setattr(database, "_get_connection", fake_get_connection)
+    monkeypatch.setattr(database, "publish_cache_invalidation", lambda topic, data: None)
+    database._paper_cache.clear()
+
+
+def test_get_paper_loads_authors_keywords_and_arxiv_in_one_query(monkeypatch):
+    cursor = FakeCursor()
+    use_fake_connection(monkeypatch, cursor)
+
+    paper = database.get_paper("arxiv:2605.29707")
+
+    assert len(cursor.calls) == 1
+    query = cursor.calls[0][0]
+    assert "FROM authors au" in query
+    assert "FROM keywords k" in query
+    assert "LEFT JOIN arxiv_papers a" in query
+    assert paper["authors"] == ["Alice Example", "Bob Example"]
+    assert paper["keywords"] == ["cs.AI"]
+    assert paper["arxiv"]["arxiv_id"] == "2605.29707"
+    assert paper["arxiv"]["published_at"] == datetime(2026, 5, 27, tzinfo=timezone.utc)
+    assert "author_names" not in paper
+
+
+def test_get_paper_serves_hot_records_until_the_paper_changes(monkeypatch):
+    cursor = FakeCursor()
+    use_fake_connection(monkeypatch, cursor)
+
+    first = database.get_paper("arxiv:2605.29707")
+    first["authors"].append("Mutated By Caller")
+    second = database.get_paper("arxiv:2605.29707")
+
+    assert len(cursor.calls) == 1
+    assert second["authors"] == ["Alice Example", "Bob Example"]
+
+    database.update_llm_response("arxiv:2605.29707", "new analysis")
+    database.get_paper("arxiv:2605.29707")
+
+    assert cursor.calls[-1][1] == ("arxiv:2605.29707",)
+    assert sum("FROM authors au" in query for query, _ in cursor.calls) == 2
@@ -0,0 +1,170 @@
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+import database
+from result_cache import ResultCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeCursor:
+    def __init__(self):
+        self.calls = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return None
+
+    def execute(self, query, params=None):
+        self.calls.append((query, params))
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self.cursor_instance = cursor
+
+    def cursor(self):
+        return self.cursor_instance
+
+    def commit(self):
+        return None
+
+
+def test_result_cache_evicts_least_recently_used_entries():
+    cache = ResultCache("test-lru", max_entries=2, max_bytes=1_000_000, default_ttl_seconds=60)
+
+    cache.set("a", [1])
+    cache.set("b", [2])
+    assert cache.get("a") == [1]
+    cache.set("c", [3])
+
+    assert cache.get("b") is None
+    assert cache.get("a") == [1]
+    assert cache.get("c") == [3]
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 3
+    assert stats["misses"] == 1
+
+
+def test_result_cache_enforces_byte_budget_and_ttl():
+    clock = FakeClock()
+    cache = ResultCache("test-budget", max_entries=10, max_bytes=2_000, default_ttl_seconds=60, clock=clock)
+
+    cache.set("small", "x" * 100, ttl_seconds=5)
+    cache.set("too-big", "x" * 5_000)
+    assert cache.get("too-big") is None
+
+    cache.set("medium-1", "y" * 900)
+    cache.set("medium-2", "z" * 900)
+    assert cache.stats()["bytes"] <= 2_000
+    assert cache.get("small") is None
+
+    clock.now += 61
+    assert cache.get("medium-2") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_result_cache_invalidates_by_tag():
+    cache = ResultCache("test-tags", max_entries=10, max_bytes=1_000_000, default_ttl_seconds=60)
+    cache.set("page-1", ["p1", "p2"], tags={"paper:p1", "paper:p2", "scope:iclr 2026"})
+    cache.set("page-2", ["p3"], tags={"paper:p3", "scope:iclr 2026"})
+
+    assert cache.invalidate_tags({"paper:p2"}) == 1
+    assert cache.get("page-1") is None
+    assert cache.get("page-2") == ["p3"]
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_update_llm_response_invalidates_cached_pages_containing_paper(monkeypatch):
+    cursor = FakeCursor()
+
+    @contextmanager
+    def fake_get_connection():
+        yield FakeConnection(cursor)
+
+    monkeypatch.setattr(database, "DATABASE_URL", "postgresql://test/paper_online")
+    monkeypatch.setattr(database, "_get_connection", fake_get_connection)
+    database._search_cache.clear()
+
+    database._set_cached_result("iclr-page", [{"id": "paper-1"}], 1, venue_prefix="ICLR 2026")
+    database._set_cached_result("neurips-page", [{"id": "paper-2"}], 1, venue_prefix="NeurIPS 2025")
+
+    database.update_llm_response("paper-1", "analysis")
+
+    assert database._get_cached_result("iclr-page") is None
+    assert database._get_cached_result("neurips-page") == ([{"id": "paper-2"}], 1)
+
+
+def test_paper_insert_invalidates_only_matching_scopes(monkeypatch):
+    database._search_cache.clear()
+    events = []
+    database.add_paper_change_listener(events.append)
+    try:
+        database._set_cached_result("all-page", [{"id": "paper-1"}], 1)
+        database._set_cached_result("iclr-page", [{"id": "paper-1"}], 1, venue_prefix="ICLR 2026")
+        database._set_cached_result("cvpr-page", [{"id": "paper-3"}], 1, venue_prefix="CVPR 2026")
+
+        database._notify_papers_changed(["paper-9"], venues=["ICLR 2026 Oral"], membership_changed=True)
+    finally:
+        database._paper_change_listeners.remove(events.append)
+
+    assert database._get_cached_result("all-page") is None
+    assert database._get_cached_result("iclr-page") is None
+    assert database._get_cached_result("cvpr-page") == ([{"id": "paper-3"}], 1)
+    assert events[0]["paper_ids"] == ["paper-9"]
+    assert events[0]["membership_changed"] is True
+
+
+def test_result_cache_drops_values_loaded_before_an_invalidation():
+    cache = ResultCache("test-generation", max_entries=10, max_bytes=1_000_000, default_ttl_seconds=60)
+
+    generation = cache.generation
+    cache.invalidate_tags({"paper:p1"})
+    cache.set("p1", {"title": "stale"}, tags={"paper:p1"}, generation=generation)
+    assert cache.get("p1") is None
+
+    cache.set("p1", {"title": "fresh"}, tags={"paper:p1"}, generation=cache.generation)
+    assert cache.get("p1") == {"title": "fresh"}
+
+
+def test_get_paper_does_not_cache_a_row_changed_while_reading(monkeypatch):
+    database._paper_cache.clear()
+    monkeypatch.setattr(database, "DATABASE_URL", "postgresql://test/paper_online")
+
+    def read_while_updated(operation, label):
+        database._apply_paper_change({"paper_ids": ["paper-1"]})
+        return {"id": "paper-1", "title": "Paper", "llm_response": None}
+
+    monkeypatch.setattr(database, "_run_with_retry", read_while_updated)
+
+    assert database.get_paper("paper-1")["id"] == "paper-1"
+    assert database._paper_cache.get("paper-1") is None
+
+
+def test_search_does_not_cache_a_page_changed_while_querying(monkeypatch):
+    database._search_cache.clear()
+    monkeypatch.setattr(database, "DATABASE_URL", "postgresql://test/paper_online")
+
+    def search_while_updated(*args, **kwargs):
+        database._apply_paper_change({"paper_ids": ["paper-1"], "code_changed": True})
+        return [{"id": "paper-1", "code_status": "unknown"}], 1, None
+
+    monkeypatch.setattr(database, "_search_papers_via_rpc", search_while_updated)
+
+    papers, total, _ = database._search_papers("ICLR 2026", 0, 8, None, True, True, True)
+
+    assert (papers, total) == ([{"id": "paper-1", "code_status": "unknown"}], 1)
+    assert len(database._search_cache) == 0
@@ -0,0 +1,70 @@
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+import database
+
+
+class FakeCursor:
+    def __init__(self):
+        self.calls = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return None
+
+    def execute(self, query, params=None):
+        self.calls.append((query, params))
+
+    def fetchone(self):
+        return {"total": 0}
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def fetchall(self):
+        return []
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self.cursor_instance = cursor
+
+    def cursor(self, *args, **kwargs):
+        return self.cursor_instance
+
+
+def test_paper_listings_never_select_stored_search_vectors(monkeypatch):
+    cursor = FakeCursor()
+
+    @contextmanager
+    def fake_get_connection():
+        yield FakeConnection(cursor)
+
+    monkeypatch.setattr(database, "DATABASE_URL", "postgresql://test/paper_online")
+    monkeypatch.setattr(database, "_get_connection", fake_get_connection)
+
+    database.get_hf_daily_papers(offset=0, limit=8)
+    database.get_arxiv_papers(offset=0, limit=6)
+    database._search_papers_legacy(None, 0, 8, None, True, True, True)
+
+    for query, _ in cursor.calls:
+        assert "p.*" not in query
+        assert "SELECT * FROM papers" not in query
+        assert "_tsv" not in query
+    assert "p.code_meta" in cursor.calls[1][0]
+
+
+def test_search_vector_migration_indexes_precomputed_columns():
+    migration = (
+        Path(__file__).resolve().parents[1] / "db" / "migrations" / "020_stored_search_vectors.sql"
+    ).read_text(encoding="utf-8")
+
+    for column in ("title_tsv", "abstract_tsv", "keywords_tsv", "search_tsv"):
+        assert f"USING GIN ({column})" in migration
+    search_function = migration.split("CREATE OR REPLACE FUNCTION search_papers_optimized", 1)[1]
+    assert "to_tsvector(" not in search_function